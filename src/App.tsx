@@ -51,6 +51,27 @@ function App() {
         await getDB();
 
         setDbStatus('ready');
+
+        // One-time background migration, so progress saves never need the `files` store
+        dbService.recoverMissingFilenames().catch((err) => {
+          console.error('Failed to recover missing filenames:', err);
+        });
+
+        // Data migrations run in chunks after startup; progress is only shown for large rewrites
+        let showingProgress = false;
+        dbService.runDataMigrations((progress) => {
+          const { showToast } = useToastStore.getState();
+          if (!progress.done && progress.migrated > 0) {
+            showingProgress = true;
+            const percent = Math.floor((progress.processed / progress.total) * 100);
+            showToast(`${progress.description}... ${percent}%`, 'info', 60000);
+          } else if (progress.done && showingProgress) {
+            showingProgress = false;
+            showToast('Library update complete', 'success');
+          }
+        }).catch((err) => {
+          console.error('Failed to run data migrations:', err);
+        });
       } catch (err) {
         console.error('Failed to initialize DB:', err);
         setDbError(err);
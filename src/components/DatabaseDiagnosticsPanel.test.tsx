@@ -0,0 +1,54 @@
+import React from 'react';
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+import { render, screen, fireEvent } from '@testing-library/react';
+import { DatabaseDiagnosticsPanel } from './DatabaseDiagnosticsPanel';
+import { dbService } from '../db/DBService';
+
+vi.mock('../db/DBService', () => ({
+    dbService: {
+        getTelemetry: vi.fn(),
+        resetTelemetry: vi.fn(),
+        getReadCacheStats: vi.fn(),
+    },
+}));
+
+const operation = {
+    name: 'getBookMetadata', calls: 12, errors: 1, meanMs: 1.5,
+    p50Ms: 0.5, p95Ms: 4, p99Ms: 8, maxMs: 9.3, payloadBytes: 4096, histogram: [],
+};
+
+describe('DatabaseDiagnosticsPanel', () => {
+    beforeEach(() => {
+        vi.clearAllMocks();
+        vi.mocked(dbService.getTelemetry).mockReturnValue({
+            since: Date.now(),
+            operations: [operation],
+            transactions: { books: { readonly: 5, readwrite: 2 } },
+        });
+        vi.mocked(dbService.getReadCacheStats).mockReturnValue({
+            books: { hits: 3, misses: 1, size: 1, capacity: 16 },
+            content_analysis: { hits: 0, misses: 0, size: 0, capacity: 256 },
+            tts_content: { hits: 0, misses: 0, size: 0, capacity: 64 },
+        });
+    });
+
+    it('shows operation latencies, transactions and cache hit rates', () => {
+        render(<DatabaseDiagnosticsPanel />);
+
+        expect(screen.getByText('getBookMetadata')).toBeInTheDocument();
+        expect(screen.getByText('9.30')).toBeInTheDocument();
+        expect(screen.getByText('4.0 KB')).toBeInTheDocument();
+        expect(screen.getByText('75%')).toBeInTheDocument();
+        expect(screen.getByText('1 / 16')).toBeInTheDocument();
+    });
+
+    it('resets the telemetry', () => {
+        render(<DatabaseDiagnosticsPanel />);
+
+        vi.mocked(dbService.getTelemetry).mockReturnValue({ since: Date.now(), operations: [], transactions: {} });
+        fireEvent.click(screen.getByText('Reset'));
+
+        expect(dbService.resetTelemetry).toHaveBeenCalled();
+        expect(screen.getByText('No operations recorded yet.')).toBeInTheDocument();
+    });
+});
@@ -0,0 +1,151 @@
+import React, { useCallback, useEffect, useState } from 'react';
+import { dbService } from '../db/DBService';
+import type { DBTelemetrySnapshot } from '../db/telemetry';
+import type { ReadCacheStats } from '../db/ReadCache';
+import { TTSCache, type MemoryCacheStats } from '../lib/tts/TTSCache';
+import { Button } from './ui/Button';
+
+const formatMs = (ms: number) => (ms < 10 ? ms.toFixed(2) : ms.toFixed(0));
+
+const formatBytes = (bytes: number) => {
+    if (bytes < 1024) return `${bytes} B`;
+    if (bytes < 1024 * 1024) return `${(bytes / 1024).toFixed(1)} KB`;
+    return `${(bytes / (1024 * 1024)).toFixed(1)} MB`;
+};
+
+/**
+ * Shows the database telemetry: per-method latency percentiles, payload sizes,
+ * transactions per object store, and read cache and in-memory audio cache hit rates.
+ */
+export const DatabaseDiagnosticsPanel: React.FC = () => {
+    const [telemetry, setTelemetry] = useState<DBTelemetrySnapshot | null>(null);
+    const [cacheStats, setCacheStats] = useState<Record<string, ReadCacheStats>>({});
+    const [audioStats, setAudioStats] = useState<MemoryCacheStats | null>(null);
+
+    const refresh = useCallback(() => {
+        setTelemetry(dbService.getTelemetry());
+        setCacheStats(dbService.getReadCacheStats());
+        setAudioStats(TTSCache.getMemoryStats());
+    }, []);
+
+    useEffect(() => {
+        refresh();
+    }, [refresh]);
+
+    const handleReset = () => {
+        dbService.resetTelemetry();
+        refresh();
+    };
+
+    if (!telemetry) return null;
+
+    const transactions = Object.entries(telemetry.transactions)
+        .sort(([, a], [, b]) => (b.readonly + b.readwrite) - (a.readonly + a.readwrite));
+
+    return (
+        <div className="space-y-8">
+            <div className="space-y-4">
+                <div className="flex items-center justify-between gap-2">
+                    <div>
+                        <h3 className="text-lg font-medium">Database Operations</h3>
+                        <p className="text-sm text-muted-foreground">
+                            Latency in milliseconds since {new Date(telemetry.since).toLocaleTimeString()}, slowest first.
+                        </p>
+                    </div>
+                    <div className="flex gap-2">
+                        <Button variant="outline" size="sm" onClick={refresh}>Refresh</Button>
+                        <Button variant="outline" size="sm" onClick={handleReset}>Reset</Button>
+                    </div>
+                </div>
+                {telemetry.operations.length === 0 ? (
+                    <p className="text-sm text-muted-foreground">No operations recorded yet.</p>
+                ) : (
+                    <div className="overflow-x-auto">
+                        <table className="w-full text-xs tabular-nums" data-testid="db-operations-table">
+                            <thead className="text-muted-foreground">
+                                <tr className="border-b">
+                                    <th className="text-left font-medium py-1 pr-2">Operation</th>
+                                    <th className="text-right font-medium py-1 px-2">Calls</th>
+                                    <th className="text-right font-medium py-1 px-2">p50</th>
+                                    <th className="text-right font-medium py-1 px-2">p95</th>
+                                    <th className="text-right font-medium py-1 px-2">p99</th>
+                                    <th className="text-right font-medium py-1 px-2">Max</th>
+                                    <th className="text-right font-medium py-1 px-2">Errors</th>
+                                    <th className="text-right font-medium py-1 pl-2">Payload</th>
+                                </tr>
+                            </thead>
+                            <tbody>
+                                {telemetry.operations.map(op => (
+                                    <tr key={op.name} className="border-b last:border-0">
+                                        <td className="py-1 pr-2 font-mono">{op.name}</td>
+                                        <td className="text-right py-1 px-2">{op.calls}</td>
+                                        <td className="text-right py-1 px-2">{formatMs(op.p50Ms)}</td>
+                                        <td className="text-right py-1 px-2">{formatMs(op.p95Ms)}</td>
+                                        <td className="text-right py-1 px-2">{formatMs(op.p99Ms)}</td>
+                                        <td className="text-right py-1 px-2">{formatMs(op.maxMs)}</td>
+                                        <td className={`text-right py-1 px-2 ${op.errors > 0 ? 'text-destructive' : ''}`}>{op.errors}</td>
+                                        <td className="text-right py-1 pl-2">{formatBytes(op.payloadBytes)}</td>
+                                    </tr>
+                                ))}
+                            </tbody>
+                        </table>
+                    </div>
+                )}
+            </div>
+
+            <div className="border-t pt-4 space-y-4">
+                <h3 className="text-lg font-medium">Transactions</h3>
+                <p className="text-sm text-muted-foreground">
+                    Transactions opened per object store. A transaction spanning several stores counts once for each.
+                </p>
+                {transactions.length === 0 ? (
+                    <p className="text-sm text-muted-foreground">No transactions recorded yet.</p>
+                ) : (
+                    <div className="grid grid-cols-[1fr_auto_auto] gap-x-4 gap-y-1 text-xs tabular-nums">
+                        <span className="text-muted-foreground font-medium">Store</span>
+                        <span className="text-muted-foreground font-medium text-right">Read</span>
+                        <span className="text-muted-foreground font-medium text-right">Write</span>
+                        {transactions.map(([store, stats]) => (
+                            <React.Fragment key={store}>
+                                <span className="font-mono">{store}</span>
+                                <span className="text-right">{stats.readonly}</span>
+                                <span className="text-right">{stats.readwrite}</span>
+                            </React.Fragment>
+                        ))}
+                    </div>
+                )}
+            </div>
+
+            <div className="border-t pt-4 space-y-4">
+                <h3 className="text-lg font-medium">Read Cache</h3>
+                <div className="grid grid-cols-[1fr_auto_auto_auto] gap-x-4 gap-y-1 text-xs tabular-nums">
+                    <span className="text-muted-foreground font-medium">Store</span>
+                    <span className="text-muted-foreground font-medium text-right">Hit Rate</span>
+                    <span className="text-muted-foreground font-medium text-right">Misses</span>
+                    <span className="text-muted-foreground font-medium text-right">Entries</span>
+                    {Object.entries(cacheStats).map(([store, stats]) => {
+                        const reads = stats.hits + stats.misses;
+                        return (
+                            <React.Fragment key={store}>
+                                <span className="font-mono">{store}</span>
+                                <span className="text-right">{reads > 0 ? `${Math.round((stats.hits / reads) * 100)}%` : '-'}</span>
+                                <span className="text-right">{stats.misses}</span>
+                                <span className="text-right">{stats.size} / {stats.capacity}</span>
+                            </React.Fragment>
+                        );
+                    })}
+                    {audioStats && (
+                        <>
+                            <span className="font-mono">tts audio (memory)</span>
+                            <span className="text-right">
+                                {audioStats.hits + audioStats.misses > 0 ? `${Math.round((audioStats.hits / (audioStats.hits + audioStats.misses)) * 100)}%` : '-'}
+                            </span>
+                            <span className="text-right">{audioStats.misses}</span>
+                            <span className="text-right">{formatBytes(audioStats.bytes)} / {formatBytes(audioStats.budget)}</span>
+                        </>
+                    )}
+                </div>
+            </div>
+        </div>
+    );
+};
@@ -16,11 +16,15 @@ import { useGenAIStore } from '../store/useGenAIStore';
 import { TTSAbbreviationSettings } from './reader/TTSAbbreviationSettings';
 import { LexiconManager } from './reader/LexiconManager';
 import { getDB } from '../db/db';
+import { BOOK_KEYED_STORES, SECTION_KEYED_STORES } from '../db/bookKeys';
 import { maintenanceService } from '../lib/MaintenanceService';
 import { backupService } from '../lib/BackupService';
-import { dbService } from '../db/DBService';
+import { dbService, DEFAULT_TTS_CACHE_BUDGET } from '../db/DBService';
+import type { TTSCacheUsage } from '../types/db';
 import { exportReadingListToCSV, parseReadingListCSV } from '../lib/csv';
 import { ReadingListDialog } from './ReadingListDialog';
+import { DatabaseDiagnosticsPanel } from './DatabaseDiagnosticsPanel';
+import { TTSCache } from '../lib/tts/TTSCache';
 import { Trash2, Download, Loader2 } from 'lucide-react';
 
 /**
@@ -44,6 +48,7 @@ export const GlobalSettingsDialog = () => {
     const zipImportRef = useRef<HTMLInputElement>(null);
     const folderImportRef = useRef<HTMLInputElement>(null);
     const [readingListCount, setReadingListCount] = useState<number | null>(null);
+    const [ttsCacheUsage, setTTSCacheUsage] = useState<TTSCacheUsage | null>(null);
     const [isReadingListOpen, setIsReadingListOpen] = useState(false);
     const [isCsvImporting, setIsCsvImporting] = useState(false);
     const [csvImportMessage, setCsvImportMessage] = useState('');
@@ -68,8 +73,24 @@ export const GlobalSettingsDialog = () => {
         if (activeTab === 'data') {
             dbService.getReadingList().then(list => setReadingListCount(list ? list.length : 0));
         }
+        if (activeTab === 'tts') {
+            dbService.getTTSCacheUsage().then(setTTSCacheUsage).catch(() => setTTSCacheUsage(null));
+        }
     }, [activeTab]);
 
+    const handleTTSCacheBudgetChange = async (value: string) => {
+        const budget = Number(value) * 1024 * 1024;
+        await dbService.setTTSCacheBudget(budget);
+        setTTSCacheUsage(usage => usage && { ...usage, budget });
+    };
+
+    const handleClearTTSCache = async () => {
+        if (!confirm('Delete all cached audio? Segments will be synthesized again when played.')) return;
+        await dbService.clearTTSCache();
+        TTSCache.clearMemory();
+        setTTSCacheUsage(usage => usage && { ...usage, bytes: 0 });
+    };
+
     const handleExportReadingList = async () => {
         try {
             const list = await dbService.getReadingList();
@@ -167,6 +188,7 @@ export const GlobalSettingsDialog = () => {
         apiKeys, setApiKey,
         backgroundAudioMode, setBackgroundAudioMode,
         whiteNoiseVolume, setWhiteNoiseVolume,
+        timeStretch, setTimeStretch,
         voice, voices, setVoice,
         downloadVoice, deleteVoice, downloadProgress, downloadStatus, isDownloading, checkVoiceDownloaded
     } = useTTSStore(useShallow(state => ({
@@ -179,6 +201,8 @@ export const GlobalSettingsDialog = () => {
         setBackgroundAudioMode: state.setBackgroundAudioMode,
         whiteNoiseVolume: state.whiteNoiseVolume,
         setWhiteNoiseVolume: state.setWhiteNoiseVolume,
+        timeStretch: state.timeStretch,
+        setTimeStretch: state.setTimeStretch,
         voice: state.voice,
         voices: state.voices,
         setVoice: state.setVoice,
@@ -214,14 +238,13 @@ export const GlobalSettingsDialog = () => {
         if (confirm("Are you sure you want to delete ALL data? This includes books, annotations, and settings.")) {
             dbService.cleanup();
             // Clear IndexedDB
+            // Every store holding per-book data (including the search index's full text),
+            // so nothing is left for the repair tool to find
             const db = await getDB();
-            await db.clear('books');
-            await db.clear('files');
-            await db.clear('annotations');
-            await db.clear('tts_cache');
-            await db.clear('lexicon');
-            await db.clear('locations');
-            await db.clear('covers');
+            for (const store of [...BOOK_KEYED_STORES, ...SECTION_KEYED_STORES, 'reading_history', 'annotations', 'lexicon'] as const) {
+                await db.clear(store);
+            }
+            await dbService.clearTTSCache();
 
             // Clear LocalStorage
             localStorage.clear();
@@ -235,9 +258,9 @@ export const GlobalSettingsDialog = () => {
         setOrphanScanResult('Scanning...');
         try {
             const report = await maintenanceService.scanForOrphans();
-            const total = report.files + report.annotations + report.locations + report.lexicon + report.covers;
+            const total = report.files + report.annotations + report.locations + report.lexicon + report.covers + report.search_index + report.library_summary + report.section_content;
             if (total > 0) {
-                if (confirm(`Found orphans:\n- Files: ${report.files}\n- Annotations: ${report.annotations}\n- Locations: ${report.locations}\n- Lexicon: ${report.lexicon}\n- Covers: ${report.covers}\n\nDelete them?`)) {
+                if (confirm(`Found orphans:\n- Files: ${report.files}\n- Annotations: ${report.annotations}\n- Locations: ${report.locations}\n- Lexicon: ${report.lexicon}\n- Covers: ${report.covers}\n- Search Indexes: ${report.search_index}\n- Library Summaries: ${report.library_summary}\n- Section Content: ${report.section_content}\n\nDelete them?`)) {
                     await maintenanceService.pruneOrphans();
                     setOrphanScanResult('Repair complete. Orphans removed.');
                 } else {
@@ -355,6 +378,9 @@ export const GlobalSettingsDialog = () => {
                     <Button variant={activeTab === 'dictionary' ? 'secondary' : 'ghost'} className="w-auto sm:w-full justify-start whitespace-nowrap flex-shrink-0" onClick={() => setActiveTab('dictionary')}>
                         Dictionary
                     </Button>
+                    <Button variant={activeTab === 'diagnostics' ? 'secondary' : 'ghost'} className="w-auto sm:w-full justify-start whitespace-nowrap flex-shrink-0" onClick={() => setActiveTab('diagnostics')}>
+                        Diagnostics
+                    </Button>
                     {/* Add margin to last item to prevent overlap with Close button on mobile */}
                     <Button variant={activeTab === 'data' ? 'secondary' : 'ghost'} className="w-auto sm:w-full justify-start whitespace-nowrap flex-shrink-0 text-destructive hover:text-destructive mr-10 sm:mr-0" onClick={() => setActiveTab('data')}>
                         Data Management
@@ -616,6 +642,45 @@ export const GlobalSettingsDialog = () => {
                                     )}
                                 </div>
                             </div>
+
+                            <div className="border-t pt-4 space-y-4">
+                                <div className="space-y-1">
+                                    <h4 className="text-sm font-medium">Audio Cache</h4>
+                                    <p className="text-xs text-muted-foreground">
+                                        Synthesized audio is kept so replaying a passage costs nothing. The least recently played audio is removed once the cache reaches its limit.
+                                    </p>
+                                </div>
+                                <div className="flex items-center justify-between gap-2">
+                                    <span className="text-sm">
+                                        {ttsCacheUsage ? `${(ttsCacheUsage.bytes / (1024 * 1024)).toFixed(1)} MB used` : '...'}
+                                    </span>
+                                    <div className="flex items-center gap-2">
+                                        <Select
+                                            value={String(Math.round((ttsCacheUsage?.budget ?? DEFAULT_TTS_CACHE_BUDGET) / (1024 * 1024)))}
+                                            onValueChange={handleTTSCacheBudgetChange}
+                                        >
+                                            <SelectTrigger className="w-32"><SelectValue /></SelectTrigger>
+                                            <SelectContent>
+                                                <SelectItem value="100">100 MB</SelectItem>
+                                                <SelectItem value="250">250 MB</SelectItem>
+                                                <SelectItem value="500">500 MB</SelectItem>
+                                                <SelectItem value="1024">1 GB</SelectItem>
+                                                <SelectItem value="2048">2 GB</SelectItem>
+                                            </SelectContent>
+                                        </Select>
+                                        <Button variant="outline" size="sm" onClick={handleClearTTSCache}>Clear</Button>
+                                    </div>
+                                </div>
+                                <div className="flex items-center justify-between">
+                                    <div className="space-y-0.5">
+                                        <label htmlFor="time-stretch-toggle" className="text-sm font-medium">Reuse Audio at Any Speed</label>
+                                        <p className="text-xs text-muted-foreground">
+                                            Synthesize at normal speed and speed up during playback, so changing the speed never re-synthesizes cached audio.
+                                        </p>
+                                    </div>
+                                    <Switch id="time-stretch-toggle" checked={timeStretch} onCheckedChange={setTimeStretch} />
+                                </div>
+                            </div>
                         </div>
                     )}
 
@@ -723,6 +788,8 @@ export const GlobalSettingsDialog = () => {
                         </div>
                     )}
 
+                    {activeTab === 'diagnostics' && <DatabaseDiagnosticsPanel />}
+
                     {activeTab === 'data' && (
                         <div className="space-y-6">
                              <div className="space-y-4">
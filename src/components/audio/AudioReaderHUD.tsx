@@ -1,4 +1,4 @@
-import React, { useEffect, useMemo } from 'react';
+import React, { useEffect } from 'react';
 import { useLocation, useNavigate } from 'react-router-dom';
 import { useTTSStore } from '../../store/useTTSStore';
 import { useReaderStore } from '../../store/useReaderStore';
@@ -14,7 +14,7 @@ export const AudioReaderHUD: React.FC = () => {
         pause: state.pause
     })));
     const immersiveMode = useReaderStore(state => state.immersiveMode);
-    const books = useLibraryStore(state => state.books);
+    const lastReadBook = useLibraryStore(state => state.lastReadBook);
     const location = useLocation();
     const navigate = useNavigate();
 
@@ -28,15 +28,8 @@ export const AudioReaderHUD: React.FC = () => {
         }
     }, [isLibrary, isPlaying, pause]);
 
-    const lastReadBook = useMemo(() => {
-        if (!books || books.length === 0) return null;
-        const startedBooks = books.filter(b => b.lastRead && b.progress && b.progress > 0);
-        if (startedBooks.length === 0) return null;
-        return startedBooks.sort((a, b) => (b.lastRead || 0) - (a.lastRead || 0))[0];
-    }, [books]);
-
-    // Show last read book if in library and not playing audio
-    const showLastRead = isLibrary && !isPlaying && lastReadBook;
+    // Show last read book if in library and not playing audio, once it has been started
+    const showLastRead = isLibrary && !isPlaying && lastReadBook && (lastReadBook.progress ?? 0) > 0;
 
     // Don't render if nothing in queue AND no last read book in library
     // If showLastRead is true, we render.
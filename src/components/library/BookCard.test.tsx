@@ -3,23 +3,31 @@ import { describe, it, expect, beforeEach, vi } from 'vitest';
 import React from 'react';
 import { BrowserRouter } from 'react-router-dom';
 import { BookCard } from './BookCard';
-import type { BookMetadata } from '../../types/db';
+import type { LibrarySummary } from '../../types/db';
 import { useLibraryStore } from '../../store/useLibraryStore';
+import { dbService } from '../../db/DBService';
 
 // Mock useLibraryStore
 vi.mock('../../store/useLibraryStore', () => ({
   useLibraryStore: vi.fn(),
 }));
 
+// Covers are loaded lazily from the database
+vi.mock('../../db/DBService', () => ({
+  dbService: {
+    getBookCover: vi.fn(),
+  },
+}));
+
 describe('BookCard', () => {
-  const mockBook: BookMetadata = {
+  const mockBook: LibrarySummary = {
     id: '1',
     title: 'Test Title',
     author: 'Test Author',
-    description: 'Test Description',
     addedAt: 1234567890,
-    coverBlob: new Blob(['mock-image'], { type: 'image/jpeg' }),
+    hasCover: true,
   };
+  const mockCover = new Blob(['mock-image'], { type: 'image/jpeg' });
 
   const mockRemoveBook = vi.fn();
   const mockOffloadBook = vi.fn();
@@ -29,6 +37,7 @@ describe('BookCard', () => {
     // Mock URL.createObjectURL and revokeObjectURL
     global.URL.createObjectURL = vi.fn(() => 'blob:mock-url');
     global.URL.revokeObjectURL = vi.fn();
+    vi.mocked(dbService.getBookCover).mockReset().mockResolvedValue(mockCover);
 
     // Setup store mock
     (useLibraryStore as unknown as ReturnType<typeof vi.fn>).mockReturnValue({
@@ -51,26 +60,29 @@ describe('BookCard', () => {
     expect(screen.getByText('Test Author')).toBeInTheDocument();
   });
 
-  it('should render cover image if blob is present', () => {
+  it('should load and render the cover image if the book has one', async () => {
     renderWithRouter(<BookCard book={mockBook} />);
 
-    const img = screen.getByRole('img');
+    const img = await screen.findByRole('img');
+    expect(dbService.getBookCover).toHaveBeenCalledWith('1');
     expect(img).toHaveAttribute('src', 'blob:mock-url');
     expect(img).toHaveAttribute('alt', 'Cover of Test Title');
   });
 
-  it('should render placeholder if no cover blob', () => {
-    const bookWithoutCover = { ...mockBook, coverBlob: undefined };
+  it('should render placeholder without fetching if the book has no cover', () => {
+    const bookWithoutCover = { ...mockBook, hasCover: false };
     renderWithRouter(<BookCard book={bookWithoutCover} />);
 
+    expect(dbService.getBookCover).not.toHaveBeenCalled();
     expect(screen.queryByRole('img')).not.toBeInTheDocument();
     expect(screen.getByText('Aa')).toBeInTheDocument();
   });
 
-  it('should clean up object URL on unmount', () => {
+  it('should clean up object URL on unmount', async () => {
     const { unmount } = renderWithRouter(<BookCard book={mockBook} />);
 
-    expect(global.URL.createObjectURL).toHaveBeenCalledWith(mockBook.coverBlob);
+    await screen.findByRole('img');
+    expect(global.URL.createObjectURL).toHaveBeenCalledWith(mockCover);
 
     unmount();
 
@@ -1,6 +1,6 @@
-import React, { useEffect, useState, useRef } from 'react';
+import React, { useState, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
-import type { BookMetadata } from '../../types/db';
+import type { LibrarySummary } from '../../types/db';
 import { MoreVertical, Trash2, CloudOff, Cloud, RefreshCw } from 'lucide-react';
 import { useLibraryStore } from '../../store/useLibraryStore';
 import { LazyLoadImage } from 'react-lazy-load-image-component';
@@ -14,13 +14,14 @@ import {
 import { Dialog } from '../ui/Dialog';
 import { Button } from '../ui/Button';
 import { cn } from '../../lib/utils';
+import { useBookCover } from '../../hooks/useBookCover';
 
 /**
  * Props for the BookCard component.
  */
 interface BookCardProps {
-  /** The metadata of the book to display. */
-  book: BookMetadata;
+  /** The summary of the book to display. */
+  book: LibrarySummary;
 }
 
 const formatDuration = (chars?: number): string => {
@@ -39,31 +40,17 @@ const formatDuration = (chars?: number): string => {
  * Displays a summary card for a book, including its cover, title, and author.
  * navigating to the reader view when clicked.
  *
- * @param props - Component props containing the book metadata.
+ * @param props - Component props containing the book summary.
  * @returns A React component rendering the book card.
  */
 export const BookCard: React.FC<BookCardProps> = React.memo(({ book }) => {
   const navigate = useNavigate();
   const { removeBook, offloadBook, restoreBook } = useLibraryStore();
-  const [coverUrl, setCoverUrl] = useState<string | null>(null);
+  const coverUrl = useBookCover(book);
   const [isDeleteDialogOpen, setIsDeleteDialogOpen] = useState(false);
   const [isMenuOpen, setIsMenuOpen] = useState(false);
   const fileInputRef = useRef<HTMLInputElement>(null);
 
-  useEffect(() => {
-    let url: string | null = null;
-    if (book.coverBlob) {
-      url = URL.createObjectURL(book.coverBlob);
-      setCoverUrl(url);
-    }
-
-    return () => {
-      if (url) {
-        URL.revokeObjectURL(url);
-      }
-    };
-  }, [book.coverBlob]);
-
   const handleCardClick = () => {
     if (book.isOffloaded) {
       // Trigger restore
@@ -1,7 +1,7 @@
 import React from 'react';
 import { render, screen } from '@testing-library/react';
 import { BookListItem } from './BookListItem';
-import { BookMetadata } from '../../types/db';
+import { LibrarySummary } from '../../types/db';
 import { MemoryRouter } from 'react-router-dom';
 import { vi } from 'vitest';
 
@@ -23,7 +23,7 @@ vi.mock('../../store/useReaderStore', () => ({
 }));
 
 describe('BookListItem', () => {
-    const mockBook: BookMetadata = {
+    const mockBook: LibrarySummary = {
         id: '1',
         title: 'Test Book',
         author: 'Test Author',
@@ -31,6 +31,7 @@ describe('BookListItem', () => {
         progress: 0.5,
         fileSize: 1024 * 1024 * 2.5, // 2.5 MB
         isOffloaded: false,
+        hasCover: false,
     };
 
     it('renders book details correctly', () => {
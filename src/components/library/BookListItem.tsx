@@ -1,5 +1,5 @@
 import React from 'react';
-import type { BookMetadata } from '../../types/db';
+import type { LibrarySummary } from '../../types/db';
 import { BookOpen, Trash2, MoreVertical, HardDriveDownload, HardDriveUpload } from 'lucide-react';
 import { useNavigate } from 'react-router-dom';
 import { useLibraryStore } from '../../store/useLibraryStore';
@@ -15,13 +15,14 @@ import { useReaderStore } from '../../store/useReaderStore';
 import { Dialog } from '../ui/Dialog';
 import { Button } from '../ui/Button';
 import { Progress } from '../ui/Progress';
+import { useBookCover } from '../../hooks/useBookCover';
 
 /**
  * Props for the BookListItem component.
  */
 interface BookListItemProps {
-    /** The metadata of the book to display. */
-    book: BookMetadata;
+    /** The summary of the book to display. */
+    book: LibrarySummary;
 }
 
 const formatFileSize = (bytes?: number): string => {
@@ -58,27 +59,10 @@ export const BookListItem: React.FC<BookListItemProps> = ({ book }) => {
     const showToast = useToastStore(state => state.showToast);
     const setBookId = useReaderStore(state => state.setCurrentBookId);
     const fileInputRef = React.useRef<HTMLInputElement>(null);
-    const [coverUrl, setCoverUrl] = React.useState<string | null>(null);
     const [isDeleteDialogOpen, setIsDeleteDialogOpen] = React.useState(false);
     const [isOffloadDialogOpen, setIsOffloadDialogOpen] = React.useState(false);
 
-    React.useEffect(() => {
-        let url: string | null = null;
-        if (book.coverBlob) {
-            url = URL.createObjectURL(book.coverBlob);
-            setCoverUrl(url);
-        } else {
-            setCoverUrl(null);
-        }
-
-        return () => {
-            if (url) {
-                URL.revokeObjectURL(url);
-            }
-        };
-    }, [book.coverBlob]);
-
-    const displayUrl = coverUrl || book.coverUrl;
+    const displayUrl = useBookCover(book);
 
     const handleOpen = () => {
         if (book.isOffloaded) {
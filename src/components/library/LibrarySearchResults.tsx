@@ -0,0 +1,78 @@
+import React from 'react';
+import { useNavigate } from 'react-router-dom';
+import { X } from 'lucide-react';
+import type { LibrarySummary } from '../../types/db';
+import type { LibrarySearchResponse } from '../../types/search';
+import { Button } from '../ui/Button';
+
+/**
+ * Props for the LibrarySearchResults component.
+ */
+interface LibrarySearchResultsProps {
+    /** The merged response of the library-wide search. */
+    response: LibrarySearchResponse;
+    /** The books in the library, used to resolve titles and authors. */
+    books: LibrarySummary[];
+    /** The query that produced the response. */
+    query: string;
+    /** Callback to dismiss the results. */
+    onClose: () => void;
+}
+
+/**
+ * Displays ranked full-text matches across the whole library, grouped by book.
+ *
+ * @param props - Component props.
+ * @returns The rendered results panel.
+ */
+export const LibrarySearchResults: React.FC<LibrarySearchResultsProps> = ({ response, books, query, onClose }) => {
+    const navigate = useNavigate();
+    const booksById = new Map(books.map(book => [book.id, book]));
+    const slowestShardMs = response.shards.reduce((max, shard) => Math.max(max, shard.roundTripMs), 0);
+
+    return (
+        <section data-testid="library-search-results" className="mb-6 rounded-lg border border-border bg-surface p-4">
+            <div className="flex items-center justify-between mb-3">
+                <h2 className="text-lg font-bold text-foreground">Matches for "{query}" inside books</h2>
+                <Button variant="ghost" size="icon" onClick={onClose} aria-label="Close full-text results">
+                    <X className="w-4 h-4" />
+                </Button>
+            </div>
+
+            {response.hits.length === 0 ? (
+                <p className="text-sm text-muted-foreground">No matches found inside your books.</p>
+            ) : (
+                <ul className="space-y-4">
+                    {response.hits.map((hit) => {
+                        const book = booksById.get(hit.bookId);
+                        return (
+                            <li key={hit.bookId} className="border-b border-border pb-3 last:border-0">
+                                <button
+                                    data-testid={`library-search-hit-${hit.bookId}`}
+                                    className="text-left w-full"
+                                    onClick={() => navigate(`/read/${hit.bookId}`)}
+                                >
+                                    <p className="font-medium text-foreground">
+                                        {book?.title || 'Unknown book'}
+                                        <span className="ml-2 text-xs text-muted-foreground">
+                                            {hit.hitCount} {hit.hitCount === 1 ? 'match' : 'matches'}
+                                        </span>
+                                    </p>
+                                    {book?.author && <p className="text-xs text-muted-foreground mb-1">{book.author}</p>}
+                                    {hit.results.map((result, idx) => (
+                                        <p key={idx} className="text-sm text-foreground line-clamp-2">{result.excerpt}</p>
+                                    ))}
+                                </button>
+                            </li>
+                        );
+                    })}
+                </ul>
+            )}
+
+            <p className="mt-3 text-xs text-muted-foreground">
+                Searched in {Math.round(slowestShardMs)} ms across {response.shards.length} {response.shards.length === 1 ? 'worker' : 'workers'}.
+                {response.unindexed.length > 0 && ` ${response.unindexed.length} not yet indexed; open them once to include them.`}
+            </p>
+        </section>
+    );
+};
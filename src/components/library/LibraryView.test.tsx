@@ -4,6 +4,8 @@ import React from 'react';
 import { LibraryView } from './LibraryView';
 import { useLibraryStore } from '../../store/useLibraryStore';
 import { useToastStore } from '../../store/useToastStore';
+import { searchClient } from '../../lib/search';
+import { dbService } from '../../db/DBService';
 
 // Mock BookCard
 vi.mock('./BookCard', () => ({
@@ -36,6 +38,8 @@ describe('LibraryView', () => {
 
         useLibraryStore.setState({
             books: [],
+            filter: '',
+            hasMore: false,
             isLoading: false,
             error: null,
             // eslint-disable-next-line @typescript-eslint/no-explicit-any
@@ -80,100 +84,95 @@ describe('LibraryView', () => {
         });
     });
 
-    it('filters books by search query', async () => {
+    it('applies the search query as a library filter', async () => {
+        const mockFetchBooks = vi.fn().mockResolvedValue(undefined);
         useLibraryStore.setState({
             books: [
                 // eslint-disable-next-line @typescript-eslint/no-explicit-any
                 { id: '1', title: 'The Great Gatsby', author: 'F. Scott Fitzgerald' } as any,
                 // eslint-disable-next-line @typescript-eslint/no-explicit-any
-                { id: '2', title: '1984', author: 'George Orwell' } as any,
-                // eslint-disable-next-line @typescript-eslint/no-explicit-any
-                { id: '3', title: 'Brave New World', author: 'Aldous Huxley' } as any
+                { id: '2', title: '1984', author: 'George Orwell' } as any
             ],
-            viewMode: 'grid'
+            viewMode: 'grid',
+            filter: '',
+            // eslint-disable-next-line @typescript-eslint/no-explicit-any
+            fetchBooks: mockFetchBooks as any
         });
 
         render(<LibraryView />);
+        mockFetchBooks.mockClear();
 
         const searchInput = screen.getByTestId('library-search-input');
         fireEvent.change(searchInput, { target: { value: 'George' } });
 
+        // Filtering happens in the database query, once typing pauses
         await waitFor(() => {
-            expect(screen.getAllByTestId('book-card')).toHaveLength(1);
-            expect(screen.getByText('1984')).toBeInTheDocument();
+            expect(useLibraryStore.getState().filter).toBe('George');
+            expect(mockFetchBooks).toHaveBeenCalledTimes(1);
         });
+    });
 
-        fireEvent.change(searchInput, { target: { value: 'Great' } });
-
-        await waitFor(() => {
-            expect(screen.getAllByTestId('book-card')).toHaveLength(1);
-            expect(screen.getByText('The Great Gatsby')).toBeInTheDocument();
+    it('drops library search results cancelled by a newer search', async () => {
+        vi.spyOn(dbService, 'getBookIds').mockResolvedValue(['1']);
+        vi.spyOn(dbService, 'getLibrarySummaries').mockResolvedValue([]);
+        const searchLibrary = vi.spyOn(searchClient, 'searchLibrary').mockResolvedValue({
+            hits: [], unindexed: [], shards: [], cancelled: true,
         });
+
+        render(<LibraryView />);
+        const searchInput = screen.getByTestId('library-search-input');
+        fireEvent.change(searchInput, { target: { value: 'whale' } });
+        fireEvent.keyDown(searchInput, { key: 'Enter' });
+
+        await waitFor(() => expect(searchLibrary).toHaveBeenCalled());
+        await act(async () => {});
+        expect(screen.queryByTestId('library-search-results')).not.toBeInTheDocument();
+
+        vi.restoreAllMocks();
     });
 
-    it('sorts books correctly', async () => {
+    it('renders books in store order and reloads on sort change', async () => {
+        const mockFetchBooks = vi.fn().mockResolvedValue(undefined);
         useLibraryStore.setState({
             books: [
-                // eslint-disable-next-line @typescript-eslint/no-explicit-any
-                { id: '1', title: 'B', author: 'Z', addedAt: 100, lastRead: 200 } as any,
                 // eslint-disable-next-line @typescript-eslint/no-explicit-any
                 { id: '2', title: 'A', author: 'Y', addedAt: 300, lastRead: 100 } as any,
                 // eslint-disable-next-line @typescript-eslint/no-explicit-any
-                { id: '3', title: 'C', author: 'X', addedAt: 200, lastRead: 300 } as any
+                { id: '3', title: 'C', author: 'X', addedAt: 200, lastRead: 300 } as any,
+                // eslint-disable-next-line @typescript-eslint/no-explicit-any
+                { id: '1', title: 'B', author: 'Z', addedAt: 100, lastRead: 200 } as any
             ],
             viewMode: 'grid',
-            sortOrder: 'recent'
+            sortOrder: 'recent',
+            // eslint-disable-next-line @typescript-eslint/no-explicit-any
+            fetchBooks: mockFetchBooks as any
         });
 
         render(<LibraryView />);
-        const sortSelect = screen.getByTestId('sort-select');
+        mockFetchBooks.mockClear();
 
-        // Default: Recently Added (Newest first) -> 2 (300), 3 (200), 1 (100)
-        let cards = screen.getAllByTestId('book-card');
+        // The store's pages are already sorted by the database
+        const cards = screen.getAllByTestId('book-card');
         expect(cards[0]).toHaveTextContent('A');
         expect(cards[1]).toHaveTextContent('C');
         expect(cards[2]).toHaveTextContent('B');
 
-        // Sort by Title (A-Z) -> 2 (A), 1 (B), 3 (C)
-        fireEvent.change(sortSelect, { target: { value: 'title' } });
-        cards = screen.getAllByTestId('book-card');
-        expect(cards[0]).toHaveTextContent('A');
-        expect(cards[1]).toHaveTextContent('B');
-        expect(cards[2]).toHaveTextContent('C');
-
-        // Sort by Author (A-Z) -> 3 (X), 2 (Y), 1 (Z)
-        fireEvent.change(sortSelect, { target: { value: 'author' } });
-        cards = screen.getAllByTestId('book-card');
-        expect(cards[0]).toHaveTextContent('C'); // Author X
-        expect(cards[1]).toHaveTextContent('A'); // Author Y
-        expect(cards[2]).toHaveTextContent('B'); // Author Z
-
-        // Sort by Last Read (Most recent first) -> 3 (300), 1 (200), 2 (100)
-        fireEvent.change(sortSelect, { target: { value: 'last_read' } });
-        cards = screen.getAllByTestId('book-card');
-        expect(cards[0]).toHaveTextContent('C');
-        expect(cards[1]).toHaveTextContent('B');
-        expect(cards[2]).toHaveTextContent('A');
+        fireEvent.change(screen.getByTestId('sort-select'), { target: { value: 'title' } });
+        expect(useLibraryStore.getState().sortOrder).toBe('title');
+        expect(mockFetchBooks).toHaveBeenCalledTimes(1);
     });
 
-    it('shows no results message when search returns nothing', async () => {
+    it('shows no results message when the filter matches nothing', async () => {
         useLibraryStore.setState({
-            books: [
-                // eslint-disable-next-line @typescript-eslint/no-explicit-any
-                { id: '1', title: 'The Great Gatsby', author: 'F. Scott Fitzgerald' } as any
-            ],
+            books: [],
+            filter: 'Harry Potter',
             viewMode: 'grid'
         });
 
         render(<LibraryView />);
 
-        const searchInput = screen.getByTestId('library-search-input');
-        fireEvent.change(searchInput, { target: { value: 'Harry Potter' } });
-
-        await waitFor(() => {
-            expect(screen.queryByTestId('book-card')).not.toBeInTheDocument();
-            expect(screen.getByText('No books found matching "Harry Potter"')).toBeInTheDocument();
-        });
+        expect(screen.queryByTestId('empty-library')).not.toBeInTheDocument();
+        expect(screen.getByText('No books found matching "Harry Potter"')).toBeInTheDocument();
     });
 
     it('handles drag and drop import', async () => {
@@ -8,11 +8,20 @@ import { Upload, Settings, LayoutGrid, List as ListIcon, FilePlus, Search } from
 import { useUIStore } from '../../store/useUIStore';
 import { Button } from '../ui/Button';
 import { Input } from '../ui/Input';
+import { LibrarySearchResults } from './LibrarySearchResults';
+import { searchClient } from '../../lib/search';
+import { dbService } from '../../db/DBService';
+import type { LibrarySearchResponse } from '../../types/search';
+import type { LibrarySummary } from '../../types/db';
+
+/** Delay before the typed title/author filter is applied to the library query. */
+const FILTER_DEBOUNCE_MS = 200;
 
 /**
  * The main library view component.
  * Displays the user's collection of books in a responsive grid or list and allows importing new books.
- * Handles fetching books from the store.
+ * Books are listed page by page from the store, already sorted and filtered by the database;
+ * the next page is requested when the end of the list scrolls into view.
  *
  * @returns A React component rendering the library interface.
  */
@@ -20,6 +29,10 @@ export const LibraryView: React.FC = () => {
   const {
     books,
     fetchBooks,
+    fetchMoreBooks,
+    hasMore,
+    filter,
+    setFilter,
     isLoading,
     error,
     addBook,
@@ -32,13 +45,42 @@ export const LibraryView: React.FC = () => {
   const { setGlobalSettingsOpen } = useUIStore();
   const showToast = useToastStore(state => state.showToast);
   const fileInputRef = useRef<HTMLInputElement>(null);
+  const loadMoreRef = useRef<HTMLDivElement>(null);
   const [dragActive, setDragActive] = useState(false);
-  const [searchQuery, setSearchQuery] = useState('');
+  const [searchQuery, setSearchQuery] = useState(filter);
+  const [libraryResults, setLibraryResults] = useState<{ query: string; response: LibrarySearchResponse; books: LibrarySummary[] } | null>(null);
+  const [isSearchingLibrary, setIsSearchingLibrary] = useState(false);
+  const librarySearchRunRef = useRef(0);
 
   useEffect(() => {
     fetchBooks();
   }, [fetchBooks]);
 
+  // The library search workers only serve this view; release them and their indexes when it closes
+  useEffect(() => {
+    return () => searchClient.terminateLibrarySearch();
+  }, []);
+
+  // Apply the typed filter to the library query once typing pauses
+  useEffect(() => {
+    const timeout = setTimeout(() => setFilter(searchQuery.trim()), FILTER_DEBOUNCE_MS);
+    return () => clearTimeout(timeout);
+  }, [searchQuery, setFilter]);
+
+  // Load the next page when the end of the list comes into view
+  useEffect(() => {
+    const sentinel = loadMoreRef.current;
+    if (!sentinel || !hasMore || typeof IntersectionObserver === 'undefined') return;
+
+    const observer = new IntersectionObserver((entries) => {
+      if (entries.some(entry => entry.isIntersecting)) {
+        fetchMoreBooks();
+      }
+    }, { rootMargin: '400px' });
+    observer.observe(sentinel);
+    return () => observer.disconnect();
+  }, [hasMore, fetchMoreBooks, books.length]);
+
   const handleFileSelect = (e: React.ChangeEvent<HTMLInputElement>) => {
     if (e.target.files && e.target.files[0]) {
       addBook(e.target.files[0]).then(() => {
@@ -92,37 +134,30 @@ export const LibraryView: React.FC = () => {
     }
   }, [addBook, showToast]);
 
+  const handleLibrarySearch = useCallback(async (query: string) => {
+    if (!query.trim()) return;
+    const run = ++librarySearchRunRef.current;
+    setIsSearchingLibrary(true);
+    try {
+      // Search every book, not just the loaded pages
+      const bookIds = await dbService.getBookIds();
+      const response = await searchClient.searchLibrary(query, bookIds);
+      // A newer search cancelled this one; its results are partial and stale
+      if (response.cancelled || run !== librarySearchRunRef.current) return;
+      const hitBooks = await dbService.getLibrarySummaries(response.hits.map(hit => hit.bookId));
+      if (run !== librarySearchRunRef.current) return;
+      setLibraryResults({ query, response, books: hitBooks });
+    } catch (err) {
+      showToast(`Search failed: ${err instanceof Error ? err.message : String(err)}`, "error");
+    } finally {
+      if (run === librarySearchRunRef.current) setIsSearchingLibrary(false);
+    }
+  }, [showToast]);
+
   const triggerFileUpload = () => {
     fileInputRef.current?.click();
   };
 
-  const filteredAndSortedBooks = books
-    .filter(book => {
-      const query = searchQuery.toLowerCase();
-      return (
-        (book.title || '').toLowerCase().includes(query) ||
-        (book.author || '').toLowerCase().includes(query)
-      );
-    })
-    .sort((a, b) => {
-      switch (sortOrder) {
-        case 'recent':
-          // Sort by addedAt descending (newest first)
-          return (b.addedAt || 0) - (a.addedAt || 0);
-        case 'last_read':
-          // Sort by lastRead descending (most recently read first)
-          return (b.lastRead || 0) - (a.lastRead || 0);
-        case 'author':
-          // Sort by author ascending (A-Z)
-          return (a.author || '').localeCompare(b.author || '');
-        case 'title':
-          // Sort by title ascending (A-Z)
-          return (a.title || '').localeCompare(b.title || '');
-        default:
-          return 0;
-      }
-    });
-
   return (
     <div
       data-testid="library-view"
@@ -207,9 +242,17 @@ export const LibraryView: React.FC = () => {
                 placeholder="Search"
                 value={searchQuery}
                 onChange={(e) => setSearchQuery(e.target.value)}
+                onKeyDown={(e) => {
+                  // Enter searches inside every book; typing filters by title/author
+                  if (e.key === 'Enter') handleLibrarySearch(searchQuery);
+                }}
                 className="pl-9"
+                aria-label="Search library (press Enter to search inside books)"
                 data-testid="library-search-input"
               />
+              {isSearchingLibrary && (
+                <div className="absolute right-3 top-1/2 -translate-y-1/2 animate-spin rounded-full h-4 w-4 border-b-2 border-primary" data-testid="library-search-spinner"></div>
+              )}
             </div>
           </div>
 
@@ -239,17 +282,26 @@ export const LibraryView: React.FC = () => {
         </section>
       )}
 
+      {libraryResults && (
+        <LibrarySearchResults
+          response={libraryResults.response}
+          books={libraryResults.books}
+          query={libraryResults.query}
+          onClose={() => setLibraryResults(null)}
+        />
+      )}
+
       {isLoading ? (
         <div className="flex justify-center items-center py-12 flex-1">
             <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-primary"></div>
         </div>
       ) : (
         <section className="flex-1 w-full">
-          {books.length === 0 ? (
+          {books.length === 0 && !filter ? (
              <EmptyLibrary onImport={triggerFileUpload} />
-          ) : filteredAndSortedBooks.length === 0 ? (
+          ) : books.length === 0 ? (
             <div className="flex flex-col items-center justify-center py-12 text-muted-foreground">
-              <p className="text-lg">No books found matching "{searchQuery}"</p>
+              <p className="text-lg">No books found matching "{filter}"</p>
               <Button
                 variant="link"
                 onClick={() => setSearchQuery('')}
@@ -262,7 +314,7 @@ export const LibraryView: React.FC = () => {
             <>
               {viewMode === 'grid' ? (
                 <div className="grid grid-cols-[repeat(auto-fill,minmax(140px,1fr))] sm:grid-cols-[repeat(auto-fill,minmax(200px,1fr))] gap-6 w-full">
-                  {filteredAndSortedBooks.map((book) => (
+                  {books.map((book) => (
                     <div key={book.id} className="flex justify-center">
                       <BookCard book={book} />
                     </div>
@@ -270,13 +322,13 @@ export const LibraryView: React.FC = () => {
                 </div>
               ) : (
                 <div className="flex flex-col gap-2 w-full">
-                  {filteredAndSortedBooks.map((book) => (
+                  {books.map((book) => (
                     <BookListItem key={book.id} book={book} />
                   ))}
                 </div>
               )}
-              {/* Spacer for bottom navigation or just breathing room */}
-              <div className="h-24" />
+              {/* Sentinel for loading the next page; doubles as spacer for bottom navigation */}
+              <div ref={loadMoreRef} className="h-24" data-testid="library-load-more" />
             </>
           )}
         </section>
@@ -1,7 +1,8 @@
-import React, { useMemo } from 'react';
+import React from 'react';
 import { useTTSStore } from '../../store/useTTSStore';
 import { useReaderStore } from '../../store/useReaderStore';
 import { useLibraryStore } from '../../store/useLibraryStore';
+import { useLibrarySummary } from '../../hooks/useLibrarySummary';
 import { useAnnotationStore } from '../../store/useAnnotationStore';
 import { CompassPill } from '../ui/CompassPill';
 import type { ActionType } from '../ui/CompassPill';
@@ -36,17 +37,11 @@ export const ReaderControlBar: React.FC = () => {
         currentSectionTitle: state.currentSectionTitle
     })));
 
-    const books = useLibraryStore(state => state.books);
-
-    // Memoize last read book calculation
-    const lastReadBook = useMemo(() => {
-        return books.filter(b => b.lastRead).sort((a, b) => (b.lastRead || 0) - (a.lastRead || 0))[0];
-    }, [books]);
+    // Loaded separately from the listing, which holds only its loaded pages in its own order
+    const lastReadBook = useLibraryStore(state => state.lastReadBook);
 
     // Determine current book title if active
-    const currentBook = useMemo(() => {
-        return currentBookId ? books.find(b => b.id === currentBookId) : undefined;
-    }, [currentBookId, books]);
+    const currentBook = useLibrarySummary(currentBookId);
 
     // Determine State Priority
     // 1. Annotation Mode
@@ -33,6 +33,13 @@ import { cn } from '../../lib/utils';
 import { Dialog } from '../ui/Dialog';
 import { useSidebarState } from '../../hooks/useSidebarState';
 
+/** Number of search results fetched from the worker per page in the search sidebar. */
+const SEARCH_PAGE_SIZE = 20;
+/** Delay after the last keystroke before a search-as-you-type query is sent. */
+const SEARCH_AS_YOU_TYPE_DEBOUNCE_MS = 250;
+/** Minimum query length for search-as-you-type; shorter queries match too much of the book. */
+const SEARCH_AS_YOU_TYPE_MIN_LENGTH = 2;
+
 /**
  * The main reader interface component.
  * Renders the EPUB content using epub.js and provides controls for navigation,
@@ -544,6 +551,103 @@ export const ReaderView: React.FC = () => {
   const [activeSearchQuery, setActiveSearchQuery] = useState('');
   const [searchResults, setSearchResults] = useState<SearchResult[]>([]);
   const [isSearching, setIsSearching] = useState(false);
+  const [hasMoreResults, setHasMoreResults] = useState(false);
+  const [isFuzzySearch, setIsFuzzySearch] = useState(false);
+  const searchRunRef = useRef(0);
+  // Resumes the paused result stream; the worker produces the next page only when called
+  const requestMoreResultsRef = useRef<(() => void) | null>(null);
+  const searchAsYouTypeTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
+
+  const cancelSearchAsYouType = useCallback(() => {
+      if (searchAsYouTypeTimerRef.current !== null) {
+          clearTimeout(searchAsYouTypeTimerRef.current);
+          searchAsYouTypeTimerRef.current = null;
+      }
+  }, []);
+
+  const stopResultStream = useCallback(() => {
+      const resume = requestMoreResultsRef.current;
+      if (!resume) return;
+      requestMoreResultsRef.current = null;
+      // Cancel first so the released stream stops at its next page boundary
+      searchClient.cancelSearch().catch(console.error);
+      resume();
+  }, []);
+
+  const runSearch = useCallback((query: string, fuzzy: boolean) => {
+      // A pending keystroke search would otherwise replace the full stream with its shorter list
+      cancelSearchAsYouType();
+      stopResultStream();
+      const run = ++searchRunRef.current;
+      setActiveSearchQuery(query);
+      setSearchResults([]);
+      setHasMoreResults(false);
+      setIsSearching(true);
+
+      searchClient.searchStream(query, id || '', (page, done) => {
+          // Ignore pages from a superseded query that were already in flight
+          if (run !== searchRunRef.current) return;
+          if (page.length > 0) {
+              setSearchResults(prev => [...prev, ...page]);
+          }
+          setIsSearching(false);
+          if (done) return;
+
+          // Keep the worker paused on this page until the reader asks for more
+          setHasMoreResults(true);
+          return new Promise<void>(resolve => {
+              requestMoreResultsRef.current = resolve;
+          });
+      }, { pageSize: SEARCH_PAGE_SIZE, mode: fuzzy ? 'fuzzy' : 'exact' }).then((completed) => {
+          if (!completed && run === searchRunRef.current) setIsSearching(false);
+      }).catch((error) => {
+          console.error('Search failed', error);
+          if (run === searchRunRef.current) setIsSearching(false);
+      });
+  }, [id, cancelSearchAsYouType, stopResultStream]);
+
+  const loadMoreResults = useCallback(() => {
+      const resume = requestMoreResultsRef.current;
+      if (!resume) return;
+      requestMoreResultsRef.current = null;
+      setHasMoreResults(false);
+      setIsSearching(true);
+      resume();
+  }, []);
+
+  // Search-as-you-type: the worker narrows the previous query's matches, so each
+  // (debounced) keystroke is cheap. Enter still streams the complete result set.
+  useEffect(() => {
+      if (!id || searchQuery.trim().length < SEARCH_AS_YOU_TYPE_MIN_LENGTH) return;
+
+      searchAsYouTypeTimerRef.current = setTimeout(() => {
+          searchAsYouTypeTimerRef.current = null;
+          stopResultStream();
+          const run = ++searchRunRef.current;
+          setActiveSearchQuery(searchQuery);
+          setHasMoreResults(false);
+          setIsSearching(false);
+
+          searchClient.searchAsYouType(searchQuery, id, { mode: isFuzzySearch ? 'fuzzy' : 'exact' }).then(({ results }) => {
+              if (run === searchRunRef.current) setSearchResults(results);
+          }).catch((error) => {
+              console.error('Search failed', error);
+          });
+      }, SEARCH_AS_YOU_TYPE_DEBOUNCE_MS);
+
+      return cancelSearchAsYouType;
+  }, [id, searchQuery, isFuzzySearch, cancelSearchAsYouType, stopResultStream]);
+
+  // Release the worker's search-as-you-type session (its cached matches) and any paused
+  // result stream when the search panel closes or the book changes
+  const isSearchPanelOpen = activeSidebar === 'search';
+  useEffect(() => {
+      if (!isSearchPanelOpen) return;
+      return () => {
+          stopResultStream();
+          searchClient.endSearchSession().catch(console.error);
+      };
+  }, [isSearchPanelOpen, id, stopResultStream]);
 
   // Indexing State
   const [isIndexing, setIsIndexing] = useState(false);
@@ -1000,18 +1104,25 @@ export const ReaderView: React.FC = () => {
                             onChange={(e) => setSearchQuery(e.target.value)}
                             onKeyDown={(e) => {
                                 if (e.key === 'Enter') {
-                                    setIsSearching(true);
-                                    setActiveSearchQuery(searchQuery);
-                                    searchClient.search(searchQuery, id || '').then(results => {
-                                        setSearchResults(results);
-                                        setIsSearching(false);
-                                    });
+                                    runSearch(searchQuery, isFuzzySearch);
                                 }
                             }}
                             placeholder="Search in book..."
                             className="w-full text-sm p-2 border rounded bg-background text-foreground border-border"
                          />
                      </div>
+                     <div className="flex items-center space-x-2 mt-2">
+                        <Switch
+                            id="fuzzy-search-mode"
+                            data-testid="search-fuzzy-toggle"
+                            checked={isFuzzySearch}
+                            onCheckedChange={setIsFuzzySearch}
+                        />
+                        <Label htmlFor="fuzzy-search-mode" className="text-xs text-muted-foreground">Match typos and accents</Label>
+                     </div>
+                     <p data-testid="search-help" className="text-xs text-muted-foreground mt-2">
+                         Finds words starting with your query; if there are none, matches inside words.
+                     </p>
                      {isIndexing && (
                         <div className="mt-3 space-y-1">
                              <div className="flex justify-between text-xs text-muted-foreground">
@@ -1028,7 +1139,7 @@ export const ReaderView: React.FC = () => {
                      )}
                  </div>
                  <div className="flex-1 overflow-y-auto p-4">
-                     {isSearching ? (
+                     {isSearching && searchResults.length === 0 ? (
                          <div className="text-center text-muted-foreground">Searching...</div>
                      ) : (
                          <ul className="space-y-4">
@@ -1038,13 +1149,17 @@ export const ReaderView: React.FC = () => {
                                         data-testid={`search-result-${idx}`}
                                         className="text-left w-full"
                                         onClick={async () => {
-                                            if (rendition) {
-                                                await rendition.display(result.href);
-                                                // Small delay to ensure rendering is complete before searching DOM
-                                                setTimeout(() => {
-                                                    scrollToText(activeSearchQuery);
-                                                }, 500);
+                                            if (!rendition) return;
+                                            if (result.cfi) {
+                                                // The index resolved the hit to its sentence; jump straight there
+                                                await rendition.display(result.cfi);
+                                                return;
                                             }
+                                            await rendition.display(result.href);
+                                            // Small delay to ensure rendering is complete before searching DOM
+                                            setTimeout(() => {
+                                                scrollToText(activeSearchQuery);
+                                            }, 500);
                                         }}
                                      >
                                          <p className="text-xs text-muted-foreground mb-1">Result {idx + 1}</p>
@@ -1057,6 +1172,22 @@ export const ReaderView: React.FC = () => {
                              {searchResults.length === 0 && searchQuery && !isSearching && (
                                  <div className="text-center text-muted-foreground text-sm">No results found</div>
                              )}
+                             {hasMoreResults && !isSearching && (
+                                 <li>
+                                     <Button
+                                        variant="ghost"
+                                        size="sm"
+                                        data-testid="search-load-more"
+                                        className="w-full"
+                                        onClick={loadMoreResults}
+                                     >
+                                         Show more results
+                                     </Button>
+                                 </li>
+                             )}
+                             {isSearching && searchResults.length > 0 && (
+                                 <li className="text-center text-muted-foreground text-xs">Searching...</li>
+                             )}
                          </ul>
                      )}
                  </div>
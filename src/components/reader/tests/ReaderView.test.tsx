@@ -3,6 +3,7 @@ import { render, screen, waitFor, fireEvent } from '@testing-library/react';
 import { ReaderView } from '../ReaderView';
 import { useReaderStore } from '../../../store/useReaderStore';
 import { useTTSStore } from '../../../store/useTTSStore';
+import { searchClient } from '../../../lib/search';
 import ePub from 'epubjs';
 import React from 'react';
 import { MemoryRouter, Routes, Route } from 'react-router-dom';
@@ -33,7 +34,12 @@ vi.mock('../../../db/db', () => ({
 vi.mock('../../../lib/search', () => ({
     searchClient: {
         indexBook: vi.fn().mockResolvedValue(undefined),
+        isIndexed: vi.fn().mockReturnValue(true),
         search: vi.fn().mockResolvedValue([]),
+        searchStream: vi.fn().mockResolvedValue(true),
+        searchAsYouType: vi.fn().mockResolvedValue({ results: [], total: 0, truncated: false, source: 'index' }),
+        cancelSearch: vi.fn().mockResolvedValue(undefined),
+        endSearchSession: vi.fn().mockResolvedValue(undefined),
         terminate: vi.fn(),
     }
 }));
@@ -165,6 +171,52 @@ describe('ReaderView', () => {
     });
   });
 
+  it('does not let a pending keystroke search replace an Enter search', async () => {
+    renderComponent();
+    await waitFor(() => expect(mockRenderTo).toHaveBeenCalled());
+
+    fireEvent.click(screen.getByLabelText('Search'));
+    const input = await screen.findByTestId('search-input');
+    fireEvent.change(input, { target: { value: 'whale' } });
+    fireEvent.keyDown(input, { key: 'Enter' });
+
+    await new Promise(resolve => setTimeout(resolve, 400));
+    expect(searchClient.searchStream).toHaveBeenCalledTimes(1);
+    expect(searchClient.searchAsYouType).not.toHaveBeenCalled();
+
+    // Closing the panel releases the worker's search session
+    fireEvent.click(screen.getByLabelText('Search'));
+    await waitFor(() => expect(searchClient.endSearchSession).toHaveBeenCalled());
+  });
+
+  it('fetches the next page of results from the stream on "show more"', async () => {
+    const result = (i: number) => ({ href: `chap${i}.html`, excerpt: `whale ${i}` });
+    let resumed = false;
+    vi.mocked(searchClient.searchStream).mockImplementationOnce(async (_query, _bookId, onPage) => {
+        await onPage(Array.from({ length: 20 }, (_, i) => result(i)), false);
+        resumed = true;
+        await onPage([result(20)], true);
+        return true;
+    });
+
+    renderComponent();
+    await waitFor(() => expect(mockRenderTo).toHaveBeenCalled());
+
+    fireEvent.click(screen.getByLabelText('Search'));
+    const input = await screen.findByTestId('search-input');
+    fireEvent.change(input, { target: { value: 'whale' } });
+    fireEvent.keyDown(input, { key: 'Enter' });
+
+    await screen.findByTestId('search-result-19');
+    expect(resumed).toBe(false);
+    expect(screen.queryByTestId('search-result-20')).not.toBeInTheDocument();
+
+    fireEvent.click(screen.getByTestId('search-load-more'));
+    await screen.findByTestId('search-result-20');
+    expect(resumed).toBe(true);
+    expect(screen.queryByTestId('search-load-more')).not.toBeInTheDocument();
+  });
+
   it('updates settings', async () => {
       renderComponent();
       await waitFor(() => expect(mockRenderTo).toHaveBeenCalled());
@@ -29,6 +29,13 @@ vi.mock('../lib/logger', () => ({
     }
 }));
 
+/** Queues a history update and flushes the write-behind queue, so it commits without waiting for the timer. */
+const updateAndFlush = (...args: Parameters<typeof dbService.updateReadingHistory>) => {
+    const update = dbService.updateReadingHistory(...args);
+    void dbService.flushWrites();
+    return update;
+};
+
 describe('DBService Reading History', () => {
     beforeEach(() => {
         vi.clearAllMocks();
@@ -82,9 +89,9 @@ describe('DBService Reading History', () => {
             };
             mockDB.transaction.mockReturnValue(mockTx);
 
-            await dbService.updateReadingHistory(bookId, newRange, 'page');
+            await updateAndFlush(bookId, newRange, 'page');
 
-            expect(mockDB.transaction).toHaveBeenCalledWith('reading_history', 'readwrite');
+            expect(mockDB.transaction).toHaveBeenCalledWith(['reading_history'], 'readwrite', { durability: 'relaxed' });
             const putArg = mockTx.objectStore().put.mock.calls[0][0];
             expect(putArg.bookId).toBe(bookId);
             expect(putArg.readRanges).toEqual(['range1', 'range2', 'range3']);
@@ -106,7 +113,7 @@ describe('DBService Reading History', () => {
             };
             mockDB.transaction.mockReturnValue(mockTx);
 
-            await dbService.updateReadingHistory(bookId, newRange, 'page');
+            await updateAndFlush(bookId, newRange, 'page');
 
             const putArg = mockTx.objectStore().put.mock.calls[0][0];
             expect(putArg.bookId).toBe(bookId);
@@ -138,7 +145,7 @@ describe('DBService Reading History', () => {
             };
             mockDB.transaction.mockReturnValue(mockTx);
 
-            await dbService.updateReadingHistory(bookId, updatedRange, 'scroll', 'Chapter 1');
+            await updateAndFlush(bookId, updatedRange, 'scroll', 'Chapter 1');
 
             const putArg = mockTx.objectStore().put.mock.calls[0][0];
 
@@ -173,7 +180,7 @@ describe('DBService Reading History', () => {
             };
             mockDB.transaction.mockReturnValue(mockTx);
 
-            await dbService.updateReadingHistory(bookId, updatedRange, 'tts', 'Sentence 2');
+            await updateAndFlush(bookId, updatedRange, 'tts', 'Sentence 2');
 
             const putArg = mockTx.objectStore().put.mock.calls[0][0];
 
@@ -195,7 +202,7 @@ describe('DBService Reading History', () => {
 
             const consoleSpy = vi.spyOn(console, 'error').mockImplementation(() => {});
 
-            await expect(dbService.updateReadingHistory('book1', 'range1', 'page')).rejects.toThrow('An unexpected database error occurred');
+            await expect(updateAndFlush('book1', 'range1', 'page')).rejects.toThrow('An unexpected database error occurred');
             consoleSpy.mockRestore();
         });
     });
@@ -3,6 +3,8 @@ import { dbService } from './DBService';
 import { getDB } from './db';
 import * as ingestion from '../lib/ingestion';
 import type { BookMetadata } from '../types/db';
+import { encodeTTSContent } from './ttsContent';
+import { LIBRARY_SUMMARY_VERSION } from './summary';
 
 // Mock ingestion
 vi.mock('../lib/ingestion', () => ({
@@ -22,6 +24,8 @@ describe('DBService', () => {
       }
       await tx.done;
     }
+    // Stores were cleared directly, so drop any records the read cache still holds
+    dbService.invalidateReadCache();
     vi.clearAllMocks();
   });
 
@@ -71,6 +75,129 @@ describe('DBService', () => {
       expect(library).toHaveLength(1);
       expect(library[0].id).toBe('1');
     });
+
+    it('should return compact summaries without cover blobs', async () => {
+      const db = await getDB();
+      const book = { id: '1', title: 'A', addedAt: 100, isOffloaded: false, fileHash: 'h1', fileSize: 100, syntheticToc: [], totalChars: 0, author: 'A', description: 'Long description', coverBlob: new Blob(['img']) };
+      await db.put('books', book);
+
+      const [summary] = await dbService.getLibrary();
+      expect(summary).toMatchObject({ id: '1', title: 'A', author: 'A', addedAt: 100, hasCover: true });
+      expect(summary).not.toHaveProperty('coverBlob');
+      expect(summary).not.toHaveProperty('syntheticToc');
+      expect(summary).not.toHaveProperty('description');
+
+      // The projection is persisted, so later reads skip the books store
+      expect(await db.count('library_summary')).toBe(1);
+    });
+
+    it('should rebuild summaries that are out of step with the books store', async () => {
+      const db = await getDB();
+      await db.put('library_summary', { id: 'stale', title: 'Gone', author: 'X', addedAt: 1, hasCover: false });
+      await db.put('books', { id: '1', title: 'A', addedAt: 100, author: 'A' });
+      await db.put('books', { id: '2', title: 'B', addedAt: 200, author: 'B' });
+
+      const library = await dbService.getLibrary();
+      expect(library.map(book => book.id)).toEqual(['2', '1']);
+      expect(await db.get('library_summary', 'stale')).toBeUndefined();
+    });
+
+    it('should rebuild summaries built by an older projection version', async () => {
+      const db = await getDB();
+      await db.put('books', { id: '1', title: 'A', addedAt: 100, author: 'A' });
+      await dbService.getLibrary();
+
+      // Same count, but written before the current projection
+      await db.put('library_summary', { id: '1', title: 'Old', author: 'A', addedAt: 100, hasCover: false });
+      await db.put('app_metadata', 0, 'librarySummaryVersion');
+
+      const [summary] = await dbService.getLibrary();
+      expect(summary.title).toBe('A');
+      expect(await db.get('app_metadata', 'librarySummaryVersion')).toBe(LIBRARY_SUMMARY_VERSION);
+    });
+  });
+
+  describe('getLibraryPage', () => {
+    const putBooks = async (books: Partial<BookMetadata>[]) => {
+      const db = await getDB();
+      for (const book of books) {
+        await db.put('books', { author: 'Author', addedAt: 0, ...book } as BookMetadata);
+      }
+    };
+
+    const readAll = async (options: Parameters<typeof dbService.getLibraryPage>[0]) => {
+      const ids: string[] = [];
+      let cursor: string | null = null;
+      do {
+        const page = await dbService.getLibraryPage({ ...options, cursor });
+        ids.push(...page.books.map(book => book.id));
+        cursor = page.cursor;
+      } while (cursor);
+      return ids;
+    };
+
+    it('should page through titles case-insensitively', async () => {
+      await putBooks([
+        { id: '1', title: 'banana' },
+        { id: '2', title: 'Apple' },
+        { id: '3', title: 'cherry' },
+        { id: '4', title: 'apricot' },
+      ]);
+
+      const first = await dbService.getLibraryPage({ sortOrder: 'title', limit: 2 });
+      expect(first.books.map(book => book.title)).toEqual(['Apple', 'apricot']);
+      expect(first.cursor).not.toBeNull();
+
+      const second = await dbService.getLibraryPage({ sortOrder: 'title', limit: 2, cursor: first.cursor });
+      expect(second.books.map(book => book.title)).toEqual(['banana', 'cherry']);
+      expect(second.cursor).toBeNull();
+    });
+
+    it('should not skip or repeat books that share a sort key', async () => {
+      await putBooks([
+        { id: 'a', title: 'A', addedAt: 100 },
+        { id: 'b', title: 'B', addedAt: 100 },
+        { id: 'c', title: 'C', addedAt: 100 },
+        { id: 'd', title: 'D', addedAt: 50 },
+      ]);
+
+      expect(await readAll({ sortOrder: 'recent', limit: 1 })).toEqual(['c', 'b', 'a', 'd']);
+    });
+
+    it('should list unread books last when sorting by last read', async () => {
+      await putBooks([
+        { id: 'unread', title: 'U' },
+        { id: 'old', title: 'O', lastRead: 100 },
+        { id: 'new', title: 'N', lastRead: 200 },
+      ]);
+
+      expect(await readAll({ sortOrder: 'last_read', limit: 2 })).toEqual(['new', 'old', 'unread']);
+    });
+
+    it('should filter by title or author', async () => {
+      await putBooks([
+        { id: '1', title: 'The Great Gatsby', author: 'F. Scott Fitzgerald' },
+        { id: '2', title: '1984', author: 'George Orwell' },
+        { id: '3', title: 'Animal Farm', author: 'George Orwell' },
+      ]);
+
+      expect(await readAll({ sortOrder: 'title', filter: 'orwell', limit: 1 })).toEqual(['2', '3']);
+      expect(await readAll({ sortOrder: 'title', filter: 'gatsby' })).toEqual(['1']);
+    });
+  });
+
+  describe('getBookCover', () => {
+    it('should return the cover thumbnail of a book', async () => {
+      const db = await getDB();
+      const cover = new Blob(['img'], { type: 'image/jpeg' });
+      await db.put('books', { id: '1', title: 'A', addedAt: 100, author: 'A', coverBlob: cover });
+      // Books written directly have no thumbnail until the summaries are rebuilt
+      await dbService.getLibrary();
+
+      const result = await dbService.getBookCover('1');
+      expect(result).toBeDefined();
+      expect(await dbService.getBookCover('missing')).toBeUndefined();
+    });
   });
 
   describe('getBook', () => {
@@ -101,6 +228,7 @@ describe('DBService', () => {
       const id = 'del-1';
       const book = { id, title: 'Del', addedAt: 100, isOffloaded: false, fileHash: 'h', fileSize: 10, syntheticToc: [], totalChars: 0, author: 'A', description: '' };
       await db.put('books', book);
+      await db.put('library_summary', { id, title: 'Del', author: 'A', addedAt: 100, hasCover: false });
       await db.put('files', new ArrayBuffer(0), id);
       await db.put('locations', { bookId: id, locations: 'loc' });
       await db.put('tts_queue', { bookId: id, queue: [], currentIndex: 0, updatedAt: 0 });
@@ -109,11 +237,37 @@ describe('DBService', () => {
       await dbService.deleteBook(id);
 
       expect(await db.get('books', id)).toBeUndefined();
+      expect(await db.get('library_summary', id)).toBeUndefined();
       expect(await db.get('files', id)).toBeUndefined();
       expect(await db.get('locations', id)).toBeUndefined();
       expect(await db.get('tts_queue', id)).toBeUndefined();
       expect(await db.get('annotations', 'ann-1')).toBeUndefined();
     });
+
+    it('should delete several books and their section records in one call', async () => {
+      const db = await getDB();
+      for (const id of ['multi-1', 'multi-2', 'keep-1']) {
+        await db.put('books', { id, title: id, addedAt: 100, isOffloaded: false, fileHash: 'h', fileSize: 10, syntheticToc: [], totalChars: 0, author: 'A', description: '' });
+        await db.put('sections', { id: `${id}-s1`, bookId: id, sectionId: 's1', characterCount: 1, playOrder: 0 });
+        await db.put('tts_content', encodeTTSContent({ id: `${id}-s1`, bookId: id, sectionId: 's1', sentences: [{ text: 'One.', cfi: 'cfi1' }] }));
+        await db.put('content_analysis', { id: `${id}-s1`, bookId: id, sectionId: 's1', structure: { footnoteMatches: [] }, lastAnalyzed: 1 });
+      }
+      await db.put('annotations', { id: 'ann-m', bookId: 'multi-2', cfiRange: 'cfi', text: 'note', color: 'red', created: 0 });
+
+      await dbService.deleteBooks(['multi-1', 'multi-2']);
+
+      for (const id of ['multi-1', 'multi-2']) {
+        expect(await db.get('books', id)).toBeUndefined();
+        expect(await db.get('sections', `${id}-s1`)).toBeUndefined();
+        expect(await db.get('tts_content', `${id}-s1`)).toBeUndefined();
+        expect(await db.get('content_analysis', `${id}-s1`)).toBeUndefined();
+      }
+      expect(await db.get('annotations', 'ann-m')).toBeUndefined();
+
+      expect(await db.get('books', 'keep-1')).toBeDefined();
+      expect(await db.get('sections', 'keep-1-s1')).toBeDefined();
+      expect(await db.get('tts_content', 'keep-1-s1')).toBeDefined();
+    });
   });
 
   describe('offloadBook', () => {
@@ -133,6 +287,22 @@ describe('DBService', () => {
         expect(updatedBook?.isOffloaded).toBe(true);
         expect(updatedBook?.fileHash).toBe('existing-hash');
         expect(await db.get('files', id)).toBeUndefined();
+        expect((await db.get('library_summary', id))?.isOffloaded).toBe(true);
+    });
+
+    it('should offload several books at once', async () => {
+        const db = await getDB();
+        for (const id of ['off-2', 'off-3']) {
+            await db.put('books', { id, title: id, addedAt: 100, isOffloaded: false, fileSize: 3, syntheticToc: [], totalChars: 0, author: 'A', description: '', fileHash: 'existing-hash' });
+            await db.put('files', new Uint8Array([1, 2, 3]).buffer, id);
+        }
+
+        await dbService.offloadBooks(['off-2', 'off-3']);
+
+        for (const id of ['off-2', 'off-3']) {
+            expect((await db.get('books', id))?.isOffloaded).toBe(true);
+            expect(await db.get('files', id)).toBeUndefined();
+        }
     });
   });
 
@@ -172,6 +342,277 @@ describe('DBService', () => {
       const updated = await db.get('books', id);
       expect(updated?.currentCfi).toBe('cfi2');
       expect(updated?.progress).toBe(0.2);
+
+      const summary = await db.get('library_summary', id);
+      expect(summary?.progress).toBe(0.2);
+      expect(summary?.lastRead).toBe(updated?.lastRead);
+    });
+
+    it('should not open the files store', async () => {
+      const db = await getDB();
+      const id = 'prog-2';
+      const book = { id, title: 'P', addedAt: 100, isOffloaded: false, fileHash: 'h', fileSize: 10, syntheticToc: [], totalChars: 0, author: 'A', description: '' };
+      await db.put('books', book);
+      const transactionSpy = vi.spyOn(db, 'transaction');
+
+      dbService.saveProgress(id, 'cfi1', 0.1);
+      await dbService.flushWrites();
+
+      const stores = transactionSpy.mock.calls.flatMap(([names]) => Array.isArray(names) ? names : [names]);
+      expect(stores).toContain('books');
+      expect(stores).not.toContain('files');
+      transactionSpy.mockRestore();
+    });
+  });
+
+  describe('recoverMissingFilenames', () => {
+    it('should fill in missing filenames from stored files once', async () => {
+      const db = await getDB();
+      const id = 'fname-1';
+      const book = { id, title: 'F', addedAt: 100, isOffloaded: false, fileHash: 'h', fileSize: 10, syntheticToc: [], totalChars: 0, author: 'A', description: '' };
+      await db.put('books', book);
+      await db.put('files', new File(['content'], 'recovered.epub'), id);
+
+      expect(await dbService.recoverMissingFilenames()).toBe(1);
+      expect((await db.get('books', id))?.filename).toBe('recovered.epub');
+      expect((await db.get('library_summary', id))?.filename).toBe('recovered.epub');
+
+      // Completed migrations are not repeated
+      await db.put('books', { ...book, id: 'fname-2' });
+      await db.put('files', new File(['content'], 'later.epub'), 'fname-2');
+      expect(await dbService.recoverMissingFilenames()).toBe(0);
+    });
+  });
+
+  describe('read cache', () => {
+    it('should serve repeated metadata reads from memory until the book is written', async () => {
+      const db = await getDB();
+      const id = 'cache-1';
+      const book = { id, title: 'Cached', addedAt: 100, isOffloaded: false, fileHash: 'h', fileSize: 10, syntheticToc: [], totalChars: 0, author: 'A', description: '' };
+      await db.put('books', book);
+
+      const before = dbService.getReadCacheStats().books;
+      await dbService.getBookMetadata(id);
+      await dbService.getBookMetadata(id);
+      const after = dbService.getReadCacheStats().books;
+      expect(after.misses - before.misses).toBe(1);
+      expect(after.hits - before.hits).toBe(1);
+
+      await dbService.updateBookMetadata(id, { title: 'Renamed' });
+      expect((await dbService.getBookMetadata(id))?.title).toBe('Renamed');
+    });
+
+    it('should invalidate cached sections when content is saved', async () => {
+      const content = { id: 'cache-2-s1', bookId: 'cache-2', sectionId: 's1', sentences: [{ text: 'One.', cfi: 'cfi1' }] };
+      expect(await dbService.getTTSContent('cache-2', 's1')).toBeUndefined();
+
+      await dbService.saveTTSContent(content);
+      expect(await dbService.getTTSContent('cache-2', 's1')).toEqual(content);
+    });
+  });
+
+  describe('TTS cache budget', () => {
+    const segment = (key: string, lastAccessed: number) => ({
+      key, audio: new ArrayBuffer(300), createdAt: lastAccessed, lastAccessed,
+    });
+
+    it('should track cached bytes as segments are written', async () => {
+      expect((await dbService.getTTSCacheUsage()).bytes).toBe(0);
+
+      await dbService.cacheSegment('seg-1', new ArrayBuffer(100));
+      await dbService.cacheSegment('seg-2', new ArrayBuffer(50));
+      // Overwriting a segment replaces its size
+      await dbService.cacheSegment('seg-1', new ArrayBuffer(10));
+
+      expect((await dbService.getTTSCacheUsage()).bytes).toBe(60);
+    });
+
+    it('should evict the least recently used segments down to the low-water mark', async () => {
+      const db = await getDB();
+      for (let i = 0; i < 5; i++) {
+        await db.put('tts_cache', segment(`seg-${i}`, 1000 + i));
+      }
+      // Segments cached before v19 get their metadata and the total from the data migration
+      await dbService.runDataMigrations();
+      expect((await dbService.getTTSCacheUsage()).bytes).toBe(1500);
+
+      await dbService.setTTSCacheBudget(1000);
+      await dbService.evictTTSCache();
+
+      expect((await db.getAllKeys('tts_cache')).sort()).toEqual(['seg-2', 'seg-3', 'seg-4']);
+      expect(await dbService.getTTSCacheUsage()).toEqual({ bytes: 900, budget: 1000 });
+    });
+
+    it('should record hits in tts_cache_meta without rewriting the segment', async () => {
+      const db = await getDB();
+      await dbService.cacheSegment('seg-1', new ArrayBuffer(100));
+      const cachedAt = (await db.get('tts_cache', 'seg-1'))!.lastAccessed;
+
+      const now = vi.spyOn(Date, 'now').mockReturnValue(cachedAt + 5000);
+      expect(await dbService.getCachedSegment('seg-1')).toBeDefined();
+      now.mockRestore();
+      await dbService.flushWrites();
+
+      expect((await db.get('tts_cache', 'seg-1'))?.lastAccessed).toBe(cachedAt);
+      expect(await db.get('tts_cache_meta', 'seg-1')).toMatchObject({ size: 100, lastAccessed: cachedAt + 5000 });
+    });
+
+    it('should keep recently played segments when evicting', async () => {
+      const db = await getDB();
+      for (let i = 0; i < 5; i++) {
+        await db.put('tts_cache', segment(`seg-${i}`, 1000 + i));
+      }
+      await dbService.runDataMigrations();
+      await dbService.getCachedSegment('seg-0');
+      await dbService.flushWrites();
+
+      await dbService.setTTSCacheBudget(1000);
+      await dbService.evictTTSCache();
+
+      expect((await db.getAllKeys('tts_cache')).sort()).toEqual(['seg-0', 'seg-3', 'seg-4']);
+      expect((await db.getAllKeys('tts_cache_meta')).sort()).toEqual(['seg-0', 'seg-3', 'seg-4']);
+    });
+
+    it('should reset the total when the cache is cleared', async () => {
+      await dbService.cacheSegment('seg-1', new ArrayBuffer(100));
+      await dbService.clearTTSCache();
+
+      expect((await dbService.getTTSCacheUsage()).bytes).toBe(0);
+      expect(await dbService.getCachedSegment('seg-1')).toBeUndefined();
+    });
+  });
+
+  describe('telemetry', () => {
+    it('should time public methods and count transactions per store', async () => {
+      const db = await getDB();
+      const book = { id: 'telemetry-1', title: 'Timed', addedAt: 100, isOffloaded: false, fileHash: 'h', fileSize: 10, syntheticToc: [], totalChars: 0, author: 'A', description: '' };
+      await db.put('books', book);
+      dbService.resetTelemetry();
+
+      await dbService.getBookMetadata('telemetry-1');
+      await dbService.getBookMetadata('telemetry-1');
+
+      const telemetry = dbService.getTelemetry();
+      const stats = telemetry.operations.find(op => op.name === 'getBookMetadata');
+      expect(stats?.calls).toBe(2);
+      expect(stats?.errors).toBe(0);
+      expect(stats?.payloadBytes).toBeGreaterThan(0);
+      // The second read is served by the read cache
+      expect(telemetry.transactions.books.readonly).toBe(1);
+      expect(telemetry.operations.some(op => op.name === 'getDB' || op.name === 'handleError')).toBe(false);
+    });
+
+    it('should count failed calls as errors', async () => {
+      vi.mocked(ingestion.processEpub).mockRejectedValue(new Error('Bad EPUB'));
+      dbService.resetTelemetry();
+
+      await expect(dbService.addBook(new File([''], 'bad.epub'))).rejects.toThrow();
+
+      const stats = dbService.getTelemetry().operations.find(op => op.name === 'addBook');
+      expect(stats).toMatchObject({ calls: 1, errors: 1 });
+    });
+  });
+
+  describe('getSectionBundle', () => {
+    it('should read a section bundle in one transaction and serve it from the cache afterwards', async () => {
+      const db = await getDB();
+      const book = { id: 'bundle-1', title: 'Bundle', addedAt: 100, isOffloaded: false, fileHash: 'h', fileSize: 10, syntheticToc: [], totalChars: 0, author: 'A', description: '' };
+      const content = { id: 'bundle-1-s1', bookId: 'bundle-1', sectionId: 's1', sentences: [{ text: 'One.', cfi: 'cfi1' }] };
+      const analysis = { id: 'bundle-1-s1', bookId: 'bundle-1', sectionId: 's1', structure: { title: 'Chapter 1', footnoteMatches: [] }, lastAnalyzed: 1 };
+      await db.put('books', book);
+      await db.put('tts_content', encodeTTSContent(content));
+      await db.put('content_analysis', analysis);
+
+      const transactionSpy = vi.spyOn(db, 'transaction');
+
+      const bundle = await dbService.getSectionBundle('bundle-1', 's1');
+      expect(bundle.content).toEqual(content);
+      expect(bundle.analysis?.structure.title).toBe('Chapter 1');
+      expect(bundle.book?.title).toBe('Bundle');
+      expect(transactionSpy).toHaveBeenCalledTimes(1);
+
+      await dbService.getSectionBundle('bundle-1', 's1');
+      expect(transactionSpy).toHaveBeenCalledTimes(1);
+      transactionSpy.mockRestore();
+    });
+  });
+
+  describe('write-behind queue', () => {
+    it('should commit queued writes across stores in one relaxed transaction', async () => {
+      const db = await getDB();
+      const id = 'wb-1';
+      const book = { id, title: 'WB', addedAt: 100, isOffloaded: false, fileHash: 'h', fileSize: 10, syntheticToc: [], totalChars: 0, author: 'A', description: '' };
+      await db.put('books', book);
+
+      const transactionSpy = vi.spyOn(db, 'transaction');
+
+      dbService.saveProgress(id, 'cfi1', 0.3);
+      dbService.saveTTSState(id, [], 2);
+      dbService.saveTTSPosition(id, 3);
+      await dbService.updatePlaybackState(id, 'cfi-played', 500);
+      const history = dbService.updateReadingHistory(id, 'epubcfi(/6/2!/4/2/1:0)', 'page');
+
+      await dbService.flushWrites();
+      await history;
+
+      const writes = transactionSpy.mock.calls.filter(([, mode]) => mode === 'readwrite');
+      expect(writes).toHaveLength(1);
+      expect(writes[0][2]).toEqual({ durability: 'relaxed' });
+      transactionSpy.mockRestore();
+
+      const updated = await db.get('books', id);
+      expect(updated?.progress).toBe(0.3);
+      expect(updated?.lastPlayedCfi).toBe('cfi-played');
+      expect(updated?.lastPauseTime).toBe(500);
+      expect((await db.get('tts_queue', id))?.currentIndex).toBe(2);
+      expect((await db.get('tts_position', id))?.currentIndex).toBe(3);
+      expect((await db.get('reading_history', id))?.sessions).toHaveLength(1);
+    });
+
+    it('should flush before reads so queued writes are visible', async () => {
+      const db = await getDB();
+      const id = 'wb-2';
+      const book = { id, title: 'WB', addedAt: 100, isOffloaded: false, fileHash: 'h', fileSize: 10, syntheticToc: [], totalChars: 0, author: 'A', description: '' };
+      await db.put('books', book);
+
+      await dbService.updatePlaybackState(id, 'cfi-read');
+
+      const metadata = await dbService.getBookMetadata(id);
+      expect(metadata?.lastPlayedCfi).toBe('cfi-read');
+    });
+
+    it('should leave unrelated writes queued when reading a book', async () => {
+      const db = await getDB();
+      const id = 'wb-4';
+      const book = { id, title: 'WB', addedAt: 100, isOffloaded: false, fileHash: 'h', fileSize: 10, syntheticToc: [], totalChars: 0, author: 'A', description: '' };
+      await db.put('books', book);
+      await db.delete('tts_position', id);
+
+      dbService.saveTTSPosition(id, 4);
+      dbService.saveProgress('other-book', 'cfi-other', 0.5);
+      await dbService.getBookMetadata(id);
+      await dbService.getSectionBundle(id, 's1');
+      expect(await db.get('tts_position', id)).toBeUndefined();
+
+      dbService.saveProgress(id, 'cfi-queued', 0.4);
+      expect((await dbService.getBookMetadata(id))?.progress).toBe(0.4);
+      expect((await db.get('tts_position', id))?.currentIndex).toBe(4);
+    });
+
+    it('should flush when the page is hidden', async () => {
+      const db = await getDB();
+      const id = 'wb-3';
+      await db.delete('tts_position', id);
+
+      const flushSpy = vi.spyOn(dbService, 'flushWrites');
+      dbService.saveTTSPosition(id, 7);
+      window.dispatchEvent(new Event('pagehide'));
+      expect(flushSpy).toHaveBeenCalledTimes(1);
+      await flushSpy.mock.results[0].value;
+      flushSpy.mockRestore();
+
+      const position = await db.get('tts_position', id);
+      expect(position?.currentIndex).toBe(7);
     });
   });
 
@@ -1,14 +1,213 @@
-import { getDB } from './db';
-import type { BookMetadata, Annotation, CachedSegment, BookLocations, TTSState, ContentAnalysis, ReadingListEntry, ReadingHistoryEntry, ReadingSession, ReadingEventType, TTSContent, SectionMetadata, TTSPosition } from '../types/db';
+import { getDB, TTS_CACHE_BYTES_KEY } from './db';
+import type { EpubLibraryDB } from './db';
+import type { StoreNames } from 'idb';
+import type { BookMetadata, LibrarySummary, LibraryPage, LibraryPageOptions, LibrarySortOrder, Annotation, CachedSegment, CachedAudioFormat, TTSCacheUsage, BookLocations, TTSState, ContentAnalysis, ReadingListEntry, ReadingHistoryEntry, ReadingSession, ReadingEventType, TTSContent, SectionBundle, SectionMetadata, TTSPosition } from '../types/db';
 import { DatabaseError, StorageFullError } from '../types/errors';
 import { processEpub, generateFileFingerprint } from '../lib/ingestion';
 import { validateBookMetadata } from './validators';
+import { LIBRARY_SUMMARY_VERSION, toLibrarySummary, toSortKey } from './summary';
+import { ReadCache, type ReadCacheStats } from './ReadCache';
+import { decodeTTSContent, encodeTTSContent } from './ttsContent';
+import { BOOK_KEYED_STORES, SECTION_KEYED_STORES, bookKeyRange } from './bookKeys';
+import { dbTelemetry, type DBTelemetrySnapshot } from './telemetry';
+import { DATA_MIGRATIONS, runDataMigrations, upgradeOnRead, type MigrationProgress } from './migrations';
 import { mergeCfiRanges } from '../lib/cfi-utils';
 import { Logger } from '../lib/logger';
 import type { TTSQueueItem } from '../lib/tts/AudioPlayerService';
 import type { ExtractionOptions } from '../lib/tts';
 
+/** Default number of books per library page. Divisible by the common grid column counts. */
+export const LIBRARY_PAGE_SIZE = 48;
+
+/** The `library_summary` index and direction walked for each sort order. */
+const LIBRARY_SORT_INDEXES: Record<LibrarySortOrder, { index: 'by_addedAt' | 'by_lastRead' | 'by_title' | 'by_author'; descending: boolean }> = {
+  recent: { index: 'by_addedAt', descending: true },
+  last_read: { index: 'by_lastRead', descending: true },
+  title: { index: 'by_title', descending: false },
+  author: { index: 'by_author', descending: false },
+};
+
+/**
+ * Encodes the position of the last record of a library page as an opaque continuation token.
+ */
+function encodeLibraryCursor(key: string | number, id: string): string {
+  return JSON.stringify([key, id]);
+}
+
+/**
+ * Decodes a continuation token produced by {@link encodeLibraryCursor}.
+ */
+function decodeLibraryCursor(token: string): { key: string | number; id: string } {
+  const [key, id] = JSON.parse(token);
+  return { key, id };
+}
+
+/** Stores whose records {@link DBService} caches in memory. */
+export type CachedStore = 'books' | 'content_analysis' | 'tts_content';
+
+/**
+ * Records kept per cached store. Playback reads one book and a few sections at a time;
+ * TTS content is the largest record, so fewer of them are kept.
+ */
+const READ_CACHE_CAPACITY: Record<CachedStore, number> = {
+  books: 16,
+  content_analysis: 256,
+  tts_content: 64,
+};
+
+/** `app_metadata` key of the {@link LIBRARY_SUMMARY_VERSION} the `library_summary` store was built with. */
+const LIBRARY_SUMMARY_VERSION_KEY = 'librarySummaryVersion';
+
+/** `app_metadata` key set once {@link DBService.recoverMissingFilenames} has run. */
+const FILENAME_RECOVERY_KEY = 'filenameRecoveryComplete';
+
+/** Default size of the `tts_cache` store, in bytes, above which segments are evicted. */
+export const DEFAULT_TTS_CACHE_BUDGET = 500 * 1024 * 1024;
+
+/** `app_metadata` key of the configured TTS cache budget. */
+const TTS_CACHE_BUDGET_KEY = 'ttsCacheBudget';
+
+/**
+ * Eviction frees space down to this fraction of the budget, so it runs once per burst
+ * of new segments rather than after every write.
+ */
+const TTS_CACHE_LOW_WATER = 0.9;
+
+/** Segments deleted per eviction transaction; each idle slice runs one. */
+const TTS_CACHE_EVICTION_CHUNK = 25;
+
+/** Runs a callback when the main thread is idle, or soon where `requestIdleCallback` is unavailable. */
+const whenIdle = (callback: () => void) => {
+  if (typeof requestIdleCallback === 'function') requestIdleCallback(callback, { timeout: 5000 });
+  else setTimeout(callback, 0);
+};
+
+/** How long writes are held before the write-behind queue flushes them. */
+const WRITE_BEHIND_DELAY_MS = 1000;
+
+/** A reading history update queued by `updateReadingHistory`. */
+interface PendingHistoryUpdate {
+  range: string;
+  type: ReadingEventType;
+  label?: string;
+  skipSession: boolean;
+  /** When the update was queued; used for session coalescing, not the flush time. */
+  timestamp: number;
+}
+
+/**
+ * Mutations held by the write-behind queue until the next flush.
+ * Per-book maps keep only the latest value, so repeated writes coalesce into one.
+ */
+interface PendingWrites {
+  progress: Map<string, { cfi: string; progress: number; timestamp: number }>;
+  playbackState: Map<string, { lastPlayedCfi?: string; lastPauseTime?: number | null }>;
+  ttsState: Map<string, TTSState>;
+  ttsPosition: Map<string, TTSPosition>;
+  /** History updates are merged into the stored entry, so all of them are kept, in order. */
+  history: Map<string, PendingHistoryUpdate[]>;
+  /** Last access time of each TTS cache segment hit since the previous flush. */
+  cacheAccess: Map<string, number>;
+  /** Writers waiting for the batch to commit. */
+  waiters: { resolve: () => void; reject: (error: unknown) => void }[];
+}
+
+function createPendingWrites(): PendingWrites {
+  return {
+    progress: new Map(),
+    playbackState: new Map(),
+    ttsState: new Map(),
+    ttsPosition: new Map(),
+    history: new Map(),
+    cacheAccess: new Map(),
+    waiters: [],
+  };
+}
+
+function isPendingWritesEmpty(batch: PendingWrites): boolean {
+  return batch.progress.size === 0 && batch.playbackState.size === 0 && batch.ttsState.size === 0
+    && batch.ttsPosition.size === 0 && batch.history.size === 0 && batch.cacheAccess.size === 0
+    && batch.waiters.length === 0;
+}
+
+/**
+ * Merges one queued update into a book's reading history.
+ * Ranges are merged and capped at 100; sessions of the same non-TTS type less than
+ * five minutes apart are coalesced, and capped at 100.
+ *
+ * @param bookId - The unique identifier of the book.
+ * @param entry - The current history entry, if any.
+ * @param update - The queued update.
+ * @returns The updated history entry.
+ */
+function applyReadingHistoryUpdate(bookId: string, entry: ReadingHistoryEntry | undefined, update: PendingHistoryUpdate): ReadingHistoryEntry {
+  const { range, type, label, skipSession, timestamp } = update;
+  const readRanges = entry?.readRanges ?? [];
+  let sessions: ReadingSession[] = entry?.sessions ?? [];
+
+  let updatedRanges = mergeCfiRanges(readRanges, range);
+
+  // Enforce limit on history size to prevent unbounded growth
+  if (updatedRanges.length > 100) {
+    updatedRanges = updatedRanges.slice(updatedRanges.length - 100);
+  }
+
+  if (!skipSession) {
+    // Coalescing Logic
+    const lastSession = sessions.length > 0 ? sessions[sessions.length - 1] : null;
+
+    // 5 minutes = 300,000 ms
+    if (lastSession && lastSession.type === type && type !== 'tts' && timestamp - lastSession.timestamp < 300000) {
+      // Update last session
+      lastSession.cfiRange = range;
+      lastSession.timestamp = timestamp;
+      if (label) lastSession.label = label;
+    } else {
+      // Add new session
+      sessions.push({
+        cfiRange: range,
+        timestamp,
+        type,
+        label
+      });
+    }
+
+    // Limit sessions size too
+    if (sessions.length > 100) {
+      sessions = sessions.slice(sessions.length - 100);
+    }
+  }
+
+  return {
+    bookId,
+    readRanges: updatedRanges,
+    sessions,
+    lastUpdated: Date.now()
+  };
+}
+
 class DBService {
+  private readCache = {
+    books: new ReadCache<BookMetadata>(READ_CACHE_CAPACITY.books),
+    content_analysis: new ReadCache<ContentAnalysis>(READ_CACHE_CAPACITY.content_analysis),
+    tts_content: new ReadCache<TTSContent>(READ_CACHE_CAPACITY.tts_content),
+  };
+
+  constructor() {
+      // Queued writes must not be lost when the page is backgrounded or unloaded;
+      // mobile browsers may kill a hidden page without firing any further events.
+      if (typeof document !== 'undefined') {
+          document.addEventListener('visibilitychange', () => {
+              if (document.visibilityState === 'hidden') void this.flushWrites();
+          });
+      }
+      if (typeof window !== 'undefined') {
+          window.addEventListener('pagehide', () => {
+              void this.flushWrites();
+          });
+      }
+  }
+
   private async getDB() {
     return getDB();
   }
@@ -29,32 +228,291 @@ class DBService {
     throw new DatabaseError('An unexpected database error occurred', error);
   }
 
+  /**
+   * Runs the body of a public method, recording its latency and payload size under the method's name.
+   * Internals are not measured separately; they are covered by the public methods calling them.
+   *
+   * @param name - The operation name reported by {@link getTelemetry}.
+   * @param args - The method's arguments, measured for the payload estimate.
+   * @param call - The method body.
+   * @returns The body's result.
+   */
+  private measure<T>(name: string, args: unknown[], call: () => T): T {
+    return dbTelemetry.measure(name, args, call);
+  }
+
   // --- Book Operations ---
 
   /**
-   * Retrieves all books in the library.
+   * Retrieves the summaries of all books in the library.
+   * Reads the compact `library_summary` projection, so cover blobs and synthetic TOCs
+   * are never loaded; covers are fetched per book with {@link getBookCover}.
+   * The library views page through it with {@link getLibraryPage} instead.
    *
-   * @returns A Promise resolving to an array of valid BookMetadata objects.
+   * @returns A Promise resolving to the library summaries, newest first.
    */
-  async getLibrary(): Promise<BookMetadata[]> {
-    try {
-      const db = await this.getDB();
-      const books = await db.getAll('books');
+  async getLibrary(): Promise<LibrarySummary[]> {
+    return this.measure('getLibrary', [], async () => {
+      try {
+        await this.flushWrites();
+        await this.ensureLibrarySummaries();
+        const db = await this.getDB();
+        const summaries = await db.getAll('library_summary');
+        return summaries.sort((a, b) => b.addedAt - a.addedAt);
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
+  }
+
+  /**
+   * Retrieves one page of the library, walking the `library_summary` index for the sort order
+   * with a cursor, so only the rows of the page are read.
+   *
+   * @param options - Sort order, page size, continuation token and title/author filter.
+   * @returns A Promise resolving to the page and the token for the next one.
+   */
+  async getLibraryPage(options: LibraryPageOptions = {}): Promise<LibraryPage> {
+    return this.measure('getLibraryPage', [options], async () => {
+      const { sortOrder = 'recent', limit = LIBRARY_PAGE_SIZE, cursor: token, filter } = options;
+      try {
+        await this.flushWrites();
+        if (!token) {
+          await this.ensureLibrarySummaries();
+        }
 
-      const validBooks = books.filter((book) => {
-        const isValid = validateBookMetadata(book);
-        if (!isValid) {
-          Logger.error('DBService', 'DB Integrity: Found corrupted book record', book);
+        const { index: indexName, descending } = LIBRARY_SORT_INDEXES[sortOrder];
+        const after = token ? decodeLibraryCursor(token) : null;
+        const query = filter ? toSortKey(filter) : '';
+
+        const db = await this.getDB();
+        const index = db.transaction('library_summary').store.index(indexName);
+        const range = after
+          ? (descending ? IDBKeyRange.upperBound(after.key) : IDBKeyRange.lowerBound(after.key))
+          : undefined;
+        let cursor = await index.openCursor(range, descending ? 'prev' : 'next');
+
+        // Skip the records up to and including the last one of the previous page
+        if (cursor && after && indexedDB.cmp(cursor.key, after.key) === 0) {
+          const order = indexedDB.cmp(cursor.primaryKey, after.id) * (descending ? -1 : 1);
+          if (order < 0) {
+            cursor = await cursor.continuePrimaryKey(after.key, after.id);
+          }
+          if (cursor && indexedDB.cmp(cursor.key, after.key) === 0 && indexedDB.cmp(cursor.primaryKey, after.id) === 0) {
+            cursor = await cursor.continue();
+          }
         }
-        return isValid;
-      });
 
-      return validBooks.sort((a, b) => b.addedAt - a.addedAt);
-    } catch (error) {
-      this.handleError(error);
+        const books: LibrarySummary[] = [];
+        while (cursor && books.length < limit) {
+          const summary = cursor.value;
+          if (!query || summary.titleKey.includes(query) || summary.authorKey.includes(query)) {
+            books.push(summary);
+          }
+          if (books.length === limit) break;
+          cursor = await cursor.continue();
+        }
+
+        let next: string | null = null;
+        if (cursor && books.length === limit) {
+          // Only hand out a token if something follows
+          const { key, primaryKey } = cursor;
+          if (await cursor.continue()) {
+            next = encodeLibraryCursor(key, primaryKey);
+          }
+        }
+
+        return { books, cursor: next };
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
+  }
+
+  /**
+   * Retrieves the summaries of specific books, e.g. to label library-wide search hits.
+   *
+   * @param ids - The book IDs.
+   * @returns A Promise resolving to the summaries of the books that exist, in the given order.
+   */
+  async getLibrarySummaries(ids: string[]): Promise<LibrarySummary[]> {
+    return this.measure('getLibrarySummaries', [ids], async () => {
+      try {
+        await this.flushWrites();
+        await this.ensureLibrarySummaries();
+        const db = await this.getDB();
+        const tx = db.transaction('library_summary');
+        const summaries = await Promise.all(ids.map(id => tx.store.get(id)));
+        await tx.done;
+        return summaries.filter((summary): summary is LibrarySummary => summary !== undefined);
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
+  }
+
+  /**
+   * Retrieves the IDs of all books in the library without reading any records.
+   *
+   * @returns A Promise resolving to the book IDs.
+   */
+  async getBookIds(): Promise<string[]> {
+    return this.measure('getBookIds', [], async () => {
+      try {
+        const db = await this.getDB();
+        return await db.getAllKeys('books');
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
+  }
+
+  /**
+   * Rebuilds the library summaries if the projection is out of step with the `books` store:
+   * built by an older {@link LIBRARY_SUMMARY_VERSION} (first run after an upgrade) or holding a
+   * different number of records (books written by an older version).
+   * Only counts records, so callers that read a single page never load the whole projection.
+   */
+  private async ensureLibrarySummaries(): Promise<void> {
+    const db = await this.getDB();
+    const [version, bookCount, summaryCount] = await Promise.all([
+      db.get('app_metadata', LIBRARY_SUMMARY_VERSION_KEY),
+      db.count('books'),
+      db.count('library_summary'),
+    ]);
+
+    if (version !== LIBRARY_SUMMARY_VERSION || bookCount !== summaryCount) {
+      await this.rebuildLibrarySummaries();
     }
   }
 
+  /**
+   * Regenerates the `library_summary` and `thumbnails` stores from the `books` store and
+   * records the projection version. Corrupted book records are logged and left out.
+   */
+  private async rebuildLibrarySummaries(): Promise<void> {
+    const db = await this.getDB();
+    const tx = db.transaction(['books', 'library_summary', 'thumbnails', 'app_metadata'], 'readwrite');
+    const summaryStore = tx.objectStore('library_summary');
+    const thumbnailStore = tx.objectStore('thumbnails');
+    await Promise.all([summaryStore.clear(), thumbnailStore.clear()]);
+
+    let rebuilt = 0;
+    let cursor = await tx.objectStore('books').openCursor();
+    while (cursor) {
+      const book = cursor.value;
+      if (validateBookMetadata(book)) {
+        await summaryStore.put(toLibrarySummary(book));
+        if (book.coverBlob) await thumbnailStore.put(book.coverBlob, book.id);
+        rebuilt++;
+      } else {
+        Logger.error('DBService', 'DB Integrity: Found corrupted book record', book);
+      }
+      cursor = await cursor.continue();
+    }
+
+    await tx.objectStore('app_metadata').put(LIBRARY_SUMMARY_VERSION, LIBRARY_SUMMARY_VERSION_KEY);
+    await tx.done;
+    Logger.info('DBService', `Rebuilt library summaries for ${rebuilt} books`);
+  }
+
+  /**
+   * One-time migration that fills in `filename` for books imported before it was recorded,
+   * taking it from the stored EPUB `File`. Progress saves rely on `filename` to keep the reading
+   * list in sync, and no longer open the `files` store to recover it.
+   * Books are found through `library_summary`; `files` is only read for books without a filename.
+   * Run in the background at startup; does nothing once it has completed.
+   *
+   * @returns A Promise resolving to the number of books updated.
+   */
+  async recoverMissingFilenames(): Promise<number> {
+    return this.measure('recoverMissingFilenames', [], async () => {
+      try {
+        const db = await this.getDB();
+        if (await db.get('app_metadata', FILENAME_RECOVERY_KEY)) return 0;
+
+        await this.ensureLibrarySummaries();
+        const summaries = await db.getAll('library_summary');
+        let recovered = 0;
+
+        for (const { id } of summaries.filter(summary => !summary.filename)) {
+          const fileData = await db.get('files', id);
+          // Check if it's a File or has a name property (fake-indexeddb might strip prototype)
+          const filename = fileData instanceof File ? fileData.name : (fileData as { name?: string } | undefined)?.name;
+          if (!filename) continue;
+
+          const tx = db.transaction(['books', 'library_summary'], 'readwrite');
+          const book = await tx.objectStore('books').get(id);
+          if (book && !book.filename) {
+            book.filename = filename;
+            await tx.objectStore('books').put(book);
+            await tx.objectStore('library_summary').put(toLibrarySummary(book));
+            recovered++;
+          }
+          await tx.done;
+          this.readCache.books.delete(id);
+        }
+
+        await db.put('app_metadata', true, FILENAME_RECOVERY_KEY);
+        if (recovered > 0) {
+          Logger.info('DBService', `Recovered filenames of ${recovered} books`);
+        }
+        return recovered;
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
+  }
+
+  /**
+   * Runs the pending data migrations (`migrations.ts`) in the background, a chunk of records
+   * per transaction, resuming where a previous run stopped. Until a record is rewritten, reads
+   * upgrade it in memory, so the app is fully usable while this runs.
+   *
+   * @param onProgress - Called after every chunk.
+   */
+  async runDataMigrations(onProgress?: (progress: MigrationProgress) => void): Promise<void> {
+    return this.measure('runDataMigrations', [onProgress], async () => {
+      try {
+        const db = await this.getDB();
+        await runDataMigrations(db, (progress) => {
+          if (progress.done) {
+            const migration = DATA_MIGRATIONS.find(m => m.id === progress.id);
+            if (migration && migration.store in this.readCache) {
+              this.invalidateReadCache(migration.store as CachedStore);
+            }
+            // The audio cache has an exact byte total now; it may be over budget
+            if (migration?.store === 'tts_cache') this.scheduleTTSCacheEviction();
+            if (progress.migrated > 0) {
+              Logger.info('DBService', `Migration ${progress.id} rewrote ${progress.migrated} of ${progress.processed} records`);
+            }
+          }
+          onProgress?.(progress);
+        });
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
+  }
+
+  /**
+   * Retrieves the cover thumbnail for a specific book from the `thumbnails` store,
+   * without deserializing the book record.
+   *
+   * @param id - The unique identifier of the book.
+   * @returns A Promise resolving to the thumbnail Blob or undefined.
+   */
+  async getBookCover(id: string): Promise<Blob | undefined> {
+    return this.measure('getBookCover', [id], async () => {
+        try {
+            const db = await this.getDB();
+            return await db.get('thumbnails', id);
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
+  }
+
   /**
    * Retrieves a specific book and its file content.
    *
@@ -62,29 +520,36 @@ class DBService {
    * @returns A Promise resolving to an object containing metadata and file content.
    */
   async getBook(id: string): Promise<{ metadata: BookMetadata | undefined; file: Blob | ArrayBuffer | undefined }> {
-    try {
-      const db = await this.getDB();
-      const metadata = await db.get('books', id);
-      const file = await db.get('files', id);
-      return { metadata, file };
-    } catch (error) {
-      this.handleError(error);
-    }
+    return this.measure('getBook', [id], async () => {
+      try {
+        await this.flushWrites();
+        const db = await this.getDB();
+        const metadata = await db.get('books', id);
+        const file = await db.get('files', id);
+        return { metadata, file };
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
   }
 
   /**
    * Retrieves only the metadata for a specific book.
+   * Served from the read cache when possible; the returned record must not be mutated.
    *
    * @param id - The unique identifier of the book.
    * @returns A Promise resolving to the BookMetadata or undefined if not found.
    */
   async getBookMetadata(id: string): Promise<BookMetadata | undefined> {
-      try {
-          const db = await this.getDB();
-          return await db.get('books', id);
-      } catch (error) {
-          this.handleError(error);
-      }
+    return this.measure('getBookMetadata', [id], async () => {
+        try {
+            await this.flushBookWrites(id);
+            const db = await this.getDB();
+            return await this.readCache.books.read(id, () => db.get('books', id));
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
   }
 
   /**
@@ -94,19 +559,30 @@ class DBService {
    * @param metadata - The partial metadata to update.
    */
   async updateBookMetadata(id: string, metadata: Partial<BookMetadata>): Promise<void> {
-    try {
-      const db = await this.getDB();
-      const tx = db.transaction('books', 'readwrite');
-      const store = tx.objectStore('books');
-      const existing = await store.get(id);
-
-      if (existing) {
-        await store.put({ ...existing, ...metadata });
+    return this.measure('updateBookMetadata', [id, metadata], async () => {
+      try {
+        await this.flushWrites();
+        const db = await this.getDB();
+        const tx = db.transaction(['books', 'library_summary', 'thumbnails'], 'readwrite');
+        const store = tx.objectStore('books');
+        const existing = await store.get(id);
+
+        if (existing) {
+          const updated = { ...existing, ...metadata };
+          await store.put(updated);
+          await tx.objectStore('library_summary').put(toLibrarySummary(updated));
+          if ('coverBlob' in metadata) {
+            await (updated.coverBlob
+              ? tx.objectStore('thumbnails').put(updated.coverBlob, id)
+              : tx.objectStore('thumbnails').delete(id));
+          }
+        }
+        await tx.done;
+        this.readCache.books.delete(id);
+      } catch (error) {
+        this.handleError(error);
       }
-      await tx.done;
-    } catch (error) {
-      this.handleError(error);
-    }
+    });
   }
 
   /**
@@ -116,12 +592,14 @@ class DBService {
    * @returns A Promise resolving to the file content (Blob or ArrayBuffer) or undefined.
    */
   async getBookFile(id: string): Promise<Blob | ArrayBuffer | undefined> {
-      try {
-          const db = await this.getDB();
-          return await db.get('files', id);
-      } catch (error) {
-          this.handleError(error);
-      }
+    return this.measure('getBookFile', [id], async () => {
+        try {
+            const db = await this.getDB();
+            return await db.get('files', id);
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
   }
 
   /**
@@ -131,12 +609,14 @@ class DBService {
    * @returns A Promise resolving to the cover Blob or undefined.
    */
   async getCover(id: string): Promise<Blob | undefined> {
-      try {
-          const db = await this.getDB();
-          return await db.get('covers', id);
-      } catch (error) {
-          this.handleError(error);
-      }
+    return this.measure('getCover', [id], async () => {
+        try {
+            const db = await this.getDB();
+            return await db.get('covers', id);
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
   }
 
   /**
@@ -146,13 +626,15 @@ class DBService {
    * @returns A Promise resolving to an array of SectionMetadata.
    */
   async getSections(bookId: string): Promise<SectionMetadata[]> {
-      try {
-          const db = await this.getDB();
-          const sections = await db.getAllFromIndex('sections', 'by_bookId', bookId);
-          return sections.sort((a, b) => a.playOrder - b.playOrder);
-      } catch (error) {
-          this.handleError(error);
-      }
+    return this.measure('getSections', [bookId], async () => {
+        try {
+            const db = await this.getDB();
+            const sections = await db.getAllFromIndex('sections', 'by_bookId', bookId);
+            return sections.sort((a, b) => a.playOrder - b.playOrder);
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
   }
 
   /**
@@ -167,11 +649,13 @@ class DBService {
     ttsOptions?: ExtractionOptions,
     onProgress?: (progress: number, message: string) => void
   ): Promise<void> {
-    try {
-      await processEpub(file, ttsOptions, onProgress);
-    } catch (error) {
-      this.handleError(error);
-    }
+    return this.measure('addBook', [file, ttsOptions, onProgress], async () => {
+      try {
+        await processEpub(file, ttsOptions, onProgress);
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
   }
 
   /**
@@ -181,59 +665,59 @@ class DBService {
    * @returns A Promise that resolves when the book is deleted.
    */
   async deleteBook(id: string): Promise<void> {
-    try {
-      const db = await this.getDB();
-      const tx = db.transaction(['books', 'files', 'annotations', 'locations', 'lexicon', 'tts_queue', 'tts_position', 'content_analysis', 'tts_content', 'covers'], 'readwrite');
-
-      await Promise.all([
-          tx.objectStore('books').delete(id),
-          tx.objectStore('files').delete(id),
-          tx.objectStore('covers').delete(id),
-          tx.objectStore('locations').delete(id),
-          tx.objectStore('tts_queue').delete(id),
-          tx.objectStore('tts_position').delete(id),
-      ]);
-
-      // Delete annotations
-      const annotationStore = tx.objectStore('annotations');
-      const annotationIndex = annotationStore.index('by_bookId');
-      let annotationCursor = await annotationIndex.openCursor(IDBKeyRange.only(id));
-      while (annotationCursor) {
-        await annotationCursor.delete();
-        annotationCursor = await annotationCursor.continue();
-      }
-
-      // Delete lexicon rules
-      const lexiconStore = tx.objectStore('lexicon');
-      const lexiconIndex = lexiconStore.index('by_bookId');
-      let lexiconCursor = await lexiconIndex.openCursor(IDBKeyRange.only(id));
-      while (lexiconCursor) {
-        await lexiconCursor.delete();
-        lexiconCursor = await lexiconCursor.continue();
-      }
-
-      // Delete content analysis
-      const analysisStore = tx.objectStore('content_analysis');
-      const analysisIndex = analysisStore.index('by_bookId');
-      let analysisCursor = await analysisIndex.openCursor(IDBKeyRange.only(id));
-      while (analysisCursor) {
-        await analysisCursor.delete();
-        analysisCursor = await analysisCursor.continue();
-      }
-
-      // Delete TTS content
-      const ttsContentStore = tx.objectStore('tts_content');
-      const ttsContentIndex = ttsContentStore.index('by_bookId');
-      let ttsContentCursor = await ttsContentIndex.openCursor(IDBKeyRange.only(id));
-      while (ttsContentCursor) {
-        await ttsContentCursor.delete();
-        ttsContentCursor = await ttsContentCursor.continue();
-      }
+    return this.measure('deleteBook', [id], async () => {
+      return this.deleteBooks([id]);
+    });
+  }
 
-      await tx.done;
-    } catch (error) {
-      this.handleError(error);
-    }
+  /**
+   * Deletes several books and all their associated data in a single transaction.
+   * Per-section records are removed with one key-range delete per store and book; annotations and
+   * book-specific lexicon rules are looked up by key through their `by_bookId` index. No request
+   * waits on the previous one.
+   *
+   * @param ids - The unique identifiers of the books to delete.
+   * @returns A Promise that resolves when the books are deleted.
+   */
+  async deleteBooks(ids: string[]): Promise<void> {
+    return this.measure('deleteBooks', [ids], async () => {
+      if (ids.length === 0) return;
+      try {
+        await this.flushWrites();
+        const db = await this.getDB();
+        const tx = db.transaction([...BOOK_KEYED_STORES, ...SECTION_KEYED_STORES, 'annotations', 'lexicon'], 'readwrite');
+
+        const requests: Promise<unknown>[] = [];
+        for (const id of ids) {
+          for (const store of BOOK_KEYED_STORES) {
+            requests.push(tx.objectStore(store).delete(id));
+          }
+          for (const store of SECTION_KEYED_STORES) {
+            requests.push(tx.objectStore(store).delete(bookKeyRange(id)));
+          }
+        }
+
+        // Annotations and lexicon rules have their own IDs
+        for (const store of ['annotations', 'lexicon'] as const) {
+          const index = tx.objectStore(store).index('by_bookId');
+          const keys = await Promise.all(ids.map(id => index.getAllKeys(IDBKeyRange.only(id))));
+          for (const key of keys.flat()) {
+            requests.push(tx.objectStore(store).delete(key));
+          }
+        }
+
+        await Promise.all(requests);
+        await tx.done;
+
+        for (const id of ids) {
+          this.readCache.books.delete(id);
+          this.readCache.content_analysis.deletePrefix(`${id}-`);
+          this.readCache.tts_content.deletePrefix(`${id}-`);
+        }
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
   }
 
   /**
@@ -243,39 +727,72 @@ class DBService {
    * @returns A Promise that resolves when the book is offloaded.
    */
   async offloadBook(id: string): Promise<void> {
-    try {
-      const db = await this.getDB();
-      const tx = db.transaction(['books', 'files', 'covers'], 'readwrite');
-      const bookStore = tx.objectStore('books');
-      const book = await bookStore.get(id);
-
-      if (!book) throw new Error('Book not found');
-
-      // If missing hash, calculate fingerprint from existing file before deleting
-      if (!book.fileHash) {
-        const fileStore = tx.objectStore('files');
-        const fileData = await fileStore.get(id);
-        if (fileData) {
-          const blob = fileData instanceof Blob ? fileData : new Blob([fileData]);
-          book.fileHash = await generateFileFingerprint(blob, {
-            title: book.title,
-            author: book.author,
-            filename: book.filename || 'unknown.epub'
-          });
-        }
-      }
-
-      book.isOffloaded = true;
-      await bookStore.put(book);
-      await tx.objectStore('files').delete(id);
+    return this.measure('offloadBook', [id], async () => {
+      return this.offloadBooks([id]);
+    });
+  }
 
-      // Delete high-res cover; metadata thumbnail remains.
-      await tx.objectStore('covers').delete(id);
+  /**
+   * Offloads several books in a single write transaction.
+   * Books without a stored fingerprint get one computed from their file first, in a
+   * read-only pass, so hashing never holds the write transaction open.
+   *
+   * @param ids - The unique identifiers of the books to offload.
+   * @returns A Promise that resolves when the books are offloaded.
+   */
+  async offloadBooks(ids: string[]): Promise<void> {
+    return this.measure('offloadBooks', [ids], async () => {
+      if (ids.length === 0) return;
+      try {
+        await this.flushWrites();
+        const db = await this.getDB();
+
+        // If missing hash, calculate fingerprint from existing file before deleting
+        const fingerprints = new Map<string, string>();
+        for (const id of ids) {
+          const book = await db.get('books', id);
+          if (!book) throw new Error('Book not found');
+          if (book.fileHash) continue;
+
+          const fileData = await db.get('files', id);
+          if (fileData) {
+            const blob = fileData instanceof Blob ? fileData : new Blob([fileData]);
+            fingerprints.set(id, await generateFileFingerprint(blob, {
+              title: book.title,
+              author: book.author,
+              filename: book.filename || 'unknown.epub'
+            }));
+          }
+        }
 
-      await tx.done;
-    } catch (error) {
-      this.handleError(error);
-    }
+        const tx = db.transaction(['books', 'library_summary', 'files', 'covers', 'search_index'], 'readwrite');
+        const bookStore = tx.objectStore('books');
+        const books = await Promise.all(ids.map(id => bookStore.get(id)));
+
+        const requests: Promise<unknown>[] = [];
+        books.forEach((book, i) => {
+          if (!book) return;
+          const id = ids[i];
+          book.fileHash = book.fileHash || fingerprints.get(id);
+          book.isOffloaded = true;
+          requests.push(
+            bookStore.put(book),
+            tx.objectStore('library_summary').put(toLibrarySummary(book)),
+            tx.objectStore('files').delete(id),
+            // Delete high-res cover; metadata thumbnail remains.
+            tx.objectStore('covers').delete(id),
+            // Delete the search index; it is rebuilt when the book is restored and searched.
+            tx.objectStore('search_index').delete(id),
+          );
+        });
+
+        await Promise.all(requests);
+        await tx.done;
+        ids.forEach(id => this.readCache.books.delete(id));
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
   }
 
   /**
@@ -287,120 +804,217 @@ class DBService {
    * @returns A Promise that resolves when the book is restored.
    */
   async restoreBook(id: string, file: File): Promise<void> {
-    try {
-      const db = await this.getDB();
-      const book = await db.get('books', id);
-
-      if (!book) throw new Error('Book not found');
+    return this.measure('restoreBook', [id, file], async () => {
+      try {
+        await this.flushWrites();
+        const db = await this.getDB();
+        const book = await db.get('books', id);
+
+        if (!book) throw new Error('Book not found');
+
+        const newFingerprint = await generateFileFingerprint(file, {
+          title: book.title,
+          author: book.author,
+          filename: file.name
+        });
+
+        if (book.fileHash && book.fileHash !== newFingerprint) {
+          throw new Error('File verification failed: Fingerprint mismatch.');
+        } else if (!book.fileHash) {
+          // If hash was missing, we accept the file and set the hash
+          book.fileHash = newFingerprint;
+        }
 
-      const newFingerprint = await generateFileFingerprint(file, {
-        title: book.title,
-        author: book.author,
-        filename: file.name
-      });
+        const tx = db.transaction(['books', 'library_summary', 'files'], 'readwrite');
+        // Store File (Blob) instead of ArrayBuffer
+        await tx.objectStore('files').put(file, id);
 
-      if (book.fileHash && book.fileHash !== newFingerprint) {
-        throw new Error('File verification failed: Fingerprint mismatch.');
-      } else if (!book.fileHash) {
-        // If hash was missing, we accept the file and set the hash
-        book.fileHash = newFingerprint;
+        book.isOffloaded = false;
+        await tx.objectStore('books').put(book);
+        await tx.objectStore('library_summary').put(toLibrarySummary(book));
+        await tx.done;
+        this.readCache.books.delete(id);
+      } catch (error) {
+        this.handleError(error);
       }
+    });
+  }
 
-      const tx = db.transaction(['books', 'files'], 'readwrite');
-      // Store File (Blob) instead of ArrayBuffer
-      await tx.objectStore('files').put(file, id);
+  // --- Write-Behind Queue ---
 
-      book.isOffloaded = false;
-      await tx.objectStore('books').put(book);
-      await tx.done;
-    } catch (error) {
-      this.handleError(error);
-    }
+  private pendingWrites: PendingWrites = createPendingWrites();
+  private flushTimeout: ReturnType<typeof setTimeout> | null = null;
+  private flushChain: Promise<void> = Promise.resolve();
+
+  /**
+   * Starts the flush timer unless one is already running. Like the per-method debounces it
+   * replaces, the timer is not reset by further writes, so a steady stream still flushes.
+   */
+  private scheduleFlush(): void {
+      if (this.flushTimeout) return;
+      this.flushTimeout = setTimeout(() => {
+          this.flushTimeout = null;
+          void this.flushWrites();
+      }, WRITE_BEHIND_DELAY_MS);
   }
 
-  // --- Progress Operations ---
+  /**
+   * Writes all queued mutations (progress, TTS state and position, playback state,
+   * reading history, TTS cache access times) in a single relaxed-durability transaction.
+   * Flushes run one after another, so a later batch never commits before an earlier one.
+   * Called by the flush timer, when the page is hidden, and before reads of the affected stores.
+   * Never rejects; failures are logged and reported to the writers awaiting them.
+   *
+   * @returns A Promise that resolves when everything queued so far has been written.
+   */
+  flushWrites(): Promise<void> {
+    return this.measure('flushWrites', [], () => {
+        if (this.flushTimeout) {
+            clearTimeout(this.flushTimeout);
+            this.flushTimeout = null;
+        }
+
+        const batch = this.pendingWrites;
+        if (isPendingWritesEmpty(batch)) return this.flushChain;
+        this.pendingWrites = createPendingWrites();
 
-  private saveProgressTimeout: NodeJS.Timeout | null = null;
-  private pendingProgress: { [key: string]: { cfi: string; progress: number } } = {};
+        this.flushChain = this.flushChain.then(() => this.commitWrites(batch));
+        return this.flushChain;
+    });
+  }
 
   /**
-   * Saves reading progress. Debounced to prevent frequent DB writes.
+   * Makes the queued writes to one book record (progress, playback state) visible before it is read.
+   * The queue is flushed only if it holds such a write for the book; otherwise this just waits for
+   * a flush already in progress, so cached reads during playback do not commit a batch each.
    *
-   * @param bookId - The unique identifier of the book.
-   * @param cfi - The Canonical Fragment Identifier (CFI) representing the current location.
-   * @param progress - The progress percentage (0.0 to 1.0).
+   * @param bookId - The book about to be read.
+   * @returns A Promise that resolves when the book's queued writes have been written.
    */
-  saveProgress(bookId: string, cfi: string, progress: number): void {
-      this.pendingProgress[bookId] = { cfi, progress };
+  private flushBookWrites(bookId: string): Promise<void> {
+      const batch = this.pendingWrites;
+      return batch.progress.has(bookId) || batch.playbackState.has(bookId)
+          ? this.flushWrites()
+          : this.flushChain;
+  }
 
-      if (this.saveProgressTimeout) return;
+  private async commitWrites(batch: PendingWrites): Promise<void> {
+      try {
+          const stores = new Set<StoreNames<EpubLibraryDB>>();
+          if (batch.progress.size > 0) {
+              stores.add('books');
+              stores.add('library_summary');
+              stores.add('reading_list');
+          }
+          if (batch.playbackState.size > 0) stores.add('books');
+          if (batch.ttsState.size > 0) stores.add('tts_queue');
+          if (batch.ttsPosition.size > 0) stores.add('tts_position');
+          if (batch.history.size > 0) stores.add('reading_history');
+          if (batch.cacheAccess.size > 0) stores.add('tts_cache_meta');
 
-      this.saveProgressTimeout = setTimeout(async () => {
-          this.saveProgressTimeout = null;
-          const pending = { ...this.pendingProgress };
-          this.pendingProgress = {};
+          const db = await this.getDB();
+          const tx = db.transaction(Array.from(stores), 'readwrite', { durability: 'relaxed' });
 
-          try {
-              const db = await this.getDB();
-              // Include 'reading_list' and 'files' in the transaction
-              const tx = db.transaction(['books', 'reading_list', 'files'], 'readwrite');
+          // Books: one read and one write per book, however many updates were queued
+          const bookIds = new Set([...batch.progress.keys(), ...batch.playbackState.keys()]);
+          for (const id of bookIds) {
               const bookStore = tx.objectStore('books');
-              const rlStore = tx.objectStore('reading_list');
-              const fileStore = tx.objectStore('files');
-
-              for (const [id, data] of Object.entries(pending)) {
-                  const book = await bookStore.get(id);
-                  if (book) {
-                      book.currentCfi = data.cfi;
-                      book.progress = data.progress;
-                      book.lastRead = Date.now();
-
-                      // Update Reading List Logic
-                      let filename = book.filename;
-                      if (!filename) {
-                          // Try to recover filename from file store if missing
-                          try {
-                              const fileData = await fileStore.get(id);
-                              // Check if it's a File or has a name property (fake-indexeddb might strip prototype)
-                              // eslint-disable-next-line @typescript-eslint/no-explicit-any
-                              if (fileData instanceof File || (fileData && (fileData as any).name)) {
-                                  // eslint-disable-next-line @typescript-eslint/no-explicit-any
-                                  filename = (fileData instanceof File) ? fileData.name : (fileData as any).name;
-                                  book.filename = filename; // Update book metadata
-                              }
-                          } catch (e) {
-                              // Ignore file fetch errors
-                              Logger.warn('DBService', 'Failed to fetch file for filename recovery', e);
-                          }
-                      }
-
-                      await bookStore.put(book);
-
-                      if (filename) {
-                           // Fetch existing entry to preserve fields like rating/isbn that aren't in book metadata
-                           const existingEntry = await rlStore.get(filename);
-
-                           const entry: ReadingListEntry = {
-                               filename: filename,
-                               title: book.title,
-                               author: book.author,
-                               isbn: existingEntry?.isbn,
-                               rating: existingEntry?.rating,
-                               percentage: data.progress,
-                               lastUpdated: Date.now(),
-                               status: data.progress > 0.98 ? 'read' : 'currently-reading'
-                           };
-                           await rlStore.put(entry);
-                      }
-                  }
+              const book = await bookStore.get(id);
+              if (!book) continue;
+
+              const playback = batch.playbackState.get(id);
+              if (playback) {
+                  if (playback.lastPlayedCfi !== undefined) book.lastPlayedCfi = playback.lastPlayedCfi;
+                  if (playback.lastPauseTime !== undefined) book.lastPauseTime = playback.lastPauseTime === null ? undefined : playback.lastPauseTime;
               }
-              await tx.done;
-          } catch (error) {
-              Logger.error('DBService', 'Failed to save progress', error);
-              // We don't throw here to avoid interrupting the user flow,
-              // but we might want to surface this via a global error handler eventually.
+
+              const progress = batch.progress.get(id);
+              if (!progress) {
+                  await bookStore.put(book);
+                  continue;
+              }
+
+              book.currentCfi = progress.cfi;
+              book.progress = progress.progress;
+              book.lastRead = progress.timestamp;
+
+              await bookStore.put(book);
+              await tx.objectStore('library_summary').put(toLibrarySummary(book));
+
+              // Update Reading List Logic
+              const filename = book.filename;
+              if (filename) {
+                  const rlStore = tx.objectStore('reading_list');
+                  // Fetch existing entry to preserve fields like rating/isbn that aren't in book metadata
+                  const existingEntry = await rlStore.get(filename);
+
+                  const entry: ReadingListEntry = {
+                      filename: filename,
+                      title: book.title,
+                      author: book.author,
+                      isbn: existingEntry?.isbn,
+                      rating: existingEntry?.rating,
+                      percentage: progress.progress,
+                      lastUpdated: progress.timestamp,
+                      status: progress.progress > 0.98 ? 'read' : 'currently-reading'
+                  };
+                  await rlStore.put(entry);
+              }
+          }
+
+          for (const state of batch.ttsState.values()) {
+              await tx.objectStore('tts_queue').put(state);
           }
-      }, 1000); // 1 second debounce
+
+          for (const position of batch.ttsPosition.values()) {
+              await tx.objectStore('tts_position').put(position);
+          }
+
+          // Reading history: apply the queued updates of each book in order, then write once
+          for (const [bookId, updates] of batch.history) {
+              const historyStore = tx.objectStore('reading_history');
+              let entry = await historyStore.get(bookId);
+              for (const update of updates) {
+                  entry = applyReadingHistoryUpdate(bookId, entry, update);
+              }
+              if (entry) await historyStore.put(entry);
+          }
+
+          // TTS cache hits: only the small metadata record is rewritten, never the audio
+          for (const [key, lastAccessed] of batch.cacheAccess) {
+              const metaStore = tx.objectStore('tts_cache_meta');
+              const meta = await metaStore.get(key);
+              // Evicted since the hit
+              if (!meta) continue;
+              meta.lastAccessed = lastAccessed;
+              await metaStore.put(meta);
+          }
+
+          await tx.done;
+          bookIds.forEach(id => this.readCache.books.delete(id));
+          batch.waiters.forEach(waiter => waiter.resolve());
+      } catch (error) {
+          Logger.error('DBService', 'Failed to flush pending writes', error);
+          // We don't throw here to avoid interrupting the user flow; writers that await
+          // their write (reading history) get the error.
+          batch.waiters.forEach(waiter => waiter.reject(error));
+      }
+  }
+
+  // --- Progress Operations ---
+
+  /**
+   * Saves reading progress. Queued and written with the next flush to prevent frequent DB writes.
+   *
+   * @param bookId - The unique identifier of the book.
+   * @param cfi - The Canonical Fragment Identifier (CFI) representing the current location.
+   * @param progress - The progress percentage (0.0 to 1.0).
+   */
+  saveProgress(bookId: string, cfi: string, progress: number): void {
+    this.measure('saveProgress', [bookId, cfi, progress], () => {
+        this.pendingWrites.progress.set(bookId, { cfi, progress, timestamp: Date.now() });
+        this.scheduleFlush();
+    });
   }
 
   // --- Reading List Operations ---
@@ -411,12 +1025,15 @@ class DBService {
    * @returns A Promise resolving to an array of ReadingListEntry objects.
    */
   async getReadingList(): Promise<ReadingListEntry[]> {
-    try {
-      const db = await this.getDB();
-      return await db.getAll('reading_list');
-    } catch (error) {
-      this.handleError(error);
-    }
+    return this.measure('getReadingList', [], async () => {
+      try {
+        await this.flushWrites();
+        const db = await this.getDB();
+        return await db.getAll('reading_list');
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
   }
 
   /**
@@ -425,12 +1042,14 @@ class DBService {
    * @param entry - The reading list entry to upsert.
    */
   async upsertReadingListEntry(entry: ReadingListEntry): Promise<void> {
-    try {
-      const db = await this.getDB();
-      await db.put('reading_list', entry);
-    } catch (error) {
-      this.handleError(error);
-    }
+    return this.measure('upsertReadingListEntry', [entry], async () => {
+      try {
+        const db = await this.getDB();
+        await db.put('reading_list', entry);
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
   }
 
   /**
@@ -439,12 +1058,14 @@ class DBService {
    * @param filename - The filename of the entry to delete.
    */
   async deleteReadingListEntry(filename: string): Promise<void> {
-    try {
-      const db = await this.getDB();
-      await db.delete('reading_list', filename);
-    } catch (error) {
-      this.handleError(error);
-    }
+    return this.measure('deleteReadingListEntry', [filename], async () => {
+      try {
+        const db = await this.getDB();
+        await db.delete('reading_list', filename);
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
   }
 
   /**
@@ -453,16 +1074,18 @@ class DBService {
    * @param filenames - The filenames of the entries to delete.
    */
   async deleteReadingListEntries(filenames: string[]): Promise<void> {
-    try {
-      const db = await this.getDB();
-      const tx = db.transaction('reading_list', 'readwrite');
-      const store = tx.objectStore('reading_list');
+    return this.measure('deleteReadingListEntries', [filenames], async () => {
+      try {
+        const db = await this.getDB();
+        const tx = db.transaction('reading_list', 'readwrite');
+        const store = tx.objectStore('reading_list');
 
-      await Promise.all(filenames.map(filename => store.delete(filename)));
-      await tx.done;
-    } catch (error) {
-      this.handleError(error);
-    }
+        await Promise.all(filenames.map(filename => store.delete(filename)));
+        await tx.done;
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
   }
 
   /**
@@ -471,75 +1094,70 @@ class DBService {
    * @param entries - The list of entries to import.
    */
   async importReadingList(entries: ReadingListEntry[]): Promise<void> {
-      try {
-          const db = await this.getDB();
-          const tx = db.transaction(['reading_list', 'books'], 'readwrite');
-          const rlStore = tx.objectStore('reading_list');
-          const bookStore = tx.objectStore('books');
-
-          // 1. Bulk upsert to reading_list
-          for (const entry of entries) {
-              await rlStore.put(entry);
-          }
-
-          // 2. Reconciliation with books
-          let cursor = await bookStore.openCursor();
-          while (cursor) {
-              const book = cursor.value;
-              if (book.filename) {
-                  const rlEntry = await rlStore.get(book.filename);
-                  if (rlEntry) {
-                      if (rlEntry.percentage > (book.progress || 0)) {
-                          book.progress = rlEntry.percentage;
-                          book.lastRead = Date.now();
-                          cursor.update(book);
-                      }
-                  }
-              }
-              cursor = await cursor.continue();
-          }
-
-          await tx.done;
-      } catch (error) {
-          this.handleError(error);
-      }
+    return this.measure('importReadingList', [entries], async () => {
+        try {
+            await this.flushWrites();
+            const db = await this.getDB();
+            const tx = db.transaction(['reading_list', 'books', 'library_summary'], 'readwrite');
+            const rlStore = tx.objectStore('reading_list');
+            const bookStore = tx.objectStore('books');
+            const summaryStore = tx.objectStore('library_summary');
+
+            // 1. Bulk upsert to reading_list
+            for (const entry of entries) {
+                await rlStore.put(entry);
+            }
+
+            // 2. Reconciliation with books
+            let cursor = await bookStore.openCursor();
+            while (cursor) {
+                const book = cursor.value;
+                if (book.filename) {
+                    const rlEntry = await rlStore.get(book.filename);
+                    if (rlEntry) {
+                        if (rlEntry.percentage > (book.progress || 0)) {
+                            book.progress = rlEntry.percentage;
+                            book.lastRead = Date.now();
+                            cursor.update(book);
+                            await summaryStore.put(toLibrarySummary(book));
+                        }
+                    }
+                }
+                cursor = await cursor.continue();
+            }
+
+            await tx.done;
+            this.invalidateReadCache('books');
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
   }
 
   /**
    * Updates the last playback state for a book.
+   * The update is queued and written with the next flush; reads through this service see it
+   * immediately, because they flush first.
    *
    * @param bookId - The unique identifier of the book.
    * @param lastPlayedCfi - Optional CFI of the last played segment.
    * @param lastPauseTime - Optional timestamp of when playback was paused.
-   * @returns A Promise that resolves when the state is updated.
+   * @returns A Promise that resolves when the update is queued.
    */
   async updatePlaybackState(bookId: string, lastPlayedCfi?: string, lastPauseTime?: number | null): Promise<void> {
-      try {
-          const db = await this.getDB();
-          const tx = db.transaction('books', 'readwrite');
-          const store = tx.objectStore('books');
-          const book = await store.get(bookId);
-          if (book) {
-              if (lastPlayedCfi !== undefined) book.lastPlayedCfi = lastPlayedCfi;
-              if (lastPauseTime !== undefined) book.lastPauseTime = lastPauseTime === null ? undefined : lastPauseTime;
-              await store.put(book);
-          }
-          await tx.done;
-      } catch (error) {
-          this.handleError(error);
-      }
+    return this.measure('updatePlaybackState', [bookId, lastPlayedCfi, lastPauseTime], async () => {
+        const pending = this.pendingWrites.playbackState.get(bookId) ?? {};
+        if (lastPlayedCfi !== undefined) pending.lastPlayedCfi = lastPlayedCfi;
+        if (lastPauseTime !== undefined) pending.lastPauseTime = lastPauseTime;
+        this.pendingWrites.playbackState.set(bookId, pending);
+        this.scheduleFlush();
+    });
   }
 
   // --- TTS State Operations ---
 
-  private saveTTSStateTimeout: NodeJS.Timeout | null = null;
-  private pendingTTSState: { [bookId: string]: TTSState } = {};
-
-  private saveTTSPositionTimeout: NodeJS.Timeout | null = null;
-  private pendingTTSPosition: { [bookId: string]: TTSPosition } = {};
-
   /**
-   * Saves TTS Queue and Index. Debounced.
+   * Saves TTS Queue and Index. Queued and written with the next flush.
    *
    * @param bookId - The unique identifier of the book.
    * @param queue - The current TTS queue.
@@ -547,72 +1165,36 @@ class DBService {
    * @param sectionIndex - The index of the current section in the playlist (optional).
    */
   saveTTSState(bookId: string, queue: TTSQueueItem[], currentIndex: number, sectionIndex?: number): void {
-      this.pendingTTSState[bookId] = {
-          bookId,
-          queue,
-          currentIndex,
-          sectionIndex,
-          updatedAt: Date.now()
-      };
-
-      if (this.saveTTSStateTimeout) return;
-
-      this.saveTTSStateTimeout = setTimeout(async () => {
-          this.saveTTSStateTimeout = null;
-          const pending = { ...this.pendingTTSState };
-          this.pendingTTSState = {};
-
-          try {
-              const db = await this.getDB();
-              const tx = db.transaction('tts_queue', 'readwrite');
-              const store = tx.objectStore('tts_queue');
-
-              for (const state of Object.values(pending)) {
-                  await store.put(state);
-              }
-              await tx.done;
-          } catch (error) {
-              Logger.error('DBService', 'Failed to save TTS state', error);
-          }
-      }, 1000); // 1s debounce
+    this.measure('saveTTSState', [bookId, queue, currentIndex, sectionIndex], () => {
+        this.pendingWrites.ttsState.set(bookId, {
+            bookId,
+            queue,
+            currentIndex,
+            sectionIndex,
+            updatedAt: Date.now()
+        });
+        this.scheduleFlush();
+    });
   }
 
   /**
    * Saves only the TTS playback position (lightweight).
-   * Debounced separately to allow more frequent updates without heavy serialization.
+   * Kept apart from the queue so frequent updates avoid re-serializing it.
    *
    * @param bookId - The unique identifier of the book.
    * @param currentIndex - The current index in the queue.
    * @param sectionIndex - The index of the current section in the playlist (optional).
    */
   saveTTSPosition(bookId: string, currentIndex: number, sectionIndex?: number): void {
-      this.pendingTTSPosition[bookId] = {
-          bookId,
-          currentIndex,
-          sectionIndex,
-          updatedAt: Date.now()
-      };
-
-      if (this.saveTTSPositionTimeout) return;
-
-      this.saveTTSPositionTimeout = setTimeout(async () => {
-          this.saveTTSPositionTimeout = null;
-          const pending = { ...this.pendingTTSPosition };
-          this.pendingTTSPosition = {};
-
-          try {
-              const db = await this.getDB();
-              const tx = db.transaction('tts_position', 'readwrite');
-              const store = tx.objectStore('tts_position');
-
-              for (const position of Object.values(pending)) {
-                  await store.put(position);
-              }
-              await tx.done;
-          } catch (error) {
-              Logger.error('DBService', 'Failed to save TTS position', error);
-          }
-      }, 500); // 500ms debounce
+    this.measure('saveTTSPosition', [bookId, currentIndex, sectionIndex], () => {
+        this.pendingWrites.ttsPosition.set(bookId, {
+            bookId,
+            currentIndex,
+            sectionIndex,
+            updatedAt: Date.now()
+        });
+        this.scheduleFlush();
+    });
   }
 
   /**
@@ -623,23 +1205,26 @@ class DBService {
    * @returns A Promise resolving to the TTSState or undefined.
    */
   async getTTSState(bookId: string): Promise<TTSState | undefined> {
-      try {
-          const db = await this.getDB();
-          const state = await db.get('tts_queue', bookId);
-          const position = await db.get('tts_position', bookId);
-
-          if (state && position && position.updatedAt > state.updatedAt) {
-              return {
-                  ...state,
-                  currentIndex: position.currentIndex,
-                  sectionIndex: position.sectionIndex !== undefined ? position.sectionIndex : state.sectionIndex
-              };
-          }
-
-          return state;
-      } catch (error) {
-          this.handleError(error);
-      }
+    return this.measure('getTTSState', [bookId], async () => {
+        try {
+            await this.flushWrites();
+            const db = await this.getDB();
+            const state = await db.get('tts_queue', bookId);
+            const position = await db.get('tts_position', bookId);
+
+            if (state && position && position.updatedAt > state.updatedAt) {
+                return {
+                    ...state,
+                    currentIndex: position.currentIndex,
+                    sectionIndex: position.sectionIndex !== undefined ? position.sectionIndex : state.sectionIndex
+                };
+            }
+
+            return state;
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
   }
 
   // --- Annotation Operations ---
@@ -651,12 +1236,14 @@ class DBService {
    * @returns A Promise that resolves when the annotation is saved.
    */
   async addAnnotation(annotation: Annotation): Promise<void> {
-    try {
-      const db = await this.getDB();
-      await db.put('annotations', annotation);
-    } catch (error) {
-      this.handleError(error);
-    }
+    return this.measure('addAnnotation', [annotation], async () => {
+      try {
+        const db = await this.getDB();
+        await db.put('annotations', annotation);
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
   }
 
   /**
@@ -666,12 +1253,14 @@ class DBService {
    * @returns A Promise resolving to an array of Annotation objects.
    */
   async getAnnotations(bookId: string): Promise<Annotation[]> {
-    try {
-      const db = await this.getDB();
-      return await db.getAllFromIndex('annotations', 'by_bookId', bookId);
-    } catch (error) {
-      this.handleError(error);
-    }
+    return this.measure('getAnnotations', [bookId], async () => {
+      try {
+        const db = await this.getDB();
+        return await db.getAllFromIndex('annotations', 'by_bookId', bookId);
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
   }
 
   /**
@@ -681,61 +1270,236 @@ class DBService {
    * @returns A Promise that resolves when the annotation is deleted.
    */
   async deleteAnnotation(id: string): Promise<void> {
-      try {
-          const db = await this.getDB();
-          await db.delete('annotations', id);
-      } catch (error) {
-          this.handleError(error);
-      }
+    return this.measure('deleteAnnotation', [id], async () => {
+        try {
+            const db = await this.getDB();
+            await db.delete('annotations', id);
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
   }
 
   // --- TTS Cache Operations ---
 
   /**
    * Retrieves a cached TTS segment.
+   * The access time of a hit is queued and written to `tts_cache_meta` with the next flush;
+   * the audio record itself is never rewritten.
    *
    * @param key - The cache key.
    * @returns A Promise resolving to the CachedSegment or undefined.
    */
   async getCachedSegment(key: string): Promise<CachedSegment | undefined> {
-      try {
-          const db = await this.getDB();
-          const segment = await db.get('tts_cache', key);
-
-          if (segment) {
-              // Fire and forget update to lastAccessed
-              // We don't await this to keep read fast
-              db.put('tts_cache', { ...segment, lastAccessed: Date.now() }).catch((err) => Logger.error('DBService', 'Failed to update TTS cache lastAccessed', err));
-          }
-          return segment;
-      } catch (error) {
-          this.handleError(error);
-      }
+    return this.measure('getCachedSegment', [key], async () => {
+        try {
+            const db = await this.getDB();
+            const segment = await db.get('tts_cache', key);
+
+            if (segment) {
+                this.pendingWrites.cacheAccess.set(key, Date.now());
+                this.scheduleFlush();
+            }
+            return segment;
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
   }
 
   /**
    * Caches a TTS segment.
+   * The running total of cached bytes in `app_metadata` is updated in the same transaction;
+   * once it exceeds the budget, least recently used segments are evicted in idle time.
    *
    * @param key - The cache key.
    * @param audio - The audio data.
    * @param alignment - Optional alignment data.
+   * @param format - The encoding of the audio, if it is not the provider's own.
    * @returns A Promise that resolves when the segment is cached.
    */
   // eslint-disable-next-line @typescript-eslint/no-explicit-any
-  async cacheSegment(key: string, audio: ArrayBuffer, alignment?: any[]): Promise<void> {
-      try {
-          const db = await this.getDB();
-          const segment: CachedSegment = {
-              key,
-              audio,
-              alignment,
-              createdAt: Date.now(),
-              lastAccessed: Date.now(),
-          };
-          await db.put('tts_cache', segment);
-      } catch (error) {
-          this.handleError(error);
+  async cacheSegment(key: string, audio: ArrayBuffer, alignment?: any[], format?: CachedAudioFormat): Promise<void> {
+    return this.measure('cacheSegment', [key, audio, alignment, format], async () => {
+        try {
+            const db = await this.getDB();
+            const segment: CachedSegment = {
+                key,
+                audio,
+                alignment,
+                format,
+                createdAt: Date.now(),
+                lastAccessed: Date.now(),
+            };
+
+            const tx = db.transaction(['tts_cache', 'tts_cache_meta', 'app_metadata'], 'readwrite');
+            const metaStore = tx.objectStore('tts_cache_meta');
+            const metadata = tx.objectStore('app_metadata');
+            const [existing, bytes, budget] = await Promise.all([
+                metaStore.get(key),
+                metadata.get(TTS_CACHE_BYTES_KEY) as Promise<number | undefined>,
+                metadata.get(TTS_CACHE_BUDGET_KEY) as Promise<number | undefined>,
+            ]);
+            await tx.objectStore('tts_cache').put(segment);
+            await metaStore.put({ key, size: audio.byteLength, createdAt: segment.createdAt, lastAccessed: segment.lastAccessed });
+            // Without a total yet, the eviction job computes it, including this segment
+            const total = bytes === undefined ? undefined : bytes + audio.byteLength - (existing?.size ?? 0);
+            if (total !== undefined) await metadata.put(total, TTS_CACHE_BYTES_KEY);
+            await tx.done;
+
+            if (total === undefined || total > (budget ?? DEFAULT_TTS_CACHE_BUDGET)) {
+                this.scheduleTTSCacheEviction();
+            }
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
+  }
+
+  private ttsCacheEvictionScheduled = false;
+
+  /**
+   * Runs {@link evictTTSCacheChunk} in idle time, one chunk per idle slice, until the cache is within budget.
+   */
+  private scheduleTTSCacheEviction(): void {
+      if (this.ttsCacheEvictionScheduled) return;
+      this.ttsCacheEvictionScheduled = true;
+
+      const step = () => {
+          this.evictTTSCacheChunk().then((more) => {
+              if (more) whenIdle(step);
+              else this.ttsCacheEvictionScheduled = false;
+          }).catch((error) => {
+              this.ttsCacheEvictionScheduled = false;
+              Logger.warn('DBService', 'TTS cache eviction failed', error);
+          });
+      };
+      whenIdle(step);
+  }
+
+  /**
+   * Evicts up to {@link TTS_CACHE_EVICTION_CHUNK} least recently used segments, walking the
+   * `by_lastAccessed` index of `tts_cache_meta`, while the cache is above the low-water mark.
+   * Only metadata records are read, so choosing what to evict never loads audio.
+   * Without a byte total yet, it is summed from `tts_cache_meta`; segments cached before v19 get
+   * their metadata, and the exact total, from the `tts-cache-meta` data migration.
+   *
+   * @returns Whether more segments remain to be evicted.
+   */
+  private async evictTTSCacheChunk(): Promise<boolean> {
+      const db = await this.getDB();
+      const tx = db.transaction(['tts_cache', 'tts_cache_meta', 'app_metadata'], 'readwrite');
+      const cache = tx.objectStore('tts_cache');
+      const metaStore = tx.objectStore('tts_cache_meta');
+      const metadata = tx.objectStore('app_metadata');
+      const budget: number = (await metadata.get(TTS_CACHE_BUDGET_KEY)) ?? DEFAULT_TTS_CACHE_BUDGET;
+      let bytes: number | undefined = await metadata.get(TTS_CACHE_BYTES_KEY);
+
+      if (bytes === undefined) {
+          bytes = 0;
+          let cursor = await metaStore.openCursor();
+          while (cursor) {
+              bytes += cursor.value.size;
+              cursor = await cursor.continue();
+          }
+      }
+
+      const target = budget * TTS_CACHE_LOW_WATER;
+      let evicted = 0;
+      let more = false;
+      if (bytes > target) {
+          let cursor = await metaStore.index('by_lastAccessed').openCursor();
+          while (cursor && bytes > target && evicted < TTS_CACHE_EVICTION_CHUNK) {
+              bytes -= cursor.value.size;
+              await cache.delete(cursor.value.key);
+              await cursor.delete();
+              evicted++;
+              cursor = await cursor.continue();
+          }
+          // An exhausted cursor means the store is now empty, whatever the total said
+          if (!cursor) bytes = 0;
+          more = bytes > target;
+      }
+
+      await metadata.put(bytes, TTS_CACHE_BYTES_KEY);
+      await tx.done;
+      if (evicted > 0) {
+          Logger.debug('DBService', `Evicted ${evicted} TTS cache segments`);
       }
+      return more;
+  }
+
+  /**
+   * Evicts least recently used segments until the TTS cache is within its budget.
+   * Normally this happens in the background after writes; this runs it to completion immediately.
+   */
+  async evictTTSCache(): Promise<void> {
+    return this.measure('evictTTSCache', [], async () => {
+        try {
+            while (await this.evictTTSCacheChunk());
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
+  }
+
+  /**
+   * Returns how many bytes of audio are cached and the configured budget.
+   *
+   * @returns A Promise resolving to the cache usage.
+   */
+  async getTTSCacheUsage(): Promise<TTSCacheUsage> {
+    return this.measure('getTTSCacheUsage', [], async () => {
+        try {
+            const db = await this.getDB();
+            let bytes: number | undefined = await db.get('app_metadata', TTS_CACHE_BYTES_KEY);
+            if (bytes === undefined) {
+                await this.evictTTSCacheChunk();
+                bytes = (await db.get('app_metadata', TTS_CACHE_BYTES_KEY)) ?? 0;
+            }
+            const budget: number = (await db.get('app_metadata', TTS_CACHE_BUDGET_KEY)) ?? DEFAULT_TTS_CACHE_BUDGET;
+            return { bytes, budget };
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
+  }
+
+  /**
+   * Sets the size of the TTS cache, evicting segments in the background if it is now over budget.
+   *
+   * @param budget - The budget in bytes.
+   */
+  async setTTSCacheBudget(budget: number): Promise<void> {
+    return this.measure('setTTSCacheBudget', [budget], async () => {
+        try {
+            const db = await this.getDB();
+            await db.put('app_metadata', budget, TTS_CACHE_BUDGET_KEY);
+            this.scheduleTTSCacheEviction();
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
+  }
+
+  /**
+   * Deletes every cached segment and resets the byte total.
+   */
+  async clearTTSCache(): Promise<void> {
+    return this.measure('clearTTSCache', [], async () => {
+        try {
+            const db = await this.getDB();
+            const tx = db.transaction(['tts_cache', 'tts_cache_meta', 'app_metadata'], 'readwrite');
+            await Promise.all([
+                tx.objectStore('tts_cache').clear(),
+                tx.objectStore('tts_cache_meta').clear(),
+                tx.objectStore('app_metadata').put(0, TTS_CACHE_BYTES_KEY),
+                tx.done,
+            ]);
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
   }
 
   // --- Locations ---
@@ -747,12 +1511,14 @@ class DBService {
    * @returns A Promise resolving to the BookLocations object or undefined.
    */
   async getLocations(bookId: string): Promise<BookLocations | undefined> {
-      try {
-          const db = await this.getDB();
-          return await db.get('locations', bookId);
-      } catch (error) {
-          this.handleError(error);
-      }
+    return this.measure('getLocations', [bookId], async () => {
+        try {
+            const db = await this.getDB();
+            return await db.get('locations', bookId);
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
   }
 
   /**
@@ -763,12 +1529,14 @@ class DBService {
    * @returns A Promise that resolves when the locations are saved.
    */
   async saveLocations(bookId: string, locations: string): Promise<void> {
-      try {
-          const db = await this.getDB();
-          await db.put('locations', { bookId, locations });
-      } catch (error) {
-          this.handleError(error);
-      }
+    return this.measure('saveLocations', [bookId, locations], async () => {
+        try {
+            const db = await this.getDB();
+            await db.put('locations', { bookId, locations });
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
   }
 
   // --- Reading History Operations ---
@@ -780,13 +1548,16 @@ class DBService {
    * @returns A Promise resolving to an array of CFI ranges.
    */
   async getReadingHistory(bookId: string): Promise<string[]> {
-      try {
-          const db = await this.getDB();
-          const entry = await db.get('reading_history', bookId);
-          return entry ? entry.readRanges : [];
-      } catch (error) {
-          this.handleError(error);
-      }
+    return this.measure('getReadingHistory', [bookId], async () => {
+        try {
+            await this.flushWrites();
+            const db = await this.getDB();
+            const entry = await db.get('reading_history', bookId);
+            return entry ? entry.readRanges : [];
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
   }
 
   /**
@@ -796,97 +1567,41 @@ class DBService {
    * @returns A Promise resolving to the ReadingHistoryEntry or undefined.
    */
   async getReadingHistoryEntry(bookId: string): Promise<ReadingHistoryEntry | undefined> {
-      try {
-          const db = await this.getDB();
-          return await db.get('reading_history', bookId);
-      } catch (error) {
-          this.handleError(error);
-      }
+    return this.measure('getReadingHistoryEntry', [bookId], async () => {
+        try {
+            await this.flushWrites();
+            const db = await this.getDB();
+            return await db.get('reading_history', bookId);
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
   }
 
   /**
    * Updates the reading history for a book by merging a new range.
+   * The update is queued and applied with the next flush, together with any other pending writes.
    *
    * @param bookId - The unique identifier of the book.
    * @param newRange - The new CFI range to add.
    * @param type - The source of the reading event.
    * @param label - Optional contextual label.
-   * @returns A Promise that resolves when the history is updated.
+   * @returns A Promise that resolves when the history is written.
    */
   async updateReadingHistory(bookId: string, newRange: string, type: ReadingEventType, label?: string, skipSession: boolean = false): Promise<void> {
-      try {
-          const db = await this.getDB();
-          const tx = db.transaction('reading_history', 'readwrite');
-          const store = tx.objectStore('reading_history');
-          const entry = await store.get(bookId);
-
-          let readRanges: string[] = [];
-          let sessions: ReadingSession[] = [];
-
-          if (entry) {
-              readRanges = entry.readRanges;
-              if (entry.sessions) {
-                  sessions = entry.sessions;
-              }
-          }
-
-          let updatedRanges = mergeCfiRanges(readRanges, newRange);
-
-          // Enforce limit on history size to prevent unbounded growth
-          if (updatedRanges.length > 100) {
-              updatedRanges = updatedRanges.slice(updatedRanges.length - 100);
-          }
-
-          if (!skipSession) {
-              // Coalescing Logic
-              const newTimestamp = Date.now();
-              const lastSession = sessions.length > 0 ? sessions[sessions.length - 1] : null;
-
-              let shouldCoalesce = false;
-
-              if (lastSession && lastSession.type === type && type !== 'tts') {
-                   const timeDiff = newTimestamp - lastSession.timestamp;
-                   // 5 minutes = 300,000 ms
-                   if (timeDiff < 300000) {
-                       shouldCoalesce = true;
-                   }
-              }
-
-              if (shouldCoalesce && lastSession) {
-                  // Update last session
-                  lastSession.cfiRange = newRange;
-                  lastSession.timestamp = newTimestamp;
-                  if (label) lastSession.label = label;
-
-                  // Update in array
-                  sessions[sessions.length - 1] = lastSession;
-              } else {
-                  // Add new session
-                  const newSession: ReadingSession = {
-                      cfiRange: newRange,
-                      timestamp: newTimestamp,
-                      type: type,
-                      label: label
-                  };
-                  sessions.push(newSession);
-              }
-
-              // Limit sessions size too
-              if (sessions.length > 100) {
-                 sessions = sessions.slice(sessions.length - 100);
-              }
-          }
-
-          await store.put({
-              bookId,
-              readRanges: updatedRanges,
-              sessions,
-              lastUpdated: Date.now()
-          });
-          await tx.done;
-      } catch (error) {
-          this.handleError(error);
-      }
+    return this.measure('updateReadingHistory', [bookId, newRange, type, label, skipSession], async () => {
+        try {
+            await new Promise<void>((resolve, reject) => {
+                const updates = this.pendingWrites.history.get(bookId) ?? [];
+                updates.push({ range: newRange, type, label, skipSession, timestamp: Date.now() });
+                this.pendingWrites.history.set(bookId, updates);
+                this.pendingWrites.waiters.push({ resolve, reject });
+                this.scheduleFlush();
+            });
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
   }
 
   // --- Content Analysis ---
@@ -898,28 +1613,35 @@ class DBService {
    * @returns A Promise that resolves when the analysis is saved.
    */
   async saveContentAnalysis(analysis: ContentAnalysis): Promise<void> {
-    try {
-      const db = await this.getDB();
-      await db.put('content_analysis', analysis);
-    } catch (error) {
-      this.handleError(error);
-    }
+    return this.measure('saveContentAnalysis', [analysis], async () => {
+      try {
+        const db = await this.getDB();
+        await db.put('content_analysis', analysis);
+        this.readCache.content_analysis.delete(analysis.id);
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
   }
 
   /**
    * Retrieves content analysis for a specific section.
+   * Served from the read cache when possible; the returned record must not be mutated.
    *
    * @param bookId - The book ID.
    * @param sectionId - The section ID.
    * @returns A Promise resolving to the ContentAnalysis or undefined.
    */
   async getContentAnalysis(bookId: string, sectionId: string): Promise<ContentAnalysis | undefined> {
-    try {
-      const db = await this.getDB();
-      return await db.get('content_analysis', `${bookId}-${sectionId}`);
-    } catch (error) {
-      this.handleError(error);
-    }
+    return this.measure('getContentAnalysis', [bookId, sectionId], async () => {
+      try {
+        const db = await this.getDB();
+        const id = `${bookId}-${sectionId}`;
+        return await this.readCache.content_analysis.read(id, () => db.get('content_analysis', id));
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
   }
 
   /**
@@ -929,12 +1651,14 @@ class DBService {
    * @returns A Promise resolving to an array of ContentAnalysis objects.
    */
   async getBookAnalysis(bookId: string): Promise<ContentAnalysis[]> {
-      try {
-          const db = await this.getDB();
-          return await db.getAllFromIndex('content_analysis', 'by_bookId', bookId);
-      } catch (error) {
-          this.handleError(error);
-      }
+    return this.measure('getBookAnalysis', [bookId], async () => {
+        try {
+            const db = await this.getDB();
+            return await db.getAllFromIndex('content_analysis', 'by_bookId', bookId);
+        } catch (error) {
+            this.handleError(error);
+        }
+    });
   }
 
   // --- Lexicon ---
@@ -950,50 +1674,151 @@ class DBService {
    * @returns A Promise that resolves when the content is saved.
    */
   async saveTTSContent(content: TTSContent): Promise<void> {
-    try {
-      const db = await this.getDB();
-      await db.put('tts_content', content);
-    } catch (error) {
-      this.handleError(error);
-    }
+    return this.measure('saveTTSContent', [content], async () => {
+      try {
+        const db = await this.getDB();
+        await db.put('tts_content', encodeTTSContent(content));
+        this.readCache.tts_content.delete(content.id);
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
   }
 
   /**
    * Retrieves extracted TTS content for a specific section.
+   * Served from the read cache when possible; the returned record must not be mutated.
+   * Sentences are decoded from the columnar record on first access.
    *
    * @param bookId - The book ID.
    * @param sectionId - The section ID.
    * @returns A Promise resolving to the TTSContent or undefined.
    */
   async getTTSContent(bookId: string, sectionId: string): Promise<TTSContent | undefined> {
-    try {
-      const db = await this.getDB();
-      return await db.get('tts_content', `${bookId}-${sectionId}`);
-    } catch (error) {
-      this.handleError(error);
-    }
+    return this.measure('getTTSContent', [bookId, sectionId], async () => {
+      try {
+        const db = await this.getDB();
+        const id = `${bookId}-${sectionId}`;
+        return await this.readCache.tts_content.read(id, async () => {
+          const record = await db.get('tts_content', id);
+          return record && decodeTTSContent(upgradeOnRead('tts_content', record));
+        });
+      } catch (error) {
+        this.handleError(error);
+      }
+    });
   }
 
   /**
-   * Cleans up any pending operations/timeouts.
-   * Call this before deleting the database or when shutting down the service.
+   * Retrieves everything needed to queue a section for TTS (its sentences, its analysis and the
+   * book metadata) in one read-only transaction over the three stores.
+   * Records already in the read cache are not read again, and those read are cached, so a bundle
+   * warmed by {@link prefetchSectionBundle} is served from memory.
+   *
+   * @param bookId - The book ID.
+   * @param sectionId - The section ID.
+   * @returns A Promise resolving to the section bundle. Missing records are undefined.
    */
-  cleanup(): void {
-      if (this.saveProgressTimeout) {
-          clearTimeout(this.saveProgressTimeout);
-          this.saveProgressTimeout = null;
-          this.pendingProgress = {};
+  async getSectionBundle(bookId: string, sectionId: string): Promise<SectionBundle> {
+    return this.measure('getSectionBundle', [bookId, sectionId], async () => {
+      try {
+        await this.flushBookWrites(bookId);
+        const db = await this.getDB();
+        const id = `${bookId}-${sectionId}`;
+
+        // Opened by the first cache miss. Every miss issues its request in this same tick, so all share it.
+        const openTransaction = () => db.transaction(['tts_content', 'content_analysis', 'books'], 'readonly');
+        let tx: ReturnType<typeof openTransaction> | undefined;
+        const transaction = () => (tx ??= openTransaction());
+
+        const [content, analysis, book] = await Promise.all([
+          this.readCache.tts_content.read(id, () => transaction().objectStore('tts_content').get(id)
+            .then(record => record && decodeTTSContent(upgradeOnRead('tts_content', record)))),
+          this.readCache.content_analysis.read(id, () => transaction().objectStore('content_analysis').get(id)),
+          this.readCache.books.read(bookId, () => transaction().objectStore('books').get(bookId)),
+        ]);
+        return { content, analysis, book };
+      } catch (error) {
+        this.handleError(error);
       }
-      if (this.saveTTSStateTimeout) {
-          clearTimeout(this.saveTTSStateTimeout);
-          this.saveTTSStateTimeout = null;
-          this.pendingTTSState = {};
+    });
+  }
+
+  /**
+   * Loads a section bundle into the read cache in the background, e.g. the next section during playback.
+   *
+   * @param bookId - The book ID.
+   * @param sectionId - The section ID.
+   */
+  prefetchSectionBundle(bookId: string, sectionId: string): void {
+    this.measure('prefetchSectionBundle', [bookId, sectionId], () => {
+      this.getSectionBundle(bookId, sectionId).catch((error) => {
+        Logger.warn('DBService', 'Failed to prefetch section bundle', error);
+      });
+    });
+  }
+
+  // --- Read Cache ---
+
+  /**
+   * Drops cached records, for callers that write the cached stores without going through this
+   * service (backup restore, clearing all data).
+   *
+   * @param store - The store to invalidate; all cached stores if omitted.
+   */
+  invalidateReadCache(store?: CachedStore): void {
+      if (store) {
+          this.readCache[store].clear();
+          return;
       }
-      if (this.saveTTSPositionTimeout) {
-          clearTimeout(this.saveTTSPositionTimeout);
-          this.saveTTSPositionTimeout = null;
-          this.pendingTTSPosition = {};
+      Object.values(this.readCache).forEach(cache => cache.clear());
+  }
+
+  /**
+   * Returns the read cache hit/miss counters of each cached store.
+   *
+   * @returns The counters, keyed by store.
+   */
+  getReadCacheStats(): Record<CachedStore, ReadCacheStats> {
+      return {
+          books: this.readCache.books.getStats(),
+          content_analysis: this.readCache.content_analysis.getStats(),
+          tts_content: this.readCache.tts_content.getStats(),
+      };
+  }
+
+  // --- Telemetry ---
+
+  /**
+   * Returns per-method latency percentiles, payload estimates and per-store transaction counts
+   * collected since startup or the last {@link resetTelemetry}.
+   *
+   * @returns The telemetry snapshot.
+   */
+  getTelemetry(): DBTelemetrySnapshot {
+      return dbTelemetry.getSnapshot();
+  }
+
+  /**
+   * Discards the collected telemetry, e.g. before measuring a specific interaction.
+   */
+  resetTelemetry(): void {
+      dbTelemetry.reset();
+  }
+
+  /**
+   * Cleans up any pending operations/timeouts.
+   * Queued writes are discarded. Call this before deleting the database or when shutting down the service.
+   */
+  cleanup(): void {
+      if (this.flushTimeout) {
+          clearTimeout(this.flushTimeout);
+          this.flushTimeout = null;
       }
+      // Writers awaiting discarded writes are released rather than left hanging
+      this.pendingWrites.waiters.forEach(waiter => waiter.resolve());
+      this.pendingWrites = createPendingWrites();
+      this.invalidateReadCache();
   }
 }
 
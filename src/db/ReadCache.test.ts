@@ -0,0 +1,63 @@
+import { describe, it, expect, vi } from 'vitest';
+import { ReadCache } from './ReadCache';
+
+describe('ReadCache', () => {
+  it('loads on a miss and serves later reads from memory', async () => {
+    const cache = new ReadCache<string>(2);
+    const load = vi.fn().mockResolvedValue('value');
+
+    expect(await cache.read('a', load)).toBe('value');
+    expect(await cache.read('a', load)).toBe('value');
+
+    expect(load).toHaveBeenCalledTimes(1);
+    expect(cache.getStats()).toEqual({ hits: 1, misses: 1, size: 1, capacity: 2 });
+  });
+
+  it('caches absent records', async () => {
+    const cache = new ReadCache<string>(2);
+    const load = vi.fn().mockResolvedValue(undefined);
+
+    expect(await cache.read('missing', load)).toBeUndefined();
+    expect(await cache.read('missing', load)).toBeUndefined();
+    expect(load).toHaveBeenCalledTimes(1);
+  });
+
+  it('evicts the least recently used record', async () => {
+    const cache = new ReadCache<string>(2);
+    await cache.read('a', async () => 'a');
+    await cache.read('b', async () => 'b');
+    await cache.read('a', async () => 'a'); // 'b' is now least recently used
+    await cache.read('c', async () => 'c');
+
+    const load = vi.fn().mockResolvedValue('b2');
+    expect(await cache.read('b', load)).toBe('b2');
+    expect(load).toHaveBeenCalledTimes(1);
+    expect(cache.getStats().size).toBe(2);
+  });
+
+  it('invalidates by key and by prefix', async () => {
+    const cache = new ReadCache<string>(4);
+    await cache.read('book1-s1', async () => 'old');
+    await cache.read('book1-s2', async () => 'old');
+    await cache.read('book2-s1', async () => 'kept');
+
+    cache.deletePrefix('book1-');
+    expect(await cache.read('book1-s1', async () => 'new')).toBe('new');
+    expect(await cache.read('book2-s1', async () => 'reloaded')).toBe('kept');
+
+    cache.delete('book2-s1');
+    expect(await cache.read('book2-s1', async () => 'reloaded')).toBe('reloaded');
+  });
+
+  it('does not cache a load that raced an invalidation', async () => {
+    const cache = new ReadCache<string>(2);
+    let release: (value: string) => void = () => {};
+    const pending = cache.read('a', () => new Promise(resolve => { release = resolve; }));
+
+    cache.delete('a');
+    release('stale');
+    expect(await pending).toBe('stale');
+
+    expect(await cache.read('a', async () => 'fresh')).toBe('fresh');
+  });
+});
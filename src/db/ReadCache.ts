@@ -0,0 +1,100 @@
+/**
+ * Hit/miss counters of a {@link ReadCache}.
+ */
+export interface ReadCacheStats {
+  /** Reads answered from memory. */
+  hits: number;
+  /** Reads that went to IndexedDB. */
+  misses: number;
+  /** Number of records currently cached. */
+  size: number;
+  /** Maximum number of records kept. */
+  capacity: number;
+}
+
+/**
+ * Bounded, least-recently-used read-through cache for the records of one object store.
+ * Absent records are cached too, so repeated lookups of a missing key skip IndexedDB as well.
+ *
+ * Records are shared between callers, so they must be treated as read-only.
+ * Every invalidation bumps a generation counter; a load that started before an
+ * invalidation does not populate the cache, so a racing write is never masked by a stale read.
+ */
+export class ReadCache<T> {
+  private entries = new Map<string, T | undefined>();
+  private generation = 0;
+  private hits = 0;
+  private misses = 0;
+
+  /**
+   * @param capacity - Maximum number of records kept.
+   */
+  constructor(private readonly capacity: number) {}
+
+  /**
+   * Returns the cached record for a key, loading it on a miss.
+   *
+   * @param key - The record key.
+   * @param load - Reads the record from IndexedDB.
+   * @returns A Promise resolving to the record, or undefined if it does not exist.
+   */
+  async read(key: string, load: () => Promise<T | undefined>): Promise<T | undefined> {
+    if (this.entries.has(key)) {
+      this.hits++;
+      const value = this.entries.get(key);
+      // Re-insert to mark as most recently used
+      this.entries.delete(key);
+      this.entries.set(key, value);
+      return value;
+    }
+
+    this.misses++;
+    const generation = this.generation;
+    const value = await load();
+    if (generation === this.generation) {
+      this.entries.set(key, value);
+      if (this.entries.size > this.capacity) {
+        // Map iteration follows insertion order, so the first key is the least recently used
+        this.entries.delete(this.entries.keys().next().value as string);
+      }
+    }
+    return value;
+  }
+
+  /**
+   * Drops the cached record for a key.
+   *
+   * @param key - The record key.
+   */
+  delete(key: string): void {
+    this.generation++;
+    this.entries.delete(key);
+  }
+
+  /**
+   * Drops every cached record whose key starts with a prefix, e.g. all sections of a book.
+   *
+   * @param prefix - The key prefix.
+   */
+  deletePrefix(prefix: string): void {
+    this.generation++;
+    for (const key of Array.from(this.entries.keys())) {
+      if (key.startsWith(prefix)) this.entries.delete(key);
+    }
+  }
+
+  /**
+   * Drops all cached records.
+   */
+  clear(): void {
+    this.generation++;
+    this.entries.clear();
+  }
+
+  /**
+   * Returns the hit/miss counters and current size.
+   */
+  getStats(): ReadCacheStats {
+    return { hits: this.hits, misses: this.misses, size: this.entries.size, capacity: this.capacity };
+  }
+}
@@ -0,0 +1,20 @@
+/**
+ * Stores keyed by the book ID itself, cleared when a book is deleted.
+ */
+export const BOOK_KEYED_STORES = ['books', 'library_summary', 'thumbnails', 'files', 'covers', 'locations', 'tts_queue', 'tts_position', 'search_index'] as const;
+
+/**
+ * Stores keyed `${bookId}-${sectionId}`, so the records of one book form a contiguous key range.
+ */
+export const SECTION_KEYED_STORES = ['sections', 'tts_content', 'content_analysis'] as const;
+
+/**
+ * Returns the key range covering every `${bookId}-${sectionId}` key of a book.
+ * Book IDs are fixed-length UUIDs, so the range of one book never overlaps another's.
+ *
+ * @param bookId - The book ID.
+ * @returns The key range, usable with `delete`, `getAll` or `count`.
+ */
+export function bookKeyRange(bookId: string): IDBKeyRange {
+  return IDBKeyRange.bound(`${bookId}-`, `${bookId}-\uffff`);
+}
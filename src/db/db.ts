@@ -1,5 +1,6 @@
-import { openDB, type DBSchema, type IDBPDatabase } from 'idb';
-import type { BookMetadata, Annotation, CachedSegment, LexiconRule, BookLocations, TTSState, SectionMetadata, ContentAnalysis, ReadingHistoryEntry, ReadingListEntry, TTSContent, TTSPosition } from '../types/db';
+import { openDB, unwrap, type DBSchema, type IDBPDatabase } from 'idb';
+import type { BookMetadata, LibrarySummary, Annotation, CachedSegment, CachedSegmentMeta, LexiconRule, BookLocations, TTSState, SectionMetadata, ContentAnalysis, ReadingHistoryEntry, ReadingListEntry, TTSContentRecord, TTSPosition, SearchIndexRecord } from '../types/db';
+import { dbTelemetry } from './telemetry';
 
 /**
  * Interface defining the schema for the IndexedDB database.
@@ -24,6 +25,19 @@ export interface EpubLibraryDB extends DBSchema {
       by_addedAt: number;
     };
   };
+  /**
+   * Store for compact book projections read by the library views.
+   */
+  library_summary: {
+    key: string; // bookId
+    value: LibrarySummary;
+    indexes: {
+      by_addedAt: number;
+      by_lastRead: number;
+      by_title: string;
+      by_author: string;
+    };
+  };
   /**
    * Store for binary file data (EPUB files).
    */
@@ -31,6 +45,13 @@ export interface EpubLibraryDB extends DBSchema {
     key: string;
     value: Blob | ArrayBuffer;
   };
+  /**
+   * Store for cover thumbnails, read one at a time as library cards mount.
+   */
+  thumbnails: {
+    key: string; // bookId
+    value: Blob;
+  };
   /**
    * Store for high-resolution cover images.
    */
@@ -61,6 +82,13 @@ export interface EpubLibraryDB extends DBSchema {
   tts_cache: {
     key: string;
     value: CachedSegment;
+  };
+  /**
+   * Store for the size and access time of each TTS audio cache entry.
+   */
+  tts_cache_meta: {
+    key: string;
+    value: CachedSegmentMeta;
     indexes: {
         by_lastAccessed: number;
     };
@@ -132,24 +160,52 @@ export interface EpubLibraryDB extends DBSchema {
    */
   tts_content: {
     key: string;
-    value: TTSContent;
+    value: TTSContentRecord;
     indexes: {
       by_bookId: string;
     };
   };
+  /**
+   * Store for serialized full-text search indexes.
+   */
+  search_index: {
+    key: string; // bookId
+    value: SearchIndexRecord;
+  };
 }
 
 let dbPromise: Promise<IDBPDatabase<EpubLibraryDB>>;
 
+/** `app_metadata` key of the running total of cached TTS audio bytes, maintained by `DBService`. */
+export const TTS_CACHE_BYTES_KEY = 'ttsCacheBytes';
+
+/**
+ * Counts every transaction opened on the connection, including those behind the `db.get`/`db.put`
+ * shortcuts, which go through the same method.
+ *
+ * @param db - The database connection.
+ */
+function countTransactions(db: IDBPDatabase<EpubLibraryDB>): void {
+  const raw = unwrap(db);
+  const transaction = raw.transaction;
+  raw.transaction = function (this: IDBDatabase, storeNames, mode, options) {
+    dbTelemetry.recordTransaction(storeNames, mode);
+    return transaction.call(this, storeNames, mode, options);
+  } as IDBDatabase['transaction'];
+}
+
 /**
  * Initializes the IndexedDB database connection and handles schema upgrades.
  * It creates the 'books', 'files', 'annotations', 'tts_cache', and 'lexicon' object stores if they don't exist.
+ * Only schema changes belong here: rewrites of existing records (e.g. the v18 columnar
+ * `tts_content` format) are data migrations, run in the background by `runDataMigrations`.
  *
  * @returns A Promise resolving to the database instance.
  */
 export const initDB = () => {
   if (!dbPromise) {
-    dbPromise = openDB<EpubLibraryDB>('EpubLibraryDB', 14, { // Upgrading to v14
+    const started = performance.now();
+    dbPromise = openDB<EpubLibraryDB>('EpubLibraryDB', 20, { // Upgrading to v20
       upgrade(db, oldVersion, _newVersion, transaction) {
         // App Metadata store (New in v14)
         if (!db.objectStoreNames.contains('app_metadata')) {
@@ -170,11 +226,31 @@ export const initDB = () => {
           booksStore.createIndex('by_addedAt', 'addedAt', { unique: false });
         }
 
+        // Library Summary store (New in v16, sort indexes in v17)
+        // Backfilled from 'books' by DBService on first read.
+        const summaryStore = db.objectStoreNames.contains('library_summary')
+          ? transaction.objectStore('library_summary')
+          : db.createObjectStore('library_summary', { keyPath: 'id' });
+        if (!summaryStore.indexNames.contains('by_addedAt')) {
+          // v16 summaries lack the sort keys; clearing them triggers the rebuild
+          summaryStore.clear();
+          summaryStore.createIndex('by_addedAt', 'addedAt', { unique: false });
+          summaryStore.createIndex('by_lastRead', 'lastRead', { unique: false });
+          summaryStore.createIndex('by_title', 'titleKey', { unique: false });
+          summaryStore.createIndex('by_author', 'authorKey', { unique: false });
+        }
+
         // Files store
         if (!db.objectStoreNames.contains('files')) {
           db.createObjectStore('files');
         }
 
+        // Thumbnails store (New in v20)
+        // Backfilled from 'books' by DBService with the library summaries.
+        if (!db.objectStoreNames.contains('thumbnails')) {
+          db.createObjectStore('thumbnails');
+        }
+
         // Covers store (New in v12)
         if (!db.objectStoreNames.contains('covers')) {
           db.createObjectStore('covers');
@@ -192,9 +268,22 @@ export const initDB = () => {
         }
 
         // TTS Cache store (New in v2)
-        if (!db.objectStoreNames.contains('tts_cache')) {
-          const cacheStore = db.createObjectStore('tts_cache', { keyPath: 'key' });
-          cacheStore.createIndex('by_lastAccessed', 'lastAccessed', { unique: false });
+        const cacheStore = db.objectStoreNames.contains('tts_cache')
+          ? transaction.objectStore('tts_cache')
+          : db.createObjectStore('tts_cache', { keyPath: 'key' });
+        // Access times moved to tts_cache_meta in v19
+        if (cacheStore.indexNames.contains('by_lastAccessed')) {
+          cacheStore.deleteIndex('by_lastAccessed');
+        }
+
+        // TTS Cache Metadata store (New in v19)
+        if (!db.objectStoreNames.contains('tts_cache_meta')) {
+          const cacheMetaStore = db.createObjectStore('tts_cache_meta', { keyPath: 'key' });
+          cacheMetaStore.createIndex('by_lastAccessed', 'lastAccessed', { unique: false });
+          // Existing segments have no metadata yet; the tts-cache-meta data migration backfills it and the byte total
+          if (oldVersion > 0) {
+            transaction.objectStore('app_metadata').delete(TTS_CACHE_BYTES_KEY);
+          }
         }
 
         // TTS Queue store (New in v5)
@@ -242,7 +331,17 @@ export const initDB = () => {
           const ttsContentStore = db.createObjectStore('tts_content', { keyPath: 'id' });
           ttsContentStore.createIndex('by_bookId', 'bookId', { unique: false });
         }
+
+        // Search Index store (New in v15)
+        if (!db.objectStoreNames.contains('search_index')) {
+          db.createObjectStore('search_index', { keyPath: 'bookId' });
+        }
       },
+    }).then((db) => {
+      // Includes any upgrade, so a slow first launch after an update shows up here
+      dbTelemetry.record('open', performance.now() - started, 0);
+      countTransactions(db);
+      return db;
     });
   }
   return dbPromise;
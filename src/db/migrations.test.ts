@@ -0,0 +1,98 @@
+import { describe, it, expect, beforeEach } from 'vitest';
+import { getDB, TTS_CACHE_BYTES_KEY } from './db';
+import { DATA_MIGRATIONS, runDataMigration, runDataMigrations, upgradeOnRead, type MigrationProgress } from './migrations';
+import { decodeTTSContent, encodeTTSContent } from './ttsContent';
+import type { TTSContent, TTSContentRecord } from '../types/db';
+
+const legacyContent = (n: number): TTSContent => ({
+  id: `book1-s${n}`,
+  bookId: 'book1',
+  sectionId: `s${n}`,
+  sentences: [{ text: `Sentence ${n}.`, cfi: `epubcfi(/6/${n})` }],
+});
+
+const ttsMigration = DATA_MIGRATIONS.find(m => m.id === 'tts-content-columnar')!;
+const cacheMigration = DATA_MIGRATIONS.find(m => m.id === 'tts-cache-meta')!;
+
+describe('data migrations', () => {
+  beforeEach(async () => {
+    const db = await getDB();
+    const tx = db.transaction(['tts_content', 'tts_cache', 'tts_cache_meta', 'app_metadata'], 'readwrite');
+    await tx.objectStore('tts_content').clear();
+    await tx.objectStore('tts_cache').clear();
+    await tx.objectStore('tts_cache_meta').clear();
+    await tx.objectStore('app_metadata').clear();
+    await tx.done;
+  });
+
+  it('rewrites legacy records in chunks and records the checkpoint', async () => {
+    const db = await getDB();
+    for (let n = 0; n < 5; n++) {
+      await db.put('tts_content', legacyContent(n) as unknown as TTSContentRecord);
+    }
+    await db.put('tts_content', encodeTTSContent(legacyContent(9)));
+
+    const progress: MigrationProgress[] = [];
+    const checkpoint = await runDataMigration(db, ttsMigration, p => progress.push(p), 2);
+
+    expect(checkpoint).toMatchObject({ processed: 6, migrated: 5, done: true });
+    expect(progress.map(p => p.processed)).toEqual([2, 4, 6]);
+    expect(progress.every(p => p.total === 6)).toBe(true);
+
+    const record = await db.get('tts_content', 'book1-s3');
+    expect(record?.format).toBeDefined();
+    expect(decodeTTSContent(record!)).toEqual(legacyContent(3));
+    expect(await db.get('app_metadata', 'migration:tts-content-columnar')).toMatchObject({ done: true });
+  });
+
+  it('resumes after the last committed chunk', async () => {
+    const db = await getDB();
+    for (let n = 0; n < 5; n++) {
+      await db.put('tts_content', legacyContent(n) as unknown as TTSContentRecord);
+    }
+
+    // Interrupt the run after its first chunk
+    await expect(runDataMigration(db, ttsMigration, () => { throw new Error('closed'); }, 2)).rejects.toThrow('closed');
+
+    const progress: MigrationProgress[] = [];
+    await runDataMigration(db, ttsMigration, p => progress.push(p), 2);
+    expect(progress.map(p => p.processed)).toEqual([4, 5]);
+    expect(progress[progress.length - 1]).toMatchObject({ migrated: 5, total: 5, done: true });
+  });
+
+  it('does nothing once a migration has completed', async () => {
+    const db = await getDB();
+    await runDataMigrations(db);
+    await db.put('tts_content', legacyContent(1) as unknown as TTSContentRecord);
+
+    const progress: MigrationProgress[] = [];
+    await runDataMigrations(db, p => progress.push(p));
+
+    expect(progress).toEqual([]);
+    expect((await db.get('tts_content', 'book1-s1')) as unknown).toEqual(legacyContent(1));
+  });
+
+  it('backfills TTS cache metadata and the byte total in chunks', async () => {
+    const db = await getDB();
+    for (let i = 0; i < 3; i++) {
+      await db.put('tts_cache', { key: `seg-${i}`, audio: new ArrayBuffer(100), createdAt: i, lastAccessed: i });
+    }
+    // Cached after the upgrade, with a newer access time than its record
+    await db.put('tts_cache_meta', { key: 'seg-2', size: 100, createdAt: 2, lastAccessed: 50 });
+
+    const checkpoint = await runDataMigration(db, cacheMigration, undefined, 2);
+
+    expect(checkpoint).toMatchObject({ processed: 3, migrated: 2, done: true });
+    expect(await db.get('tts_cache_meta', 'seg-0')).toEqual({ key: 'seg-0', size: 100, createdAt: 0, lastAccessed: 0 });
+    expect((await db.get('tts_cache_meta', 'seg-2'))?.lastAccessed).toBe(50);
+    expect(await db.get('app_metadata', TTS_CACHE_BYTES_KEY)).toBe(300);
+  });
+
+  it('upgrades unmigrated records on read', () => {
+    const legacy = legacyContent(1) as unknown as TTSContentRecord;
+    expect(decodeTTSContent(upgradeOnRead('tts_content', legacy))).toEqual(legacyContent(1));
+
+    const current = encodeTTSContent(legacyContent(2));
+    expect(upgradeOnRead('tts_content', current)).toBe(current);
+  });
+});
@@ -0,0 +1,237 @@
+import type { IDBPDatabase, IDBPTransaction, StoreNames, StoreValue } from 'idb';
+import { TTS_CACHE_BYTES_KEY, type EpubLibraryDB } from './db';
+import type { TTSContent } from '../types/db';
+import { encodeTTSContent } from './ttsContent';
+
+/** Records rewritten per transaction; small enough that foreground reads are never held up for long. */
+export const MIGRATION_CHUNK_SIZE = 200;
+
+/** Prefix of the `app_metadata` keys holding migration checkpoints. */
+const CHECKPOINT_PREFIX = 'migration:';
+
+type MigratedStore = StoreNames<EpubLibraryDB>;
+
+/** The transaction of one chunk: the migrated store, the `writes` stores and `app_metadata`. */
+export type MigrationTransaction = IDBPTransaction<EpubLibraryDB, MigratedStore[], 'readwrite'>;
+
+/**
+ * A data rewrite of one object store, run in the background after the database opens.
+ * Schema changes (stores, indexes) stay in the `upgrade` callback of `initDB`; anything that
+ * touches every record belongs here, so a large library never blocks startup.
+ *
+ * `upgrade` must be idempotent and cheap for records already in the current format:
+ * it also runs on read for records the background job has not reached yet.
+ * A migration may instead (or also) derive records in other stores with `visit`, e.g. to
+ * backfill a store added by a schema change.
+ */
+export interface DataMigration<S extends MigratedStore = MigratedStore> {
+  /** Stable identifier; the checkpoint is stored under `migration:${id}`. */
+  id: string;
+  /** Human-readable description, shown while the migration runs. */
+  description: string;
+  /** The store whose records are walked. */
+  store: S;
+  /** Other stores written by `visit` and `complete`, included in every chunk's transaction. */
+  writes?: MigratedStore[];
+  /** Records per transaction, if not {@link MIGRATION_CHUNK_SIZE} (e.g. for stores of large records). */
+  chunkSize?: number;
+  /**
+   * Upgrades one record. Omitted by migrations that leave the walked store unchanged.
+   *
+   * @param value - The stored record, possibly in a legacy format.
+   * @returns The upgraded record, or undefined if it is already current.
+   */
+  upgrade?(value: StoreValue<EpubLibraryDB, S>): StoreValue<EpubLibraryDB, S> | undefined;
+  /**
+   * Derives records in the `writes` stores from one record, in the chunk's transaction.
+   *
+   * @param value - The stored record, after `upgrade`.
+   * @param tx - The chunk's transaction.
+   * @returns Whether anything was written.
+   */
+  visit?(value: StoreValue<EpubLibraryDB, S>, tx: MigrationTransaction): Promise<boolean>;
+  /**
+   * Runs in the transaction of the last chunk, once every record has been walked.
+   *
+   * @param tx - The chunk's transaction.
+   */
+  complete?(tx: MigrationTransaction): Promise<void>;
+}
+
+/**
+ * Persisted state of a migration, written in the same transaction as each chunk,
+ * so an interrupted migration resumes after the last committed record.
+ */
+export interface MigrationCheckpoint {
+  /** Key of the last record processed. */
+  lastKey?: IDBValidKey;
+  /** Records processed so far. */
+  processed: number;
+  /** Records rewritten so far. */
+  migrated: number;
+  /** Whether the whole store has been walked. */
+  done: boolean;
+}
+
+/**
+ * Progress of a running migration.
+ */
+export interface MigrationProgress {
+  id: string;
+  description: string;
+  /** Records processed so far. */
+  processed: number;
+  /** Records rewritten so far. */
+  migrated: number;
+  /** Records in the store when the migration (re)started, plus those already processed. */
+  total: number;
+  done: boolean;
+}
+
+const ttsContentColumnar: DataMigration<'tts_content'> = {
+  id: 'tts-content-columnar',
+  description: 'Compacting text-to-speech content',
+  store: 'tts_content',
+  upgrade(value) {
+    // Records written before v18 hold a `sentences` array instead of the columnar fields
+    const legacy = value as unknown as Partial<TTSContent>;
+    return Array.isArray(legacy.sentences) ? encodeTTSContent(legacy as TTSContent) : undefined;
+  },
+};
+
+const ttsCacheMeta: DataMigration<'tts_cache'> = {
+  id: 'tts-cache-meta',
+  description: 'Indexing cached audio',
+  store: 'tts_cache',
+  writes: ['tts_cache_meta'],
+  // Each record holds a segment of audio
+  chunkSize: 50,
+  async visit({ key, audio, createdAt, lastAccessed }, tx) {
+    // Segments cached since the v19 upgrade already have metadata, possibly with a newer access time
+    const metaStore = tx.objectStore('tts_cache_meta');
+    if (await metaStore.getKey(key) !== undefined) return false;
+    await metaStore.put({ key, size: audio.byteLength, createdAt, lastAccessed });
+    return true;
+  },
+  async complete(tx) {
+    // Summed from the metadata, so segments cached or evicted while this ran are counted correctly
+    let bytes = 0;
+    let cursor = await tx.objectStore('tts_cache_meta').openCursor();
+    while (cursor) {
+      bytes += cursor.value.size;
+      cursor = await cursor.continue();
+    }
+    await tx.objectStore('app_metadata').put(bytes, TTS_CACHE_BYTES_KEY);
+  },
+};
+
+/** Registered data migrations, in the order they run. */
+export const DATA_MIGRATIONS: DataMigration[] = [
+  ttsContentColumnar as unknown as DataMigration,
+  ttsCacheMeta as unknown as DataMigration,
+];
+
+/**
+ * Brings a record read from a store up to date with every registered migration of that store.
+ * Lets readers handle records the background migration has not rewritten yet; the result is
+ * not written back.
+ *
+ * @param store - The store the record was read from.
+ * @param value - The stored record.
+ * @param migrations - The migrations to apply; the registered ones by default.
+ * @returns The current-format record.
+ */
+export function upgradeOnRead<S extends MigratedStore>(
+  store: S,
+  value: StoreValue<EpubLibraryDB, S>,
+  migrations: DataMigration[] = DATA_MIGRATIONS
+): StoreValue<EpubLibraryDB, S> {
+  let current = value;
+  for (const migration of migrations) {
+    if (migration.store !== store) continue;
+    current = (migration as unknown as DataMigration<S>).upgrade?.(current) ?? current;
+  }
+  return current;
+}
+
+/** Lets queued foreground transactions run between chunks. */
+const yieldToForeground = () => new Promise<void>(resolve => setTimeout(resolve, 0));
+
+/**
+ * Runs one migration to completion, one chunk per transaction, resuming from its checkpoint.
+ *
+ * @param db - The database connection.
+ * @param migration - The migration to run.
+ * @param onProgress - Called after every chunk.
+ * @param chunkSize - Records per transaction.
+ * @returns The final checkpoint.
+ */
+export async function runDataMigration(
+  db: IDBPDatabase<EpubLibraryDB>,
+  migration: DataMigration,
+  onProgress?: (progress: MigrationProgress) => void,
+  chunkSize: number = migration.chunkSize ?? MIGRATION_CHUNK_SIZE
+): Promise<MigrationCheckpoint> {
+  const checkpointKey = CHECKPOINT_PREFIX + migration.id;
+  let checkpoint: MigrationCheckpoint = (await db.get('app_metadata', checkpointKey))
+    ?? { processed: 0, migrated: 0, done: false };
+  if (checkpoint.done) return checkpoint;
+
+  const remaining = await db.count(migration.store,
+    checkpoint.lastKey !== undefined ? IDBKeyRange.lowerBound(checkpoint.lastKey, true) : undefined);
+  const total = checkpoint.processed + remaining;
+
+  while (!checkpoint.done) {
+    const stores = new Set<MigratedStore>([migration.store, ...(migration.writes ?? []), 'app_metadata']);
+    const tx: MigrationTransaction = db.transaction(Array.from(stores), 'readwrite');
+    const range = checkpoint.lastKey !== undefined ? IDBKeyRange.lowerBound(checkpoint.lastKey, true) : undefined;
+    const next = { ...checkpoint };
+
+    let cursor = await tx.objectStore(migration.store).openCursor(range);
+    let count = 0;
+    while (cursor && count < chunkSize) {
+      const upgraded = migration.upgrade?.(cursor.value);
+      if (upgraded !== undefined) await cursor.update(upgraded);
+      const derived = await migration.visit?.(upgraded ?? cursor.value, tx);
+      if (upgraded !== undefined || derived) next.migrated++;
+      next.lastKey = cursor.primaryKey;
+      next.processed++;
+      count++;
+      cursor = await cursor.continue();
+    }
+    next.done = !cursor;
+    if (next.done) await migration.complete?.(tx);
+
+    await tx.objectStore('app_metadata').put(next, checkpointKey);
+    await tx.done;
+    checkpoint = next;
+
+    onProgress?.({
+      id: migration.id,
+      description: migration.description,
+      processed: checkpoint.processed,
+      migrated: checkpoint.migrated,
+      total: Math.max(total, checkpoint.processed),
+      done: checkpoint.done,
+    });
+    if (!checkpoint.done) await yieldToForeground();
+  }
+  return checkpoint;
+}
+
+/**
+ * Runs every registered migration that has not completed, one after another.
+ *
+ * @param db - The database connection.
+ * @param onProgress - Called after every chunk.
+ * @param migrations - The migrations to run; the registered ones by default.
+ */
+export async function runDataMigrations(
+  db: IDBPDatabase<EpubLibraryDB>,
+  onProgress?: (progress: MigrationProgress) => void,
+  migrations: DataMigration[] = DATA_MIGRATIONS
+): Promise<void> {
+  for (const migration of migrations) {
+    await runDataMigration(db, migration, onProgress);
+  }
+}
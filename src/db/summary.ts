@@ -0,0 +1,44 @@
+import type { BookMetadata, LibrarySummary } from '../types/db';
+
+/**
+ * Version of the `library_summary` projection and the `thumbnails` store built with it.
+ * Bump it whenever {@link toLibrarySummary} changes, so `DBService` rebuilds both from `books`.
+ */
+export const LIBRARY_SUMMARY_VERSION = 1;
+
+/**
+ * Folds a title or author into the key used by the `by_title` and `by_author` indexes,
+ * so index order matches case-insensitive alphabetical order.
+ *
+ * @param value - The title or author.
+ * @returns The sort key.
+ */
+export function toSortKey(value: string | undefined): string {
+  return (value || '').trim().toLocaleLowerCase();
+}
+
+/**
+ * Projects a book record onto the fields stored in the `library_summary` store.
+ * A book that was never opened gets `lastRead: 0` rather than no value, because
+ * IndexedDB leaves records without a key out of an index and `by_lastRead` must list every book.
+ *
+ * @param book - The full book metadata.
+ * @returns The library summary for the book.
+ */
+export function toLibrarySummary(book: BookMetadata): LibrarySummary {
+  return {
+    id: book.id,
+    filename: book.filename,
+    title: book.title,
+    author: book.author,
+    addedAt: book.addedAt,
+    lastRead: book.lastRead ?? 0,
+    progress: book.progress,
+    isOffloaded: book.isOffloaded,
+    fileSize: book.fileSize,
+    totalChars: book.totalChars,
+    hasCover: Boolean(book.coverBlob),
+    titleKey: toSortKey(book.title),
+    authorKey: toSortKey(book.author),
+  };
+}
@@ -0,0 +1,86 @@
+import { describe, it, expect, vi } from 'vitest';
+import { DBTelemetry, estimateBytes, LATENCY_BUCKETS_MS } from './telemetry';
+
+describe('DBTelemetry', () => {
+  it('estimates percentiles from the histogram', () => {
+    const telemetry = new DBTelemetry();
+    for (let i = 0; i < 98; i++) telemetry.record('get', 0.1, 0);
+    telemetry.record('get', 3, 0);
+    telemetry.record('get', 40, 0);
+
+    const [stats] = telemetry.getSnapshot().operations;
+    expect(stats.calls).toBe(100);
+    expect(stats.p50Ms).toBe(0.125);
+    expect(stats.p95Ms).toBe(0.125);
+    expect(stats.p99Ms).toBe(4);
+    expect(stats.maxMs).toBe(40);
+    expect(stats.histogram).toHaveLength(LATENCY_BUCKETS_MS.length + 1);
+  });
+
+  it('uses the slowest call for the overflow bucket', () => {
+    const telemetry = new DBTelemetry();
+    telemetry.record('open', 60000, 0);
+    expect(telemetry.getSnapshot().operations[0].p99Ms).toBe(60000);
+  });
+
+  it('sorts operations by p95, slowest first', () => {
+    const telemetry = new DBTelemetry();
+    telemetry.record('fast', 0.1, 0);
+    telemetry.record('slow', 20, 0);
+    expect(telemetry.getSnapshot().operations.map(op => op.name)).toEqual(['slow', 'fast']);
+  });
+
+  it('measures synchronous, resolved and rejected calls', async () => {
+    const telemetry = new DBTelemetry();
+    expect(telemetry.measure('sync', ['abc'], () => 1)).toBe(1);
+    expect(await telemetry.measure('async', [], async () => 'ok')).toBe('ok');
+    await expect(telemetry.measure('fails', [], () => Promise.reject(new Error('no')))).rejects.toThrow('no');
+    expect(() => telemetry.measure('throws', [], () => { throw new Error('no'); })).toThrow('no');
+
+    const byName = Object.fromEntries(telemetry.getSnapshot().operations.map(op => [op.name, op]));
+    expect(byName.sync).toMatchObject({ calls: 1, errors: 0, payloadBytes: 6 + 8 });
+    expect(byName.async).toMatchObject({ calls: 1, errors: 0 });
+    expect(byName.fails).toMatchObject({ calls: 1, errors: 1 });
+    expect(byName.throws).toMatchObject({ calls: 1, errors: 1 });
+  });
+
+  it('counts transactions per store and mode', () => {
+    const telemetry = new DBTelemetry();
+    telemetry.recordTransaction('books');
+    telemetry.recordTransaction(['books', 'files'], 'readwrite');
+
+    expect(telemetry.getSnapshot().transactions).toEqual({
+      books: { readonly: 1, readwrite: 1 },
+      files: { readonly: 0, readwrite: 1 },
+    });
+
+    telemetry.reset();
+    expect(telemetry.getSnapshot()).toMatchObject({ operations: [], transactions: {} });
+  });
+});
+
+describe('estimateBytes', () => {
+  it('measures binary data exactly', () => {
+    expect(estimateBytes(new ArrayBuffer(100))).toBe(100);
+    expect(estimateBytes(new Uint16Array(10))).toBe(20);
+    expect(estimateBytes(new Blob(['hello']))).toBe(5);
+  });
+
+  it('extrapolates long arrays from a sample', () => {
+    const items = Array.from({ length: 1000 }, () => 'abcd');
+    expect(estimateBytes(items)).toBe(8000);
+  });
+
+  it('sums object keys and values', () => {
+    expect(estimateBytes({ id: 'ab', n: 1 })).toBe(4 + 4 + 2 + 8);
+    expect(estimateBytes(null)).toBe(0);
+  });
+
+  it('does not call getters', () => {
+    const getter = vi.fn(() => 'decoded');
+    const record = { id: 'ab', get sentences() { return getter(); } };
+
+    expect(estimateBytes(record)).toBe(4 + 4);
+    expect(getter).not.toHaveBeenCalled();
+  });
+});
@@ -0,0 +1,247 @@
+/**
+ * Upper bounds (ms) of the latency histogram buckets: 0.125ms doubling up to ~16s.
+ * A final overflow bucket catches anything slower.
+ */
+export const LATENCY_BUCKETS_MS = Array.from({ length: 18 }, (_, i) => 0.125 * 2 ** i);
+
+/** Arrays longer than this are estimated from a sample of their elements. */
+const SIZE_SAMPLE = 16;
+
+/** Objects nested deeper than this are not descended into. */
+const SIZE_MAX_DEPTH = 4;
+
+/**
+ * Latency and payload statistics of one instrumented operation.
+ */
+export interface OperationStats {
+  /** Operation name, e.g. `getBookMetadata` or `open`. */
+  name: string;
+  /** Completed calls. */
+  calls: number;
+  /** Calls that threw or rejected. */
+  errors: number;
+  /** Mean latency in ms. */
+  meanMs: number;
+  /** Latency percentiles in ms, estimated as the upper bound of the bucket they fall in. */
+  p50Ms: number;
+  p95Ms: number;
+  p99Ms: number;
+  /** Slowest call in ms. */
+  maxMs: number;
+  /** Estimated bytes passed in and returned, summed over all calls. */
+  payloadBytes: number;
+  /** Call counts per bucket of {@link LATENCY_BUCKETS_MS}, plus the overflow bucket. */
+  histogram: number[];
+}
+
+/**
+ * Transactions opened on one object store, by mode.
+ */
+export interface StoreTransactionStats {
+  readonly: number;
+  readwrite: number;
+}
+
+/**
+ * Snapshot of the database telemetry.
+ */
+export interface DBTelemetrySnapshot {
+  /** When collection started (or was last reset). */
+  since: number;
+  /** Per-operation statistics, slowest p95 first. */
+  operations: OperationStats[];
+  /** Transactions opened per object store. */
+  transactions: Record<string, StoreTransactionStats>;
+}
+
+interface OperationRecord {
+  calls: number;
+  errors: number;
+  totalMs: number;
+  maxMs: number;
+  payloadBytes: number;
+  histogram: Uint32Array;
+}
+
+/**
+ * Estimates the structured-clone size of a value in bytes. Blobs and buffers are exact;
+ * strings count two bytes per character; long arrays are extrapolated from a sample.
+ * Only own data properties are counted: getters are never called, so measuring a record
+ * with lazily decoded fields (e.g. `TTSContent.sentences`) does not decode them.
+ * Meant for relative comparisons between operations, not accounting.
+ *
+ * @param value - The value to measure.
+ * @returns The estimated size in bytes.
+ */
+export function estimateBytes(value: unknown): number {
+  return sizeOf(value, 0);
+}
+
+function sizeOf(value: unknown, depth: number): number {
+  if (value === null || value === undefined) return 0;
+  switch (typeof value) {
+    case 'string': return value.length * 2;
+    case 'number': return 8;
+    case 'boolean': return 4;
+    case 'object': break;
+    default: return 0;
+  }
+  if (value instanceof Blob) return value.size;
+  if (value instanceof ArrayBuffer) return value.byteLength;
+  if (ArrayBuffer.isView(value)) return value.byteLength;
+  if (depth >= SIZE_MAX_DEPTH) return 0;
+
+  if (Array.isArray(value)) {
+    if (value.length === 0) return 0;
+    const sample = Math.min(value.length, SIZE_SAMPLE);
+    let sampled = 0;
+    for (let i = 0; i < sample; i++) sampled += sizeOf(value[i], depth + 1);
+    return Math.round(sampled * (value.length / sample));
+  }
+
+  let total = 0;
+  for (const [key, descriptor] of Object.entries(Object.getOwnPropertyDescriptors(value))) {
+    if (!descriptor.enumerable || !('value' in descriptor)) continue;
+    total += key.length * 2 + sizeOf(descriptor.value, depth + 1);
+  }
+  return total;
+}
+
+function bucketIndex(durationMs: number): number {
+  for (let i = 0; i < LATENCY_BUCKETS_MS.length; i++) {
+    if (durationMs <= LATENCY_BUCKETS_MS[i]) return i;
+  }
+  return LATENCY_BUCKETS_MS.length;
+}
+
+function percentile(histogram: Uint32Array, calls: number, maxMs: number, p: number): number {
+  if (calls === 0) return 0;
+  const rank = Math.ceil((p / 100) * calls);
+  let seen = 0;
+  for (let i = 0; i < histogram.length; i++) {
+    seen += histogram[i];
+    // The overflow bucket has no upper bound; the slowest call is the best estimate
+    if (seen >= rank) return Math.min(LATENCY_BUCKETS_MS[i] ?? maxMs, maxMs);
+  }
+  return maxMs;
+}
+
+/**
+ * Collects latency histograms, payload size estimates and transaction counts for the database layer.
+ * Histograms have fixed log-scale buckets, so recording is O(1) and memory does not grow with calls.
+ */
+export class DBTelemetry {
+  private operations = new Map<string, OperationRecord>();
+  private transactions = new Map<string, StoreTransactionStats>();
+  private since = Date.now();
+
+  /**
+   * Records one completed call.
+   *
+   * @param name - The operation name.
+   * @param durationMs - How long the call took.
+   * @param payloadBytes - Estimated bytes passed in and returned.
+   * @param failed - Whether the call threw or rejected.
+   */
+  record(name: string, durationMs: number, payloadBytes: number, failed = false): void {
+    let record = this.operations.get(name);
+    if (!record) {
+      record = { calls: 0, errors: 0, totalMs: 0, maxMs: 0, payloadBytes: 0, histogram: new Uint32Array(LATENCY_BUCKETS_MS.length + 1) };
+      this.operations.set(name, record);
+    }
+    record.calls++;
+    if (failed) record.errors++;
+    record.totalMs += durationMs;
+    record.maxMs = Math.max(record.maxMs, durationMs);
+    record.payloadBytes += payloadBytes;
+    record.histogram[bucketIndex(durationMs)]++;
+  }
+
+  /**
+   * Counts a transaction against each store it spans.
+   *
+   * @param storeNames - The stores of the transaction.
+   * @param mode - The transaction mode.
+   */
+  recordTransaction(storeNames: string | ArrayLike<string>, mode: IDBTransactionMode = 'readonly'): void {
+    const names = typeof storeNames === 'string' ? [storeNames] : Array.from(storeNames);
+    for (const name of names) {
+      let stats = this.transactions.get(name);
+      if (!stats) {
+        stats = { readonly: 0, readwrite: 0 };
+        this.transactions.set(name, stats);
+      }
+      if (mode === 'readwrite') stats.readwrite++;
+      else stats.readonly++;
+    }
+  }
+
+  /**
+   * Times a call and records it. Works for both synchronous and Promise-returning functions.
+   *
+   * @param name - The operation name.
+   * @param args - The arguments, measured for the payload estimate.
+   * @param call - The call to time.
+   * @returns The call's result.
+   */
+  measure<T>(name: string, args: unknown[], call: () => T): T {
+    const started = performance.now();
+    const finish = (result: unknown, failed: boolean) => {
+      this.record(name, performance.now() - started, estimateBytes(args) + estimateBytes(result), failed);
+    };
+
+    let result: T;
+    try {
+      result = call();
+    } catch (error) {
+      finish(undefined, true);
+      throw error;
+    }
+
+    if (result instanceof Promise) {
+      return result.then(
+        (value) => { finish(value, false); return value; },
+        (error) => { finish(undefined, true); throw error; }
+      ) as T;
+    }
+    finish(result, false);
+    return result;
+  }
+
+  /**
+   * Returns the statistics collected since startup or the last reset.
+   */
+  getSnapshot(): DBTelemetrySnapshot {
+    const operations = Array.from(this.operations, ([name, record]): OperationStats => ({
+      name,
+      calls: record.calls,
+      errors: record.errors,
+      meanMs: record.calls > 0 ? record.totalMs / record.calls : 0,
+      p50Ms: percentile(record.histogram, record.calls, record.maxMs, 50),
+      p95Ms: percentile(record.histogram, record.calls, record.maxMs, 95),
+      p99Ms: percentile(record.histogram, record.calls, record.maxMs, 99),
+      maxMs: record.maxMs,
+      payloadBytes: record.payloadBytes,
+      histogram: Array.from(record.histogram),
+    }));
+    operations.sort((a, b) => b.p95Ms - a.p95Ms);
+
+    return {
+      since: this.since,
+      operations,
+      transactions: Object.fromEntries(Array.from(this.transactions, ([name, stats]) => [name, { ...stats }])),
+    };
+  }
+
+  /**
+   * Discards all collected statistics.
+   */
+  reset(): void {
+    this.operations.clear();
+    this.transactions.clear();
+    this.since = Date.now();
+  }
+}
+
+/** Telemetry shared by the connection (`db.ts`) and `DBService`. */
+export const dbTelemetry = new DBTelemetry();
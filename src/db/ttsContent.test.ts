@@ -0,0 +1,44 @@
+import { describe, it, expect } from 'vitest';
+import { decodeTTSContent, encodeTTSContent, TTS_CONTENT_FORMAT } from './ttsContent';
+import type { TTSContent } from '../types/db';
+
+const content: TTSContent = {
+  id: 'book1-chap1.html',
+  bookId: 'book1',
+  sectionId: 'chap1.html',
+  sentences: [
+    { text: 'Call me Ishmael.', cfi: 'epubcfi(/6/2!/4/2/1:0)' },
+    { text: 'Some years ago — never mind how long precisely.', cfi: 'epubcfi(/6/2!/4/2/1:17)' },
+    { text: '', cfi: 'epubcfi(/6/2!/4/4/1:0)' },
+    { text: 'Whenever I find myself growing grim about the mouth.', cfi: 'epubcfi(/6/2!/4/4/1:0)' },
+    { text: 'Short.', cfi: 'x' },
+  ],
+};
+
+describe('ttsContent codec', () => {
+  it('round-trips sentences', () => {
+    const record = encodeTTSContent(content);
+    expect(record.format).toBe(TTS_CONTENT_FORMAT);
+    expect(decodeTTSContent(record)).toEqual(content);
+  });
+
+  it('stores only the differing suffix of each CFI', () => {
+    const record = encodeTTSContent(content);
+    expect(record.cfiPrefixLengths[0]).toBe(0);
+    expect(record.cfiPrefixLengths[1]).toBe('epubcfi(/6/2!/4/2/1:'.length);
+    // An identical CFI is stored as an empty suffix
+    expect(record.cfiSuffixOffsets[4] - record.cfiSuffixOffsets[3]).toBe(0);
+    const fullLength = content.sentences.reduce((sum, s) => sum + s.cfi.length, 0);
+    expect(record.cfiSuffixes.length).toBeLessThan(fullLength / 2);
+  });
+
+  it('handles sections without sentences', () => {
+    const empty = { ...content, sentences: [] };
+    expect(decodeTTSContent(encodeTTSContent(empty)).sentences).toEqual([]);
+  });
+
+  it('decodes sentences once, on first access', () => {
+    const decoded = decodeTTSContent(encodeTTSContent(content));
+    expect(decoded.sentences).toBe(decoded.sentences);
+  });
+});
@@ -0,0 +1,94 @@
+import type { TTSContent, TTSContentRecord } from '../types/db';
+
+/** Format version of {@link TTSContentRecord}. */
+export const TTS_CONTENT_FORMAT = 2;
+
+/** Shared CFI prefix lengths are stored as 16-bit values; longer prefixes are capped. */
+const MAX_PREFIX_LENGTH = 0xffff;
+
+function sharedPrefixLength(a: string, b: string): number {
+  const limit = Math.min(a.length, b.length, MAX_PREFIX_LENGTH);
+  let length = 0;
+  while (length < limit && a.charCodeAt(length) === b.charCodeAt(length)) length++;
+  return length;
+}
+
+/**
+ * Encodes a section's sentences into the columnar `tts_content` record format.
+ * Texts are concatenated into one string with a table of offsets. Each CFI is stored as the
+ * length of the prefix it shares with the previous CFI plus the remaining suffix, since CFIs of
+ * one section differ only in their last steps. Storing a few strings and typed arrays instead of
+ * an object per sentence also makes the record far cheaper to structured-clone.
+ *
+ * @param content - The section's TTS content.
+ * @returns The record to store.
+ */
+export function encodeTTSContent(content: TTSContent): TTSContentRecord {
+  const { sentences } = content;
+  const textOffsets = new Uint32Array(sentences.length + 1);
+  const cfiPrefixLengths = new Uint16Array(sentences.length);
+  const cfiSuffixOffsets = new Uint32Array(sentences.length + 1);
+  const texts: string[] = [];
+  const cfiSuffixes: string[] = [];
+
+  let textLength = 0;
+  let suffixLength = 0;
+  let previousCfi = '';
+  sentences.forEach((sentence, i) => {
+    texts.push(sentence.text);
+    textLength += sentence.text.length;
+    textOffsets[i + 1] = textLength;
+
+    const prefixLength = sharedPrefixLength(previousCfi, sentence.cfi);
+    const suffix = sentence.cfi.slice(prefixLength);
+    cfiPrefixLengths[i] = prefixLength;
+    cfiSuffixes.push(suffix);
+    suffixLength += suffix.length;
+    cfiSuffixOffsets[i + 1] = suffixLength;
+    previousCfi = sentence.cfi;
+  });
+
+  return {
+    id: content.id,
+    bookId: content.bookId,
+    sectionId: content.sectionId,
+    format: TTS_CONTENT_FORMAT,
+    text: texts.join(''),
+    textOffsets,
+    cfiPrefixLengths,
+    cfiSuffixes: cfiSuffixes.join(''),
+    cfiSuffixOffsets,
+  };
+}
+
+function decodeSentences(record: TTSContentRecord): TTSContent['sentences'] {
+  const count = record.textOffsets.length - 1;
+  const sentences: TTSContent['sentences'] = new Array(count);
+  let previousCfi = '';
+  for (let i = 0; i < count; i++) {
+    const cfi = previousCfi.slice(0, record.cfiPrefixLengths[i])
+      + record.cfiSuffixes.slice(record.cfiSuffixOffsets[i], record.cfiSuffixOffsets[i + 1]);
+    sentences[i] = { text: record.text.slice(record.textOffsets[i], record.textOffsets[i + 1]), cfi };
+    previousCfi = cfi;
+  }
+  return sentences;
+}
+
+/**
+ * Decodes a `tts_content` record. Sentences are decoded on first access to `sentences`,
+ * so a record fetched ahead of time (e.g. a prefetched section) costs nothing until it is played.
+ *
+ * @param record - The stored record.
+ * @returns The section's TTS content.
+ */
+export function decodeTTSContent(record: TTSContentRecord): TTSContent {
+  let sentences: TTSContent['sentences'] | undefined;
+  return {
+    id: record.id,
+    bookId: record.bookId,
+    sectionId: record.sectionId,
+    get sentences() {
+      return (sentences ??= decodeSentences(record));
+    },
+  };
+}
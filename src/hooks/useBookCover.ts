@@ -0,0 +1,43 @@
+import { useEffect, useState } from 'react';
+import { dbService } from '../db/DBService';
+import type { LibrarySummary } from '../types/db';
+
+/**
+ * Loads a book's cover thumbnail on demand and exposes it as an object URL.
+ * Library summaries carry no image data, so each card fetches its own cover when it mounts
+ * (the library is listed page by page, so only cards of loaded pages do). The URL is revoked on unmount.
+ *
+ * @param book - The library summary of the book.
+ * @returns The object URL of the cover, or null while loading or if the book has none.
+ */
+export function useBookCover(book: Pick<LibrarySummary, 'id' | 'hasCover'>): string | null {
+  const [coverUrl, setCoverUrl] = useState<string | null>(null);
+  const { id, hasCover } = book;
+
+  useEffect(() => {
+    let url: string | null = null;
+    let cancelled = false;
+    setCoverUrl(null);
+
+    if (hasCover) {
+      dbService.getBookCover(id)
+        .then((blob) => {
+          if (cancelled || !blob) return;
+          url = URL.createObjectURL(blob);
+          setCoverUrl(url);
+        })
+        .catch((error) => {
+          console.error('Failed to load cover:', error);
+        });
+    }
+
+    return () => {
+      cancelled = true;
+      if (url) {
+        URL.revokeObjectURL(url);
+      }
+    };
+  }, [id, hasCover]);
+
+  return coverUrl;
+}
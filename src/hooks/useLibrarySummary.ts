@@ -0,0 +1,35 @@
+import { useEffect, useState } from 'react';
+import { dbService } from '../db/DBService';
+import type { LibrarySummary } from '../types/db';
+
+/**
+ * Loads the library summary of one book from the database.
+ * The library store only holds the loaded pages of the current listing, which need not include the book.
+ *
+ * @param id - The ID of the book, or null for none.
+ * @returns The summary, or undefined while loading, if there is no book, or if it does not exist.
+ */
+export function useLibrarySummary(id: string | null): LibrarySummary | undefined {
+  const [summary, setSummary] = useState<LibrarySummary | undefined>(undefined);
+
+  useEffect(() => {
+    let cancelled = false;
+    setSummary(undefined);
+
+    if (id) {
+      dbService.getLibrarySummaries([id])
+        .then(([book]) => {
+          if (!cancelled) setSummary(book);
+        })
+        .catch((error) => {
+          console.error('Failed to load book summary:', error);
+        });
+    }
+
+    return () => {
+      cancelled = true;
+    };
+  }, [id]);
+
+  return summary;
+}
@@ -68,8 +68,9 @@ describe('Feature Integration Tests', () => {
   beforeEach(async () => {
     // Clear DB
     const db = await getDB();
-    const tx = db.transaction(['books', 'files', 'annotations', 'sections', 'tts_content'], 'readwrite');
+    const tx = db.transaction(['books', 'library_summary', 'files', 'annotations', 'sections', 'tts_content'], 'readwrite');
     await tx.objectStore('books').clear();
+    await tx.objectStore('library_summary').clear();
     await tx.objectStore('files').clear();
     await tx.objectStore('annotations').clear();
     await tx.objectStore('sections').clear();
@@ -119,7 +120,7 @@ describe('Feature Integration Tests', () => {
     const updatedStore = useLibraryStore.getState();
     expect(updatedStore.books).toHaveLength(1);
     expect(updatedStore.books[0].title).toContain("Alice's Adventures in Wonderland");
-    expect(updatedStore.books[0].coverBlob).toBeDefined();
+    expect(updatedStore.books[0].hasCover).toBe(true);
 
     // Verify DB
     const db = await getDB();
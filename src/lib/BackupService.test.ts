@@ -17,6 +17,7 @@ vi.mock('../db/db', () => ({
 vi.mock('../db/DBService', () => ({
   dbService: {
     getBookFile: vi.fn(),
+    invalidateReadCache: vi.fn(),
   },
 }));
 
@@ -3,6 +3,7 @@ import { saveAs } from 'file-saver';
 import { dbService } from '../db/DBService';
 import type { BookMetadata, Annotation, LexiconRule, BookLocations } from '../types/db';
 import { getSanitizedBookMetadata } from '../db/validators';
+import { toLibrarySummary } from '../db/summary';
 import { getDB } from '../db/db';
 
 /**
@@ -229,7 +230,7 @@ export class BackupService {
     // --- PHASE 2: Database Operations ---
 
     // Metadata Transaction
-    const tx = db.transaction(['books', 'annotations', 'locations', 'lexicon'], 'readwrite');
+    const tx = db.transaction(['books', 'library_summary', 'annotations', 'locations', 'lexicon'], 'readwrite');
 
     // 1.1 Restore Books Metadata
     for (const book of booksToSave) {
@@ -243,12 +244,14 @@ export class BackupService {
           existingBook.currentCfi = book.currentCfi;
         }
         await tx.objectStore('books').put(existingBook);
+        await tx.objectStore('library_summary').put(toLibrarySummary(existingBook));
       } else {
         // New Book - initially mark as offloaded until we confirm file
         // If it's a light backup, it remains offloaded.
         // If it's a full backup, we will update it in the next step.
         book.isOffloaded = true;
         await tx.objectStore('books').put(book);
+        await tx.objectStore('library_summary').put(toLibrarySummary(book));
       }
       updateProgress(`Restoring metadata for ${book.title}...`);
     }
@@ -289,7 +292,7 @@ export class BackupService {
                 const arrayBuffer = await zipFile.async('arraybuffer');
 
                 // New short-lived transaction for file write
-                const fileTx = db.transaction(['books', 'files'], 'readwrite');
+                const fileTx = db.transaction(['books', 'library_summary', 'files'], 'readwrite');
                 await fileTx.objectStore('files').put(arrayBuffer, book.id);
 
                 // Update book status to not offloaded
@@ -297,12 +300,16 @@ export class BackupService {
                 if (bookRecord) {
                     bookRecord.isOffloaded = false;
                     await fileTx.objectStore('books').put(bookRecord);
+                    await fileTx.objectStore('library_summary').put(toLibrarySummary(bookRecord));
                 }
                 await fileTx.done;
             }
         }
     }
 
+    // Book records were written directly, so drop any cached copies
+    dbService.invalidateReadCache('books');
+
     onProgress?.(100, 'Restore complete!');
   }
 }
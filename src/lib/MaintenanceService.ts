@@ -1,4 +1,24 @@
-import { getDB } from '../db/db';
+import type { IDBPDatabase } from 'idb';
+import { getDB, type EpubLibraryDB } from '../db/db';
+import { SECTION_KEYED_STORES, bookKeyRange } from '../db/bookKeys';
+
+/**
+ * Counts the records of each book in a `${bookId}-${sectionId}` keyed store.
+ * Walks only the keys of the `by_bookId` index, never the records themselves.
+ */
+async function countSectionRecordsByBook(
+  db: IDBPDatabase<EpubLibraryDB>,
+  store: (typeof SECTION_KEYED_STORES)[number]
+): Promise<Map<string, number>> {
+  const counts = new Map<string, number>();
+  let cursor = await db.transaction(store).store.index('by_bookId').openKeyCursor();
+  while (cursor) {
+    const bookId = cursor.key.toString();
+    counts.set(bookId, (counts.get(bookId) ?? 0) + 1);
+    cursor = await cursor.continue();
+  }
+  return counts;
+}
 
 /**
  * Service to handle database maintenance and integrity checks.
@@ -16,6 +36,9 @@ export class MaintenanceService {
     lexicon: number;
     covers: number;
     tts_position: number;
+    search_index: number;
+    library_summary: number;
+    section_content: number;
   }> {
     const db = await getDB();
     const books = await db.getAllKeys('books');
@@ -33,14 +56,22 @@ export class MaintenanceService {
     const locationKeys = await db.getAllKeys('locations');
     const orphanedLocations = locationKeys.filter((k) => !bookIds.has(k.toString()));
 
-    // Check covers
-    const coverKeys = await db.getAllKeys('covers');
+    // Check covers and thumbnails
+    const coverKeys = [...await db.getAllKeys('covers'), ...await db.getAllKeys('thumbnails')];
     const orphanedCovers = coverKeys.filter((k) => !bookIds.has(k.toString()));
 
     // Check TTS positions
     const ttsPositionKeys = await db.getAllKeys('tts_position');
     const orphanedTTSPositions = ttsPositionKeys.filter((k) => !bookIds.has(k.toString()));
 
+    // Check search indexes
+    const searchIndexKeys = await db.getAllKeys('search_index');
+    const orphanedSearchIndexes = searchIndexKeys.filter((k) => !bookIds.has(k.toString()));
+
+    // Check library summaries
+    const summaryKeys = await db.getAllKeys('library_summary');
+    const orphanedSummaries = summaryKeys.filter((k) => !bookIds.has(k.toString()));
+
     // Check lexicon
     const rules = await db.getAll('lexicon');
     // Lexicon rules can be global (bookId is null/undefined), so only check if bookId is present
@@ -48,6 +79,15 @@ export class MaintenanceService {
       (r) => r.bookId && !bookIds.has(r.bookId)
     );
 
+    // Check per-section records (sections, TTS content, content analysis)
+    let orphanedSectionContent = 0;
+    for (const store of SECTION_KEYED_STORES) {
+      const counts = await countSectionRecordsByBook(db, store);
+      counts.forEach((count, bookId) => {
+        if (!bookIds.has(bookId)) orphanedSectionContent += count;
+      });
+    }
+
     return {
       files: orphanedFiles.length,
       annotations: orphanedAnnotations.length,
@@ -55,6 +95,9 @@ export class MaintenanceService {
       lexicon: orphanedLexicon.length,
       covers: orphanedCovers.length,
       tts_position: orphanedTTSPositions.length,
+      search_index: orphanedSearchIndexes.length,
+      library_summary: orphanedSummaries.length,
+      section_content: orphanedSectionContent,
     };
   }
 
@@ -68,11 +111,27 @@ export class MaintenanceService {
     const books = await db.getAllKeys('books');
     const bookIds = new Set(books.map((k) => k.toString()));
 
+    // Books that still own per-section records, found before the write transaction opens
+    const sectionOwners = new Map<(typeof SECTION_KEYED_STORES)[number], string[]>();
+    for (const store of SECTION_KEYED_STORES) {
+      const counts = await countSectionRecordsByBook(db, store);
+      sectionOwners.set(store, Array.from(counts.keys()).filter((bookId) => !bookIds.has(bookId)));
+    }
+
     const tx = db.transaction(
-      ['files', 'annotations', 'locations', 'lexicon', 'covers', 'tts_position'],
+      ['files', 'annotations', 'locations', 'lexicon', 'covers', 'thumbnails', 'tts_position', 'search_index', 'library_summary', ...SECTION_KEYED_STORES],
       'readwrite'
     );
 
+    // Prune per-section records with one key-range delete per orphaned book
+    const rangeDeletes: Promise<unknown>[] = [];
+    sectionOwners.forEach((orphanedBookIds, store) => {
+      for (const bookId of orphanedBookIds) {
+        rangeDeletes.push(tx.objectStore(store).delete(bookKeyRange(bookId)));
+      }
+    });
+    await Promise.all(rangeDeletes);
+
     // Prune files
     const filesStore = tx.objectStore('files');
     const fileKeys = await filesStore.getAllKeys();
@@ -101,12 +160,14 @@ export class MaintenanceService {
       }
     }
 
-    // Prune covers
-    const coversStore = tx.objectStore('covers');
-    const coverKeys = await coversStore.getAllKeys();
-    for (const key of coverKeys) {
-      if (!bookIds.has(key.toString())) {
-        await coversStore.delete(key);
+    // Prune covers and thumbnails
+    for (const store of ['covers', 'thumbnails'] as const) {
+      const coversStore = tx.objectStore(store);
+      const coverKeys = await coversStore.getAllKeys();
+      for (const key of coverKeys) {
+        if (!bookIds.has(key.toString())) {
+          await coversStore.delete(key);
+        }
       }
     }
 
@@ -119,6 +180,24 @@ export class MaintenanceService {
       }
     }
 
+    // Prune search indexes
+    const searchIndexStore = tx.objectStore('search_index');
+    const searchIndexKeys = await searchIndexStore.getAllKeys();
+    for (const key of searchIndexKeys) {
+      if (!bookIds.has(key.toString())) {
+        await searchIndexStore.delete(key);
+      }
+    }
+
+    // Prune library summaries
+    const summaryStore = tx.objectStore('library_summary');
+    const summaryKeys = await summaryStore.getAllKeys();
+    for (const key of summaryKeys) {
+      if (!bookIds.has(key.toString())) {
+        await summaryStore.delete(key);
+      }
+    }
+
     // Prune lexicon
     const lexiconStore = tx.objectStore('lexicon');
     let lexCursor = await lexiconStore.openCursor();
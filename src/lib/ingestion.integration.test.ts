@@ -2,6 +2,7 @@
 import { describe, it, expect, beforeEach, vi } from 'vitest';
 import { processEpub } from './ingestion';
 import { getDB } from '../db/db';
+import { decodeTTSContent } from '../db/ttsContent';
 import * as fs from 'fs';
 import * as path from 'path';
 
@@ -84,9 +85,10 @@ describe('ingestion integration', () => {
     // Check first batch
     const firstBatch = ttsContent[0];
     expect(firstBatch.bookId).toBe(bookId);
-    expect(firstBatch.sentences.length).toBeGreaterThan(0);
-    expect(firstBatch.sentences[0].text).toBeTruthy();
-    expect(firstBatch.sentences[0].cfi).toContain('epubcfi');
+    const { sentences } = decodeTTSContent(firstBatch);
+    expect(sentences.length).toBeGreaterThan(0);
+    expect(sentences[0].text).toBeTruthy();
+    expect(sentences[0].cfi).toContain('epubcfi');
 
     // Restore fetch
     fetchSpy.mockRestore();
@@ -2,6 +2,8 @@
 import { describe, it, expect, beforeEach, vi, afterEach } from 'vitest';
 import { processEpub, validateZipSignature } from './ingestion';
 import { getDB } from '../db/db';
+import { decodeTTSContent } from '../db/ttsContent';
+import { PositionalIndex, SEARCH_INDEX_VERSION } from './search-index';
 
 // Mock browser-image-compression
 vi.mock('browser-image-compression', () => ({
@@ -129,8 +131,28 @@ describe('ingestion', () => {
     const ttsContent = await db.getAll('tts_content');
     expect(ttsContent.length).toBeGreaterThan(0);
     expect(ttsContent[0].bookId).toBe(bookId);
-    expect(ttsContent[0].sentences.length).toBeGreaterThan(0);
-    expect(ttsContent[0].sentences[0].text).toBe('Chapter Content.');
+    const { sentences } = decodeTTSContent(ttsContent[0]);
+    expect(sentences.length).toBeGreaterThan(0);
+    expect(sentences[0].text).toBe('Chapter Content.');
+  });
+
+  it('should build the search index from the extracted chapter text', async () => {
+    const mockFile = createMockFile(true);
+    const bookId = await processEpub(mockFile);
+
+    const db = await getDB();
+    const record = await db.get('search_index', bookId);
+
+    expect(record).toBeDefined();
+    expect(record?.version).toBe(SEARCH_INDEX_VERSION);
+    expect(record?.sections).toHaveLength(1);
+    expect(record?.sections[0].href).toBe('chapter1.html');
+
+    const results = PositionalIndex.deserialize(record!).search('content', 50);
+    expect(results).toHaveLength(1);
+    expect(results[0].href).toBe('chapter1.html');
+    // Hits resolve to the sentence CFI extracted for TTS
+    expect(results[0].cfi).toBe('epubcfi(/6/2!/4/2/1:0)');
   });
 
   it('should handle missing cover gracefully', async () => {
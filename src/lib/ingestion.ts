@@ -4,8 +4,11 @@ import imageCompression from 'browser-image-compression';
 import { getDB } from '../db/db';
 import type { BookMetadata, SectionMetadata, TTSContent } from '../types/db';
 import { getSanitizedBookMetadata } from '../db/validators';
+import { toLibrarySummary } from '../db/summary';
+import { encodeTTSContent } from '../db/ttsContent';
 import type { ExtractionOptions } from './tts';
 import { extractContentOffscreen } from './offscreen-renderer';
+import { PositionalIndex, createSearchIndexRecord } from './search-index';
 
 function cheapHash(buffer: ArrayBuffer): string {
   const view = new Uint8Array(buffer);
@@ -133,6 +136,8 @@ export async function processEpub(
   const syntheticToc: NavigationItem[] = [];
   const sections: SectionMetadata[] = [];
   const ttsContentBatches: TTSContent[] = [];
+  // Build the search index from the text we already extracted, so the reader never re-extracts it
+  const searchIndex = new PositionalIndex();
   let totalChars = 0;
 
   chapters.forEach((chapter, i) => {
@@ -153,6 +158,12 @@ export async function processEpub(
       });
       totalChars += chapter.textContent.length;
 
+      // Search Index
+      if (chapter.textContent) {
+          searchIndex.addSection(chapter.href, chapter.textContent);
+          searchIndex.setSentenceLocations(chapter.href, chapter.sentences);
+      }
+
       // TTS Content
       if (chapter.sentences.length > 0) {
           ttsContentBatches.push({
@@ -199,8 +210,12 @@ export async function processEpub(
 
   const db = await getDB();
 
-  const tx = db.transaction(['books', 'files', 'sections', 'tts_content', 'covers'], 'readwrite');
+  const tx = db.transaction(['books', 'library_summary', 'thumbnails', 'files', 'sections', 'tts_content', 'covers', 'search_index'], 'readwrite');
   await tx.objectStore('books').add(finalBook);
+  await tx.objectStore('library_summary').put(toLibrarySummary(finalBook));
+  if (finalBook.coverBlob) {
+    await tx.objectStore('thumbnails').put(finalBook.coverBlob, bookId);
+  }
   await tx.objectStore('files').add(file, bookId);
 
   // Store high-res cover if it exists
@@ -217,9 +232,12 @@ export async function processEpub(
   // Store TTS content
   const ttsStore = tx.objectStore('tts_content');
   for (const batch of ttsContentBatches) {
-      await ttsStore.add(batch);
+      await ttsStore.add(encodeTTSContent(batch));
   }
 
+  // Store search index
+  await tx.objectStore('search_index').put(createSearchIndexRecord(bookId, searchIndex));
+
   await tx.done;
 
   return bookId;
@@ -0,0 +1,50 @@
+import { describe, it, expect, beforeEach } from 'vitest';
+import { SearchEngine } from './search-engine';
+import { getDB } from '../db/db';
+
+describe('SearchEngine Library Search', () => {
+    let engine: SearchEngine;
+
+    beforeEach(async () => {
+        const db = await getDB();
+        await db.clear('search_index');
+
+        engine = new SearchEngine();
+        engine.indexBook('moby', [
+            { id: '1', href: 'chap1.html', text: 'The whale. The whale. The whale.' }
+        ]);
+        engine.indexBook('alice', [
+            { id: '1', href: 'chap1.html', text: 'Alice saw a whale once.' }
+        ]);
+    });
+
+    it('should rank books by relevance and cap excerpts per book', async () => {
+        const result = await engine.searchLibrary(['alice', 'moby'], 'whale', { resultsPerBook: 2 });
+
+        expect(result.hits.map(h => h.bookId)).toEqual(['moby', 'alice']);
+        expect(result.hits[0].hitCount).toBe(3);
+        expect(result.hits[0].results).toHaveLength(2);
+        expect(result.hits[1].hitCount).toBe(1);
+        expect(result.booksSearched).toBe(2);
+        expect(result.cancelled).toBe(false);
+        expect(result.elapsedMs).toBeGreaterThanOrEqual(0);
+    });
+
+    it('should load persisted indexes and report unindexed books', async () => {
+        await engine.persistIndex('alice');
+
+        const fresh = new SearchEngine();
+        const result = await fresh.searchLibrary(['alice', 'missing'], 'alice');
+
+        expect(result.hits.map(h => h.bookId)).toEqual(['alice']);
+        expect(result.unindexed).toEqual(['missing']);
+    });
+
+    it('should mark a superseded library search as cancelled', async () => {
+        const first = engine.searchLibrary(['moby', 'alice'], 'whale');
+        const second = engine.searchLibrary(['moby'], 'whale');
+
+        expect((await first).cancelled).toBe(true);
+        expect((await second).cancelled).toBe(false);
+    });
+});
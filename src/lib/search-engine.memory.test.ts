@@ -0,0 +1,75 @@
+import { describe, it, expect, beforeEach } from 'vitest';
+import { SearchEngine } from './search-engine';
+import { getDB } from '../db/db';
+
+const chapter = (word: string) => [
+    { id: '1', href: 'chap1.html', text: `${word} `.repeat(2000) }
+];
+
+describe('SearchEngine Memory Budget', () => {
+    let engine: SearchEngine;
+    let bookBytes: number;
+
+    beforeEach(async () => {
+        const db = await getDB();
+        await db.clear('search_index');
+
+        // Measure a single book to size the budget in tests
+        const probe = new SearchEngine();
+        probe.indexBook('probe', chapter('alpha'));
+        bookBytes = probe.getMemoryStats().residentBytes;
+
+        // Room for two books, not three
+        engine = new SearchEngine(Math.floor(bookBytes * 2.5));
+    });
+
+    it('should evict the least recently used persisted book', async () => {
+        for (const [bookId, word] of [['a', 'alpha'], ['b', 'bravo'], ['c', 'gamma']]) {
+            engine.indexBook(bookId, chapter(word));
+            await engine.persistIndex(bookId);
+        }
+
+        const stats = engine.getMemoryStats();
+        expect(stats.books).toBe(2);
+        expect(stats.evictions).toBe(1);
+        expect(stats.residentBytes).toBeLessThanOrEqual(stats.budgetBytes);
+        expect(engine.search('a', 'alpha')).toHaveLength(0);
+    });
+
+    it('should keep recently searched books resident', async () => {
+        engine.indexBook('a', chapter('alpha'));
+        await engine.persistIndex('a');
+        engine.indexBook('b', chapter('bravo'));
+        await engine.persistIndex('b');
+
+        // Touch "a" so "b" becomes the eviction candidate
+        expect(engine.search('a', 'alpha').length).toBeGreaterThan(0);
+
+        engine.indexBook('c', chapter('gamma'));
+        await engine.persistIndex('c');
+
+        expect(engine.search('a', 'alpha').length).toBeGreaterThan(0);
+        expect(engine.search('b', 'bravo')).toHaveLength(0);
+    });
+
+    it('should reload evicted books from the persisted index', async () => {
+        engine.setMemoryBudget(0);
+        engine.indexBook('a', chapter('alpha'));
+        await engine.persistIndex('a');
+        engine.indexBook('b', chapter('bravo'));
+        await engine.persistIndex('b');
+
+        expect(engine.search('a', 'alpha')).toHaveLength(0);
+        expect(await engine.loadIndex('a')).toBe(true);
+        expect(engine.search('a', 'alpha').length).toBeGreaterThan(0);
+    });
+
+    it('should never evict books that are not persisted', () => {
+        engine.setMemoryBudget(0);
+        engine.indexBook('a', chapter('alpha'));
+        engine.indexBook('b', chapter('bravo'));
+
+        expect(engine.getMemoryStats().books).toBe(2);
+        expect(engine.search('a', 'alpha').length).toBeGreaterThan(0);
+    });
+});
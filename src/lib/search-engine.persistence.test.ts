@@ -0,0 +1,81 @@
+import { describe, it, expect, beforeEach } from 'vitest';
+import { SearchEngine } from './search-engine';
+import { SEARCH_INDEX_VERSION } from './search-index';
+import { getDB } from '../db/db';
+import { encodeTTSContent } from '../db/ttsContent';
+
+describe('SearchEngine Persistence', () => {
+    beforeEach(async () => {
+        const db = await getDB();
+        await db.clear('search_index');
+    });
+
+    it('should persist an index and restore it in a fresh engine', async () => {
+        const writer = new SearchEngine();
+        writer.indexBook('book-1', [
+            { id: '1', href: 'chap1.html', text: 'Call me Ishmael.' },
+            { id: '2', href: 'chap2.html', text: 'The white whale swam.' }
+        ]);
+        await writer.persistIndex('book-1');
+
+        const reader = new SearchEngine();
+        expect(reader.search('book-1', 'whale')).toHaveLength(0);
+
+        expect(await reader.loadIndex('book-1')).toBe(true);
+        const results = reader.search('book-1', 'white whale');
+        expect(results).toHaveLength(1);
+        expect(results[0].href).toBe('chap2.html');
+        expect(results[0].excerpt).toContain('white whale');
+    });
+
+    it('should report missing indexes', async () => {
+        const engine = new SearchEngine();
+        expect(await engine.loadIndex('unknown')).toBe(false);
+    });
+
+    it('should ignore indexes persisted with a different version', async () => {
+        const db = await getDB();
+        await db.put('search_index', {
+            bookId: 'stale',
+            version: SEARCH_INDEX_VERSION + 1,
+            createdAt: Date.now(),
+            vocabulary: [],
+            sections: []
+        });
+
+        const engine = new SearchEngine();
+        expect(await engine.loadIndex('stale')).toBe(false);
+    });
+
+    it('should attach sentence CFIs from tts_content and persist them', async () => {
+        const db = await getDB();
+        await db.put('tts_content', encodeTTSContent({
+            id: 'book-3-chap1.html',
+            bookId: 'book-3',
+            sectionId: 'chap1.html',
+            sentences: [
+                { text: 'Call me Ishmael.', cfi: 'epubcfi(/6/2!/4/2/1:0)' },
+                { text: 'Some years ago.', cfi: 'epubcfi(/6/2!/4/2/1:17)' }
+            ]
+        }));
+
+        const writer = new SearchEngine();
+        writer.indexBook('book-3', [{ id: '1', href: 'chap1.html', text: 'Call me Ishmael. Some years ago.' }]);
+        expect(await writer.attachSentenceLocations('book-3')).toBe(2);
+        await writer.persistIndex('book-3');
+
+        const reader = new SearchEngine();
+        await reader.loadIndex('book-3');
+        expect(reader.search('book-3', 'years')[0].cfi).toBe('epubcfi(/6/2!/4/2/1:17)');
+
+        await db.delete('tts_content', 'book-3-chap1.html');
+    });
+
+    it('should prefer the in-memory index over the persisted one', async () => {
+        const engine = new SearchEngine();
+        engine.indexBook('book-2', [{ id: '1', href: 'chap1.html', text: 'In memory.' }]);
+
+        expect(await engine.loadIndex('book-2')).toBe(true);
+        expect(engine.search('book-2', 'memory')).toHaveLength(1);
+    });
+});
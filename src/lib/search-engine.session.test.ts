@@ -0,0 +1,89 @@
+import { describe, it, expect, beforeEach, vi, afterEach } from 'vitest';
+import { SearchEngine } from './search-engine';
+import { PositionalIndex } from './search-index';
+
+describe('SearchEngine Search-As-You-Type', () => {
+    let engine: SearchEngine;
+
+    beforeEach(() => {
+        engine = new SearchEngine();
+        engine.indexBook('book', [
+            { id: '1', href: 'chap1.html', text: 'The white whale swam. The whale, white as snow. Whales and whalers.' },
+            { id: '2', href: 'chap2.html', text: 'Whaling is hard work for white men on the whale road.' }
+        ]);
+    });
+
+    afterEach(() => {
+        vi.restoreAllMocks();
+    });
+
+    it('should look the query up once and narrow on later keystrokes', async () => {
+        const lookups = vi.spyOn(PositionalIndex.prototype, 'matches');
+
+        const sources: string[] = [];
+        let last;
+        for (const query of ['wh', 'wha', 'whal', 'whale', 'whale ', 'whale r']) {
+            last = await engine.searchAsYouType('book', query);
+            sources.push(last.source);
+        }
+
+        expect(lookups).toHaveBeenCalledTimes(1);
+        expect(sources).toEqual(['index', 'narrowed', 'narrowed', 'narrowed', 'narrowed', 'narrowed']);
+        expect(last!.results.map(r => r.excerpt)).toEqual(engine.search('book', 'whale r').map(r => r.excerpt));
+    });
+
+    it('should return the same matches as a full search', async () => {
+        for (const query of ['th', 'the', 'the ', 'the w', 'the wh', 'the whale', 'the whale,']) {
+            const session = await engine.searchAsYouType('book', query);
+            const full = engine.search('book', query);
+            expect(session.results.map(r => [r.href, r.excerpt])).toEqual(full.map(r => [r.href, r.excerpt]));
+            expect(session.total).toBe(full.length);
+        }
+    });
+
+    it('should look a query up again when narrowing leaves no word-aligned match', async () => {
+        // "ha" matches "hard"; "hal" only occurs inside words ("whale")
+        await engine.searchAsYouType('book', 'ha');
+        const next = await engine.searchAsYouType('book', 'hal');
+
+        expect(next.source).toBe('index');
+        expect(next.total).toBeGreaterThan(0);
+        expect(next.total).toBe(engine.search('book', 'hal').length);
+    });
+
+    it('should serve repeated queries (e.g. backspace) from the session cache', async () => {
+        await engine.searchAsYouType('book', 'whal');
+        await engine.searchAsYouType('book', 'whale');
+
+        const back = await engine.searchAsYouType('book', 'whal');
+        expect(back.source).toBe('cache');
+        expect(back.total).toBe(engine.search('book', 'whal').length);
+    });
+
+    it('should not narrow fuzzy queries', async () => {
+        await engine.searchAsYouType('book', 'whal', { mode: 'fuzzy' });
+        const next = await engine.searchAsYouType('book', 'whale', { mode: 'fuzzy' });
+        expect(next.source).toBe('index');
+    });
+
+    it('should start a new session when the book is re-indexed', async () => {
+        await engine.searchAsYouType('book', 'wh');
+        engine.indexBook('book', [{ id: '1', href: 'chap1.html', text: 'Whales only.' }]);
+
+        const result = await engine.searchAsYouType('book', 'wha');
+        expect(result.source).toBe('index');
+        expect(result.total).toBe(1);
+    });
+
+    it('should respect the result limit but report the total', async () => {
+        const result = await engine.searchAsYouType('book', 'wh', { limit: 2 });
+        expect(result.results).toHaveLength(2);
+        expect(result.total).toBe(engine.search('book', 'wh').length);
+        expect(result.truncated).toBe(false);
+    });
+
+    it('should return nothing for blank queries or unknown books', async () => {
+        expect((await engine.searchAsYouType('book', '  ')).total).toBe(0);
+        expect((await engine.searchAsYouType('unknown', 'whale')).total).toBe(0);
+    });
+});
@@ -0,0 +1,126 @@
+import { describe, it, expect, beforeEach } from 'vitest';
+import { SearchEngine } from './search-engine';
+import type { SearchResult } from '../types/search';
+
+describe('SearchEngine Streaming', () => {
+    let engine: SearchEngine;
+
+    beforeEach(() => {
+        engine = new SearchEngine();
+        engine.indexBook('book', [
+            { id: '1', href: 'chap1.html', text: 'repeat '.repeat(120) },
+            { id: '2', href: 'chap2.html', text: 'repeat '.repeat(30) }
+        ]);
+    });
+
+    it('should stream results in pages beyond the 50-hit cap', async () => {
+        const pages: { size: number; done: boolean }[] = [];
+        const results: SearchResult[] = [];
+
+        const completed = await engine.searchStream('book', 'repeat', (page, done) => {
+            pages.push({ size: page.length, done });
+            results.push(...page);
+        }, { pageSize: 40 });
+
+        expect(completed).toBe(true);
+        expect(results).toHaveLength(150);
+        expect(pages.map(p => p.size)).toEqual([40, 40, 40, 30]);
+        expect(pages.filter(p => p.done)).toHaveLength(1);
+        expect(pages[pages.length - 1].done).toBe(true);
+        expect(results[149].href).toBe('chap2.html');
+    });
+
+    it('should mark the last full page as done instead of sending an empty one', async () => {
+        const pages: { size: number; done: boolean }[] = [];
+        await engine.searchStream('book', 'repeat', (page, done) => {
+            pages.push({ size: page.length, done });
+        }, { pageSize: 50 });
+
+        expect(pages).toEqual([
+            { size: 50, done: false },
+            { size: 50, done: false },
+            { size: 50, done: true }
+        ]);
+    });
+
+    it('should hold back the next page until the consumer asks for it', async () => {
+        const sizes: number[] = [];
+        const pending: { requestMore?: () => void } = {};
+
+        const stream = engine.searchStream('book', 'repeat', (page, done) => {
+            sizes.push(page.length);
+            if (!done) return new Promise<void>(resolve => { pending.requestMore = resolve; });
+        }, { pageSize: 100 });
+
+        await new Promise(resolve => setTimeout(resolve, 20));
+        expect(sizes).toEqual([100]);
+
+        pending.requestMore!();
+        expect(await stream).toBe(true);
+        expect(sizes).toEqual([100, 50]);
+    });
+
+    it('should stream fuzzy matches when requested', async () => {
+        const exact: SearchResult[] = [];
+        await engine.searchStream('book', 'repaet', (page) => {
+            exact.push(...page);
+        });
+        expect(exact).toHaveLength(0);
+
+        const fuzzy: SearchResult[] = [];
+        await engine.searchStream('book', 'repaet', (page) => {
+            fuzzy.push(...page);
+        }, { pageSize: 40, mode: 'fuzzy' });
+        expect(fuzzy).toHaveLength(150);
+    });
+
+    it('should respect maxResults', async () => {
+        const results: SearchResult[] = [];
+        await engine.searchStream('book', 'repeat', (page) => {
+            results.push(...page);
+        }, { pageSize: 10, maxResults: 25 });
+
+        expect(results).toHaveLength(25);
+    });
+
+    it('should abort a stream superseded by a newer query', async () => {
+        const first: SearchResult[] = [];
+        let firstDone = false;
+        const firstStream = engine.searchStream('book', 'repeat', (page, done) => {
+            first.push(...page);
+            firstDone = done;
+        }, { pageSize: 10 });
+
+        let secondDone = false;
+        const secondStream = engine.searchStream('book', 'chap', (_page, done) => {
+            secondDone = done;
+        });
+
+        expect(await firstStream).toBe(false);
+        expect(await secondStream).toBe(true);
+        expect(firstDone).toBe(false);
+        expect(first.length).toBeLessThan(150);
+        expect(secondDone).toBe(true);
+    });
+
+    it('should stop a stream when cancelled', async () => {
+        let pages = 0;
+        const stream = engine.searchStream('book', 'repeat', () => {
+            pages++;
+            engine.cancelSearch();
+        }, { pageSize: 10 });
+
+        expect(await stream).toBe(false);
+        expect(pages).toBe(1);
+    });
+
+    it('should finish immediately for unknown books', async () => {
+        const calls: [number, boolean][] = [];
+        const completed = await engine.searchStream('unknown', 'repeat', (page, done) => {
+            calls.push([page.length, done]);
+        });
+
+        expect(completed).toBe(true);
+        expect(calls).toEqual([[0, true]]);
+    });
+});
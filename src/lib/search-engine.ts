@@ -1,12 +1,86 @@
-import type { SearchResult, SearchSection } from '../types/search';
+import type { SearchResult, SearchSection, SearchOptions, SearchAsYouTypeOptions, SearchAsYouTypeResult, SearchPageCallback, SearchStreamOptions, SearchMode, LibrarySearchHit, LibrarySearchOptions, LibrarySearchShardResult, EncodedSearchSections, SearchMemoryStats } from '../types/search';
+import { PositionalIndex, SEARCH_INDEX_VERSION, createSearchIndexRecord, scoreHits, type IndexMatch } from './search-index';
+import { decodeSearchSections } from './search-transfer';
+import { getDB } from '../db/db';
+import { decodeTTSContent } from '../db/ttsContent';
+import { upgradeOnRead } from '../db/migrations';
+import { Logger } from './logger';
+
+/** Memory budget used when the device does not report its memory. */
+const DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024;
+/** Share of device memory granted to a search worker, per GB reported by `navigator.deviceMemory`. */
+const MEMORY_BUDGET_PER_GB = 16 * 1024 * 1024;
+/** Bounds for the derived memory budget. */
+const MIN_MEMORY_BUDGET = 32 * 1024 * 1024;
+const MAX_MEMORY_BUDGET = 256 * 1024 * 1024;
+
+/** Maximum number of matches kept per query in a search-as-you-type session. */
+const MAX_SESSION_MATCHES = 5000;
+/** Number of queries cached per search-as-you-type session. */
+const SESSION_CACHE_SIZE = 16;
+/** Queries with word characters can be narrowed; pure punctuation queries use the literal scan. */
+const WORD_CHARACTER = /[\p{L}\p{N}\p{M}]/u;
 
 /**
- * Provides search functionality for book content using a simple RegExp scan.
- * Handles storage of raw text and linear scanning for queries.
+ * The matches of one query in a search-as-you-type session.
+ */
+interface SessionEntry {
+    matches: IndexMatch[];
+    /** False if matching stopped at {@link MAX_SESSION_MATCHES}. */
+    complete: boolean;
+}
+
+/**
+ * State of the current search-as-you-type session: the queries typed so far for one book and mode.
+ */
+interface SearchSession {
+    bookId: string;
+    mode: SearchMode;
+    /** The index the cached matches refer to; a re-indexed book starts a new session. */
+    index: PositionalIndex;
+    /** Query -> matches, in insertion (LRU) order. */
+    entries: Map<string, SessionEntry>;
+}
+
+/**
+ * Derives the search worker memory budget from `navigator.deviceMemory` (where supported).
+ *
+ * @returns The budget in bytes.
+ */
+export function getSearchMemoryBudget(): number {
+    const deviceMemory = typeof navigator !== 'undefined'
+        ? (navigator as Navigator & { deviceMemory?: number }).deviceMemory
+        : undefined;
+    if (!deviceMemory) return DEFAULT_MEMORY_BUDGET;
+    return Math.min(MAX_MEMORY_BUDGET, Math.max(MIN_MEMORY_BUDGET, deviceMemory * MEMORY_BUDGET_PER_GB));
+}
+
+/**
+ * Provides search functionality for book content using a positional inverted index.
+ * Sections are tokenized once when added; queries are resolved via posting-list lookups.
+ *
+ * In-memory indexes are kept within a byte budget. When the budget is exceeded the least
+ * recently used books are evicted; evicted books are reloaded from their persisted index
+ * in IndexedDB on demand. Books that have not been persisted yet are never evicted.
  */
 export class SearchEngine {
-    // Stores content as: BookID -> (Href -> Text)
-    private books = new Map<string, Map<string, string>>();
+    // Stores one positional index per book: BookID -> Index. Iteration order is LRU order.
+    private books = new Map<string, PositionalIndex>();
+    // Books whose current index is persisted in IndexedDB (and can therefore be evicted)
+    private persisted = new Set<string>();
+    // Identifies the most recent streaming search; older streams stop when it changes
+    private activeSearchId = 0;
+    private memoryBudget: number;
+    private evictions = 0;
+    // The current search-as-you-type session
+    private session: SearchSession | null = null;
+
+    /**
+     * @param memoryBudget - Maximum bytes of in-memory indexes. Defaults to a budget derived from device memory.
+     */
+    constructor(memoryBudget: number = getSearchMemoryBudget()) {
+        this.memoryBudget = memoryBudget;
+    }
 
     /**
      * Initializes an empty storage for a book, clearing any previous data.
@@ -14,7 +88,104 @@ export class SearchEngine {
      * @param bookId - The unique identifier of the book.
      */
     initIndex(bookId: string) {
-        this.books.set(bookId, new Map<string, string>());
+        this.books.delete(bookId);
+        this.persisted.delete(bookId);
+        this.books.set(bookId, new PositionalIndex());
+    }
+
+    /**
+     * Sets the memory budget and evicts books until the in-memory indexes fit.
+     *
+     * @param bytes - Maximum bytes of in-memory indexes.
+     */
+    setMemoryBudget(bytes: number) {
+        this.memoryBudget = bytes;
+        this.enforceMemoryBudget();
+    }
+
+    /**
+     * Reports the memory used by the in-memory indexes.
+     */
+    getMemoryStats(): SearchMemoryStats {
+        return {
+            books: this.books.size,
+            residentBytes: this.getResidentBytes(),
+            budgetBytes: this.memoryBudget,
+            evictions: this.evictions
+        };
+    }
+
+    /**
+     * Ensures the index for a book is in memory, loading the persisted index from IndexedDB if needed.
+     * Persisted indexes written with a different format version are ignored.
+     *
+     * @param bookId - The unique identifier of the book.
+     * @returns True if the book is ready to be searched, false if it must be (re)indexed.
+     */
+    async loadIndex(bookId: string): Promise<boolean> {
+        if (this.getIndex(bookId)) return true;
+
+        try {
+            const db = await getDB();
+            const record = await db.get('search_index', bookId);
+            if (!record || record.version !== SEARCH_INDEX_VERSION) return false;
+
+            // Another call may have indexed the book while we were reading
+            if (!this.books.has(bookId)) {
+                this.books.set(bookId, PositionalIndex.deserialize(record));
+                this.persisted.add(bookId);
+                this.enforceMemoryBudget(bookId);
+            }
+            return true;
+        } catch (e) {
+            console.warn(`Failed to load persisted search index for ${bookId}`, e);
+            return false;
+        }
+    }
+
+    /**
+     * Writes the in-memory index for a book to IndexedDB so later sessions can skip extraction.
+     *
+     * @param bookId - The unique identifier of the book.
+     */
+    async persistIndex(bookId: string): Promise<void> {
+        const index = this.books.get(bookId);
+        if (!index) return;
+
+        const db = await getDB();
+        await db.put('search_index', createSearchIndexRecord(bookId, index));
+
+        // Only mark as evictable if the index was not replaced while writing
+        if (this.books.get(bookId) === index) {
+            this.persisted.add(bookId);
+            this.enforceMemoryBudget(bookId);
+        }
+    }
+
+    /**
+     * Attaches the sentence CFIs stored in `tts_content` to the in-memory index of a book,
+     * so that search results carry the CFI of the sentence they were found in.
+     * Call before {@link persistIndex} so the locations are persisted with the index.
+     *
+     * @param bookId - The unique identifier of the book.
+     * @returns The number of sentences located.
+     */
+    async attachSentenceLocations(bookId: string): Promise<number> {
+        const index = this.books.get(bookId);
+        if (!index) return 0;
+
+        try {
+            const db = await getDB();
+            const contents = await db.getAllFromIndex('tts_content', 'by_bookId', bookId);
+            let located = 0;
+            for (const content of contents) {
+                located += index.setSentenceLocations(content.sectionId, decodeTTSContent(upgradeOnRead('tts_content', content)).sentences);
+            }
+            return located;
+        } catch (e) {
+            console.warn(`Failed to load sentence locations for ${bookId}`, e);
+            return 0;
+        }
     }
 
     /**
@@ -26,17 +197,24 @@ export class SearchEngine {
     }
 
     /**
-     * Adds documents (sections) to the store for a book.
+     * Adds documents (sections) to the index for a book.
+     * Each section is tokenized and its postings are appended to the book's index.
+     * Sections may be passed as a packed buffer (see `encodeSearchSections`) so the client can
+     * transfer the content instead of cloning it.
      *
      * @param bookId - The unique identifier of the book.
-     * @param sections - An array of sections to add.
+     * @param batch - An array of sections to add, or an encoded batch.
      */
-    addDocuments(bookId: string, sections: SearchSection[]) {
-        let bookStore = this.books.get(bookId);
-        if (!bookStore) {
-            bookStore = new Map<string, string>();
-            this.books.set(bookId, bookStore);
+    addDocuments(bookId: string, batch: SearchSection[] | EncodedSearchSections) {
+        const sections = Array.isArray(batch) ? batch : decodeSearchSections(batch);
+
+        let index = this.getIndex(bookId);
+        if (!index) {
+            index = new PositionalIndex();
+            this.books.set(bookId, index);
         }
+        // The index now differs from any persisted copy
+        this.persisted.delete(bookId);
 
         // Check if the number of documents being added is excessively large
         const LARGE_INDEX_THRESHOLD = 2000;
@@ -59,9 +237,11 @@ export class SearchEngine {
             }
 
             if (text) {
-                bookStore.set(section.href, text);
+                index.addSection(section.href, text);
             }
         });
+
+        this.enforceMemoryBudget(bookId);
     }
 
     /**
@@ -77,56 +257,272 @@ export class SearchEngine {
     }
 
     /**
-     * Searches a specific book for a query string using linear RegExp scan.
+     * Searches a specific book for a query string using the positional index.
      *
      * @param bookId - The unique identifier of the book to search.
      * @param query - The text query to search for.
+     * @param options - Matching mode (exact by default).
      * @returns An array of SearchResult objects matching the query.
      */
-    search(bookId: string, query: string): SearchResult[] {
-        const bookStore = this.books.get(bookId);
-        if (!bookStore || !query.trim()) return [];
+    search(bookId: string, query: string, options: SearchOptions = {}): SearchResult[] {
+        const index = this.getIndex(bookId);
+        if (!index || !query.trim()) return [];
 
-        // Escape regex special characters to safely use the query in a RegExp
-        const escapedQuery = query.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
-        // Use a global, case-insensitive regex to find all matches
-        const regex = new RegExp(escapedQuery, 'gi');
-
-        const results: SearchResult[] = [];
         const MAX_RESULTS = 50;
+        return index.search(query, MAX_RESULTS, options.mode);
+    }
+
+    /**
+     * Runs one keystroke of a search-as-you-type session.
+     *
+     * The worker keeps the matches of recent queries for the current book and mode. A repeated
+     * query is served from that cache. In exact mode, a query that extends a previous one
+     * (e.g. "whal" -> "whale") is answered by narrowing the previous matches instead of
+     * looking the query up again, so typing a word costs about one lookup. Changing the book
+     * or mode starts a new session.
+     *
+     * @param bookId - The unique identifier of the book to search.
+     * @param query - The text typed so far.
+     * @param options - Result limit and matching mode.
+     * @returns The first results and how they were obtained.
+     */
+    async searchAsYouType(bookId: string, query: string, options: SearchAsYouTypeOptions = {}): Promise<SearchAsYouTypeResult> {
+        const limit = options.limit ?? 100;
+        const mode = options.mode ?? 'exact';
 
-        for (const [href, text] of bookStore.entries()) {
-            // Reset lastIndex for each new string because we are reusing the regex object
-            regex.lastIndex = 0;
+        if (!query.trim() || !(await this.loadIndex(bookId))) {
+            return { results: [], total: 0, truncated: false, source: 'index' };
+        }
+        const index = this.getIndex(bookId);
+        if (!index) return { results: [], total: 0, truncated: false, source: 'index' };
 
-            let match;
-            while ((match = regex.exec(text)) !== null) {
-                results.push({
-                    href: href,
-                    excerpt: this.getExcerpt(text, match.index, match[0].length)
-                });
+        if (!this.session || this.session.bookId !== bookId || this.session.mode !== mode || this.session.index !== index) {
+            this.session = { bookId, mode, index, entries: new Map() };
+        }
+        const entries = this.session.entries;
 
-                if (results.length >= MAX_RESULTS) {
-                    return results;
+        let source: SearchAsYouTypeResult['source'] = 'cache';
+        let entry = entries.get(query);
+        if (entry) {
+            // Refresh LRU position
+            entries.delete(query);
+        } else {
+            const base = mode === 'exact' ? this.findNarrowingBase(entries, query) : undefined;
+            const narrowed = base ? index.refineMatches(base.matches, query) : [];
+            // No word-aligned match left: a full lookup falls back to the literal scan
+            if (narrowed.length > 0) {
+                source = 'narrowed';
+                entry = { matches: narrowed, complete: true };
+            } else {
+                source = 'index';
+                const matches: IndexMatch[] = [];
+                const candidates = mode === 'fuzzy' ? index.rankedMatches(query, MAX_SESSION_MATCHES + 1) : index.matches(query);
+                for (const match of candidates) {
+                    if (matches.length >= MAX_SESSION_MATCHES) break;
+                    matches.push(match);
                 }
+                entry = { matches, complete: matches.length < MAX_SESSION_MATCHES };
             }
         }
 
-        return results;
+        entries.set(query, entry);
+        if (entries.size > SESSION_CACHE_SIZE) {
+            entries.delete(entries.keys().next().value as string);
+        }
+
+        return {
+            results: entry.matches.slice(0, limit).map(match => index.toResult(match)),
+            total: entry.matches.length,
+            truncated: !entry.complete,
+            source
+        };
     }
 
     /**
-     * Generates a context excerpt around the match.
+     * Ends the current search-as-you-type session and releases its cached matches.
+     */
+    endSearchSession() {
+        this.session = null;
+    }
+
+    /**
+     * Streams search results for a book in pages.
+     *
+     * Starting a new stream (or calling {@link cancelSearch}) supersedes the current one: the
+     * worker yields to its message loop between pages, and a superseded stream stops at the next
+     * page boundary without delivering further results.
      *
-     * @param text - The full text where the match was found.
-     * @param index - The start index of the match.
-     * @param length - The length of the match.
-     * @returns A string snippet surrounding the matched term.
+     * Matches are pulled lazily from the index. If `onPage` returns a promise, the next page is
+     * only produced once it settles, so a consumer can fetch further pages on demand. A page is
+     * flushed once the following match is known, so only the last page is marked `done`.
+     *
+     * @param bookId - The unique identifier of the book to search.
+     * @param query - The text query to search for.
+     * @param onPage - Receives each page of results; the final call has `done` set to true.
+     * @param options - Page size, result cap and matching mode. Fuzzy results are streamed best first.
+     * @returns True if the stream completed, false if it was superseded.
      */
-    private getExcerpt(text: string, index: number, length: number): string {
-        const start = Math.max(0, index - 40);
-        const end = Math.min(text.length, index + length + 40);
+    async searchStream(bookId: string, query: string, onPage: SearchPageCallback, options: SearchStreamOptions = {}): Promise<boolean> {
+        const searchId = ++this.activeSearchId;
+        const pageSize = options.pageSize ?? 20;
+        const maxResults = options.maxResults ?? 1000;
+
+        const isLoaded = query.trim() ? await this.loadIndex(bookId) : false;
+        if (searchId !== this.activeSearchId) return false;
+
+        const index = this.getIndex(bookId);
+        if (!isLoaded || !index) {
+            await onPage([], true);
+            return true;
+        }
+
+        const matches = options.mode === 'fuzzy' ? index.rankedMatches(query, maxResults) : index.matches(query);
+
+        let page: SearchResult[] = [];
+        let total = 0;
+        for (const match of matches) {
+            if (page.length >= pageSize) {
+                await onPage(page, false);
+                page = [];
+
+                // Let newer search requests reach the worker before continuing
+                await new Promise(resolve => setTimeout(resolve, 0));
+                if (searchId !== this.activeSearchId) return false;
+            }
+
+            page.push(index.toResult(match));
+            total++;
+            if (total >= maxResults) break;
+        }
+
+        await onPage(page, true);
+        return true;
+    }
+
+    /**
+     * Searches a set of books (this worker's shard of the library) and ranks the matching books.
+     * Indexes are loaded lazily from IndexedDB; books without a persisted index are reported
+     * as unindexed rather than extracted on the fly.
+     *
+     * @param bookIds - The books to search.
+     * @param query - The text query to search for.
+     * @param options - Number of excerpts per book and matching mode.
+     * @returns The matching books of this shard, best first, with timing information.
+     */
+    async searchLibrary(bookIds: string[], query: string, options: LibrarySearchOptions = {}): Promise<LibrarySearchShardResult> {
+        const searchId = ++this.activeSearchId;
+        const started = performance.now();
+        const resultsPerBook = options.resultsPerBook ?? 3;
+        // Counting stops here; beyond this the score is saturated anyway
+        const MAX_COUNTED_HITS = 10000;
+
+        const hits: LibrarySearchHit[] = [];
+        const unindexed: string[] = [];
+        let booksSearched = 0;
+        let cancelled = false;
+
+        if (query.trim()) {
+            for (const bookId of bookIds) {
+                const isLoaded = await this.loadIndex(bookId);
+                if (searchId !== this.activeSearchId) {
+                    cancelled = true;
+                    break;
+                }
+
+                const index = this.getIndex(bookId);
+                if (!isLoaded || !index) {
+                    unindexed.push(bookId);
+                    continue;
+                }
+                booksSearched++;
 
-        return (start > 0 ? '...' : '') + text.substring(start, end) + (end < text.length ? '...' : '');
+                const results: SearchResult[] = [];
+                let hitCount = 0;
+                const matches = options.mode === 'fuzzy' ? index.rankedMatches(query, MAX_COUNTED_HITS) : index.matches(query);
+                for (const match of matches) {
+                    if (results.length < resultsPerBook) {
+                        results.push(index.toResult(match));
+                    }
+                    if (++hitCount >= MAX_COUNTED_HITS) break;
+                }
+
+                if (hitCount > 0) {
+                    hits.push({ bookId, score: scoreHits(hitCount, index.tokenCount), hitCount, results });
+                }
+            }
+        }
+
+        hits.sort((a, b) => b.score - a.score);
+
+        return {
+            hits,
+            unindexed,
+            booksSearched,
+            elapsedMs: performance.now() - started,
+            cancelled
+        };
+    }
+
+    /**
+     * Cancels the active streaming or library search, if any.
+     */
+    cancelSearch() {
+        this.activeSearchId++;
+    }
+
+    /**
+     * Finds the longest cached query that the new query extends and whose matches are complete.
+     */
+    private findNarrowingBase(entries: Map<string, SessionEntry>, query: string): SessionEntry | undefined {
+        const needle = query.toLowerCase();
+        let best: string | undefined;
+        for (const [previous, entry] of entries) {
+            if (!entry.complete || !WORD_CHARACTER.test(previous)) continue;
+            if (previous.length >= query.length || !needle.startsWith(previous.toLowerCase())) continue;
+            if (best === undefined || previous.length > best.length) best = previous;
+        }
+        return best === undefined ? undefined : entries.get(best);
+    }
+
+    /**
+     * Returns the in-memory index of a book and marks it as most recently used.
+     */
+    private getIndex(bookId: string): PositionalIndex | undefined {
+        const index = this.books.get(bookId);
+        if (index) {
+            this.books.delete(bookId);
+            this.books.set(bookId, index);
+        }
+        return index;
+    }
+
+    private getResidentBytes(): number {
+        let bytes = 0;
+        for (const index of this.books.values()) {
+            bytes += index.byteSize;
+        }
+        return bytes;
+    }
+
+    /**
+     * Evicts least recently used, persisted books until the in-memory indexes fit the budget.
+     *
+     * @param keepBookId - A book that must stay resident (the one currently in use).
+     */
+    private enforceMemoryBudget(keepBookId?: string) {
+        let bytes = this.getResidentBytes();
+        if (bytes <= this.memoryBudget) return;
+
+        for (const [bookId, index] of this.books) {
+            if (bytes <= this.memoryBudget) break;
+            if (bookId === keepBookId || !this.persisted.has(bookId)) continue;
+
+            this.books.delete(bookId);
+            this.persisted.delete(bookId);
+            if (this.session?.bookId === bookId) this.session = null;
+            this.evictions++;
+            bytes -= index.byteSize;
+            Logger.debug('SearchEngine', `Evicted search index for ${bookId}`, { residentBytes: bytes, budget: this.memoryBudget });
+        }
     }
 }
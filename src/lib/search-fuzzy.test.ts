@@ -0,0 +1,58 @@
+import { describe, it, expect } from 'vitest';
+import { FuzzyTermLookup, boundedEditDistance, foldTerm, getMaxEdits } from './search-fuzzy';
+
+describe('foldTerm', () => {
+    it('should strip diacritics and compatibility forms', () => {
+        expect(foldTerm('Thé')).toBe('the');
+        expect(foldTerm('naïve')).toBe('naive');
+        expect(foldTerm('ﬁle')).toBe('file');
+        expect(foldTerm('Ångström')).toBe('angstrom');
+    });
+});
+
+describe('boundedEditDistance', () => {
+    it('should count edits including transpositions', () => {
+        expect(boundedEditDistance('whale', 'whale', 2)).toBe(0);
+        expect(boundedEditDistance('whale', 'whle', 2)).toBe(1);
+        expect(boundedEditDistance('whale', 'hwale', 2)).toBe(1);
+        expect(boundedEditDistance('whale', 'whales', 2)).toBe(1);
+    });
+
+    it('should give up beyond the bound', () => {
+        expect(boundedEditDistance('whale', 'ocean', 1)).toBe(2);
+        expect(boundedEditDistance('a', 'abcdef', 2)).toBe(3);
+    });
+
+    it('should scale the typo budget with term length', () => {
+        expect(getMaxEdits(3)).toBe(0);
+        expect(getMaxEdits(5)).toBe(1);
+        expect(getMaxEdits(9)).toBe(2);
+    });
+});
+
+describe('FuzzyTermLookup', () => {
+    const vocabulary = ['whale', 'whales', 'thé', 'the', 'ishmael', 'while', 'cat'];
+    const lookup = new FuzzyTermLookup(vocabulary);
+
+    it('should expand to all terms sharing a folded form', () => {
+        const expansion = lookup.expand('the', false);
+        expect(expansion.get(vocabulary.indexOf('the'))).toBe(1);
+        expect(expansion.get(vocabulary.indexOf('thé'))).toBe(1);
+    });
+
+    it('should match typos within the budget and score them below exact matches', () => {
+        const expansion = lookup.expand('ishmeal', false);
+        const score = expansion.get(vocabulary.indexOf('ishmael'));
+        expect(score).toBeGreaterThan(0);
+        expect(score).toBeLessThan(1);
+    });
+
+    it('should not tolerate typos in short terms', () => {
+        expect(lookup.expand('cot', false).size).toBe(0);
+    });
+
+    it('should match prefixes only when allowed', () => {
+        expect(lookup.expand('ishm', false).size).toBe(0);
+        expect(lookup.expand('ishm', true).has(vocabulary.indexOf('ishmael'))).toBe(true);
+    });
+});
@@ -0,0 +1,212 @@
+/** Combining marks stripped after NFKD decomposition (accents, diaeresis, etc.). */
+const COMBINING_MARKS = /\p{M}/gu;
+
+/** Padding added around a term before cutting trigrams, so short terms and word edges get grams too. */
+const TRIGRAM_PREFIX = '  ';
+const TRIGRAM_SUFFIX = ' ';
+
+/**
+ * Upper bound on the trigrams a single edit can destroy: three for an insertion, deletion or
+ * substitution, four for a transposition of adjacent characters.
+ */
+const TRIGRAMS_PER_EDIT = 4;
+
+/** Score of a vocabulary term that extends the (last) query term, relative to an exact match (1). */
+const PREFIX_SCORE = 0.9;
+
+/** Estimated fixed overhead of one map entry or array in the lookup. */
+const BYTES_PER_ENTRY = 64;
+
+/**
+ * Folds a term for diacritic- and compatibility-insensitive comparison:
+ * NFKD decomposition, removal of combining marks, then lowercasing.
+ * "Thé" and "the" fold to the same form, as do "ﬁle" and "file".
+ *
+ * @param term - The term to fold.
+ * @returns The folded form.
+ */
+export function foldTerm(term: string): string {
+    return term.normalize('NFKD').replace(COMBINING_MARKS, '').toLowerCase();
+}
+
+/**
+ * Maximum number of typos tolerated for a query term of the given length.
+ * Short terms must match exactly; otherwise almost every word would be a candidate.
+ *
+ * @param length - Length of the folded query term.
+ */
+export function getMaxEdits(length: number): number {
+    if (length < 4) return 0;
+    if (length < 7) return 1;
+    return 2;
+}
+
+/**
+ * Computes the optimal string alignment distance (Levenshtein plus adjacent transpositions),
+ * giving up as soon as it exceeds `max`.
+ *
+ * @param a - First string.
+ * @param b - Second string.
+ * @param max - The largest distance of interest.
+ * @returns The distance, or `max + 1` if it is larger than `max`.
+ */
+export function boundedEditDistance(a: string, b: string, max: number): number {
+    if (Math.abs(a.length - b.length) > max) return max + 1;
+
+    let prevPrev = new Array<number>(b.length + 1).fill(0);
+    let prev = Array.from({ length: b.length + 1 }, (_, j) => j);
+    let current = new Array<number>(b.length + 1).fill(0);
+
+    for (let i = 1; i <= a.length; i++) {
+        current[0] = i;
+        let rowMin = current[0];
+        for (let j = 1; j <= b.length; j++) {
+            const cost = a[i - 1] === b[j - 1] ? 0 : 1;
+            let value = Math.min(prev[j] + 1, current[j - 1] + 1, prev[j - 1] + cost);
+            if (i > 1 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) {
+                value = Math.min(value, prevPrev[j - 2] + 1);
+            }
+            current[j] = value;
+            if (value < rowMin) rowMin = value;
+        }
+        if (rowMin > max) return max + 1;
+        [prevPrev, prev, current] = [prev, current, prevPrev];
+    }
+
+    return prev[b.length] > max ? max + 1 : prev[b.length];
+}
+
+/**
+ * Returns the distinct padded trigrams of a folded term.
+ */
+function trigramsOf(term: string): Set<string> {
+    const padded = TRIGRAM_PREFIX + term + TRIGRAM_SUFFIX;
+    const grams = new Set<string>();
+    for (let i = 0; i + 3 <= padded.length; i++) {
+        grams.add(padded.substring(i, i + 3));
+    }
+    return grams;
+}
+
+/**
+ * A trigram index over the folded vocabulary of a {@link PositionalIndex}.
+ *
+ * Query terms are expanded to the vocabulary terms they match fuzzily: identical folded
+ * forms, forms within a small edit distance, and (for the last query term) forms that
+ * extend it. Candidates are found through shared trigrams, so only forms that can possibly
+ * be within the edit budget (q-gram lemma: each edit destroys a bounded number of trigrams) are
+ * compared, and the cost does not grow with the length of the book.
+ */
+export class FuzzyTermLookup {
+    /** Distinct folded forms. */
+    private forms: string[] = [];
+    /** Folded form -> form id. */
+    private formIds = new Map<string, number>();
+    /** Vocabulary term ids sharing each folded form. */
+    private termIdsByForm: number[][] = [];
+    /** Trigram -> ids of the forms containing it. */
+    private trigrams = new Map<string, number[]>();
+    /** Form ids sorted by form, used for prefix lookups. */
+    private sortedForms: number[];
+    private bytes = 0;
+
+    /**
+     * @param vocabulary - The index vocabulary (lowercased terms). Term ids are positions in this array.
+     */
+    constructor(vocabulary: string[]) {
+        vocabulary.forEach((term, termId) => {
+            const form = foldTerm(term);
+            let formId = this.formIds.get(form);
+            if (formId === undefined) {
+                formId = this.forms.length;
+                this.forms.push(form);
+                this.formIds.set(form, formId);
+                this.termIdsByForm.push([]);
+                this.bytes += form.length * 2 + BYTES_PER_ENTRY;
+
+                for (const gram of trigramsOf(form)) {
+                    let list = this.trigrams.get(gram);
+                    if (!list) {
+                        list = [];
+                        this.trigrams.set(gram, list);
+                        this.bytes += BYTES_PER_ENTRY;
+                    }
+                    list.push(formId);
+                    this.bytes += 8;
+                }
+            }
+            this.termIdsByForm[formId].push(termId);
+            this.bytes += 8;
+        });
+
+        this.sortedForms = this.forms
+            .map((_, id) => id)
+            .sort((a, b) => (this.forms[a] < this.forms[b] ? -1 : this.forms[a] > this.forms[b] ? 1 : 0));
+        this.bytes += this.sortedForms.length * 8;
+    }
+
+    /**
+     * Approximate heap footprint of the lookup in bytes.
+     */
+    get byteSize(): number {
+        return this.bytes;
+    }
+
+    /**
+     * Expands a folded query term to the vocabulary terms it matches, with a similarity score
+     * in (0, 1]: 1 for an identical folded form, less for prefixes and typos.
+     *
+     * @param term - The folded query term.
+     * @param allowPrefix - Whether longer terms starting with `term` also match.
+     * @returns Vocabulary term id -> score.
+     */
+    expand(term: string, allowPrefix: boolean): Map<number, number> {
+        const scores = new Map<number, number>();
+        const accept = (formId: number, score: number) => {
+            for (const termId of this.termIdsByForm[formId]) {
+                if ((scores.get(termId) ?? 0) < score) scores.set(termId, score);
+            }
+        };
+
+        const exact = this.formIds.get(term);
+        if (exact !== undefined) accept(exact, 1);
+
+        const maxEdits = getMaxEdits(term.length);
+        if (maxEdits > 0) {
+            const grams = trigramsOf(term);
+            const shared = new Map<number, number>();
+            for (const gram of grams) {
+                const list = this.trigrams.get(gram);
+                if (!list) continue;
+                for (const formId of list) {
+                    shared.set(formId, (shared.get(formId) ?? 0) + 1);
+                }
+            }
+
+            const required = grams.size - TRIGRAMS_PER_EDIT * maxEdits;
+            for (const [formId, count] of shared) {
+                if (count < required || formId === exact) continue;
+                const distance = boundedEditDistance(term, this.forms[formId], maxEdits);
+                if (distance <= maxEdits) {
+                    accept(formId, 1 - distance / (term.length + 1));
+                }
+            }
+        }
+
+        if (allowPrefix) {
+            const sorted = this.sortedForms;
+            let lo = 0;
+            let hi = sorted.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >>> 1;
+                if (this.forms[sorted[mid]] < term) lo = mid + 1;
+                else hi = mid;
+            }
+            for (let i = lo; i < sorted.length && this.forms[sorted[i]].startsWith(term); i++) {
+                if (sorted[i] !== exact) accept(sorted[i], PREFIX_SCORE);
+            }
+        }
+
+        return scores;
+    }
+}
@@ -0,0 +1,177 @@
+import { describe, it, expect, beforeEach } from 'vitest';
+import { PositionalIndex, forEachToken, createExcerpt } from './search-index';
+
+describe('forEachToken', () => {
+    it('should emit lowercased terms with offsets into the original text', () => {
+        const tokens: [string, number, number][] = [];
+        forEachToken('Call me, Ishmael!', (term, offset, length) => tokens.push([term, offset, length]));
+
+        expect(tokens).toEqual([
+            ['call', 0, 4],
+            ['me', 5, 2],
+            ['ishmael', 9, 7]
+        ]);
+    });
+
+    it('should keep offsets stable for characters that change length when lowercased', () => {
+        const tokens: [string, number][] = [];
+        forEachToken('AİB matching', (term, offset) => tokens.push([term, offset]));
+
+        expect(tokens[1]).toEqual(['matching', 4]);
+    });
+});
+
+describe('createExcerpt', () => {
+    it('should add ellipses only when text is truncated', () => {
+        expect(createExcerpt('short text', 0, 5)).toBe('short text');
+        const long = 'x'.repeat(100) + 'needle' + 'y'.repeat(100);
+        const excerpt = createExcerpt(long, 100, 6);
+        expect(excerpt.startsWith('...')).toBe(true);
+        expect(excerpt.endsWith('...')).toBe(true);
+        expect(excerpt).toContain('needle');
+    });
+});
+
+describe('PositionalIndex', () => {
+    let index: PositionalIndex;
+
+    beforeEach(() => {
+        index = new PositionalIndex();
+        index.addSection('chap1.html', 'The white whale swam. The whale, white as snow.');
+        index.addSection('chap2.html', 'Whaling is hard work for white men.');
+    });
+
+    it('should match phrases using token positions', () => {
+        const results = index.search('white whale', 50);
+        expect(results).toHaveLength(1);
+        expect(results[0].href).toBe('chap1.html');
+    });
+
+    it('should treat the last word as a prefix', () => {
+        const results = index.search('whal', 50);
+        expect(results.map(r => r.href)).toEqual(['chap1.html', 'chap1.html', 'chap2.html']);
+    });
+
+    it('should not treat words followed by punctuation as prefixes', () => {
+        expect(index.search('whale,', 50)).toHaveLength(1);
+        expect(index.search('swam.', 50)).toHaveLength(1);
+    });
+
+    it('should prefer matches at word boundaries', () => {
+        index.addSection('chap3.html', 'Women and men.');
+
+        expect(index.search('men', 50).map(r => r.href)).toEqual(['chap2.html', 'chap3.html']);
+    });
+
+    it('should fall back to matches inside words when no word starts with the query', () => {
+        index.addSection('chap3.html', 'Such happiness.');
+
+        const spans = Array.from(index.matches('hale')).map(m => index.getText(m.section).substring(m.start, m.start + m.length));
+        expect(spans).toEqual(['hale', 'hale']);
+        expect(index.search('ness', 50).map(r => r.href)).toEqual(['chap3.html']);
+    });
+
+    it('should verify the literal query including punctuation', () => {
+        // Tokens match ("whale" "white") but the literal separator differs
+        expect(index.search('whale white', 50)).toHaveLength(0);
+        expect(index.search('whale, white', 50)).toHaveLength(1);
+    });
+
+    it('should respect the limit', () => {
+        expect(index.search('white', 2)).toHaveLength(2);
+    });
+
+    it('should yield matches with offsets into the section text', () => {
+        const [match] = Array.from(index.matches('swam'));
+        expect(index.getText(match.section).substring(match.start, match.start + match.length)).toBe('swam');
+        expect(index.getHref(match.section)).toBe('chap1.html');
+    });
+
+    it('should replace a section that is added again', () => {
+        index.addSection('chap1.html', 'A completely different chapter.');
+
+        expect(index.sectionCount).toBe(2);
+        expect(index.search('swam', 50)).toHaveLength(0);
+        expect(index.search('different', 50)).toHaveLength(1);
+        // Postings of other sections are unaffected and stay in reading order
+        expect(index.search('white', 50).map(r => r.href)).toEqual(['chap2.html']);
+    });
+
+    it('should fall back to a literal scan for queries without word characters', () => {
+        index.addSection('chap3.html', 'Emoji 💩 and symbols ++ here.');
+
+        expect(index.search('💩', 50)).toHaveLength(1);
+        expect(index.search('++', 50)).toHaveLength(1);
+    });
+
+    it('should rank fuzzy matches by similarity', () => {
+        index.addSection('chap3.html', 'Thé whale and the whle.');
+
+        const matches = [...index.rankedMatches('the whale', 50)];
+        const spans = matches.map(m => index.getText(m.section).substring(m.start, m.start + m.length));
+        // Exact (accent-insensitive) matches rank ahead of the typo, then reading order
+        expect(spans).toEqual(['The whale', 'Thé whale', 'the whle']);
+        expect(index.search('the whale', 50, 'fuzzy').map(r => r.href)).toEqual(['chap1.html', 'chap3.html', 'chap3.html']);
+    });
+
+    it('should yield the best fuzzy matches first, then in reading order', () => {
+        index.addSection('chap3.html', 'Whales and whaler. ' + 'The whale. '.repeat(500));
+
+        const matches = index.rankedMatches('whale', 3);
+        // Exact matches outrank earlier prefix matches, in reading order
+        const first = matches.next().value!;
+        expect(index.getText(first.section).substring(first.start, first.start + first.length)).toBe('whale');
+        expect(first.section).toBe(0);
+        expect([...matches].map(m => m.score)).toEqual([1, 1]);
+    });
+
+    it('should report fuzzy match spans in the original text', () => {
+        index.addSection('chap3.html', 'Call me Ishmäel.');
+
+        const [match] = index.rankedMatches('ishmael', 10);
+        expect(index.getText(match.section).substring(match.start, match.start + match.length)).toBe('Ishmäel');
+        expect(match.score).toBe(1);
+    });
+
+    it('should keep exact mode accent- and typo-sensitive', () => {
+        index.addSection('chap3.html', 'Thé whle.');
+
+        expect(index.search('the', 50)).toHaveLength(2);
+        expect(index.search('whle', 50)).toHaveLength(1);
+        expect(index.search('whle', 50, 'fuzzy').length).toBeGreaterThan(1);
+    });
+
+    it('should resolve matches to the CFI of their sentence', () => {
+        const located = index.setSentenceLocations('chap1.html', [
+            { text: 'The white whale swam.', cfi: 'epubcfi(/6/2!/4/2,/1:0,/1:21)' },
+            { text: 'The whale, white as snow.', cfi: 'epubcfi(/6/2!/4/2,/1:22,/1:47)' }
+        ]);
+        expect(located).toBe(2);
+
+        const results = index.search('white', 50);
+        expect(results.map(r => r.cfi)).toEqual([
+            'epubcfi(/6/2!/4/2,/1:0,/1:21)',
+            'epubcfi(/6/2!/4/2,/1:22,/1:47)',
+            undefined
+        ]);
+    });
+
+    it('should align sentences whose text differs from the section text', () => {
+        // Sentence text may drop punctuation or change whitespace; unknown sentences are skipped
+        expect(index.setSentenceLocations('chap1.html', [
+            { text: 'Unrelated sentence', cfi: 'cfi-0' },
+            { text: 'The white whale swam', cfi: 'cfi-1' },
+            { text: 'The  whale white as snow', cfi: 'cfi-2' }
+        ])).toBe(2);
+
+        // Locations survive persistence
+        const restored = PositionalIndex.deserialize(index.serialize());
+        expect(restored.search('swam', 50)[0].cfi).toBe('cfi-1');
+        expect(restored.search('snow', 50)[0].cfi).toBe('cfi-2');
+    });
+
+    it('should return nothing for unknown terms or blank queries', () => {
+        expect(index.search('ishmael', 50)).toHaveLength(0);
+        expect(index.search('   ', 50)).toHaveLength(0);
+    });
+});
@@ -0,0 +1,782 @@
+import type { SearchMode, SearchResult, SerializedSearchIndex } from '../types/search';
+import type { SearchIndexRecord, TTSContent } from '../types/db';
+import { FuzzyTermLookup, foldTerm } from './search-fuzzy';
+
+/**
+ * Version of the serialized index format.
+ * Bump this whenever tokenization or the serialized layout changes so stale indexes are rebuilt.
+ */
+export const SEARCH_INDEX_VERSION = 2;
+
+/**
+ * Matches a single word token: a run of letters, numbers and combining marks.
+ * Everything else (whitespace, punctuation, symbols) acts as a separator.
+ */
+const TOKEN_PATTERN = /[\p{L}\p{N}\p{M}]+/gu;
+
+/** Sticky variant of {@link TOKEN_PATTERN}, used to find where a token at a known offset ends. */
+const TOKEN_AT_OFFSET = /[\p{L}\p{N}\p{M}]+/uy;
+
+/**
+ * Postings are stored as a single number per occurrence: `section * POSITION_RANGE + position`.
+ * This keeps posting lists flat, naturally sorted in reading order and cheap to merge.
+ */
+const POSITION_RANGE = 0x4000000; // 2^26 tokens per section
+
+/**
+ * How many tokens ahead of the previous sentence the aligner looks for the next sentence's
+ * first word. Bounds the work when a sentence cannot be found in the section text.
+ */
+const SENTENCE_ALIGN_WINDOW = 200;
+
+/** Number of characters shown on either side of a match in an excerpt. */
+const EXCERPT_CONTEXT = 40;
+
+/** BM25 term-frequency saturation parameter. */
+const BM25_K1 = 1.2;
+/** BM25 length normalization parameter. */
+const BM25_B = 0.75;
+/**
+ * Reference book length (in tokens) for length normalization. A fixed reference (roughly a
+ * typical novel) keeps scores comparable across search workers that each see only a shard.
+ */
+const REFERENCE_BOOK_TOKENS = 100000;
+
+/**
+ * Most vocabulary terms a fuzzy query word expands to, best scoring first. Bounds the postings
+ * visited for short prefixes, which can match a large part of the vocabulary.
+ */
+const MAX_TERM_EXPANSIONS = 64;
+
+/** Tolerance when comparing fuzzy scores, which are sums of fractions. */
+const SCORE_EPSILON = 1e-9;
+
+/** Estimated heap cost of one posting (a boxed double in a JS array). */
+const BYTES_PER_POSTING = 8;
+/** Estimated fixed overhead of one vocabulary entry (map slot, posting array header). */
+const BYTES_PER_TERM = 64;
+
+/**
+ * A single occurrence of a query inside an indexed section.
+ */
+export interface IndexMatch {
+    /** Index of the section (in insertion order). */
+    section: number;
+    /** Character offset of the match within the section text. */
+    start: number;
+    /** Length of the match in characters. */
+    length: number;
+}
+
+/**
+ * A fuzzy match, with a relevance score in (0, 1] (1 for an exact, accent-insensitive match).
+ */
+export interface RankedMatch extends IndexMatch {
+    /** Mean similarity of the matched words to the query words. */
+    score: number;
+}
+
+/**
+ * A section stored in the index, alongside its token stream.
+ */
+interface IndexedSection {
+    href: string;
+    text: string;
+    /** Vocabulary id of each token, in reading order. */
+    termIds: Uint32Array;
+    /** Character offset of each token within `text`. */
+    offsets: Uint32Array;
+    /** Start offset of each located sentence within `text`, ascending. */
+    sentenceOffsets?: Uint32Array;
+    /** CFI of each located sentence, parallel to `sentenceOffsets`. */
+    sentenceCfis?: string[];
+}
+
+/**
+ * Invokes the callback for every word token in the text.
+ * Terms are lowercased individually so that offsets always refer to the original text,
+ * even for characters whose lowercase form has a different length.
+ *
+ * @param text - The text to tokenize.
+ * @param callback - Receives the lowercased term, its offset and its length in the original text.
+ */
+export function forEachToken(text: string, callback: (term: string, offset: number, length: number) => void): void {
+    const pattern = new RegExp(TOKEN_PATTERN.source, TOKEN_PATTERN.flags);
+    let match;
+    while ((match = pattern.exec(text)) !== null) {
+        callback(match[0].toLowerCase(), match.index, match[0].length);
+    }
+}
+
+/**
+ * Returns the end offset of the token starting at `offset`.
+ */
+function tokenEnd(text: string, offset: number): number {
+    const pattern = new RegExp(TOKEN_AT_OFFSET.source, TOKEN_AT_OFFSET.flags);
+    pattern.lastIndex = offset;
+    const match = pattern.exec(text);
+    return match ? offset + match[0].length : offset;
+}
+
+/**
+ * Merges sorted posting lists lazily, in reading order.
+ */
+function* mergePostings(lists: ArrayLike<number>[]): Generator<number> {
+    const heads = lists.map(() => 0);
+    for (;;) {
+        let min = -1;
+        for (let i = 0; i < lists.length; i++) {
+            if (heads[i] < lists[i].length && (min === -1 || lists[i][heads[i]] < lists[min][heads[min]])) min = i;
+        }
+        if (min === -1) return;
+        yield lists[min][heads[min]++];
+    }
+}
+
+/**
+ * Keeps the {@link MAX_TERM_EXPANSIONS} best scoring terms of a query word's expansion.
+ */
+function topExpansions(expansion: Map<number, number>): Map<number, number> {
+    if (expansion.size <= MAX_TERM_EXPANSIONS) return expansion;
+    return new Map([...expansion].sort((a, b) => b[1] - a[1]).slice(0, MAX_TERM_EXPANSIONS));
+}
+
+const compareRanked = (a: RankedMatch, b: RankedMatch) =>
+    b.score - a.score || a.section - b.section || a.start - b.start;
+
+/**
+ * Generates a context excerpt around a match.
+ *
+ * @param text - The full text where the match was found.
+ * @param index - The start index of the match.
+ * @param length - The length of the match.
+ * @returns A string snippet surrounding the matched term.
+ */
+export function createExcerpt(text: string, index: number, length: number): string {
+    const start = Math.max(0, index - EXCERPT_CONTEXT);
+    const end = Math.min(text.length, index + length + EXCERPT_CONTEXT);
+
+    return (start > 0 ? '...' : '') + text.substring(start, end) + (end < text.length ? '...' : '');
+}
+
+/**
+ * Scores how relevant a book is for a query from its hit count and length,
+ * using BM25-style term-frequency saturation and length normalization.
+ *
+ * @param hitCount - Number of occurrences of the query in the book.
+ * @param tokenCount - Total number of tokens in the book.
+ * @returns A relevance score (higher is better).
+ */
+export function scoreHits(hitCount: number, tokenCount: number): number {
+    if (hitCount <= 0) return 0;
+    const lengthRatio = tokenCount / REFERENCE_BOOK_TOKENS;
+    return (hitCount * (BM25_K1 + 1)) / (hitCount + BM25_K1 * (1 - BM25_B + BM25_B * lengthRatio));
+}
+
+/**
+ * Wraps a serialized index into a versioned `search_index` record for a book.
+ *
+ * @param bookId - The unique identifier of the book.
+ * @param index - The index to persist.
+ * @returns The record to store.
+ */
+export function createSearchIndexRecord(bookId: string, index: PositionalIndex): SearchIndexRecord {
+    return {
+        ...index.serialize(),
+        bookId,
+        version: SEARCH_INDEX_VERSION,
+        createdAt: Date.now()
+    };
+}
+
+/**
+ * A tokenized positional inverted index over the sections of a single book.
+ *
+ * Each term maps to a posting list of (section, token position) pairs, and every section
+ * keeps its token stream (term ids + character offsets). A query is resolved by walking the
+ * posting list of its first term, checking the following token positions for the rest of the
+ * phrase, and finally verifying the literal query against the stored offset. This keeps the
+ * semantics of the previous case-insensitive literal scan for word-aligned queries while
+ * only touching the text around actual candidates.
+ */
+export class PositionalIndex {
+    private sections: IndexedSection[] = [];
+    private sectionByHref = new Map<string, number>();
+    private vocabulary: string[] = [];
+    private termIds = new Map<string, number>();
+    private postings: number[][] = [];
+    /** Term ids sorted by term, used for prefix lookups. Rebuilt lazily after writes. */
+    private sortedTerms: number[] | null = null;
+    private totalTokens = 0;
+    /** Memoized {@link byteSize}; reset whenever a section is added. */
+    private cachedByteSize: number | null = null;
+    /** Trigram index over the folded vocabulary, built on the first fuzzy query. */
+    private fuzzy: FuzzyTermLookup | null = null;
+
+    /**
+     * Restores an index from a serialized snapshot.
+     * Posting lists are rebuilt from the stored token streams in a single integer pass,
+     * so no re-tokenization is needed.
+     *
+     * @param data - The snapshot produced by {@link serialize}.
+     * @returns The restored index.
+     */
+    static deserialize(data: SerializedSearchIndex): PositionalIndex {
+        const index = new PositionalIndex();
+        index.vocabulary = data.vocabulary;
+        data.vocabulary.forEach((term, id) => {
+            index.termIds.set(term, id);
+            index.postings.push([]);
+        });
+
+        data.sections.forEach((section, sectionIndex) => {
+            const base = sectionIndex * POSITION_RANGE;
+            for (let position = 0; position < section.termIds.length; position++) {
+                index.postings[section.termIds[position]].push(base + position);
+            }
+            index.totalTokens += section.termIds.length;
+            index.sections.push({
+                href: section.href,
+                text: section.text,
+                termIds: section.termIds,
+                offsets: section.offsets,
+                sentenceOffsets: section.sentenceOffsets,
+                sentenceCfis: section.sentenceCfis
+            });
+            index.sectionByHref.set(section.href, sectionIndex);
+        });
+
+        return index;
+    }
+
+    /**
+     * Produces a structured-clone friendly snapshot of the index for persistence.
+     */
+    serialize(): SerializedSearchIndex {
+        return {
+            vocabulary: this.vocabulary.slice(),
+            sections: this.sections.map(section => ({
+                href: section.href,
+                text: section.text,
+                termIds: section.termIds,
+                offsets: section.offsets,
+                sentenceOffsets: section.sentenceOffsets,
+                sentenceCfis: section.sentenceCfis
+            }))
+        };
+    }
+
+    /**
+     * The number of sections in the index.
+     */
+    get sectionCount(): number {
+        return this.sections.length;
+    }
+
+    /**
+     * The total number of tokens across all sections.
+     */
+    get tokenCount(): number {
+        return this.totalTokens;
+    }
+
+    /**
+     * Approximate heap footprint of the index in bytes: section text (UTF-16), token streams,
+     * posting lists and vocabulary. Used by the search worker to enforce its memory budget.
+     */
+    get byteSize(): number {
+        if (this.cachedByteSize === null) {
+            let bytes = this.totalTokens * BYTES_PER_POSTING;
+            for (const section of this.sections) {
+                bytes += section.text.length * 2 + section.termIds.byteLength + section.offsets.byteLength;
+                if (section.sentenceOffsets && section.sentenceCfis) {
+                    bytes += section.sentenceOffsets.byteLength;
+                    for (const cfi of section.sentenceCfis) bytes += cfi.length * 2;
+                }
+            }
+            for (const term of this.vocabulary) {
+                bytes += term.length * 2 + BYTES_PER_TERM;
+            }
+            if (this.fuzzy) bytes += this.fuzzy.byteSize;
+            this.cachedByteSize = bytes;
+        }
+        return this.cachedByteSize;
+    }
+
+    /**
+     * Adds (or replaces) a section in the index.
+     *
+     * @param href - The section href.
+     * @param text - The plain text content of the section.
+     */
+    addSection(href: string, text: string) {
+        const existing = this.sectionByHref.get(href);
+        const sectionIndex = existing ?? this.sections.length;
+
+        if (existing !== undefined) {
+            this.removePostings(existing);
+            this.totalTokens -= this.sections[existing].termIds.length;
+        }
+
+        const ids: number[] = [];
+        const offsets: number[] = [];
+        forEachToken(text, (term, offset) => {
+            const termId = this.getOrCreateTermId(term);
+            this.postings[termId].push(sectionIndex * POSITION_RANGE + ids.length);
+            ids.push(termId);
+            offsets.push(offset);
+        });
+
+        if (ids.length >= POSITION_RANGE) {
+            console.warn(`Search Index Warning: Section ${href} has ${ids.length} tokens; positions beyond ${POSITION_RANGE} may be unreliable.`);
+        }
+
+        this.totalTokens += ids.length;
+        this.cachedByteSize = null;
+
+        const section: IndexedSection = {
+            href,
+            text,
+            termIds: Uint32Array.from(ids),
+            offsets: Uint32Array.from(offsets)
+        };
+
+        if (existing !== undefined) {
+            this.sections[existing] = section;
+            // Re-added postings were appended out of order; restore reading order.
+            for (const termId of new Set(ids)) {
+                this.postings[termId].sort((a, b) => a - b);
+            }
+        } else {
+            this.sections.push(section);
+            this.sectionByHref.set(href, sectionIndex);
+        }
+    }
+
+    /**
+     * Returns the href of a section.
+     *
+     * @param section - The section index.
+     */
+    getHref(section: number): string {
+        return this.sections[section].href;
+    }
+
+    /**
+     * Returns the plain text of a section.
+     *
+     * @param section - The section index.
+     */
+    getText(section: number): string {
+        return this.sections[section].text;
+    }
+
+    /**
+     * Builds an excerpt for a match returned by {@link matches}.
+     *
+     * @param match - The match to describe.
+     */
+    excerpt(match: IndexMatch): string {
+        return createExcerpt(this.sections[match.section].text, match.start, match.length);
+    }
+
+    /**
+     * Attaches sentence locations (as stored in `tts_content`) to a section, building its
+     * offset-to-CFI table.
+     *
+     * Sentence text is sanitized and may differ from the section text in whitespace or
+     * punctuation, so sentences are aligned on the token stream: each sentence is anchored
+     * at the next occurrence of its first word after the previous sentence. Sentences that
+     * cannot be found nearby are skipped; their matches resolve to the preceding sentence.
+     *
+     * @param href - The section href.
+     * @param sentences - The section's sentences, in reading order.
+     * @returns The number of sentences located.
+     */
+    setSentenceLocations(href: string, sentences: TTSContent['sentences']): number {
+        const sectionIndex = this.sectionByHref.get(href);
+        if (sectionIndex === undefined) return 0;
+        const section = this.sections[sectionIndex];
+
+        const offsets: number[] = [];
+        const cfis: string[] = [];
+        let cursor = 0;
+        for (const sentence of sentences) {
+            const terms: string[] = [];
+            forEachToken(sentence.text, term => terms.push(term));
+            if (terms.length === 0) continue;
+
+            const termId = this.termIds.get(terms[0]);
+            if (termId === undefined) continue;
+
+            const windowEnd = Math.min(section.termIds.length, cursor + SENTENCE_ALIGN_WINDOW);
+            let position = cursor;
+            while (position < windowEnd && section.termIds[position] !== termId) position++;
+            if (position >= windowEnd) continue;
+
+            offsets.push(section.offsets[position]);
+            cfis.push(sentence.cfi);
+            cursor = position + terms.length;
+        }
+
+        section.sentenceOffsets = Uint32Array.from(offsets);
+        section.sentenceCfis = cfis;
+        this.cachedByteSize = null;
+        return cfis.length;
+    }
+
+    /**
+     * Resolves a match to the CFI of the sentence containing it.
+     *
+     * @param match - The match to locate.
+     * @returns The sentence CFI, or undefined if the section has no sentence locations.
+     */
+    cfiAt(match: IndexMatch): string | undefined {
+        const { sentenceOffsets, sentenceCfis } = this.sections[match.section];
+        if (!sentenceOffsets || !sentenceCfis || sentenceOffsets.length === 0) return undefined;
+
+        // Last sentence starting at or before the match
+        let lo = 0;
+        let hi = sentenceOffsets.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >>> 1;
+            if (sentenceOffsets[mid] <= match.start) lo = mid + 1;
+            else hi = mid;
+        }
+        return sentenceCfis[Math.max(0, lo - 1)];
+    }
+
+    /**
+     * Converts a match into a search result with its excerpt and, where known, its sentence CFI.
+     *
+     * @param match - The match to convert.
+     */
+    toResult(match: IndexMatch): SearchResult {
+        const result: SearchResult = {
+            href: this.sections[match.section].href,
+            excerpt: this.excerpt(match)
+        };
+        const cfi = this.cfiAt(match);
+        if (cfi) result.cfi = cfi;
+        return result;
+    }
+
+    /**
+     * Lazily enumerates all occurrences of the query in reading order.
+     *
+     * Queries are matched case-insensitively through the index, starting at a word boundary. The
+     * last word of the query may be a prefix ("whal" matches "whale"). When that finds nothing,
+     * and for queries without word characters (e.g. emoji or punctuation), the stored text is
+     * scanned literally instead, so a word fragment still finds the words containing it
+     * ("ness" matches "happiness").
+     *
+     * @param query - The text query.
+     */
+    *matches(query: string): Generator<IndexMatch> {
+        if (!query.trim()) return;
+
+        let found = false;
+        for (const match of this.indexedMatches(query)) {
+            found = true;
+            yield match;
+        }
+        if (!found) yield* this.scan(query);
+    }
+
+    /**
+     * Enumerates the word-aligned occurrences of the query found through the posting lists.
+     * Yields nothing for queries without word characters.
+     *
+     * @param query - The text query.
+     */
+    private *indexedMatches(query: string): Generator<IndexMatch> {
+
+        const terms: string[] = [];
+        const termOffsets: number[] = [];
+        let queryEnd = 0;
+        forEachToken(query, (term, offset, length) => {
+            terms.push(term);
+            termOffsets.push(offset);
+            queryEnd = offset + length;
+        });
+
+        if (terms.length === 0) return;
+
+        const last = terms.length - 1;
+        // The final word is open-ended only if the query actually ends with it.
+        const lastIsPrefix = queryEnd === query.length;
+        const lead = termOffsets[0];
+        const needle = query.toLowerCase();
+
+        const exactIds: number[] = [];
+        for (let i = 0; i < terms.length; i++) {
+            if (i === last && lastIsPrefix) break;
+            const id = this.termIds.get(terms[i]);
+            if (id === undefined) return;
+            exactIds.push(id);
+        }
+
+        let candidates: ArrayLike<number>;
+        if (last === 0 && lastIsPrefix) {
+            candidates = this.prefixPostings(terms[0]);
+        } else {
+            candidates = this.postings[exactIds[0]];
+        }
+
+        for (let c = 0; c < candidates.length; c++) {
+            const posting = candidates[c];
+            const sectionIndex = Math.floor(posting / POSITION_RANGE);
+            const position = posting % POSITION_RANGE;
+            const section = this.sections[sectionIndex];
+
+            if (position + last >= section.termIds.length) continue;
+
+            let phraseMatches = true;
+            for (let i = 1; i <= last; i++) {
+                const termId = section.termIds[position + i];
+                if (i === last && lastIsPrefix) {
+                    if (!this.vocabulary[termId].startsWith(terms[i])) phraseMatches = false;
+                } else if (termId !== exactIds[i]) {
+                    phraseMatches = false;
+                }
+                if (!phraseMatches) break;
+            }
+            if (!phraseMatches) continue;
+
+            // Verify the literal query (including punctuation and spacing) at the stored offset.
+            const start = section.offsets[position] - lead;
+            if (start < 0) continue;
+            if (section.text.substring(start, start + query.length).toLowerCase() !== needle) continue;
+
+            yield { section: sectionIndex, start, length: query.length };
+        }
+    }
+
+    /**
+     * Searches the index and returns up to `limit` results: in reading order for exact
+     * searches, best first for fuzzy searches.
+     *
+     * @param query - The text query.
+     * @param limit - The maximum number of results.
+     * @param mode - The matching mode.
+     */
+    search(query: string, limit: number, mode: SearchMode = 'exact'): SearchResult[] {
+        const matches = mode === 'fuzzy' ? this.rankedMatches(query, limit) : this.matches(query);
+        const results: SearchResult[] = [];
+        for (const match of matches) {
+            results.push(this.toResult(match));
+            if (results.length >= limit) break;
+        }
+        return results;
+    }
+
+    /**
+     * Narrows the exact matches of a query down to the matches of a longer query that extends it.
+     *
+     * Every exact match of `query` starts at the same offset as a match of `previous` (its
+     * literal text begins with `previous`), so re-verifying the literal text at the previous
+     * match offsets is enough; no posting list is touched. Only valid when `previous` contains
+     * word characters. An empty result is not conclusive: `query` may still occur inside words,
+     * which only the literal scan of {@link matches} finds.
+     *
+     * @param matches - All exact matches of `previous`, in reading order.
+     * @param query - The extended query; must start with `previous` (case-insensitively).
+     * @returns The matches of `query`, in reading order.
+     */
+    refineMatches(matches: IndexMatch[], query: string): IndexMatch[] {
+        const needle = query.toLowerCase();
+        const refined: IndexMatch[] = [];
+        for (const match of matches) {
+            const text = this.sections[match.section].text;
+            if (text.substring(match.start, match.start + query.length).toLowerCase() === needle) {
+                refined.push({ section: match.section, start: match.start, length: query.length });
+            }
+        }
+        return refined;
+    }
+
+    /**
+     * Finds approximate occurrences of the query, best first.
+     *
+     * Every query word is folded (see `foldTerm`) and expanded through the trigram lookup to
+     * the vocabulary terms within its typo budget; the last word may also be a prefix. A match
+     * is a run of consecutive tokens that each belong to the expansion of the corresponding
+     * query word. Matches are ranked by mean word similarity, then reading order. Queries
+     * without word characters fall back to the literal scan.
+     *
+     * Matches are produced lazily. The terms the first word expands to are walked in tiers of
+     * equal score, best first, each tier's postings merged in reading order. After a tier,
+     * every match scoring above the best any later tier can reach is final and is yielded; a
+     * tier's walk stops once it has found enough matches at its best possible score. Each word
+     * expands to at most {@link MAX_TERM_EXPANSIONS} terms. So a common query word costs the
+     * postings needed for `limit` results, not all of them, and a streaming caller can stop
+     * between tiers.
+     *
+     * @param query - The text query.
+     * @param limit - The maximum number of matches.
+     */
+    *rankedMatches(query: string, limit: number): Generator<RankedMatch> {
+        if (!query.trim() || limit <= 0) return;
+
+        const terms: string[] = [];
+        let queryEnd = 0;
+        forEachToken(query, (term, offset, length) => {
+            const folded = foldTerm(term);
+            if (folded) terms.push(folded);
+            queryEnd = offset + length;
+        });
+
+        if (terms.length === 0) {
+            let count = 0;
+            for (const match of this.scan(query)) {
+                yield { ...match, score: 1 };
+                if (++count >= limit) return;
+            }
+            return;
+        }
+
+        if (!this.fuzzy) {
+            this.fuzzy = new FuzzyTermLookup(this.vocabulary);
+            this.cachedByteSize = null;
+        }
+        const lookup = this.fuzzy;
+
+        const last = terms.length - 1;
+        const lastIsPrefix = queryEnd === query.length;
+        const expansions = terms.map((term, i) => topExpansions(lookup.expand(term, i === last && lastIsPrefix)));
+        if (expansions.some(expansion => expansion.size === 0)) return;
+
+        // The most the words after the first can add to a match's score
+        let restBest = 0;
+        for (let i = 1; i <= last; i++) restBest += Math.max(...expansions[i].values());
+
+        // Terms of the first word grouped by score, best first
+        const tiers = new Map<number, number[]>();
+        for (const [termId, score] of expansions[0]) {
+            const tier = tiers.get(score);
+            if (tier) tier.push(termId);
+            else tiers.set(score, [termId]);
+        }
+        const tierScores = [...tiers.keys()].sort((a, b) => b - a);
+
+        let pending: RankedMatch[] = [];
+        let remaining = limit;
+        for (let t = 0; t < tierScores.length && remaining > 0; t++) {
+            const best = (tierScores[t] + restBest) / terms.length;
+            let atBest = 0;
+
+            for (const posting of mergePostings(tiers.get(tierScores[t])!.map(termId => this.postings[termId]))) {
+                const sectionIndex = Math.floor(posting / POSITION_RANGE);
+                const position = posting % POSITION_RANGE;
+                const section = this.sections[sectionIndex];
+                if (position + last >= section.termIds.length) continue;
+
+                let score = tierScores[t];
+                for (let i = 1; i <= last && score > 0; i++) {
+                    const wordScore = expansions[i].get(section.termIds[position + i]);
+                    score = wordScore === undefined ? 0 : score + wordScore;
+                }
+                if (score === 0) continue;
+
+                const start = section.offsets[position];
+                const end = tokenEnd(section.text, section.offsets[position + last]);
+                const match = { section: sectionIndex, start, length: end - start, score: score / terms.length };
+                pending.push(match);
+
+                // Later postings of this tier come after these in reading order and score no higher
+                if (match.score >= best - SCORE_EPSILON && ++atBest >= remaining) break;
+            }
+
+            // No later tier can reach this; pending matches above it are final
+            const nextBest = t + 1 < tierScores.length ? (tierScores[t + 1] + restBest) / terms.length : -Infinity;
+            pending.sort(compareRanked);
+            let ready = 0;
+            while (ready < pending.length && ready < remaining && pending[ready].score > nextBest + SCORE_EPSILON) {
+                yield pending[ready++];
+            }
+            remaining -= ready;
+            // Matches ranked below `remaining` others can never be returned
+            pending = pending.slice(ready, ready + remaining);
+        }
+    }
+
+    private getOrCreateTermId(term: string): number {
+        let termId = this.termIds.get(term);
+        if (termId === undefined) {
+            termId = this.vocabulary.length;
+            this.vocabulary.push(term);
+            this.termIds.set(term, termId);
+            this.postings.push([]);
+            this.sortedTerms = null;
+            this.fuzzy = null;
+        }
+        return termId;
+    }
+
+    private removePostings(sectionIndex: number) {
+        const lower = sectionIndex * POSITION_RANGE;
+        const upper = lower + POSITION_RANGE;
+        for (const termId of new Set(this.sections[sectionIndex].termIds)) {
+            this.postings[termId] = this.postings[termId].filter(p => p < lower || p >= upper);
+        }
+    }
+
+    /**
+     * Collects the merged posting list of every term starting with `prefix`, in reading order.
+     */
+    private prefixPostings(prefix: string): ArrayLike<number> {
+        if (!this.sortedTerms) {
+            this.sortedTerms = this.vocabulary
+                .map((_, id) => id)
+                .sort((a, b) => (this.vocabulary[a] < this.vocabulary[b] ? -1 : this.vocabulary[a] > this.vocabulary[b] ? 1 : 0));
+        }
+        const sorted = this.sortedTerms;
+
+        // Binary search for the first term >= prefix
+        let lo = 0;
+        let hi = sorted.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >>> 1;
+            if (this.vocabulary[sorted[mid]] < prefix) lo = mid + 1;
+            else hi = mid;
+        }
+
+        const lists: number[][] = [];
+        let total = 0;
+        for (let i = lo; i < sorted.length && this.vocabulary[sorted[i]].startsWith(prefix); i++) {
+            const list = this.postings[sorted[i]];
+            if (list.length > 0) {
+                lists.push(list);
+                total += list.length;
+            }
+        }
+
+        if (lists.length === 1) return lists[0];
+
+        const merged = new Float64Array(total);
+        let cursor = 0;
+        for (const list of lists) {
+            merged.set(list, cursor);
+            cursor += list.length;
+        }
+        return merged.sort();
+    }
+
+    /**
+     * Literal, case-insensitive scan used when the indexed lookup finds nothing.
+     */
+    private *scan(query: string): Generator<IndexMatch> {
+        const escapedQuery = query.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+        const regex = new RegExp(escapedQuery, 'gi');
+
+        for (let s = 0; s < this.sections.length; s++) {
+            const text = this.sections[s].text;
+            regex.lastIndex = 0;
+
+            let match;
+            while ((match = regex.exec(text)) !== null) {
+                yield { section: s, start: match.index, length: match[0].length };
+            }
+        }
+    }
+}
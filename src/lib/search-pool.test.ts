@@ -0,0 +1,106 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+import type { LibrarySearchShardResult } from '../types/search';
+
+// Mock Worker
+class MockWorker {
+  terminate = vi.fn();
+}
+vi.stubGlobal('Worker', MockWorker);
+vi.stubGlobal('URL', class {
+    constructor(url: string) { return url; }
+    toString() { return ''; }
+});
+
+// Each wrapped worker gets its own engine that reports a fixed score per book
+const engines: { searchLibrary: ReturnType<typeof vi.fn>, setMemoryBudget: ReturnType<typeof vi.fn> }[] = [];
+vi.mock('comlink', () => ({
+    wrap: vi.fn(() => {
+        const engine = {
+            setMemoryBudget: vi.fn().mockResolvedValue(undefined),
+            searchLibrary: vi.fn(async (bookIds: string[]): Promise<LibrarySearchShardResult> => ({
+                hits: bookIds
+                    .filter(id => id !== 'unindexed')
+                    .map(id => ({ bookId: id, score: Number(id.replace('book-', '')), hitCount: 1, results: [] })),
+                unindexed: bookIds.filter(id => id === 'unindexed'),
+                booksSearched: bookIds.length,
+                elapsedMs: 5,
+                cancelled: false
+            }))
+        };
+        engines.push(engine);
+        return engine;
+    }),
+    expose: vi.fn(),
+    Remote: {}
+}));
+
+import { SearchWorkerPool, getShardForBook, getSearchPoolSize } from './search-pool';
+import { getSearchMemoryBudget } from './search-engine';
+
+describe('SearchWorkerPool', () => {
+    beforeEach(() => {
+        engines.length = 0;
+    });
+
+    it('should size the pool from hardwareConcurrency within bounds', () => {
+        const spy = vi.spyOn(navigator, 'hardwareConcurrency', 'get');
+
+        spy.mockReturnValue(2);
+        expect(getSearchPoolSize()).toBe(2);
+
+        spy.mockReturnValue(16);
+        expect(getSearchPoolSize()).toBe(4);
+
+        spy.mockRestore();
+    });
+
+    it('should assign books to stable shards', () => {
+        const shard = getShardForBook('book-42', 3);
+        expect(shard).toBeGreaterThanOrEqual(0);
+        expect(shard).toBeLessThan(3);
+        expect(getShardForBook('book-42', 3)).toBe(shard);
+    });
+
+    it('should shard books across workers and merge ranked results', async () => {
+        const pool = new SearchWorkerPool(3);
+        const bookIds = ['book-1', 'book-5', 'book-3', 'book-2', 'book-4', 'unindexed'];
+
+        const response = await pool.searchLibrary(bookIds, 'whale');
+
+        expect(engines).toHaveLength(3);
+        // Every book is sent to exactly one worker
+        const dispatched = engines.flatMap(e => e.searchLibrary.mock.calls.flatMap(call => call[0] as string[]));
+        expect(dispatched.sort()).toEqual([...bookIds].sort());
+
+        expect(response.hits.map(h => h.bookId)).toEqual(['book-5', 'book-4', 'book-3', 'book-2', 'book-1']);
+        expect(response.unindexed).toEqual(['unindexed']);
+        expect(response.cancelled).toBe(false);
+
+        const shardBooks = response.shards.reduce((sum, s) => sum + s.books, 0);
+        expect(shardBooks).toBe(bookIds.length);
+        response.shards.forEach(s => {
+            expect(s.elapsedMs).toBe(5);
+            expect(s.roundTripMs).toBeGreaterThanOrEqual(0);
+        });
+    });
+
+    it('should split the memory budget across workers', async () => {
+        const pool = new SearchWorkerPool(2);
+        await pool.searchLibrary(['book-1'], 'a');
+
+        const [first, second] = engines.map(e => e.setMemoryBudget.mock.calls[0][0] as number);
+        expect(first).toBe(second);
+        expect(first * 2).toBeLessThanOrEqual(getSearchMemoryBudget());
+    });
+
+    it('should reuse workers across queries and terminate them', async () => {
+        const pool = new SearchWorkerPool(2);
+        await pool.searchLibrary(['book-1'], 'a');
+        await pool.searchLibrary(['book-1'], 'b');
+        expect(engines).toHaveLength(2);
+
+        pool.terminate();
+        await pool.searchLibrary(['book-1'], 'c');
+        expect(engines).toHaveLength(4);
+    });
+});
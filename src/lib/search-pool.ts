@@ -0,0 +1,124 @@
+import * as Comlink from 'comlink';
+import type { LibrarySearchOptions, LibrarySearchResponse, LibrarySearchShardStats } from '../types/search';
+import { getSearchMemoryBudget, type SearchEngine } from './search-engine';
+import { Logger } from './logger';
+
+/**
+ * Upper bound on the number of search workers. Each worker keeps its shard's indexes in memory,
+ * so the pool is capped even on devices that report many cores.
+ */
+const MAX_POOL_SIZE = 4;
+
+/**
+ * Determines the pool size from `navigator.hardwareConcurrency`.
+ *
+ * @returns The number of search workers to spawn (at least 1).
+ */
+export function getSearchPoolSize(): number {
+    const cores = typeof navigator !== 'undefined' && navigator.hardwareConcurrency ? navigator.hardwareConcurrency : 2;
+    return Math.max(1, Math.min(cores, MAX_POOL_SIZE));
+}
+
+/**
+ * Assigns a book to a shard using a stable FNV-1a hash of its ID, so the same worker keeps
+ * the same books (and their loaded indexes) across queries.
+ *
+ * @param bookId - The unique identifier of the book.
+ * @param shardCount - The number of shards.
+ * @returns The shard index.
+ */
+export function getShardForBook(bookId: string, shardCount: number): number {
+    let hash = 0x811c9dc5;
+    for (let i = 0; i < bookId.length; i++) {
+        hash ^= bookId.charCodeAt(i);
+        hash = Math.imul(hash, 0x01000193);
+    }
+    return (hash >>> 0) % shardCount;
+}
+
+/**
+ * A pool of search workers used for library-wide queries.
+ * Books are sharded across the workers, each worker searches its shard in parallel,
+ * and the ranked per-shard results are merged on the main thread.
+ */
+export class SearchWorkerPool {
+    private size: number;
+    private workers: Worker[] = [];
+    private engines: Comlink.Remote<SearchEngine>[] = [];
+
+    /**
+     * @param size - Number of workers. Defaults to a size derived from `navigator.hardwareConcurrency`.
+     */
+    constructor(size: number = getSearchPoolSize()) {
+        this.size = Math.max(1, size);
+    }
+
+    /**
+     * Retrieves the worker proxies, spawning the workers on first use.
+     * The memory budget is split across the workers so the pool as a whole stays within it.
+     */
+    private getEngines() {
+        if (this.engines.length === 0) {
+            const budget = Math.floor(getSearchMemoryBudget() / this.size);
+            for (let i = 0; i < this.size; i++) {
+                const worker = new Worker(new URL('../workers/search.worker.ts', import.meta.url), {
+                    type: 'module'
+                });
+                const engine = Comlink.wrap<SearchEngine>(worker);
+                // Messages are delivered in order, so the budget applies before the first search
+                void engine.setMemoryBudget(budget);
+                this.workers.push(worker);
+                this.engines.push(engine);
+            }
+        }
+        return this.engines;
+    }
+
+    /**
+     * Searches all given books, sharded across the pool, and merges the ranked results.
+     *
+     * @param bookIds - The books to search.
+     * @param query - The text query to search for.
+     * @param options - Number of excerpts per book.
+     * @returns The merged hits (best first), unindexed books and per-shard latency.
+     */
+    async searchLibrary(bookIds: string[], query: string, options?: LibrarySearchOptions): Promise<LibrarySearchResponse> {
+        const engines = this.getEngines();
+        const shards: string[][] = engines.map(() => []);
+        for (const bookId of bookIds) {
+            shards[getShardForBook(bookId, engines.length)].push(bookId);
+        }
+
+        const responses = await Promise.all(shards.map(async (shardBookIds, shard) => {
+            if (shardBookIds.length === 0) return null;
+            const started = performance.now();
+            const result = await engines[shard].searchLibrary(shardBookIds, query, options);
+            return { shard, books: shardBookIds.length, result, roundTripMs: performance.now() - started };
+        }));
+
+        const response: LibrarySearchResponse = { hits: [], unindexed: [], shards: [], cancelled: false };
+        for (const shardResponse of responses) {
+            if (!shardResponse) continue;
+            const { shard, books, result, roundTripMs } = shardResponse;
+            response.hits.push(...result.hits);
+            response.unindexed.push(...result.unindexed);
+            response.cancelled = response.cancelled || result.cancelled;
+            const stats: LibrarySearchShardStats = { shard, books, elapsedMs: result.elapsedMs, roundTripMs };
+            response.shards.push(stats);
+        }
+
+        response.hits.sort((a, b) => b.score - a.score || b.hitCount - a.hitCount);
+        Logger.debug('SearchWorkerPool', `Library search across ${bookIds.length} books`, response.shards);
+
+        return response;
+    }
+
+    /**
+     * Terminates all workers in the pool.
+     */
+    terminate() {
+        this.workers.forEach(worker => worker.terminate());
+        this.workers = [];
+        this.engines = [];
+    }
+}
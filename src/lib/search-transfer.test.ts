@@ -0,0 +1,34 @@
+import { describe, it, expect } from 'vitest';
+import { encodeSearchSections, decodeSearchSections } from './search-transfer';
+
+describe('search-transfer', () => {
+    it('should round-trip sections through a single buffer', () => {
+        const sections = [
+            { id: '1', href: 'chap1.html', text: 'Thé brown 🦊 jumps' },
+            { id: '2', href: 'chap2.html', xml: '<html><body>Über</body></html>' },
+            { id: '3', href: 'chap3.html', text: 'plain' }
+        ];
+
+        const payload = encodeSearchSections(sections);
+
+        expect(payload.buffer).toBeInstanceOf(ArrayBuffer);
+        expect(payload.sections.map(s => s.href)).toEqual(['chap1.html', 'chap2.html', 'chap3.html']);
+        expect(decodeSearchSections(payload)).toEqual([
+            { id: '1', href: 'chap1.html', text: 'Thé brown 🦊 jumps', xml: undefined },
+            { id: '2', href: 'chap2.html', text: undefined, xml: '<html><body>Über</body></html>' },
+            { id: '3', href: 'chap3.html', text: 'plain', xml: undefined }
+        ]);
+    });
+
+    it('should keep a byte order mark at the start of the first section', () => {
+        const sections = [
+            { id: '1', href: 'chap1.xhtml', text: '\uFEFFChapter one', xml: '<p>one</p>' },
+            { id: '2', href: 'chap2.xhtml', text: 'Chapter two' }
+        ];
+
+        expect(decodeSearchSections(encodeSearchSections(sections))).toEqual([
+            { id: '1', href: 'chap1.xhtml', text: '\uFEFFChapter one', xml: '<p>one</p>' },
+            { id: '2', href: 'chap2.xhtml', text: 'Chapter two', xml: undefined }
+        ]);
+    });
+});
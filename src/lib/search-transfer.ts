@@ -0,0 +1,43 @@
+import type { EncodedSearchSections, SearchSection } from '../types/search';
+
+/**
+ * Packs the text and XML of a batch of sections into a single UTF-8 buffer.
+ * The buffer can be handed to the search worker with `Comlink.transfer`, which moves it
+ * instead of structured-cloning every string.
+ *
+ * @param sections - The sections to encode.
+ * @returns The section metadata and the packed content.
+ */
+export function encodeSearchSections(sections: SearchSection[]): EncodedSearchSections {
+    const content: string[] = [];
+    const infos = sections.map(section => {
+        const text = section.text ?? '';
+        const xml = section.xml ?? '';
+        content.push(text, xml);
+        return { id: section.id, href: section.href, textLength: text.length, xmlLength: xml.length };
+    });
+
+    const bytes = new TextEncoder().encode(content.join(''));
+    return { sections: infos, buffer: bytes.buffer };
+}
+
+/**
+ * Restores the sections packed by {@link encodeSearchSections}.
+ * Empty text or XML is restored as `undefined`, as in the original sections.
+ *
+ * @param payload - The encoded batch.
+ * @returns The decoded sections.
+ */
+export function decodeSearchSections(payload: EncodedSearchSections): SearchSection[] {
+    // Keep a leading byte order mark: it is part of the first section and counted in its length
+    const content = new TextDecoder('utf-8', { ignoreBOM: true }).decode(new Uint8Array(payload.buffer));
+
+    let cursor = 0;
+    return payload.sections.map(info => {
+        const text = content.substring(cursor, cursor + info.textLength);
+        cursor += info.textLength;
+        const xml = content.substring(cursor, cursor + info.xmlLength);
+        cursor += info.xmlLength;
+        return { id: info.id, href: info.href, text: text || undefined, xml: xml || undefined };
+    });
+}
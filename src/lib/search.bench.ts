@@ -0,0 +1,181 @@
+import { afterAll, beforeAll, bench, describe } from 'vitest';
+import * as Comlink from 'comlink';
+import * as fs from 'fs';
+import * as path from 'path';
+import { SearchEngine } from './search-engine';
+import { CORPUS_NEEDLE, countNeedles, generateCorpus } from '../test/search-corpus';
+import type { SearchSection } from '../types/search';
+
+/**
+ * Search subsystem benchmarks.
+ *
+ * Run with `npm run bench`. Besides vitest's own report (written to
+ * `bench-results/search-bench.json`), this suite records metrics tinybench does not
+ * measure (heap growth, latency percentiles over a fixed query set, worker round-trip
+ * overhead) in `bench-results/search-metrics.json`, so releases can be compared.
+ * Run node with `--expose-gc` for stable heap numbers.
+ */
+
+/** Corpus sizes in MB. */
+const CORPUS_SIZES = [1, 10, 50];
+
+/** Number of timed runs per query when computing latency percentiles. */
+const LATENCY_SAMPLES = 50;
+
+const RESULTS_DIR = path.resolve(__dirname, '../../bench-results');
+
+/** Queries covering the main index paths. */
+const QUERIES = {
+    phrase: CORPUS_NEEDLE,
+    prefix: 'ka',
+    word: 'lighthouse',
+    fuzzy: 'lighthuose',
+    missing: 'nonexistentterm'
+};
+
+interface CorpusMetrics {
+    megabytes: number;
+    sections: number;
+    characters: number;
+    needleHits: number;
+    buildMs: number;
+    heapGrowthBytes: number | null;
+    estimatedIndexBytes: number;
+    latencyMs: Record<string, { p50: number; p95: number; p99: number; max: number }>;
+    roundTripOverheadMs: { p50: number; p95: number };
+}
+
+const metrics: CorpusMetrics[] = [];
+
+function collectGarbage() {
+    const gc = (globalThis as { gc?: () => void }).gc;
+    if (gc) gc();
+    return Boolean(gc);
+}
+
+function heapUsed(): number {
+    return process.memoryUsage().heapUsed;
+}
+
+function percentile(sorted: number[], p: number): number {
+    if (sorted.length === 0) return 0;
+    const rank = Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1);
+    return sorted[Math.max(0, rank)];
+}
+
+async function sample(run: () => unknown): Promise<number[]> {
+    const durations: number[] = [];
+    for (let i = 0; i < LATENCY_SAMPLES; i++) {
+        const started = performance.now();
+        await run();
+        durations.push(performance.now() - started);
+    }
+    return durations.sort((a, b) => a - b);
+}
+
+/**
+ * Exposes an engine over a MessageChannel, mirroring how the app talks to the search worker
+ * (Comlink + structured clone), without needing a real Worker in the test environment.
+ */
+function createRemoteEngine(engine: SearchEngine) {
+    const channel = new MessageChannel();
+    Comlink.expose(engine, channel.port1);
+    const remote = Comlink.wrap<SearchEngine>(channel.port2);
+    return {
+        remote,
+        close: () => {
+            remote[Comlink.releaseProxy]();
+            channel.port1.close();
+            channel.port2.close();
+        }
+    };
+}
+
+for (const megabytes of CORPUS_SIZES) {
+    describe(`search: ${megabytes} MB corpus`, () => {
+        const bookId = `bench-${megabytes}`;
+        let sections: SearchSection[] = [];
+        let engine: SearchEngine;
+        let connection: ReturnType<typeof createRemoteEngine>;
+
+        beforeAll(async () => {
+            sections = generateCorpus(megabytes);
+            // Budget large enough that the benchmark never measures eviction
+            engine = new SearchEngine(Number.MAX_SAFE_INTEGER);
+
+            const hasGc = collectGarbage();
+            const heapBefore = heapUsed();
+            const started = performance.now();
+            engine.indexBook(bookId, sections);
+            const buildMs = performance.now() - started;
+            collectGarbage();
+            const heapGrowthBytes = hasGc ? heapUsed() - heapBefore : null;
+
+            const latencyMs: CorpusMetrics['latencyMs'] = {};
+            for (const [name, query] of Object.entries(QUERIES)) {
+                const durations = await sample(() => engine.search(bookId, query, { mode: name === 'fuzzy' ? 'fuzzy' : 'exact' }));
+                latencyMs[name] = {
+                    p50: percentile(durations, 50),
+                    p95: percentile(durations, 95),
+                    p99: percentile(durations, 99),
+                    max: durations[durations.length - 1]
+                };
+            }
+
+            connection = createRemoteEngine(engine);
+            const direct = await sample(() => engine.search(bookId, QUERIES.word));
+            const remote = await sample(() => connection.remote.search(bookId, QUERIES.word));
+
+            metrics.push({
+                megabytes,
+                sections: sections.length,
+                characters: sections.reduce((sum, section) => sum + (section.text?.length ?? 0), 0),
+                needleHits: countNeedles(sections),
+                buildMs,
+                heapGrowthBytes,
+                estimatedIndexBytes: engine.getMemoryStats().residentBytes,
+                latencyMs,
+                roundTripOverheadMs: {
+                    p50: percentile(remote, 50) - percentile(direct, 50),
+                    p95: percentile(remote, 95) - percentile(direct, 95)
+                }
+            });
+        });
+
+        afterAll(() => {
+            // Release this corpus before the next (larger) one is generated
+            connection?.close();
+            engine?.initIndex(bookId);
+            sections = [];
+        });
+
+        // Builds of the larger corpora take seconds; a few unwarmed iterations are enough
+        bench('build index', () => {
+            new SearchEngine(Number.MAX_SAFE_INTEGER).indexBook(`${bookId}-rebuild`, sections);
+        }, { iterations: megabytes >= 50 ? 2 : 5, time: 0, warmupIterations: 0, warmupTime: 0 });
+
+        bench('query: phrase', () => {
+            engine.search(bookId, QUERIES.phrase);
+        });
+
+        bench('query: common prefix', () => {
+            engine.search(bookId, QUERIES.prefix);
+        });
+
+        bench('query: fuzzy', () => {
+            engine.search(bookId, QUERIES.fuzzy, { mode: 'fuzzy' });
+        });
+
+        bench('worker round-trip: search', async () => {
+            await connection.remote.search(bookId, QUERIES.word);
+        });
+    });
+}
+
+afterAll(() => {
+    fs.mkdirSync(RESULTS_DIR, { recursive: true });
+    fs.writeFileSync(
+        path.join(RESULTS_DIR, 'search-metrics.json'),
+        JSON.stringify({ generatedAt: new Date().toISOString(), node: process.version, corpora: metrics }, null, 2)
+    );
+});
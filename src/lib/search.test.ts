@@ -15,16 +15,30 @@ const mockEngine = {
     initIndex: vi.fn().mockResolvedValue(undefined),
     addDocuments: vi.fn().mockResolvedValue(undefined),
     search: vi.fn().mockResolvedValue([{ href: 'chap1.html', excerpt: '...found match...' }]),
-    supportsXmlParsing: vi.fn().mockResolvedValue(false)
+    supportsXmlParsing: vi.fn().mockResolvedValue(false),
+    loadIndex: vi.fn().mockResolvedValue(false),
+    persistIndex: vi.fn().mockResolvedValue(undefined),
+    attachSentenceLocations: vi.fn().mockResolvedValue(0),
+    searchStream: vi.fn().mockResolvedValue(true),
+    cancelSearch: vi.fn().mockResolvedValue(undefined)
 };
 
 vi.mock('comlink', () => ({
     wrap: vi.fn(() => mockEngine),
     expose: vi.fn(),
+    proxy: vi.fn((fn) => fn),
+    transfer: vi.fn((obj) => obj),
     Remote: {}
 }));
 
 import { searchClient } from './search';
+import { decodeSearchSections } from './search-transfer';
+
+/** Decodes the packed sections sent to the worker for a book. */
+function sentSections(bookId: string) {
+    const call = mockEngine.addDocuments.mock.calls.find(args => args[0] === bookId);
+    return call ? decodeSearchSections(call[1]) : [];
+}
 
 // Mock epubjs Book
 const mockBlob = new Blob(['<html xmlns="http://www.w3.org/1999/xhtml"><body>This is some text content in chapter 1.</body></html>'], { type: 'application/xhtml+xml' });
@@ -65,11 +79,23 @@ describe('SearchClient', () => {
         expect(mockBook.load).not.toHaveBeenCalled();
 
         // Should send add message
-        expect(mockEngine.addDocuments).toHaveBeenCalledWith('book-1', expect.arrayContaining([
+        expect(sentSections('book-1')).toEqual(expect.arrayContaining([
             expect.objectContaining({ href: 'chap1.html', text: expect.stringContaining('This is some text content in chapter 1.') })
         ]));
     });
 
+    it('should transfer section content as a buffer', async () => {
+        const Comlink = await import('comlink');
+        mockBook.archive.getBlob.mockResolvedValue(mockBlob);
+
+        // eslint-disable-next-line @typescript-eslint/no-explicit-any
+        await searchClient.indexBook(mockBook as any, 'book-transfer');
+
+        const payload = mockEngine.addDocuments.mock.calls[0][1];
+        expect(payload.buffer).toBeInstanceOf(ArrayBuffer);
+        expect(Comlink.transfer).toHaveBeenCalledWith(payload, [payload.buffer]);
+    });
+
     it('should fallback to book.load if archive fails', async () => {
         mockBook.archive.getBlob.mockResolvedValue(null); // Simulate archive failure/missing file
 
@@ -82,7 +108,7 @@ describe('SearchClient', () => {
         expect(mockBook.load).toHaveBeenCalledWith('chap1.html');
 
         // Should send add message (with content from load)
-        expect(mockEngine.addDocuments).toHaveBeenCalledWith('book-1', expect.arrayContaining([
+        expect(sentSections('book-1')).toEqual(expect.arrayContaining([
             expect.objectContaining({ href: 'chap1.html', text: expect.stringContaining('This is some text content in chapter 1.') })
         ]));
     });
@@ -99,6 +125,16 @@ describe('SearchClient', () => {
         expect(results).toHaveLength(1);
         expect(results[0].href).toBe('chap1.html');
         expect(mockEngine.search).toHaveBeenCalledWith('book-1', 'query');
+        // Reloads the index in case the worker evicted it
+        expect(mockEngine.loadIndex).toHaveBeenCalledWith('book-1');
+    });
+
+    it('should stream results through a proxied callback', async () => {
+        const onPage = vi.fn();
+        const completed = await searchClient.searchStream('query', 'book-1', onPage, { pageSize: 10 });
+
+        expect(completed).toBe(true);
+        expect(mockEngine.searchStream).toHaveBeenCalledWith('book-1', 'query', onPage, { pageSize: 10 });
     });
 
     it('should wait for book.ready before indexing', async () => {
@@ -145,7 +181,7 @@ describe('SearchClient', () => {
         // Should NOT parse on main thread (checking if DOMParser was instantiated is hard if we don't spy on it,
         // but we can check what was sent to addDocuments)
 
-        expect(mockEngine.addDocuments).toHaveBeenCalledWith('book-offload', expect.arrayContaining([
+        expect(sentSections('book-offload')).toEqual(expect.arrayContaining([
             expect.objectContaining({
                 href: 'chap1.html',
                 xml: expect.stringContaining('<html'),
@@ -154,6 +190,33 @@ describe('SearchClient', () => {
         ]));
     });
 
+    it('should restore a persisted index without extracting content', async () => {
+        mockEngine.loadIndex.mockResolvedValueOnce(true);
+        const onProgress = vi.fn();
+
+        // eslint-disable-next-line @typescript-eslint/no-explicit-any
+        await searchClient.indexBook(mockBook as any, 'book-persisted', onProgress);
+
+        expect(mockEngine.loadIndex).toHaveBeenCalledWith('book-persisted');
+        expect(mockBook.archive.getBlob).not.toHaveBeenCalled();
+        expect(mockEngine.addDocuments).not.toHaveBeenCalled();
+        expect(onProgress).toHaveBeenCalledWith(1.0);
+        expect(searchClient.isIndexed('book-persisted')).toBe(true);
+    });
+
+    it('should persist the index after extraction', async () => {
+        mockBook.archive.getBlob.mockResolvedValue(mockBlob);
+
+        // eslint-disable-next-line @typescript-eslint/no-explicit-any
+        await searchClient.indexBook(mockBook as any, 'book-to-persist');
+
+        expect(mockEngine.persistIndex).toHaveBeenCalledWith('book-to-persist');
+        // Sentence CFIs are attached first so they are persisted with the index
+        expect(mockEngine.attachSentenceLocations).toHaveBeenCalledWith('book-to-persist');
+        expect(mockEngine.attachSentenceLocations.mock.invocationCallOrder[0])
+            .toBeLessThan(mockEngine.persistIndex.mock.invocationCallOrder[0]);
+    });
+
     it('should skip indexing if already indexed', async () => {
         mockBook.archive.getBlob.mockResolvedValue(mockBlob);
 
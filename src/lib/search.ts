@@ -1,7 +1,9 @@
 import * as Comlink from 'comlink';
 import type { Book } from 'epubjs';
-import type { SearchResult, SearchSection } from '../types/search';
+import type { SearchResult, SearchSection, SearchPageCallback, SearchStreamOptions, SearchAsYouTypeOptions, SearchAsYouTypeResult, LibrarySearchOptions, LibrarySearchResponse } from '../types/search';
 import type { SearchEngine } from './search-engine';
+import { SearchWorkerPool } from './search-pool';
+import { encodeSearchSections } from './search-transfer';
 
 export type { SearchResult };
 
@@ -14,6 +16,7 @@ class SearchClient {
     private engine: Comlink.Remote<SearchEngine> | null = null;
     private indexedBooks = new Set<string>();
     private pendingIndexes = new Map<string, Promise<void>>();
+    private pool: SearchWorkerPool | null = null;
 
     /**
      * Retrieves the existing Web Worker instance or creates a new one if it doesn't exist.
@@ -39,7 +42,8 @@ class SearchClient {
     }
 
     /**
-     * Extracts text content from a book's spine items and sends it to the worker for indexing.
+     * Makes a book searchable. Restores the persisted index if one exists; otherwise extracts
+     * text content from the book's spine items, sends it to the worker for indexing and persists the result.
      * Uses batch processing to avoid blocking the main thread.
      *
      * @param book - The epubjs Book object to be indexed.
@@ -73,6 +77,13 @@ class SearchClient {
 
     private async indexBookInternal(book: Book, bookId: string, onProgress?: (percent: number) => void) {
         const engine = this.getEngine();
+
+        // Fast path: restore the index built at ingestion time or persisted by a previous session
+        if (await engine.loadIndex(bookId)) {
+            if (onProgress) onProgress(1.0);
+            return;
+        }
+
         await book.ready;
         // Init/Clear index
         await engine.initIndex(bookId);
@@ -137,8 +148,10 @@ class SearchClient {
             }
 
             if (sections.length > 0) {
+                // Transfer the packed content instead of structured-cloning every string.
                 // Wait for the worker to acknowledge receipt and addition of this batch
-                await engine.addDocuments(bookId, sections);
+                const payload = encodeSearchSections(sections);
+                await engine.addDocuments(bookId, Comlink.transfer(payload, [payload.buffer]));
             }
 
             if (onProgress) {
@@ -148,10 +161,20 @@ class SearchClient {
             // Yield to main thread
             await new Promise(resolve => setTimeout(resolve, 0));
         }
+
+        try {
+            // Resolve results to sentence CFIs using the locations extracted at ingestion
+            await engine.attachSentenceLocations(bookId);
+            await engine.persistIndex(bookId);
+        } catch (e) {
+            // Search still works for this session; the index is rebuilt next time.
+            console.warn(`Failed to persist search index for ${bookId}`, e);
+        }
     }
 
     /**
      * Performs a search query against a specific book index via the worker.
+     * If the worker evicted the book to stay within its memory budget, the persisted index is reloaded first.
      *
      * @param query - The text query to search for.
      * @param bookId - The unique identifier of the book to search.
@@ -159,9 +182,87 @@ class SearchClient {
      */
     async search(query: string, bookId: string): Promise<SearchResult[]> {
         const engine = this.getEngine();
+        await engine.loadIndex(bookId);
         return engine.search(bookId, query);
     }
 
+    /**
+     * Streams search results for a book in pages via the worker.
+     * A newer stream (or {@link cancelSearch}) aborts the previous one inside the worker.
+     *
+     * @param query - The text query to search for.
+     * @param bookId - The unique identifier of the book to search.
+     * @param onPage - Receives each page of results; the final call has `done` set to true.
+     * @param options - Page size, result cap and matching mode (exact or fuzzy).
+     * @returns A Promise resolving to true if the stream completed, false if it was superseded.
+     */
+    async searchStream(query: string, bookId: string, onPage: SearchPageCallback, options?: SearchStreamOptions): Promise<boolean> {
+        const engine = this.getEngine();
+        return engine.searchStream(bookId, query, Comlink.proxy(onPage), options);
+    }
+
+    /**
+     * Runs one keystroke of search-as-you-type in the worker.
+     * Queries that extend the previous one are answered by narrowing its matches in the worker,
+     * and repeated queries are served from the worker's session cache.
+     *
+     * @param query - The text typed so far.
+     * @param bookId - The unique identifier of the book to search.
+     * @param options - Result limit and matching mode.
+     * @returns A Promise resolving to the first results and the total match count.
+     */
+    async searchAsYouType(query: string, bookId: string, options?: SearchAsYouTypeOptions): Promise<SearchAsYouTypeResult> {
+        const engine = this.getEngine();
+        return engine.searchAsYouType(bookId, query, options);
+    }
+
+    /**
+     * Ends the worker's search-as-you-type session and frees its cached matches.
+     */
+    async endSearchSession(): Promise<void> {
+        if (this.engine) {
+            await this.engine.endSearchSession();
+        }
+    }
+
+    /**
+     * Cancels the active streaming search in the worker.
+     */
+    async cancelSearch(): Promise<void> {
+        if (this.engine) {
+            await this.engine.cancelSearch();
+        }
+    }
+
+    /**
+     * Searches across the whole library using a pool of search workers.
+     * Books are sharded across the pool and each worker loads its books' persisted indexes lazily.
+     * Books that have never been indexed are reported in `unindexed`.
+     *
+     * @param query - The text query to search for.
+     * @param bookIds - The books to search.
+     * @param options - Number of excerpts per book.
+     * @returns A Promise resolving to the ranked hits and per-shard latency.
+     */
+    async searchLibrary(query: string, bookIds: string[], options?: LibrarySearchOptions): Promise<LibrarySearchResponse> {
+        if (!this.pool) {
+            this.pool = new SearchWorkerPool();
+        }
+        return this.pool.searchLibrary(bookIds, query, options);
+    }
+
+    /**
+     * Terminates the library search worker pool.
+     * Called when the library view closes; while it is open the pool is kept alive so
+     * repeated queries reuse the indexes its workers have loaded.
+     */
+    terminateLibrarySearch() {
+        if (this.pool) {
+            this.pool.terminate();
+            this.pool = null;
+        }
+    }
+
     /**
      * Terminates the search worker and cleans up resources.
      */
@@ -0,0 +1,131 @@
+import { describe, it, expect, vi, afterEach } from 'vitest';
+import { compressForStorage, muxWebM, parseWav, resample, WEBM_OPUS_MIME_TYPE } from './AudioCompressor';
+
+/** Builds a 16-bit PCM WAV file. */
+const makeWav = (samples: number[], channels = 1, sampleRate = 22050): Blob => {
+  const data = new ArrayBuffer(44 + samples.length * 2);
+  const view = new DataView(data);
+  const tag = (offset: number, value: string) => [...value].forEach((c, i) => view.setUint8(offset + i, c.charCodeAt(0)));
+  tag(0, 'RIFF');
+  view.setUint32(4, 36 + samples.length * 2, true);
+  tag(8, 'WAVE');
+  tag(12, 'fmt ');
+  view.setUint32(16, 16, true);
+  view.setUint16(20, 1, true);
+  view.setUint16(22, channels, true);
+  view.setUint32(24, sampleRate, true);
+  view.setUint32(28, sampleRate * channels * 2, true);
+  view.setUint16(32, channels * 2, true);
+  view.setUint16(34, 16, true);
+  tag(36, 'data');
+  view.setUint32(40, samples.length * 2, true);
+  samples.forEach((s, i) => view.setInt16(44 + i * 2, s, true));
+  return new Blob([data], { type: 'audio/wav' });
+};
+
+/** Stands in for WebCodecs: emits one 3-byte packet per 20 ms of input. */
+class FakeAudioEncoder {
+  static isConfigSupported = vi.fn().mockResolvedValue({ supported: true });
+  constructor(private init: { output(chunk: object): void }) {}
+  configure() {}
+  encode(data: { init: { numberOfFrames: number; sampleRate: number } }) {
+    const packets = Math.ceil(data.init.numberOfFrames / (data.init.sampleRate * 0.02));
+    for (let i = 0; i < packets; i++) {
+      this.init.output({ timestamp: i * 20_000, byteLength: 3, copyTo: (dst: Uint8Array) => dst.set([1, 2, 3]) });
+    }
+  }
+  flush() { return Promise.resolve(); }
+  close() {}
+}
+
+describe('AudioCompressor', () => {
+  afterEach(() => {
+    vi.unstubAllGlobals();
+    vi.restoreAllMocks();
+  });
+
+  it('parses interleaved 16-bit samples into planar floats', async () => {
+    const pcm = parseWav(await makeWav([16384, -16384, 0, 32767], 2).arrayBuffer());
+
+    expect(pcm).toMatchObject({ sampleRate: 22050, channels: 2, frames: 2 });
+    expect(Array.from(pcm!.samples)).toEqual([0.5, 0, -0.5, 32767 / 32768]);
+  });
+
+  it('does not parse non-WAV audio', () => {
+    expect(parseWav(new ArrayBuffer(64))).toBeNull();
+  });
+
+  it('resamples planar channels with linear interpolation', () => {
+    const pcm = resample({ sampleRate: 2, channels: 2, frames: 2, samples: new Float32Array([0, 1, 1, 0]) }, 4);
+
+    expect(pcm).toMatchObject({ sampleRate: 4, channels: 2, frames: 4 });
+    expect(Array.from(pcm.samples)).toEqual([0, 0.5, 1, 1, 1, 0.5, 0, 0]);
+  });
+
+  it('muxes packets into a WebM file', () => {
+    const webm = muxWebM([{ timestamp: 0, data: new Uint8Array([9]) }], new Uint8Array(19), 1, 20);
+    const text = new TextDecoder('latin1').decode(webm);
+
+    expect(Array.from(webm.slice(0, 4))).toEqual([0x1A, 0x45, 0xDF, 0xA3]);
+    expect(text).toContain('webm');
+    expect(text).toContain('A_OPUS');
+  });
+
+  it('leaves non-WAV audio as returned', async () => {
+    expect(await compressForStorage(new Blob(['ID3 mp3 data'], { type: 'audio/mp3' }))).toBeUndefined();
+  });
+
+  it('stores WAV unchanged where Opus cannot be encoded', async () => {
+    const wav = makeWav(new Array(2205).fill(0));
+    const stored = await compressForStorage(wav);
+
+    expect(stored).toEqual({ audio: wav, format: 'wav' });
+  });
+
+  it('stores WAV when the encoder rejects Opus at every sample rate', async () => {
+    const isConfigSupported = vi.fn().mockResolvedValue({ supported: false });
+    vi.stubGlobal('AudioEncoder', class extends FakeAudioEncoder { static isConfigSupported = isConfigSupported; });
+    vi.stubGlobal('AudioData', class { constructor(public init: object) {} close() {} });
+    vi.spyOn(HTMLMediaElement.prototype, 'canPlayType').mockReturnValue('probably');
+    const warn = vi.spyOn(console, 'warn').mockImplementation(() => {});
+
+    const wav = makeWav(new Array(22050).fill(0));
+    const stored = await compressForStorage(wav);
+
+    expect(stored).toEqual({ audio: wav, format: 'wav' });
+    expect(isConfigSupported.mock.calls.map(([config]) => config.sampleRate)).toEqual([22050, 48000]);
+    expect(warn).toHaveBeenCalledWith(expect.stringContaining('22050 Hz'));
+  });
+
+  it('resamples to 48 kHz when the encoder rejects the source rate', async () => {
+    const frames: { sampleRate: number; numberOfFrames: number }[] = [];
+    vi.stubGlobal('AudioEncoder', class extends FakeAudioEncoder {
+      static isConfigSupported = vi.fn(async (config: { sampleRate: number }) => ({ supported: config.sampleRate === 48000 }));
+    });
+    vi.stubGlobal('AudioData', class {
+      constructor(public init: { sampleRate: number; numberOfFrames: number }) { frames.push(init); }
+      close() {}
+    });
+    vi.spyOn(HTMLMediaElement.prototype, 'canPlayType').mockReturnValue('probably');
+
+    const wav = makeWav(new Array(22050).fill(0));
+    const stored = await compressForStorage(wav);
+
+    expect(stored?.format).toBe('webm-opus');
+    expect(frames).toHaveLength(1);
+    expect(frames[0]).toMatchObject({ sampleRate: 48000, numberOfFrames: 48000 });
+  });
+
+  it('transcodes WAV to WebM/Opus with WebCodecs', async () => {
+    vi.stubGlobal('AudioEncoder', FakeAudioEncoder);
+    vi.stubGlobal('AudioData', class { constructor(public init: object) {} close() {} });
+    vi.spyOn(HTMLMediaElement.prototype, 'canPlayType').mockReturnValue('probably');
+
+    const wav = makeWav(new Array(22050).fill(0));
+    const stored = await compressForStorage(wav);
+
+    expect(stored?.format).toBe('webm-opus');
+    expect(stored?.audio.type).toBe(WEBM_OPUS_MIME_TYPE);
+    expect(stored!.audio.size).toBeLessThan(wav.size);
+  });
+});
@@ -0,0 +1,398 @@
+import type { CachedAudioFormat } from '../../types/db';
+
+/** Opus bitrate for cached speech, in bits per second; transparent for a single voice. */
+export const OPUS_BITRATE = 32_000;
+
+/** Opus's native sample rate; every encoder must accept it. */
+export const OPUS_SAMPLE_RATE = 48_000;
+
+/** MIME type of WebM/Opus audio, as given to the audio element. */
+export const WEBM_OPUS_MIME_TYPE = 'audio/webm;codecs=opus';
+
+/**
+ * Audio as it is stored in the TTS cache.
+ */
+export interface CompressedAudio {
+  audio: Blob;
+  format: CachedAudioFormat;
+}
+
+/**
+ * Decoded PCM samples of a WAV file.
+ */
+export interface PcmAudio {
+  sampleRate: number;
+  channels: number;
+  /** Samples per channel. */
+  frames: number;
+  /** Planar float samples: all of channel 0, then all of channel 1, ... */
+  samples: Float32Array;
+}
+
+// WebCodecs audio types are missing from older DOM libs; only the parts used here.
+interface EncodedChunk {
+  timestamp: number;
+  byteLength: number;
+  copyTo(destination: Uint8Array): void;
+}
+interface EncoderMetadata {
+  decoderConfig?: { description?: ArrayBuffer | ArrayBufferView };
+}
+interface AudioEncoderLike {
+  configure(config: object): void;
+  encode(data: object): void;
+  flush(): Promise<void>;
+  close(): void;
+}
+interface WebCodecsAudio {
+  AudioEncoder?: {
+    new (init: { output(chunk: EncodedChunk, metadata?: EncoderMetadata): void; error(error: unknown): void }): AudioEncoderLike;
+    isConfigSupported(config: object): Promise<{ supported?: boolean }>;
+  };
+  AudioData?: new (init: object) => { close(): void };
+}
+
+const readTag = (view: DataView, offset: number) =>
+  String.fromCharCode(view.getUint8(offset), view.getUint8(offset + 1), view.getUint8(offset + 2), view.getUint8(offset + 3));
+
+/**
+ * Decodes a PCM WAV file (16-bit integer or 32-bit float samples).
+ *
+ * @param buffer - The WAV file.
+ * @returns The samples, or null if the buffer is not a WAV file in a supported encoding.
+ */
+export function parseWav(buffer: ArrayBuffer): PcmAudio | null {
+  const view = new DataView(buffer);
+  if (view.byteLength < 12 || readTag(view, 0) !== 'RIFF' || readTag(view, 8) !== 'WAVE') return null;
+
+  let format: { encoding: number; channels: number; sampleRate: number; bits: number } | null = null;
+  let offset = 12;
+  while (offset + 8 <= view.byteLength) {
+    const id = readTag(view, offset);
+    const size = view.getUint32(offset + 4, true);
+    const body = offset + 8;
+
+    if (id === 'fmt ') {
+      format = {
+        encoding: view.getUint16(body, true),
+        channels: view.getUint16(body + 2, true),
+        sampleRate: view.getUint32(body + 4, true),
+        bits: view.getUint16(body + 14, true),
+      };
+    } else if (id === 'data' && format) {
+      const { encoding, channels, sampleRate, bits } = format;
+      const isInt16 = encoding === 1 && bits === 16;
+      const isFloat32 = encoding === 3 && bits === 32;
+      if ((!isInt16 && !isFloat32) || channels === 0) return null;
+
+      const bytesPerSample = bits / 8;
+      const length = Math.min(size, view.byteLength - body);
+      const frames = Math.floor(length / (bytesPerSample * channels));
+      const samples = new Float32Array(frames * channels);
+      for (let frame = 0; frame < frames; frame++) {
+        for (let channel = 0; channel < channels; channel++) {
+          const at = body + (frame * channels + channel) * bytesPerSample;
+          samples[channel * frames + frame] = isInt16 ? view.getInt16(at, true) / 32768 : view.getFloat32(at, true);
+        }
+      }
+      return { sampleRate, channels, frames, samples };
+    }
+    // Chunks are padded to an even size
+    offset = body + size + (size & 1);
+  }
+  return null;
+}
+
+/**
+ * Resamples PCM audio with linear interpolation.
+ *
+ * @param pcm - The samples.
+ * @param sampleRate - The target sample rate.
+ * @returns The resampled audio (the input itself if it is already at the target rate).
+ */
+export function resample(pcm: PcmAudio, sampleRate: number): PcmAudio {
+  if (pcm.sampleRate === sampleRate || pcm.frames === 0) return pcm;
+
+  const { channels, frames } = pcm;
+  const outFrames = Math.max(1, Math.round(frames * sampleRate / pcm.sampleRate));
+  const step = pcm.sampleRate / sampleRate;
+  const samples = new Float32Array(outFrames * channels);
+  for (let channel = 0; channel < channels; channel++) {
+    const input = pcm.samples.subarray(channel * frames, (channel + 1) * frames);
+    const output = samples.subarray(channel * outFrames, (channel + 1) * outFrames);
+    for (let i = 0; i < outFrames; i++) {
+      const position = i * step;
+      const before = Math.min(Math.floor(position), frames - 1);
+      const after = Math.min(before + 1, frames - 1);
+      const weight = position - before;
+      output[i] = input[before] * (1 - weight) + input[after] * weight;
+    }
+  }
+  return { sampleRate, channels, frames: outFrames, samples };
+}
+
+// --- WebM (Matroska) muxing -------------------------------------------------
+
+const concat = (parts: Uint8Array[]): Uint8Array => {
+  const out = new Uint8Array(parts.reduce((n, p) => n + p.byteLength, 0));
+  let offset = 0;
+  for (const part of parts) {
+    out.set(part, offset);
+    offset += part.byteLength;
+  }
+  return out;
+};
+
+/** Big-endian bytes of an unsigned integer, at least one byte. */
+const uintBytes = (value: number): Uint8Array => {
+  const bytes: number[] = [];
+  do {
+    bytes.unshift(value % 256);
+    value = Math.floor(value / 256);
+  } while (value > 0);
+  return new Uint8Array(bytes);
+};
+
+/** EBML variable-length size. */
+const sizeBytes = (size: number): Uint8Array => {
+  let length = 1;
+  while (size >= 2 ** (7 * length) - 1) length++;
+  const out = new Uint8Array(length);
+  let value = size;
+  for (let i = length - 1; i >= 0; i--) {
+    out[i] = value % 256;
+    value = Math.floor(value / 256);
+  }
+  out[0] |= 1 << (8 - length);
+  return out;
+};
+
+/** An EBML element; ids already carry their length marker. */
+const element = (id: number, ...payload: Uint8Array[]): Uint8Array => {
+  const body = concat(payload);
+  return concat([uintBytes(id), sizeBytes(body.byteLength), body]);
+};
+const uintElement = (id: number, value: number) => element(id, uintBytes(value));
+const stringElement = (id: number, value: string) => element(id, new TextEncoder().encode(value));
+const floatElement = (id: number, value: number) => {
+  const bytes = new Uint8Array(8);
+  new DataView(bytes.buffer).setFloat64(0, value);
+  return element(id, bytes);
+};
+
+/** Longest cluster, in milliseconds; block timecodes are 16-bit offsets from the cluster's. */
+const MAX_CLUSTER_MS = 30_000;
+
+/** Opus decoder delay recommended when the encoder does not report one, in samples at 48 kHz. */
+const DEFAULT_PRE_SKIP = 312;
+
+/**
+ * Builds the Ogg Opus identification header, used as the WebM codec private data.
+ */
+const opusHead = (channels: number, inputSampleRate: number): Uint8Array => {
+  const head = new Uint8Array(19);
+  head.set(new TextEncoder().encode('OpusHead'));
+  const view = new DataView(head.buffer);
+  view.setUint8(8, 1);
+  view.setUint8(9, channels);
+  view.setUint16(10, DEFAULT_PRE_SKIP, true);
+  view.setUint32(12, inputSampleRate, true);
+  return head;
+};
+
+/**
+ * Wraps Opus packets in a single-track WebM file.
+ *
+ * @param packets - Encoded packets with their timestamps in microseconds.
+ * @param codecPrivate - The OpusHead header.
+ * @param channels - Channel count.
+ * @param durationMs - Duration of the audio.
+ * @returns The WebM file.
+ */
+export function muxWebM(
+  packets: { timestamp: number; data: Uint8Array }[],
+  codecPrivate: Uint8Array,
+  channels: number,
+  durationMs: number
+): Uint8Array {
+  const preSkip = new DataView(codecPrivate.buffer, codecPrivate.byteOffset, codecPrivate.byteLength).getUint16(10, true);
+
+  const header = element(0x1A45DFA3,
+    uintElement(0x4286, 1),        // EBMLVersion
+    uintElement(0x42F7, 1),        // EBMLReadVersion
+    uintElement(0x42F2, 4),        // EBMLMaxIDLength
+    uintElement(0x42F3, 8),        // EBMLMaxSizeLength
+    stringElement(0x4282, 'webm'), // DocType
+    uintElement(0x4287, 4),        // DocTypeVersion
+    uintElement(0x4285, 2),        // DocTypeReadVersion
+  );
+
+  const info = element(0x1549A966,
+    uintElement(0x2AD7B1, 1_000_000), // TimecodeScale: milliseconds
+    stringElement(0x4D80, 'Versicle'), // MuxingApp
+    stringElement(0x5741, 'Versicle'), // WritingApp
+    floatElement(0x4489, durationMs),  // Duration
+  );
+
+  const tracks = element(0x1654AE6B,
+    element(0xAE,
+      uintElement(0xD7, 1),                                   // TrackNumber
+      uintElement(0x73C5, 1),                                 // TrackUID
+      uintElement(0x83, 2),                                   // TrackType: audio
+      stringElement(0x86, 'A_OPUS'),                          // CodecID
+      element(0x63A2, codecPrivate),                          // CodecPrivate
+      uintElement(0x56AA, Math.round(preSkip / 48_000 * 1e9)), // CodecDelay, ns
+      uintElement(0x56BB, 80_000_000),                        // SeekPreRoll, ns
+      element(0xE1,
+        floatElement(0xB5, 48_000), // SamplingFrequency
+        uintElement(0x9F, channels), // Channels
+      ),
+    ),
+  );
+
+  const clusters: Uint8Array[] = [];
+  let clusterStart = 0;
+  let blocks: Uint8Array[] = [];
+  const closeCluster = () => {
+    if (blocks.length > 0) clusters.push(element(0x1F43B675, uintElement(0xE7, clusterStart), ...blocks));
+    blocks = [];
+  };
+  for (const packet of packets) {
+    const timecode = Math.round(packet.timestamp / 1000);
+    if (blocks.length === 0 || timecode - clusterStart > MAX_CLUSTER_MS) {
+      closeCluster();
+      clusterStart = timecode;
+    }
+    const blockHeader = new Uint8Array(4);
+    blockHeader[0] = 0x81; // track 1
+    new DataView(blockHeader.buffer).setInt16(1, timecode - clusterStart);
+    blockHeader[3] = 0x80; // keyframe
+    blocks.push(element(0xA3, blockHeader, packet.data)); // SimpleBlock
+  }
+  closeCluster();
+
+  return concat([header, element(0x18538067, info, tracks, ...clusters)]);
+}
+
+// --- Encoding -----------------------------------------------------------------
+
+/** Whether WebCodecs can encode audio at all in this browser. */
+const hasAudioEncoder = (): boolean => {
+  const { AudioEncoder, AudioData } = globalThis as unknown as WebCodecsAudio;
+  return !!AudioEncoder && !!AudioData;
+};
+
+/** Whether the audio element can play WebM/Opus; nothing is encoded to a format that cannot be played back. */
+const canPlayOpus = (): boolean =>
+  typeof document !== 'undefined' && document.createElement('audio').canPlayType('audio/webm; codecs="opus"') !== '';
+
+/** Set once the unsupported-encoder fallback has been reported; it applies to every utterance. */
+let reportedUnsupported = false;
+
+const isWav = async (audio: Blob): Promise<boolean> => {
+  const view = new DataView(await audio.slice(0, 12).arrayBuffer());
+  return view.byteLength === 12 && readTag(view, 0) === 'RIFF' && readTag(view, 8) === 'WAVE';
+};
+
+/**
+ * Encodes PCM samples to WebM/Opus with WebCodecs. Encoders that reject the source
+ * sample rate (Piper voices run at 22050 Hz) are given the audio resampled to 48 kHz.
+ *
+ * @param source - The samples.
+ * @returns The WebM file, or null if this browser cannot encode Opus.
+ */
+export async function encodeOpus(source: PcmAudio): Promise<Blob | null> {
+  const { AudioEncoder, AudioData } = globalThis as unknown as WebCodecsAudio;
+  if (!AudioEncoder || !AudioData || source.frames === 0) return null;
+
+  const configFor = (sampleRate: number) =>
+    ({ codec: 'opus', sampleRate, numberOfChannels: source.channels, bitrate: OPUS_BITRATE });
+
+  let pcm = source;
+  let config = configFor(source.sampleRate);
+  if (!(await AudioEncoder.isConfigSupported(config)).supported) {
+    if (source.sampleRate === OPUS_SAMPLE_RATE) return null;
+    config = configFor(OPUS_SAMPLE_RATE);
+    if (!(await AudioEncoder.isConfigSupported(config)).supported) return null;
+    pcm = resample(source, OPUS_SAMPLE_RATE);
+  }
+
+  const packets: { timestamp: number; data: Uint8Array }[] = [];
+  let description: Uint8Array | undefined;
+  let failure: unknown;
+  const encoder = new AudioEncoder({
+    output: (chunk, metadata) => {
+      const data = new Uint8Array(chunk.byteLength);
+      chunk.copyTo(data);
+      packets.push({ timestamp: chunk.timestamp, data });
+      const head = metadata?.decoderConfig?.description;
+      if (head) {
+        description = head instanceof ArrayBuffer
+          ? new Uint8Array(head)
+          : new Uint8Array(head.buffer, head.byteOffset, head.byteLength);
+      }
+    },
+    error: (error) => { failure = error; },
+  });
+
+  try {
+    encoder.configure(config);
+    const data = new AudioData({
+      format: 'f32-planar',
+      sampleRate: pcm.sampleRate,
+      numberOfFrames: pcm.frames,
+      numberOfChannels: pcm.channels,
+      timestamp: 0,
+      data: pcm.samples,
+    });
+    encoder.encode(data);
+    data.close();
+    await encoder.flush();
+  } finally {
+    encoder.close();
+  }
+  if (failure) throw failure;
+
+  const webm = muxWebM(packets, description ?? opusHead(pcm.channels, source.sampleRate), pcm.channels,
+    (pcm.frames / pcm.sampleRate) * 1000);
+  return new Blob([webm], { type: WEBM_OPUS_MIME_TYPE });
+}
+
+/**
+ * Prepares synthesized audio for the persistent cache. WAV audio (Piper output) is
+ * transcoded to WebM/Opus, roughly a tenth of the size, where WebCodecs can encode it
+ * and the audio element can play it; otherwise it is stored unchanged.
+ *
+ * @param audio - The audio as returned by the provider.
+ * @returns The audio to store with its format, or undefined if it is not WAV and is stored as returned.
+ */
+export async function compressForStorage(audio: Blob): Promise<CompressedAudio | undefined> {
+  if (!await isWav(audio)) return undefined;
+  // Without an encoder there is no point reading and parsing the whole file
+  if (!hasAudioEncoder() || !canPlayOpus()) return { audio, format: 'wav' };
+
+  const pcm = parseWav(await audio.arrayBuffer());
+  if (pcm) {
+    try {
+      const encoded = await encodeOpus(pcm);
+      if (encoded && encoded.size < audio.size) return { audio: encoded, format: 'webm-opus' };
+      if (!encoded && !reportedUnsupported) {
+        reportedUnsupported = true;
+        console.warn(`Opus encoding is not supported for ${pcm.sampleRate} Hz audio, caching WAV`);
+      }
+    } catch (e) {
+      console.warn('Opus encoding failed, caching WAV', e);
+    }
+  }
+  return { audio, format: 'wav' };
+}
+
+/**
+ * Returns the MIME type of cached audio in a given format.
+ *
+ * @param format - The stored format.
+ * @returns The MIME type.
+ */
+export function mimeTypeOf(format: CachedAudioFormat): string {
+  return format === 'webm-opus' ? WEBM_OPUS_MIME_TYPE : 'audio/wav';
+}
@@ -15,6 +15,7 @@ describe('AudioElementPlayer', () => {
       currentTime: 0,
       volume: 1,
       playbackRate: 1,
+      defaultPlaybackRate: 1,
       ontimeupdate: null,
       onended: null,
       onerror: null,
@@ -78,6 +79,25 @@ describe('AudioElementPlayer', () => {
     expect(mockAudio.playbackRate).toBe(1.5);
   });
 
+  it('should keep the playback rate when a new source is played', async () => {
+    // Like a media element, loading a source resets playbackRate to defaultPlaybackRate
+    let src = '';
+    Object.defineProperty(mockAudio, 'src', {
+      get: () => src,
+      set: (value: string) => {
+        src = value;
+        mockAudio.playbackRate = mockAudio.defaultPlaybackRate;
+      },
+    });
+
+    player.setRate(1.5);
+    await player.playBlob(new Blob(['test'], { type: 'audio/wav' }));
+    expect(mockAudio.playbackRate).toBe(1.5);
+
+    await player.playUrl('http://example.com/audio.mp3');
+    expect(mockAudio.playbackRate).toBe(1.5);
+  });
+
   it('should handle time updates', () => {
       const callback = vi.fn();
       player.setOnTimeUpdate(callback);
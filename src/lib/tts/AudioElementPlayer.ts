@@ -17,6 +17,8 @@ export class AudioElementPlayer {
    */
   constructor() {
     this.audio = new Audio();
+    // Keep the voice's pitch when the rate changes (time-stretch rather than resample)
+    this.audio.preservesPitch = true;
     this.attachListeners();
   }
 
@@ -115,11 +117,13 @@ export class AudioElementPlayer {
   }
 
   /**
-   * Sets the playback rate.
+   * Sets the playback rate, for the current audio and any played after it.
+   * Loading a new source resets `playbackRate` to `defaultPlaybackRate`, so both are set.
    *
    * @param rate - The playback speed (e.g., 1.0 for normal speed).
    */
   public setRate(rate: number) {
+    this.audio.defaultPlaybackRate = rate;
     this.audio.playbackRate = rate;
   }
 
@@ -1,6 +1,7 @@
 import { describe, it, expect, vi, beforeEach } from 'vitest';
 import { AudioPlayerService } from './AudioPlayerService';
 import { BackgroundAudio } from './BackgroundAudio';
+import { dbService } from '../../db/DBService';
 
 // Mock WebSpeechProvider class
 vi.mock('./providers/WebSpeechProvider', () => {
@@ -49,8 +50,9 @@ vi.mock('./LexiconService', () => ({
     }
 }));
 vi.mock('./MediaSessionManager');
-vi.mock('../../db/DBService', () => ({
-  dbService: {
+vi.mock('../../db/DBService', async () => {
+  const { mockGetSectionBundle } = await import('../../test/mockDBService');
+  const dbService = {
     getBookMetadata: vi.fn().mockResolvedValue({
         title: 'Test Book',
         author: 'Test Author',
@@ -72,8 +74,11 @@ vi.mock('../../db/DBService', () => ({
         });
     }),
     saveTTSPosition: vi.fn(),
-  }
-}));
+    prefetchSectionBundle: vi.fn(),
+    getSectionBundle: mockGetSectionBundle(() => dbService),
+  };
+  return { dbService };
+});
 vi.mock('./CostEstimator');
 
 // Mock useTTSStore to avoid circular dependency
@@ -146,6 +151,15 @@ describe('AudioPlayerService', () => {
         expect(queue[0].coverUrl).toBe('http://example.com/cover.jpg');
     });
 
+    it('should load a section in one bundle read and prefetch the next section', async () => {
+        service.setBookId('book1');
+
+        await service.loadSection(0, false);
+
+        expect(dbService.getSectionBundle).toHaveBeenCalledWith('book1', 'sec1');
+        expect(dbService.prefetchSectionBundle).toHaveBeenCalledWith('book1', 'sec2');
+    });
+
     it('should transition to completed status when queue finishes', async () => {
         // Use the WebSpeechProvider mock class to create a mock instance that passes instanceof checks
         const { WebSpeechProvider } = await import('./providers/WebSpeechProvider');
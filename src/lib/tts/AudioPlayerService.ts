@@ -85,6 +85,7 @@ export class AudioPlayerService {
   private currentSectionIndex: number = -1;
   private sessionRestored: boolean = false;
   private prerollEnabled: boolean = false;
+  private timeStretch: boolean = true;
   private isPreviewing: boolean = false;
 
   private pendingPromise: Promise<void> = Promise.resolve();
@@ -303,6 +304,16 @@ export class AudioPlayerService {
       this.prerollEnabled = enabled;
   }
 
+  /**
+   * Sets whether cloud and Piper audio is synthesized at the normal rate and sped up at playback.
+   * Cached audio is then reused at any speed.
+   *
+   * @param enabled - Whether to apply speed at playback.
+   */
+  public setTimeStretch(enabled: boolean) {
+      this.timeStretch = enabled;
+  }
+
   public setProvider(provider: ITTSProvider) {
       return this.enqueue(async () => {
         await this.stopInternal();
@@ -443,7 +454,8 @@ export class AudioPlayerService {
 
             await this.provider.play(text, {
                 voiceId,
-                speed: this.speed
+                speed: this.speed,
+                timeStretch: this.timeStretch
             });
 
         } catch (e) {
@@ -515,7 +527,8 @@ export class AudioPlayerService {
 
         await this.provider.play(processedText, {
             voiceId,
-            speed: this.speed
+            speed: this.speed,
+            timeStretch: this.timeStretch
         });
 
         if (this.currentIndex < this.queue.length - 1) {
@@ -523,7 +536,8 @@ export class AudioPlayerService {
              const nextProcessed = this.lexiconService.applyLexicon(nextItem.text, rules);
              this.provider.preload(nextProcessed, {
                  voiceId,
-                 speed: this.speed
+                 speed: this.speed,
+                 timeStretch: this.timeStretch
              });
         }
 
@@ -798,19 +812,20 @@ export class AudioPlayerService {
 
       const section = this.playlist[sectionIndex];
       try {
-          const ttsContent = await dbService.getTTSContent(this.currentBookId, section.sectionId);
+          const { content: ttsContent, analysis, book: bookMetadata } = await dbService.getSectionBundle(this.currentBookId, section.sectionId);
+
+          // Warm the next section so the chapter transition does not wait on IndexedDB
+          const nextSection = this.playlist[sectionIndex + 1];
+          if (nextSection) {
+              dbService.prefetchSectionBundle(this.currentBookId, nextSection.sectionId);
+          }
 
           // Determine Title
           let title = sectionTitle || `Section ${sectionIndex + 1}`;
-          if (!sectionTitle) {
-              const analysis = await dbService.getContentAnalysis(this.currentBookId, section.sectionId);
-              if (analysis && analysis.structure.title) {
-                  title = analysis.structure.title;
-              }
+          if (!sectionTitle && analysis && analysis.structure.title) {
+              title = analysis.structure.title;
           }
 
-          const bookMetadata = await dbService.getBookMetadata(this.currentBookId);
-
           let coverUrl = bookMetadata?.coverUrl;
           if (!coverUrl && bookMetadata?.coverBlob) {
               if (!this.currentCoverUrl) {
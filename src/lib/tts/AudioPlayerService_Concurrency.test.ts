@@ -3,8 +3,9 @@ import { AudioPlayerService, TTSQueueItem } from './AudioPlayerService';
 import { MockCloudProvider } from './providers/MockCloudProvider';
 
 // Mock DBService
-vi.mock('../../db/DBService', () => ({
-  dbService: {
+vi.mock('../../db/DBService', async () => {
+  const { mockGetSectionBundle } = await import('../../test/mockDBService');
+  const dbService = {
     getBookMetadata: vi.fn().mockResolvedValue({}),
     updatePlaybackState: vi.fn().mockResolvedValue(undefined),
     getTTSState: vi.fn().mockResolvedValue(null),
@@ -13,8 +14,11 @@ vi.mock('../../db/DBService', () => ({
     getContentAnalysis: vi.fn(),
     getTTSContent: vi.fn(),
     updateReadingHistory: vi.fn(),
-  }
-}));
+    prefetchSectionBundle: vi.fn(),
+    getSectionBundle: mockGetSectionBundle(() => dbService),
+  };
+  return { dbService };
+});
 
 // Mock LexiconService
 vi.mock('./LexiconService', () => ({
@@ -51,8 +51,9 @@ vi.mock('../../store/useTTSStore', () => ({
 }));
 
 // Mock DBService
-vi.mock('../../db/DBService', () => ({
-  dbService: {
+vi.mock('../../db/DBService', async () => {
+  const { mockGetSectionBundle } = await import('../../test/mockDBService');
+  const dbService = {
     getBookMetadata: vi.fn().mockResolvedValue({}),
     updatePlaybackState: vi.fn().mockResolvedValue(undefined),
     getTTSState: vi.fn().mockResolvedValue(null),
@@ -61,8 +62,11 @@ vi.mock('../../db/DBService', () => ({
     getContentAnalysis: vi.fn(),
     getTTSContent: vi.fn(),
     updateReadingHistory: vi.fn(),
-  }
-}));
+    prefetchSectionBundle: vi.fn(),
+    getSectionBundle: mockGetSectionBundle(() => dbService),
+  };
+  return { dbService };
+});
 
 // Mock AudioElementPlayer with shared spies
 const sharedSpies = {
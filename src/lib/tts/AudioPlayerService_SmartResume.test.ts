@@ -5,8 +5,9 @@ import { AudioElementPlayer } from './AudioElementPlayer';
 import { dbService } from '../../db/DBService';
 
 // Mock DBService
-vi.mock('../../db/DBService', () => ({
-  dbService: {
+vi.mock('../../db/DBService', async () => {
+  const { mockGetSectionBundle } = await import('../../test/mockDBService');
+  const dbService = {
     getBook: vi.fn(),
     getBookMetadata: vi.fn(),
     updatePlaybackState: vi.fn(),
@@ -15,8 +16,11 @@ vi.mock('../../db/DBService', () => ({
     getSections: vi.fn().mockResolvedValue([]),
     getContentAnalysis: vi.fn(),
     getTTSContent: vi.fn(),
-  }
-}));
+    prefetchSectionBundle: vi.fn(),
+    getSectionBundle: mockGetSectionBundle(() => dbService),
+  };
+  return { dbService };
+});
 
 // Define hoisted mocks first to avoid reference errors
 const { mockDB, mockBook, mockTTSState } = vi.hoisted(() => {
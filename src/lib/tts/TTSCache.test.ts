@@ -1,5 +1,5 @@
 import { describe, it, expect, vi, beforeEach } from 'vitest';
-import { TTSCache } from './TTSCache';
+import { AudioMemoryCache, TTSCache } from './TTSCache';
 import { dbService } from '../../db/DBService';
 
 vi.mock('../../db/DBService', () => ({
@@ -14,6 +14,7 @@ describe('TTSCache', () => {
 
   beforeEach(() => {
     cache = new TTSCache();
+    TTSCache.clearMemory();
     vi.clearAllMocks();
   });
 
@@ -68,7 +69,7 @@ describe('TTSCache', () => {
         const audio = new ArrayBuffer(10);
         await cache.put(key, audio);
 
-        expect(dbService.cacheSegment).toHaveBeenCalledWith(key, audio, undefined);
+        expect(dbService.cacheSegment).toHaveBeenCalledWith(key, audio, undefined, undefined);
     });
 
     it('should store alignment if provided', async () => {
@@ -77,7 +78,64 @@ describe('TTSCache', () => {
         const alignment = [{ timeSeconds: 0, charIndex: 0 }];
         await cache.put(key, audio, alignment);
 
-        expect(dbService.cacheSegment).toHaveBeenCalledWith(key, audio, alignment);
+        expect(dbService.cacheSegment).toHaveBeenCalledWith(key, audio, alignment, undefined);
+    });
+  });
+
+  describe('getAudio', () => {
+    it('should serve a segment from memory after the first read', async () => {
+      // eslint-disable-next-line @typescript-eslint/no-explicit-any
+      (dbService.getCachedSegment as any).mockResolvedValue({
+        key: 'k', audio: new ArrayBuffer(8), alignment: [], createdAt: 1, lastAccessed: 1,
+      });
+
+      const first = await cache.getAudio('k', 'audio/mp3');
+      const second = await new TTSCache().getAudio('k', 'audio/mp3');
+
+      expect(first?.audio.type).toBe('audio/mp3');
+      expect(second).toBe(first);
+      expect(dbService.getCachedSegment).toHaveBeenCalledTimes(1);
+    });
+
+    it('should type compressed audio by its stored format', async () => {
+      // eslint-disable-next-line @typescript-eslint/no-explicit-any
+      (dbService.getCachedSegment as any).mockResolvedValue({
+        key: 'k', audio: new ArrayBuffer(8), format: 'webm-opus', createdAt: 1, lastAccessed: 1,
+      });
+
+      const result = await cache.getAudio('k', 'audio/mp3');
+      expect(result?.audio.type).toBe('audio/webm;codecs=opus');
+    });
+
+    it('should hold written segments in memory', async () => {
+      const audio = new Blob(['audio'], { type: 'audio/wav' });
+      await cache.putAudio('k', audio);
+
+      expect((await cache.getAudio('k', 'audio/mp3'))?.audio).toBe(audio);
+      expect(dbService.getCachedSegment).not.toHaveBeenCalled();
+      expect(dbService.cacheSegment).toHaveBeenCalledWith('k', expect.any(ArrayBuffer), undefined, undefined);
+    });
+  });
+
+  describe('AudioMemoryCache', () => {
+    const entry = (size: number) => ({ audio: new Blob([new Uint8Array(size)]) });
+
+    it('should drop the least recently used segments beyond its byte budget', () => {
+      const memory = new AudioMemoryCache(10);
+      memory.set('a', entry(4));
+      memory.set('b', entry(4));
+      memory.get('a');
+      memory.set('c', entry(4));
+
+      expect(memory.get('b')).toBeUndefined();
+      expect(memory.get('a')).toBeDefined();
+      expect(memory.getStats()).toMatchObject({ entries: 2, bytes: 8, hits: 2, misses: 1 });
+    });
+
+    it('should not hold segments larger than the budget', () => {
+      const memory = new AudioMemoryCache(10);
+      memory.set('big', entry(11));
+      expect(memory.getStats().entries).toBe(0);
     });
   });
 });
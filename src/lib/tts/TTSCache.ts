@@ -1,10 +1,128 @@
 import { dbService } from '../../db/DBService';
-import type { CachedSegment } from '../../types/db';
+import type { CachedAudioFormat, CachedSegment } from '../../types/db';
 import type { Timepoint } from './providers/types';
+import { compressForStorage, mimeTypeOf } from './AudioCompressor';
+
+/** Default size of the in-memory tier, in bytes; roughly 15-30 minutes of compressed speech. */
+export const DEFAULT_MEMORY_CACHE_BUDGET = 32 * 1024 * 1024;
+
+/**
+ * A ready-to-play cached segment.
+ */
+export interface CachedAudio {
+  /** The audio, typed with its MIME type. */
+  audio: Blob;
+  /** Optional alignment/timepoint data. */
+  alignment?: Timepoint[];
+}
+
+/**
+ * Hit/miss counters and size of the in-memory tier.
+ */
+export interface MemoryCacheStats {
+  hits: number;
+  misses: number;
+  /** Segments held. */
+  entries: number;
+  /** Bytes of audio held. */
+  bytes: number;
+  /** Size above which least recently used segments are dropped. */
+  budget: number;
+}
+
+/**
+ * Byte-budgeted LRU of ready-to-play segments, ordered by Map insertion (oldest first).
+ * Holds Blobs rather than object URLs: `AudioElementPlayer` owns the URL it plays and revokes it
+ * when playback ends, and creating a URL for an existing Blob costs nothing.
+ */
+export class AudioMemoryCache {
+  private entries = new Map<string, CachedAudio>();
+  private bytes = 0;
+  private hits = 0;
+  private misses = 0;
+
+  /**
+   * @param budget - The maximum bytes of audio held.
+   */
+  constructor(private budget: number = DEFAULT_MEMORY_CACHE_BUDGET) {}
+
+  /**
+   * Returns a segment and marks it most recently used.
+   *
+   * @param key - The cache key.
+   * @returns The segment, or undefined if not held.
+   */
+  get(key: string): CachedAudio | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      this.misses++;
+      return undefined;
+    }
+    this.hits++;
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry;
+  }
+
+  /**
+   * Adds a segment, dropping the least recently used ones beyond the budget.
+   * Segments larger than the whole budget are not held.
+   *
+   * @param key - The cache key.
+   * @param entry - The segment.
+   */
+  set(key: string, entry: CachedAudio): void {
+    this.delete(key);
+    if (entry.audio.size > this.budget) return;
+
+    this.entries.set(key, entry);
+    this.bytes += entry.audio.size;
+    for (const [oldestKey, oldest] of this.entries) {
+      if (this.bytes <= this.budget) break;
+      this.entries.delete(oldestKey);
+      this.bytes -= oldest.audio.size;
+    }
+  }
+
+  /**
+   * Drops a segment.
+   *
+   * @param key - The cache key.
+   */
+  delete(key: string): void {
+    const entry = this.entries.get(key);
+    if (!entry) return;
+    this.entries.delete(key);
+    this.bytes -= entry.audio.size;
+  }
+
+  /**
+   * Drops every segment. Counters are kept.
+   */
+  clear(): void {
+    this.entries.clear();
+    this.bytes = 0;
+  }
+
+  /**
+   * Returns the hit/miss counters and size.
+   */
+  getStats(): MemoryCacheStats {
+    return { hits: this.hits, misses: this.misses, entries: this.entries.size, bytes: this.bytes, budget: this.budget };
+  }
+}
+
+/** In-memory tier shared by every provider's {@link TTSCache}. */
+const memoryCache = new AudioMemoryCache();
 
 /**
- * Handles caching of synthesized audio segments to IndexedDB.
+ * Handles caching of synthesized audio segments.
  * Reduces API costs and latency for repeated playback.
+ *
+ * Two tiers: recently played or fetched segments are held in memory as ready-to-play Blobs
+ * (shared by all providers), so rewinding or replaying a paragraph never waits on IndexedDB;
+ * every segment is persisted to IndexedDB. WAV audio (Piper) is transcoded to WebM/Opus
+ * before it is persisted where the browser supports it.
  */
 export class TTSCache {
   /**
@@ -43,9 +161,65 @@ export class TTSCache {
    * @param key - The cache key.
    * @param audio - The audio data as an ArrayBuffer.
    * @param alignment - Optional alignment/timepoint data.
+   * @param format - The encoding of the audio, if it is not the provider's own.
    * @returns A Promise that resolves when the segment is stored.
    */
-  async put(key: string, audio: ArrayBuffer, alignment?: Timepoint[]): Promise<void> {
-    await dbService.cacheSegment(key, audio, alignment);
+  async put(key: string, audio: ArrayBuffer, alignment?: Timepoint[], format?: CachedAudioFormat): Promise<void> {
+    await dbService.cacheSegment(key, audio, alignment, format);
+  }
+
+  /**
+   * Retrieves a ready-to-play segment, from memory when possible. Segments read from
+   * IndexedDB are kept in memory for the next request.
+   *
+   * @param key - The cache key.
+   * @param mimeType - MIME type given to audio read from IndexedDB that was stored as the provider returned it.
+   * @returns A Promise that resolves to the segment or undefined if not cached.
+   */
+  async getAudio(key: string, mimeType: string): Promise<CachedAudio | undefined> {
+    const held = memoryCache.get(key);
+    if (held) return held;
+
+    const cached = await this.get(key);
+    if (!cached) return undefined;
+
+    const type = cached.format ? mimeTypeOf(cached.format) : mimeType;
+    const entry: CachedAudio = { audio: new Blob([cached.audio], { type }), alignment: cached.alignment };
+    memoryCache.set(key, entry);
+    return entry;
+  }
+
+  /**
+   * Stores a segment in memory and in IndexedDB, compressing WAV audio first.
+   * The segment is held in memory before it is encoded, so it can be played right away.
+   *
+   * @param key - The cache key.
+   * @param audio - The audio.
+   * @param alignment - Optional alignment/timepoint data.
+   * @returns A Promise that resolves when the segment is persisted.
+   */
+  async putAudio(key: string, audio: Blob, alignment?: Timepoint[]): Promise<void> {
+    memoryCache.set(key, { audio, alignment });
+
+    const compressed = await compressForStorage(audio);
+    if (compressed && compressed.audio !== audio) {
+      memoryCache.set(key, { audio: compressed.audio, alignment });
+    }
+    const stored = compressed?.audio ?? audio;
+    await this.put(key, await stored.arrayBuffer(), alignment, compressed?.format);
+  }
+
+  /**
+   * Returns the hit/miss counters and size of the in-memory tier.
+   */
+  static getMemoryStats(): MemoryCacheStats {
+    return memoryCache.getStats();
+  }
+
+  /**
+   * Drops every segment held in memory, e.g. after the persistent cache is cleared.
+   */
+  static clearMemory(): void {
+    memoryCache.clear();
   }
 }
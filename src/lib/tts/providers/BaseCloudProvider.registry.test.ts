@@ -43,8 +43,8 @@ const mockGenerateKey = vi.fn((text) => Promise.resolve(`key-${text}`));
 vi.mock('../TTSCache', () => {
   return {
     TTSCache: class {
-      get = mockGet;
-      put = mockPut;
+      getAudio = mockGet;
+      putAudio = mockPut;
       generateKey = mockGenerateKey;
     }
   };
@@ -69,6 +69,10 @@ class TestProvider extends BaseCloudProvider {
       return result;
   }
 
+  get player() {
+      return this.audioPlayer as unknown as { setRate: ReturnType<typeof vi.fn> };
+  }
+
   // Expose registry for verification
   get requestRegistrySize() {
       return this.requestRegistry.size;
@@ -169,7 +173,7 @@ describe('BaseCloudProvider Request Registry', () => {
       const text = 'cached test';
       const options: TTSOptions = { voiceId: 'v1', speed: 1.0 };
 
-      mockGet.mockResolvedValue({ audio: new ArrayBuffer(0), alignment: [] });
+      mockGet.mockResolvedValue({ audio: new Blob([]), alignment: [] });
 
       const p = provider.getOrFetchPublic(text, options);
       await new Promise(resolve => setTimeout(resolve, 0));
@@ -179,4 +183,25 @@ describe('BaseCloudProvider Request Registry', () => {
       expect(trackSpy).not.toHaveBeenCalled();
       expect(provider.requestRegistrySize).toBe(0);
   });
+
+  it('should synthesize at the normal rate and apply speed at playback when time-stretching', async () => {
+      mockGet.mockResolvedValue(undefined);
+      provider.fetchAudioDataMock.mockResolvedValue({ audio: new Blob(['audio']), isNative: false });
+
+      await provider.play('stretch test', { voiceId: 'v1', speed: 1.5, timeStretch: true });
+
+      expect(mockGenerateKey).toHaveBeenCalledWith('stretch test', 'v1', 1.0, 1.0, '');
+      expect(provider.fetchAudioDataMock).toHaveBeenCalledWith('stretch test', expect.objectContaining({ speed: 1.0 }));
+      expect(provider.player.setRate).toHaveBeenCalledWith(1.5);
+  });
+
+  it('should play audio synthesized at the rate at normal speed', async () => {
+      mockGet.mockResolvedValue(undefined);
+      provider.fetchAudioDataMock.mockResolvedValue({ audio: new Blob(['audio']), isNative: false });
+
+      await provider.play('native test', { voiceId: 'v1', speed: 1.5 });
+
+      expect(mockGenerateKey).toHaveBeenCalledWith('native test', 'v1', 1.5, 1.0, '');
+      expect(provider.player.setRate).toHaveBeenCalledWith(1);
+  });
 });
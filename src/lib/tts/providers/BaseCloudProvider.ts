@@ -1,4 +1,4 @@
-import type { ITTSProvider, TTSOptions, TTSEvent, TTSVoice, SpeechSegment } from './types';
+import type { ITTSProvider, TTSOptions, TTSEvent, TTSVoice, SpeechSegment, Timepoint } from './types';
 import { AudioElementPlayer } from '../AudioElementPlayer';
 import { TTSCache } from '../TTSCache';
 import { CostEstimator } from '../CostEstimator';
@@ -10,6 +10,8 @@ export abstract class BaseCloudProvider implements ITTSProvider {
   protected cache: TTSCache;
   protected eventListeners: ((event: TTSEvent) => void)[] = [];
   protected requestRegistry: Map<string, Promise<SpeechSegment>> = new Map();
+  /** Whether `fetchAudioData` can synthesize at `options.speed`; if not, speed is always applied at playback. */
+  protected nativeRate = true;
 
   constructor() {
     this.audioPlayer = new AudioElementPlayer();
@@ -37,7 +39,8 @@ export abstract class BaseCloudProvider implements ITTSProvider {
 
   async play(text: string, options: TTSOptions): Promise<void> {
     try {
-      const { audio, alignment } = await this.getOrFetch(text, options);
+      const synthesis = this.synthesisOptions(options);
+      const { audio, alignment } = await this.getOrFetch(text, synthesis);
 
       // 4. Emit Meta
       if (alignment) {
@@ -45,7 +48,8 @@ export abstract class BaseCloudProvider implements ITTSProvider {
       }
 
       // 5. Play
-      this.audioPlayer.setRate(options.speed);
+      // Only the part of the speed not already synthesized into the audio
+      this.audioPlayer.setRate(options.speed / synthesis.speed);
       // We need to wait for playback to START. playBlob returns a promise that resolves when it starts.
       if (audio) {
         await this.audioPlayer.playBlob(audio);
@@ -60,20 +64,35 @@ export abstract class BaseCloudProvider implements ITTSProvider {
 
   async preload(text: string, options: TTSOptions): Promise<void> {
     try {
-      await this.getOrFetch(text, options);
+      await this.getOrFetch(text, this.synthesisOptions(options));
     } catch (e) {
       console.warn("Preload failed", e);
     }
   }
 
+  /**
+   * Returns the options audio is synthesized and cached with. With time-stretching, or for
+   * providers that cannot synthesize at a rate, that is the normal rate, so the cache key does
+   * not depend on the speed and cached audio stays valid when the speed changes.
+   *
+   * @param options - The playback options.
+   * @returns The synthesis options.
+   */
+  protected synthesisOptions(options: TTSOptions): TTSOptions {
+    if (options.timeStretch || !this.nativeRate) {
+      return { ...options, speed: 1.0 };
+    }
+    return options;
+  }
+
   protected async getOrFetch(text: string, options: TTSOptions): Promise<SpeechSegment> {
     const cacheKey = await this.cache.generateKey(text, options.voiceId, options.speed, 1.0, '');
 
-    // 1. Permanent Cache Check
-    const cached = await this.cache.get(cacheKey);
+    // 1. Cache Check (memory, then IndexedDB)
+    const cached = await this.cache.getAudio(cacheKey, 'audio/mp3');
     if (cached) {
       return {
-        audio: new Blob([cached.audio], { type: 'audio/mp3' }),
+        audio: cached.audio,
         alignment: cached.alignment,
         isNative: false
       };
@@ -96,8 +115,8 @@ export abstract class BaseCloudProvider implements ITTSProvider {
           throw new Error("No audio returned from provider");
         }
 
-        // Write to permanent cache
-        await this.cache.put(cacheKey, await result.audio.arrayBuffer(), result.alignment);
+        // Write to cache without holding up playback
+        void this.writeToCache(cacheKey, result.audio, result.alignment);
 
         return result;
       } finally {
@@ -110,6 +129,18 @@ export abstract class BaseCloudProvider implements ITTSProvider {
     return await fetchPromise;
   }
 
+  /**
+   * Caches a fetched segment. It is held in memory at once, then compressed and
+   * persisted in the background; a failed write only costs a later re-fetch.
+   */
+  private async writeToCache(key: string, audio: Blob, alignment?: Timepoint[]): Promise<void> {
+    try {
+      await this.cache.putAudio(key, audio, alignment);
+    } catch (e) {
+      console.warn("Failed to cache audio", e);
+    }
+  }
+
   pause(): void {
       this.audioPlayer.pause();
   }
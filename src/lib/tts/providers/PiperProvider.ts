@@ -24,6 +24,7 @@ interface PiperVoiceInfo {
 
 export class PiperProvider extends BaseCloudProvider {
   id = 'piper';
+  protected nativeRate = false;
   private voiceMap: Map<string, { modelPath: string; configPath: string; speakerId?: number }> = new Map();
   private segmenter: TextSegmenter;
 
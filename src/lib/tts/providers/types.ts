@@ -43,6 +43,11 @@ export interface TTSOptions {
   voiceId: string;
   speed: number;
   volume?: number;
+  /**
+   * Synthesize (and cache) audio at the normal rate and apply `speed` at playback,
+   * so cached audio is reused at any speed. Only honoured by providers that play Blobs.
+   */
+  timeStretch?: boolean;
 }
 
 export type TTSEvent =
@@ -1,6 +1,7 @@
 import { describe, it, expect, beforeEach, vi, afterEach } from 'vitest';
 import { useLibraryStore } from './useLibraryStore';
 import { getDB } from '../db/db';
+import { LIBRARY_PAGE_SIZE } from '../db/DBService';
 import type { BookMetadata, LexiconRule } from '../types/db';
 
 // Mock ingestion
@@ -46,14 +47,17 @@ describe('useLibraryStore', () => {
     // Reset Zustand store
     useLibraryStore.setState({
       books: [],
+      lastReadBook: null,
       isLoading: false,
+      filter: '',
       sortOrder: 'last_read', // Default
     });
 
     // Clear IndexedDB
     const db = await getDB();
-    const tx = db.transaction(['books', 'files', 'annotations', 'lexicon'], 'readwrite');
+    const tx = db.transaction(['books', 'library_summary', 'files', 'annotations', 'lexicon'], 'readwrite');
     await tx.objectStore('books').clear();
+    await tx.objectStore('library_summary').clear();
     await tx.objectStore('files').clear();
     await tx.objectStore('annotations').clear();
     await tx.objectStore('lexicon').clear();
@@ -76,7 +80,7 @@ describe('useLibraryStore', () => {
 
     const state = useLibraryStore.getState();
     expect(state.books).toHaveLength(1);
-    expect(state.books[0]).toEqual(mockBook);
+    expect(state.books[0]).toMatchObject({ id: mockBook.id, title: mockBook.title, author: mockBook.author, addedAt: mockBook.addedAt });
     expect(state.isLoading).toBe(false);
 
     // Verify it's in DB
@@ -123,7 +127,7 @@ describe('useLibraryStore', () => {
     // State should now have the book
     const state = useLibraryStore.getState();
     expect(state.books).toHaveLength(1);
-    expect(state.books[0]).toEqual(mockBook);
+    expect(state.books[0]).toMatchObject({ id: mockBook.id, title: mockBook.title, author: mockBook.author, addedAt: mockBook.addedAt });
   });
 
   it('should sort books by addedAt desc on refresh', async () => {
@@ -134,6 +138,7 @@ describe('useLibraryStore', () => {
     await db.put('books', book1);
     await db.put('books', book2);
 
+    useLibraryStore.setState({ sortOrder: 'recent' });
     await useLibraryStore.getState().fetchBooks();
 
     const state = useLibraryStore.getState();
@@ -142,6 +147,42 @@ describe('useLibraryStore', () => {
     expect(state.books[1].id).toBe('1');
   });
 
+  it('should load the library page by page', async () => {
+    const db = await getDB();
+    for (let i = 0; i < LIBRARY_PAGE_SIZE + 2; i++) {
+      await db.put('books', { ...mockBook, id: `book-${i}`, addedAt: i });
+    }
+    useLibraryStore.setState({ sortOrder: 'recent' });
+
+    await useLibraryStore.getState().fetchBooks();
+    let state = useLibraryStore.getState();
+    expect(state.books).toHaveLength(LIBRARY_PAGE_SIZE);
+    expect(state.hasMore).toBe(true);
+    expect(state.books[0].id).toBe(`book-${LIBRARY_PAGE_SIZE + 1}`);
+
+    await useLibraryStore.getState().fetchMoreBooks();
+    state = useLibraryStore.getState();
+    expect(state.books).toHaveLength(LIBRARY_PAGE_SIZE + 2);
+    expect(state.hasMore).toBe(false);
+    expect(state.books[state.books.length - 1].id).toBe('book-0');
+  });
+
+  it('should find the last read book outside the loaded pages and filter', async () => {
+    const db = await getDB();
+    for (let i = 0; i < LIBRARY_PAGE_SIZE + 2; i++) {
+      await db.put('books', { ...mockBook, id: `book-${i}`, title: `Book ${String(i).padStart(3, '0')}`, addedAt: i });
+    }
+    await db.put('books', { ...mockBook, id: 'book-read', title: 'Zebra', addedAt: 0, lastRead: 5000, progress: 0.4 });
+    useLibraryStore.setState({ sortOrder: 'title', filter: 'book' });
+
+    await useLibraryStore.getState().fetchBooks();
+    await useLibraryStore.getState().fetchLastReadBook();
+
+    const state = useLibraryStore.getState();
+    expect(state.books.some(book => book.id === 'book-read')).toBe(false);
+    expect(state.lastReadBook).toMatchObject({ id: 'book-read', progress: 0.4 });
+  });
+
   it('should update and persist sort order', () => {
     const state = useLibraryStore.getState();
     expect(state.sortOrder).toBe('last_read');
@@ -1,21 +1,46 @@
 import { create } from 'zustand';
 import { persist } from 'zustand/middleware';
-import { dbService } from '../db/DBService';
-import type { BookMetadata } from '../types/db';
+import { dbService, LIBRARY_PAGE_SIZE } from '../db/DBService';
+import type { LibrarySortOrder, LibrarySummary } from '../types/db';
 import { StorageFullError } from '../types/errors';
 import { useTTSStore } from './useTTSStore';
 import { processBatchImport } from '../lib/batch-ingestion';
 
-export type SortOption = 'recent' | 'last_read' | 'author' | 'title';
+export type SortOption = LibrarySortOrder;
+
+/** Identifies a listing, so a refresh can tell whether the loaded pages are still valid. */
+const listingKey = (sortOrder: SortOption, filter: string) => `${sortOrder}\u0000${filter}`;
+
+/** Incremented by every listing request; responses of superseded requests are dropped. */
+let listingGeneration = 0;
+
+/** The listing the loaded pages belong to. */
+let loadedListing: string | null = null;
 
 /**
  * State interface for the Library store.
  */
 interface LibraryState {
-  /** List of book metadata currently in the library. */
-  books: BookMetadata[];
+  /**
+   * Summaries of the books loaded so far, in `sortOrder` and matching `filter`.
+   * Pages are appended by `fetchMoreBooks` (covers are loaded per card).
+   */
+  books: LibrarySummary[];
+  /**
+   * The most recently read book, whatever the listing's sort order, filter and loaded pages;
+   * null if no book has been read. Refreshed with every `fetchBooks`.
+   */
+  lastReadBook: LibrarySummary | null;
   /** Flag indicating if the library is currently loading. */
   isLoading: boolean;
+  /** Flag indicating if a further page is being loaded. */
+  isLoadingMore: boolean;
+  /** Whether more books follow the loaded pages. */
+  hasMore: boolean;
+  /** Continuation token of the next page, or null if none. */
+  nextCursor: string | null;
+  /** Text that the title or author of listed books must contain. */
+  filter: string;
   /** Flag indicating if a book is currently being imported. */
   isImporting: boolean;
   /** Progress percentage of the current import (0-100). */
@@ -38,14 +63,29 @@ interface LibraryState {
    */
   setViewMode: (mode: 'grid' | 'list') => void;
   /**
-   * Sets the sort order of the library.
+   * Sets the sort order of the library and reloads it from the first page.
    * @param sort - The new sort order.
    */
   setSortOrder: (sort: SortOption) => void;
   /**
-   * Fetches all books from the database and updates the store.
+   * Sets the title/author filter and reloads the library from the first page.
+   * @param filter - The text to match.
+   */
+  setFilter: (filter: string) => void;
+  /**
+   * Loads the first page of the library for the current sort order and filter.
+   * When refreshing the same listing, as many books as are already loaded are reloaded,
+   * so the user keeps their scroll position.
    */
   fetchBooks: () => Promise<void>;
+  /**
+   * Appends the next page of the library, if any.
+   */
+  fetchMoreBooks: () => Promise<void>;
+  /**
+   * Reloads `lastReadBook` from the first row of the `last_read` index.
+   */
+  fetchLastReadBook: () => Promise<void>;
   /**
    * Imports a new EPUB file into the library.
    * @param file - The EPUB file to import.
@@ -61,12 +101,22 @@ interface LibraryState {
    * @param id - The unique identifier of the book to remove.
    */
   removeBook: (id: string) => Promise<void>;
+  /**
+   * Removes several books (e.g. a multi-selection) in a single database transaction.
+   * @param ids - The unique identifiers of the books to remove.
+   */
+  removeBooks: (ids: string[]) => Promise<void>;
 
   /**
    * Offloads the binary file of a book to save space, retaining metadata.
    * @param id - The unique identifier of the book to offload.
    */
   offloadBook: (id: string) => Promise<void>;
+  /**
+   * Offloads several books in a single database transaction.
+   * @param ids - The unique identifiers of the books to offload.
+   */
+  offloadBooks: (ids: string[]) => Promise<void>;
 
   /**
    * Restores the binary file of an offloaded book.
@@ -84,7 +134,12 @@ export const useLibraryStore = create<LibraryState>()(
   persist(
     (set, get) => ({
       books: [],
+      lastReadBook: null,
       isLoading: false,
+      isLoadingMore: false,
+      hasMore: false,
+      nextCursor: null,
+      filter: '',
       isImporting: false,
       importProgress: 0,
       importStatus: '',
@@ -95,19 +150,76 @@ export const useLibraryStore = create<LibraryState>()(
       sortOrder: 'last_read',
 
       setViewMode: (mode) => set({ viewMode: mode }),
-      setSortOrder: (sort) => set({ sortOrder: sort }),
+      setSortOrder: (sort) => {
+        set({ sortOrder: sort });
+        void get().fetchBooks();
+      },
+
+      setFilter: (filter) => {
+        if (filter === get().filter) return;
+        set({ filter });
+        void get().fetchBooks();
+      },
 
       fetchBooks: async () => {
-        set({ isLoading: true, error: null });
+        const { sortOrder, filter, books } = get();
+        const listing = listingKey(sortOrder, filter);
+        const limit = listing === loadedListing ? Math.max(LIBRARY_PAGE_SIZE, books.length) : LIBRARY_PAGE_SIZE;
+        const generation = ++listingGeneration;
+
+        // Keep showing the current books while a refresh or re-sort is in flight
+        set({ isLoading: books.length === 0, error: null });
+        void get().fetchLastReadBook();
         try {
-          const books = await dbService.getLibrary();
-          set({ books, isLoading: false });
+          const page = await dbService.getLibraryPage({ sortOrder, filter, limit });
+          if (generation !== listingGeneration) return;
+          loadedListing = listing;
+          set({
+            books: page.books,
+            nextCursor: page.cursor,
+            hasMore: page.cursor !== null,
+            isLoading: false,
+            isLoadingMore: false
+          });
         } catch (err) {
+          if (generation !== listingGeneration) return;
           console.error('Failed to fetch books:', err);
           set({ error: 'Failed to load library.', isLoading: false });
         }
       },
 
+      fetchMoreBooks: async () => {
+        const { sortOrder, filter, nextCursor, isLoadingMore } = get();
+        if (!nextCursor || isLoadingMore) return;
+        const generation = listingGeneration;
+
+        set({ isLoadingMore: true });
+        try {
+          const page = await dbService.getLibraryPage({ sortOrder, filter, cursor: nextCursor });
+          if (generation !== listingGeneration) return;
+          set((state) => ({
+            books: [...state.books, ...page.books],
+            nextCursor: page.cursor,
+            hasMore: page.cursor !== null,
+            isLoadingMore: false
+          }));
+        } catch (err) {
+          if (generation !== listingGeneration) return;
+          console.error('Failed to fetch more books:', err);
+          set({ error: 'Failed to load library.', isLoadingMore: false });
+        }
+      },
+
+      fetchLastReadBook: async () => {
+        try {
+          const { books: [book] } = await dbService.getLibraryPage({ sortOrder: 'last_read', limit: 1 });
+          // Unread books are indexed with lastRead 0, so they come last
+          set({ lastReadBook: book?.lastRead ? book : null });
+        } catch (err) {
+          console.error('Failed to fetch the last read book:', err);
+        }
+      },
+
       addBook: async (file: File) => {
         set({
             isImporting: true,
@@ -215,6 +327,16 @@ export const useLibraryStore = create<LibraryState>()(
         }
       },
 
+      removeBooks: async (ids: string[]) => {
+        try {
+          await dbService.deleteBooks(ids);
+          await get().fetchBooks();
+        } catch (err) {
+          console.error('Failed to remove books:', err);
+          set({ error: 'Failed to remove books.' });
+        }
+      },
+
       offloadBook: async (id: string) => {
         try {
           await dbService.offloadBook(id);
@@ -225,6 +347,16 @@ export const useLibraryStore = create<LibraryState>()(
         }
       },
 
+      offloadBooks: async (ids: string[]) => {
+        try {
+          await dbService.offloadBooks(ids);
+          await get().fetchBooks();
+        } catch (err) {
+          console.error('Failed to offload books:', err);
+          set({ error: 'Failed to offload books.' });
+        }
+      },
+
       restoreBook: async (id: string, file: File) => {
         set({ isImporting: true, error: null });
         try {
@@ -64,6 +64,9 @@ interface TTSState {
   /** Whether to enable chapter pre-roll announcements */
   prerollEnabled: boolean;
 
+  /** Whether to synthesize at the normal rate and apply speed at playback, so cached audio works at any speed */
+  timeStretch: boolean;
+
   /** Whether to enable text sanitization (remove URLs, page numbers, etc.) */
   sanitizationEnabled: boolean;
 
@@ -87,6 +90,7 @@ interface TTSState {
   setSentenceStarters: (words: string[]) => void;
   setEnableCostWarning: (enable: boolean) => void;
   setPrerollEnabled: (enable: boolean) => void;
+  setTimeStretch: (enable: boolean) => void;
   setSanitizationEnabled: (enable: boolean) => void;
   loadVoices: () => Promise<void>;
   downloadVoice: (voiceId: string) => Promise<void>;
@@ -167,6 +171,7 @@ export const useTTSStore = create<TTSState>()(
             },
             enableCostWarning: true,
             prerollEnabled: false,
+            timeStretch: true,
             sanitizationEnabled: true,
             backgroundAudioMode: 'silence',
             whiteNoiseVolume: 0.1,
@@ -231,6 +236,10 @@ export const useTTSStore = create<TTSState>()(
                 player.setPrerollEnabled(enable);
                 set({ prerollEnabled: enable });
             },
+            setTimeStretch: (enable) => {
+                player.setTimeStretch(enable);
+                set({ timeStretch: enable });
+            },
             setSanitizationEnabled: (enable) => {
                 set({ sanitizationEnabled: enable });
             },
@@ -332,6 +341,7 @@ export const useTTSStore = create<TTSState>()(
             sentenceStarters: state.sentenceStarters,
             enableCostWarning: state.enableCostWarning,
             prerollEnabled: state.prerollEnabled,
+            timeStretch: state.timeStretch,
             sanitizationEnabled: state.sanitizationEnabled,
             backgroundAudioMode: state.backgroundAudioMode,
             whiteNoiseVolume: state.whiteNoiseVolume,
@@ -341,6 +351,7 @@ export const useTTSStore = create<TTSState>()(
                 player.setBackgroundAudioMode(state.backgroundAudioMode);
                 player.setBackgroundVolume(state.whiteNoiseVolume);
                 player.setPrerollEnabled(state.prerollEnabled);
+                player.setTimeStretch(state.timeStretch);
                 player.setSpeed(state.rate);
                 if (state.voice) {
                     player.setVoice(state.voice.id);
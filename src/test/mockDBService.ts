@@ -0,0 +1,27 @@
+import { vi } from 'vitest';
+
+/** The per-store reads a section bundle is assembled from. */
+interface SectionBundleSources {
+  getTTSContent(bookId: string, sectionId: string): unknown;
+  getContentAnalysis(bookId: string, sectionId: string): unknown;
+  getBookMetadata(bookId: string): unknown;
+}
+
+/**
+ * Creates a mock of `DBService.getSectionBundle` built from the per-store mocks of a mocked
+ * `dbService`. They are looked up at call time, so tests can keep stubbing `getTTSContent`,
+ * `getContentAnalysis` and `getBookMetadata`.
+ *
+ * @param getService - Returns the mocked service; called on every invocation.
+ * @returns The `getSectionBundle` mock.
+ */
+export function mockGetSectionBundle(getService: () => SectionBundleSources) {
+  return vi.fn(async (bookId: string, sectionId: string): Promise<Record<string, unknown>> => {
+    const dbService = getService();
+    return {
+      content: await dbService.getTTSContent(bookId, sectionId),
+      analysis: await dbService.getContentAnalysis(bookId, sectionId),
+      book: await dbService.getBookMetadata(bookId),
+    };
+  });
+}
@@ -0,0 +1,107 @@
+import type { SearchSection } from '../types/search';
+
+/** Approximate size of one generated section (a chapter) in characters. */
+const SECTION_SIZE = 64 * 1024;
+
+/** Number of distinct synthetic words. Word frequencies follow a Zipf-like distribution. */
+const VOCABULARY_SIZE = 20000;
+
+/** Phrase planted at a fixed rate so that queries with a known hit count exist at every size. */
+export const CORPUS_NEEDLE = 'cerulean lighthouse keeper';
+
+/** Planted once per this many sentences. */
+const NEEDLE_INTERVAL = 500;
+
+const SYLLABLES = ['ka', 'lo', 'mi', 'ne', 'ru', 'sa', 'ti', 'vo', 'ze', 'an', 'el', 'or', 'us', 'ith', 'ber', 'gal', 'dor', 'fen'];
+
+/**
+ * Small deterministic PRNG (mulberry32), so every run benchmarks the same text.
+ */
+function createRandom(seed: number): () => number {
+    let state = seed >>> 0;
+    return () => {
+        state = (state + 0x6d2b79f5) >>> 0;
+        let t = state;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+}
+
+function buildVocabulary(random: () => number): string[] {
+    const words = new Set<string>();
+    while (words.size < VOCABULARY_SIZE) {
+        const syllables = 1 + Math.floor(random() * 4);
+        let word = '';
+        for (let i = 0; i < syllables; i++) {
+            word += SYLLABLES[Math.floor(random() * SYLLABLES.length)];
+        }
+        words.add(word);
+    }
+    return Array.from(words);
+}
+
+/**
+ * Generates a deterministic synthetic book of roughly the requested size.
+ *
+ * @param megabytes - Approximate corpus size in MB (of UTF-16 characters).
+ * @param seed - PRNG seed.
+ * @returns The book's sections, ready for `SearchEngine.indexBook`.
+ */
+export function generateCorpus(megabytes: number, seed = 42): SearchSection[] {
+    const random = createRandom(seed);
+    const vocabulary = buildVocabulary(random);
+    const target = megabytes * 1024 * 1024;
+
+    const sections: SearchSection[] = [];
+    let produced = 0;
+    let sentenceCount = 0;
+
+    while (produced < target) {
+        const parts: string[] = [];
+        let length = 0;
+        while (length < SECTION_SIZE) {
+            sentenceCount++;
+            let sentence: string;
+            if (sentenceCount % NEEDLE_INTERVAL === 0) {
+                sentence = `The ${CORPUS_NEEDLE} waited.`;
+            } else {
+                const words: string[] = [];
+                const wordCount = 6 + Math.floor(random() * 14);
+                for (let i = 0; i < wordCount; i++) {
+                    // Squaring skews towards low ranks: a cheap Zipf-like distribution
+                    const rank = Math.floor(random() * random() * vocabulary.length);
+                    words.push(vocabulary[rank]);
+                }
+                sentence = words.join(' ') + '.';
+                sentence = sentence[0].toUpperCase() + sentence.slice(1);
+            }
+            parts.push(sentence);
+            length += sentence.length + 1;
+        }
+
+        const index = sections.length;
+        sections.push({ id: `section-${index}`, href: `chapter${index}.xhtml`, text: parts.join(' ') });
+        produced += length;
+    }
+
+    return sections;
+}
+
+/**
+ * Returns the number of needle phrases planted in a corpus.
+ *
+ * @param sections - The generated sections.
+ */
+export function countNeedles(sections: SearchSection[]): number {
+    let count = 0;
+    for (const section of sections) {
+        let from = 0;
+        const text = section.text ?? '';
+        while ((from = text.indexOf(CORPUS_NEEDLE, from)) !== -1) {
+            count++;
+            from += CORPUS_NEEDLE.length;
+        }
+    }
+    return count;
+}
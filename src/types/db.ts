@@ -1,6 +1,7 @@
 import type { Timepoint } from '../lib/tts/providers/types';
 import type { NavigationItem } from 'epubjs';
 import type { TTSQueueItem } from '../lib/tts/AudioPlayerService';
+import type { SerializedSearchIndex } from './search';
 
 /**
  * Metadata for a book stored in the library.
@@ -52,6 +53,81 @@ export interface BookMetadata {
   aiAnalysisStatus?: 'none' | 'partial' | 'complete';
 }
 
+/**
+ * Compact projection of a book holding only what the library views render.
+ * Stored in the `library_summary` store and kept in sync with `books` on every write,
+ * so listing the library never deserializes cover blobs or synthetic TOCs.
+ */
+export interface LibrarySummary {
+  /** Unique identifier for the book (UUID). */
+  id: string;
+  /** The original filename of the EPUB file. */
+  filename?: string;
+  /** The title of the book. */
+  title: string;
+  /** The author(s) of the book. */
+  author: string;
+  /** Timestamp when the book was added to the library. */
+  addedAt: number;
+  /** Timestamp when the book was last opened, or 0 if it never was. */
+  lastRead?: number;
+  /** Reading progress as a percentage (0.0 to 1.0). */
+  progress?: number;
+  /** Whether the binary file content has been deleted to save space. */
+  isOffloaded?: boolean;
+  /** The size of the file in bytes. */
+  fileSize?: number;
+  /** Total number of characters in the book, used for duration estimation. */
+  totalChars?: number;
+  /** Whether a cover thumbnail exists. It is fetched on demand with `DBService.getBookCover`. */
+  hasCover: boolean;
+  /** Case-folded title, the key of the `by_title` index. */
+  titleKey: string;
+  /** Case-folded author, the key of the `by_author` index. */
+  authorKey: string;
+}
+
+/**
+ * Orders in which the library can be listed. Each maps to an index of `library_summary`.
+ */
+export type LibrarySortOrder = 'recent' | 'last_read' | 'author' | 'title';
+
+/**
+ * Options for `DBService.getLibraryPage`.
+ */
+export interface LibraryPageOptions {
+  /** The order to list books in. Defaults to 'recent'. */
+  sortOrder?: LibrarySortOrder;
+  /** Maximum number of books in the page. */
+  limit?: number;
+  /** Continuation token from the previous page; omit for the first page. */
+  cursor?: string | null;
+  /** Case-insensitive text that the title or author must contain. */
+  filter?: string;
+}
+
+/**
+ * One page of the library listing.
+ */
+export interface LibraryPage {
+  /** The books in this page, in the requested order. */
+  books: LibrarySummary[];
+  /** Token to pass as `cursor` for the next page, or null if this was the last page. */
+  cursor: string | null;
+}
+
+/**
+ * The records needed to queue a section for TTS playback, read together by `DBService.getSectionBundle`.
+ */
+export interface SectionBundle {
+  /** Extracted TTS sentences of the section. */
+  content?: TTSContent;
+  /** AI analysis of the section, which may provide its title. */
+  analysis?: ContentAnalysis;
+  /** Metadata of the book (title, author and cover thumbnail for the media session). */
+  book?: BookMetadata;
+}
+
 /**
  * Result of AI analysis for a section.
  */
@@ -121,6 +197,27 @@ export interface BookLocations {
   locations: string;
 }
 
+/**
+ * Size and access time of a cached audio segment, kept apart from the audio so that recording
+ * a cache hit, or choosing what to evict, never reads or rewrites audio bytes.
+ */
+export interface CachedSegmentMeta {
+  /** Key of the segment in `tts_cache`. */
+  key: string;
+  /** Size of the audio in bytes. */
+  size: number;
+  /** Timestamp when the segment was cached. */
+  createdAt: number;
+  /** Timestamp when the segment was last played (for LRU eviction). */
+  lastAccessed: number;
+}
+
+/**
+ * Encoding of cached WAV audio: transcoded to WebM/Opus, or left as PCM WAV where
+ * this browser cannot encode or play Opus.
+ */
+export type CachedAudioFormat = 'webm-opus' | 'wav';
+
 /**
  * A cached audio segment for TTS.
  */
@@ -129,14 +226,26 @@ export interface CachedSegment {
   key: string;
   /** The raw audio data. */
   audio: ArrayBuffer;
+  /** Encoding of `audio`; absent when stored as the provider returned it (MP3 for cloud providers). */
+  format?: CachedAudioFormat;
   /** Optional alignment data for synchronizing text highlighting. */
   alignment?: Timepoint[];
   /** Timestamp when the cache entry was created. */
   createdAt: number;
-  /** Timestamp when the cache entry was last accessed (for LRU eviction). */
+  /** Timestamp when the cache entry was written. Later accesses are recorded in {@link CachedSegmentMeta}. */
   lastAccessed: number;
 }
 
+/**
+ * Size of the TTS audio cache against its budget, in bytes.
+ */
+export interface TTSCacheUsage {
+  /** Bytes of cached audio. */
+  bytes: number;
+  /** Size above which least recently used segments are evicted. */
+  budget: number;
+}
+
 /**
  * Persisted TTS state for session restoration.
  */
@@ -275,3 +384,50 @@ export interface TTSContent {
     cfi: string;
   }[];
 }
+
+/**
+ * Stored form of {@link TTSContent} in the `tts_content` store: the sentences of a section in columns
+ * rather than one object per sentence. Encoded and decoded by `src/db/ttsContent.ts`.
+ */
+export interface TTSContentRecord {
+  /** Composite key: `${bookId}-${sectionId}` */
+  id: string;
+
+  /** Foreign key to Books store */
+  bookId: string;
+
+  /** The href/id of the spine item. */
+  sectionId: string;
+
+  /** Record format version. */
+  format: number;
+
+  /** The texts of all sentences, concatenated. */
+  text: string;
+
+  /** Start offset of each sentence in `text`, followed by the end offset of the last one. */
+  textOffsets: Uint32Array;
+
+  /** Length of the prefix each CFI shares with the previous sentence's CFI. */
+  cfiPrefixLengths: Uint16Array;
+
+  /** The remainder of each CFI after its shared prefix, concatenated. */
+  cfiSuffixes: string;
+
+  /** Start offset of each CFI suffix in `cfiSuffixes`, followed by the end offset of the last one. */
+  cfiSuffixOffsets: Uint32Array;
+}
+
+/**
+ * Persisted full-text search index for a book, loaded lazily by the search worker.
+ */
+export interface SearchIndexRecord extends SerializedSearchIndex {
+  /** The ID of the book (Primary Key). */
+  bookId: string;
+
+  /** Index format version. Records with a different version are ignored and rebuilt. */
+  version: number;
+
+  /** Timestamp when the index was built. */
+  createdAt: number;
+}
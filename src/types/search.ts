@@ -16,10 +16,130 @@ export interface SearchResult {
     href: string;
     /** A snippet of text containing the search term, with surrounding context. */
     excerpt: string;
-    /** Optional Canonical Fragment Identifier (CFI) for precise location navigation. */
+    /** Canonical Fragment Identifier (CFI) of the sentence containing the match, when the book has sentence locations. */
     cfi?: string;
 }
 
+/**
+ * How a query is matched.
+ * - `exact`: case-insensitive literal match at word boundaries (the last word may be a prefix).
+ * - `fuzzy`: accent-insensitive, typo-tolerant match, ranked by similarity.
+ */
+export type SearchMode = 'exact' | 'fuzzy';
+
+/**
+ * Options controlling a search.
+ */
+export interface SearchOptions {
+    /** Matching mode. Defaults to `exact`. */
+    mode?: SearchMode;
+}
+
+/**
+ * Options controlling a streaming search.
+ */
+export interface SearchStreamOptions extends SearchOptions {
+    /** Number of results delivered per page. Defaults to 20. */
+    pageSize?: number;
+    /** Upper bound on the total number of results streamed. Defaults to 1000. */
+    maxResults?: number;
+}
+
+/**
+ * Options controlling a search-as-you-type query.
+ */
+export interface SearchAsYouTypeOptions extends SearchOptions {
+    /** Number of results returned. Defaults to 100. */
+    limit?: number;
+}
+
+/**
+ * The response to a search-as-you-type query.
+ */
+export interface SearchAsYouTypeResult {
+    /** The first results (reading order for exact searches, best first for fuzzy ones). */
+    results: SearchResult[];
+    /** Total number of matches found (capped). */
+    total: number;
+    /** True if the match set was cut off at the session cap. */
+    truncated: boolean;
+    /** How the matches were obtained: a full index lookup, narrowing of a previous query, or the session cache. */
+    source: 'index' | 'narrowed' | 'cache';
+}
+
+/**
+ * Receives one page of streamed search results.
+ * `done` is true for the final page (which is only empty when nothing matched).
+ * Returning a promise holds back the next page until it settles.
+ */
+export type SearchPageCallback = (results: SearchResult[], done: boolean) => void | Promise<void>;
+
+/**
+ * Options controlling a library-wide search.
+ */
+export interface LibrarySearchOptions extends SearchOptions {
+    /** Number of excerpts returned per matching book. Defaults to 3. */
+    resultsPerBook?: number;
+}
+
+/**
+ * All matches of a library-wide query within a single book.
+ */
+export interface LibrarySearchHit {
+    /** The ID of the matching book. */
+    bookId: string;
+    /** Relevance score used to rank books against each other (higher is better). */
+    score: number;
+    /** Number of occurrences of the query in the book (capped). */
+    hitCount: number;
+    /** The first few results within the book, in reading order. */
+    results: SearchResult[];
+}
+
+/**
+ * The response of a single search worker for its shard of the library.
+ */
+export interface LibrarySearchShardResult {
+    /** Matching books in this shard. */
+    hits: LibrarySearchHit[];
+    /** Books without an in-memory or persisted index. */
+    unindexed: string[];
+    /** Number of books actually searched. */
+    booksSearched: number;
+    /** Time spent inside the worker, in milliseconds. */
+    elapsedMs: number;
+    /** True if a newer search superseded this one before it finished. */
+    cancelled: boolean;
+}
+
+/**
+ * Latency report for one shard of a library-wide search.
+ */
+export interface LibrarySearchShardStats {
+    /** Index of the worker in the pool. */
+    shard: number;
+    /** Number of books assigned to the shard. */
+    books: number;
+    /** Time spent inside the worker, in milliseconds. */
+    elapsedMs: number;
+    /** Time from dispatch to response on the main thread, in milliseconds. */
+    roundTripMs: number;
+}
+
+/**
+ * The merged, ranked result of a library-wide search.
+ */
+export interface LibrarySearchResponse {
+    /** Matching books, best first. */
+    hits: LibrarySearchHit[];
+    /** Books that could not be searched because they have no index yet. */
+    unindexed: string[];
+    /** Per-shard latency. */
+    shards: LibrarySearchShardStats[];
+    /** True if any shard was superseded by a newer search. */
+    cancelled: boolean;
+}
+
 /**
  * Represents a section of a book to be indexed.
  * Typically corresponds to a single spine item (chapter/file).
@@ -34,3 +154,72 @@ export interface SearchSection {
     /** The raw XML content of the section (optional, for worker-side parsing). */
     xml?: string;
 }
+
+/**
+ * Metadata for one section of an {@link EncodedSearchSections} batch.
+ * Lengths are in UTF-16 code units of the decoded strings.
+ */
+export interface EncodedSearchSectionInfo {
+    /** Unique identifier for the section. */
+    id: string;
+    /** Relative path/href to the section file. */
+    href: string;
+    /** Length of the section text (0 if absent). */
+    textLength: number;
+    /** Length of the section XML (0 if absent). */
+    xmlLength: number;
+}
+
+/**
+ * A batch of sections whose text is packed into a single UTF-8 buffer, so the bulk content
+ * can be transferred to the search worker instead of being structured-cloned.
+ */
+export interface EncodedSearchSections {
+    /** Section metadata, in the order their content appears in `buffer`. */
+    sections: EncodedSearchSectionInfo[];
+    /** The UTF-8 encoded text and XML of all sections, concatenated. */
+    buffer: ArrayBuffer;
+}
+
+/**
+ * Memory usage of a search worker's in-memory indexes.
+ */
+export interface SearchMemoryStats {
+    /** Number of books currently held in memory. */
+    books: number;
+    /** Approximate bytes used by the in-memory indexes. */
+    residentBytes: number;
+    /** The configured memory budget in bytes. */
+    budgetBytes: number;
+    /** Number of books evicted since the worker started. */
+    evictions: number;
+}
+
+/**
+ * A section of a serialized search index, holding its text and token stream.
+ */
+export interface SerializedSearchSection {
+    /** Relative path/href to the section file. */
+    href: string;
+    /** The plain text content of the section. */
+    text: string;
+    /** Vocabulary id of each token, in reading order. */
+    termIds: Uint32Array;
+    /** Character offset of each token within `text`. */
+    offsets: Uint32Array;
+    /** Start offset of each located sentence within `text`, ascending. */
+    sentenceOffsets?: Uint32Array;
+    /** CFI of each located sentence, parallel to `sentenceOffsets`. */
+    sentenceCfis?: string[];
+}
+
+/**
+ * A structured-clone friendly snapshot of a book's positional search index.
+ * Posting lists are not stored; they are rebuilt from the token streams on load.
+ */
+export interface SerializedSearchIndex {
+    /** Indexed vocabulary (lowercased terms). Term ids are positions in this array. */
+    vocabulary: string[];
+    /** Indexed sections, in reading order. */
+    sections: SerializedSearchSection[];
+}
@@ -42,8 +42,9 @@ vi.mock('@jofr/capacitor-media-session', () => ({
 }));
 
 // Mock DBService
-vi.mock('../db/DBService', () => ({
-  dbService: {
+vi.mock('../db/DBService', async () => {
+  const { mockGetSectionBundle } = await import('../test/mockDBService');
+  const dbService = {
     getTTSContent: vi.fn(),
     getContentAnalysis: vi.fn(),
     getBookMetadata: vi.fn(),
@@ -52,8 +53,11 @@ vi.mock('../db/DBService', () => ({
     updatePlaybackState: vi.fn(),
     updateReadingHistory: vi.fn(),
     getSections: vi.fn(),
-  },
-}));
+    prefetchSectionBundle: vi.fn(),
+    getSectionBundle: mockGetSectionBundle(() => dbService),
+  };
+  return { dbService };
+});
 
 // Mock LexiconService
 vi.mock('../lib/tts/LexiconService', () => ({